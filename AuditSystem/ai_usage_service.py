@@ -0,0 +1,106 @@
+"""
+Service for persisting and reading aggregated Gemini usage metrics.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict
+
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from services.ai_instrumentation import GenerationTrace
+
+from .models import AiUsageMetric
+
+logger = logging.getLogger(__name__)
+
+
+class AiUsageMetricsService:
+    """Aggregates GenerationTrace records into daily per-model/per-operation rows"""
+
+    @staticmethod
+    def record(trace: GenerationTrace) -> None:
+        """
+        Add a finished trace to today's aggregate row.
+
+        Failures are logged and swallowed: metrics must never break generation.
+        """
+        try:
+            logger.info(f"[AI TRACE] {trace.as_dict()}")
+
+            metric, _ = AiUsageMetric.objects.get_or_create(
+                date=timezone.localdate(),
+                model_name=trace.model or 'unknown',
+                operation=trace.operation,
+            )
+            latency_ms = trace.latency_ms or 0
+            AiUsageMetric.objects.filter(pk=metric.pk).update(
+                calls=F('calls') + 1,
+                successes=F('successes') + (1 if trace.success else 0),
+                failures=F('failures') + (0 if trace.success else 1),
+                attempts=F('attempts') + len(trace.attempts),
+                cache_hits=F('cache_hits') + (1 if trace.cache_hit else 0),
+                prompt_tokens=F('prompt_tokens') + trace.prompt_tokens,
+                output_tokens=F('output_tokens') + trace.output_tokens,
+                total_tokens=F('total_tokens') + trace.total_tokens,
+                total_latency_ms=F('total_latency_ms') + latency_ms,
+                total_first_chunk_ms=F('total_first_chunk_ms') + (trace.first_chunk_ms or 0),
+                max_latency_ms=Greatest(F('max_latency_ms'), latency_ms),
+                updated_at=timezone.now(),
+            )
+        except Exception as e:
+            logger.warning(f"[AI TRACE] Failed to persist usage metric: {str(e)}")
+
+    @staticmethod
+    def get_stats(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """
+        Get usage per model/operation for a date range.
+
+        Returns:
+            Dict with totals and one entry per (model, operation) with call
+            counts, error rate, token usage and average latencies
+        """
+        rows = AiUsageMetric.objects.filter(
+            date__gte=start_date.date(),
+            date__lte=end_date.date(),
+        ).values('model_name', 'operation').annotate(
+            calls=Sum('calls'),
+            successes=Sum('successes'),
+            failures=Sum('failures'),
+            attempts=Sum('attempts'),
+            cache_hits=Sum('cache_hits'),
+            prompt_tokens=Sum('prompt_tokens'),
+            output_tokens=Sum('output_tokens'),
+            total_tokens=Sum('total_tokens'),
+            total_latency_ms=Sum('total_latency_ms'),
+            total_first_chunk_ms=Sum('total_first_chunk_ms'),
+        ).order_by('model_name', 'operation')
+
+        models = []
+        for row in rows:
+            calls = row['calls'] or 0
+            models.append({
+                'model': row['model_name'],
+                'operation': row['operation'],
+                'calls': calls,
+                'successes': row['successes'],
+                'failures': row['failures'],
+                'error_rate': round(row['failures'] / calls, 3) if calls else 0.0,
+                'avg_attempts': round(row['attempts'] / calls, 2) if calls else 0.0,
+                'cache_hits': row['cache_hits'],
+                'prompt_tokens': row['prompt_tokens'],
+                'output_tokens': row['output_tokens'],
+                'total_tokens': row['total_tokens'],
+                'avg_latency_ms': round(row['total_latency_ms'] / calls) if calls else None,
+                'avg_first_chunk_ms': round(row['total_first_chunk_ms'] / calls) if calls else None,
+            })
+
+        return {
+            'metric': 'ai_usage',
+            'total_calls': sum(item['calls'] for item in models),
+            'total_tokens': sum(item['total_tokens'] for item in models),
+            'models': models,
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+        }
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-16 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuditSystem', '0007_alter_auditlog_action'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AiUsageMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Dia da agregação')),
+                ('model_name', models.CharField(help_text='Modelo Gemini utilizado', max_length=100)),
+                ('operation', models.CharField(help_text='Operação (text_generation, image_generation...)', max_length=50)),
+                ('calls', models.PositiveIntegerField(default=0, help_text='Chamadas concluídas (sucesso ou falha)')),
+                ('successes', models.PositiveIntegerField(default=0)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Tentativas, incluindo retries')),
+                ('cache_hits', models.PositiveIntegerField(default=0)),
+                ('prompt_tokens', models.BigIntegerField(default=0)),
+                ('output_tokens', models.BigIntegerField(default=0)),
+                ('total_tokens', models.BigIntegerField(default=0)),
+                ('total_latency_ms', models.BigIntegerField(default=0, help_text='Soma das latências totais')),
+                ('total_first_chunk_ms', models.BigIntegerField(default=0, help_text='Soma dos tempos até o primeiro chunk')),
+                ('max_latency_ms', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Métrica de Uso de IA',
+                'verbose_name_plural': 'Métricas de Uso de IA',
+                'db_table': 'ai_usage_metrics',
+                'ordering': ['-date', 'model_name', 'operation'],
+                'unique_together': {('date', 'model_name', 'operation')},
+            },
+        ),
+    ]
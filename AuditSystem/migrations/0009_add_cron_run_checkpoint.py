@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-16 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuditSystem', '0008_add_ai_usage_metric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CronRunCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_key', models.CharField(help_text='Cron + dia da execução', max_length=150, unique=True)),
+                ('cron_name', models.CharField(help_text='Nome do cron (daily_ideas, weekly_feed...)', max_length=100)),
+                ('last_id', models.BigIntegerField(default=0, help_text='Maior id de usuário já reservado')),
+                ('claimed_users', models.PositiveIntegerField(default=0, help_text='Usuários reservados até agora')),
+                ('completed_at', models.DateTimeField(blank=True, help_text='Quando não restaram usuários', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Checkpoint de Execução de Cron',
+                'verbose_name_plural': 'Checkpoints de Execução de Cron',
+                'db_table': 'cron_run_checkpoints',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-16 19:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuditSystem', '0009_add_cron_run_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CronInvocationSample',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pipeline', models.CharField(help_text='Pipeline do cron (daily_ideas, weekly_feed...)', max_length=100)),
+                ('planned_users', models.PositiveIntegerField(help_text='Tamanho de batch escolhido')),
+                ('users', models.PositiveIntegerField(default=0, help_text='Usuários efetivamente processados')),
+                ('concurrency', models.PositiveIntegerField(default=1, help_text='Usuários processados em paralelo')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, help_text='Vazio se a invocação ainda roda ou estourou o timeout', null=True)),
+                ('duration_seconds', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Amostra de Invocação de Cron',
+                'verbose_name_plural': 'Amostras de Invocação de Cron',
+                'db_table': 'cron_invocation_samples',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['pipeline', '-started_at'], name='cron_sample_pipeline_idx')],
+            },
+        ),
+    ]
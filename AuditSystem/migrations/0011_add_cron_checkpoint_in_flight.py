@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-16 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AuditSystem', '0010_add_cron_invocation_sample'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cronruncheckpoint',
+            name='in_flight',
+            field=models.JSONField(blank=True, default=list, help_text='Páginas reservadas ainda não concluídas (after_id, through_id, leased_until)'),
+        ),
+    ]
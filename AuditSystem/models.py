@@ -207,3 +207,88 @@ class DailyReport(models.Model):
 
     def __str__(self):
         return f"Relatório Diário para {self.report_date} - {self.total_operations} operações"
+
+
+class AiUsageMetric(models.Model):
+    """Daily aggregated usage of each Gemini model per operation"""
+
+    date = models.DateField(help_text="Dia da agregação")
+    model_name = models.CharField(max_length=100, help_text="Modelo Gemini utilizado")
+    operation = models.CharField(max_length=50, help_text="Operação (text_generation, image_generation...)")
+
+    calls = models.PositiveIntegerField(default=0, help_text="Chamadas concluídas (sucesso ou falha)")
+    successes = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0, help_text="Tentativas, incluindo retries")
+    cache_hits = models.PositiveIntegerField(default=0)
+
+    prompt_tokens = models.BigIntegerField(default=0)
+    output_tokens = models.BigIntegerField(default=0)
+    total_tokens = models.BigIntegerField(default=0)
+
+    total_latency_ms = models.BigIntegerField(default=0, help_text="Soma das latências totais")
+    total_first_chunk_ms = models.BigIntegerField(default=0, help_text="Soma dos tempos até o primeiro chunk")
+    max_latency_ms = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ai_usage_metrics'
+        verbose_name = 'Métrica de Uso de IA'
+        verbose_name_plural = 'Métricas de Uso de IA'
+        ordering = ['-date', 'model_name', 'operation']
+        unique_together = ['date', 'model_name', 'operation']
+
+    def __str__(self):
+        return f"{self.date} - {self.model_name} ({self.operation})"
+
+
+class CronRunCheckpoint(models.Model):
+    """Keyset checkpoint of a batch cron run: last user id already claimed"""
+
+    run_key = models.CharField(max_length=150, unique=True, help_text="Cron + dia da execução")
+    cron_name = models.CharField(max_length=100, help_text="Nome do cron (daily_ideas, weekly_feed...)")
+    last_id = models.BigIntegerField(default=0, help_text="Maior id de usuário já reservado")
+    claimed_users = models.PositiveIntegerField(default=0, help_text="Usuários reservados até agora")
+    in_flight = models.JSONField(
+        default=list, blank=True,
+        help_text="Páginas reservadas ainda não concluídas (after_id, through_id, leased_until)"
+    )
+    completed_at = models.DateTimeField(null=True, blank=True, help_text="Quando não restaram usuários")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'cron_run_checkpoints'
+        verbose_name = 'Checkpoint de Execução de Cron'
+        verbose_name_plural = 'Checkpoints de Execução de Cron'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.run_key} (last_id={self.last_id})"
+
+
+class CronInvocationSample(models.Model):
+    """Duration of one batch cron invocation, used to size the next batches"""
+
+    pipeline = models.CharField(max_length=100, help_text="Pipeline do cron (daily_ideas, weekly_feed...)")
+    planned_users = models.PositiveIntegerField(help_text="Tamanho de batch escolhido")
+    users = models.PositiveIntegerField(default=0, help_text="Usuários efetivamente processados")
+    concurrency = models.PositiveIntegerField(default=1, help_text="Usuários processados em paralelo")
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True,
+                                       help_text="Vazio se a invocação ainda roda ou estourou o timeout")
+    duration_seconds = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'cron_invocation_samples'
+        verbose_name = 'Amostra de Invocação de Cron'
+        verbose_name_plural = 'Amostras de Invocação de Cron'
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['pipeline', '-started_at'], name='cron_sample_pipeline_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.pipeline} - {self.users}/{self.planned_users} usuários ({self.duration_seconds}s)"
@@ -16,6 +16,8 @@ from .views import (
     subscription_details_view,
     onboarding_funnel_view,
     onboarding_step_details_view,
+    ai_model_health_view,
+    ai_usage_stats_view,
     run_migrations,
     create_yearly_plan,
     update_plan_stripe_price,
@@ -63,6 +65,12 @@ urlpatterns = [
     path('dashboard/onboarding/step/<int:step_number>/', onboarding_step_details_view,
          name='dashboard_onboarding_step_details'),
 
+    # AI model health (breaker states, rolling error rate and latency)
+    path('dashboard/ai-models/health/', ai_model_health_view,
+         name='dashboard_ai_model_health'),
+    path('dashboard/ai-usage/', ai_usage_stats_view,
+         name='dashboard_ai_usage'),
+
     # Admin maintenance endpoints
     path('admin/run-migrations/', run_migrations,
          name='admin_run_migrations'),
@@ -15,6 +15,11 @@ from rest_framework.decorators import (
 from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 
+from services.ai_service import IMAGE_MODELS, TEXT_MODELS
+from services.model_health_registry import ModelHealthRegistry
+from services.prompt_result_cache import prompt_result_cache
+
+from .ai_usage_service import AiUsageMetricsService
 from .daily_report_service import DailyReportService
 from .dashboard_service import BehaviorDashboardService
 from .models import AuditLog, DailyReport
@@ -1195,6 +1200,76 @@ def onboarding_step_details_view(request, step_number):
         )
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def ai_usage_stats_view(request):
+    """
+    Get aggregated Gemini usage per model and operation.
+
+    Query Parameters:
+    - days (optional): Number of days to look back (1, 7, 30, 90, 180). Default: 7
+
+    Returns:
+    - metric: Name of the metric
+    - total_calls / total_tokens: Totals for the period
+    - models: Per model/operation calls, error rate, average attempts,
+      cache hits, token usage, average latency and time to first chunk
+    - period_days, start_date, end_date
+    """
+    try:
+        days = int(request.GET.get('days', 7))
+        if days not in [1, 7, 30, 90, 180]:
+            return Response(
+                {'error': 'Days parameter must be one of: 1, 7, 30, 90, 180'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        end_date = timezone.now()
+        start_date = end_date - timedelta(days=days)
+
+        result = AiUsageMetricsService.get_stats(start_date, end_date)
+        result['period_days'] = days
+
+        return Response(result, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response(
+            {'error': f'Error calculating AI usage stats: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def ai_model_health_view(request):
+    """
+    Get the health registry and circuit breaker state of the Gemini models.
+
+    Returns:
+    - text_models: Stats per text model, in the order requests will try them
+    - image_models: Stats per image model, in the order requests will try them
+    - Each entry has samples, failures, error_rate, avg/p95 latency,
+      circuit (closed, open, half_open), consecutive_failures and open_until
+    - prompt_cache: Hit/miss counters of this worker's prompt result cache
+    """
+    try:
+        result = {
+            'text_models': ModelHealthRegistry.snapshot(
+                ModelHealthRegistry.order_models(TEXT_MODELS)),
+            'image_models': ModelHealthRegistry.snapshot(
+                ModelHealthRegistry.order_models(IMAGE_MODELS)),
+            'prompt_cache': prompt_result_cache.stats(),
+            'generated_at': timezone.now().isoformat(),
+        }
+        return Response(result, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response(
+            {'error': f'Error reading AI model health: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 # ============================================================================
 # ADMIN MIGRATION ENDPOINT
 # ============================================================================
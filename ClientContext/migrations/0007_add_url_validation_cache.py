@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-16 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ClientContext', '0006_add_discovered_trends'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DomainValidationHealth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(max_length=255, unique=True)),
+                ('consecutive_failures', models.PositiveIntegerField(default=0)),
+                ('last_failure_at', models.DateTimeField(blank=True, null=True)),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Domain Validation Health',
+                'verbose_name_plural': 'Domain Validation Health',
+                'db_table': 'domain_validation_health',
+            },
+        ),
+        migrations.CreateModel(
+            name='UrlValidationResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key_hash', models.CharField(max_length=64, unique=True)),
+                ('url_key', models.TextField()),
+                ('domain', models.CharField(db_index=True, max_length=255)),
+                ('is_valid', models.BooleanField()),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('final_url', models.TextField(blank=True, default='')),
+                ('checked_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'URL Validation Result',
+                'verbose_name_plural': 'URL Validation Results',
+                'db_table': 'url_validation_results',
+            },
+        ),
+    ]
@@ -86,3 +86,44 @@ class ClientContext(models.Model):
 
     def __str__(self):
         return f"ClientContext {self.id}"
+
+
+class UrlValidationResult(models.Model):
+    """Last accessibility check of a source URL, keyed by its normalized key."""
+
+    class Meta:
+        app_label = 'ClientContext'
+        db_table = 'url_validation_results'
+        verbose_name = 'URL Validation Result'
+        verbose_name_plural = 'URL Validation Results'
+
+    # sha256 of url_key: normalized URLs can exceed the indexable column size
+    key_hash = models.CharField(max_length=64, unique=True)
+    url_key = models.TextField()
+    domain = models.CharField(max_length=255, db_index=True)
+
+    is_valid = models.BooleanField()
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True)
+    final_url = models.TextField(default="", blank=True)
+    checked_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.url_key} ({'valid' if self.is_valid else 'invalid'})"
+
+
+class DomainValidationHealth(models.Model):
+    """Consecutive unreachable checks (timeouts, connection errors, 5xx) of a domain."""
+
+    class Meta:
+        app_label = 'ClientContext'
+        db_table = 'domain_validation_health'
+        verbose_name = 'Domain Validation Health'
+        verbose_name_plural = 'Domain Validation Health'
+
+    domain = models.CharField(max_length=255, unique=True)
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    last_failure_at = models.DateTimeField(blank=True, null=True)
+    last_success_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.domain} ({self.consecutive_failures} failures)"
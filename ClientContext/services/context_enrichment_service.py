@@ -2,20 +2,28 @@
 Service for enriching context data with additional sources and analysis.
 Phase 2 of the two-phase enrichment system.
 """
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Set
+import os
+from typing import Any, Dict, Optional, Set
 
 from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from django.utils import timezone
 
 from ClientContext.models import ClientContext
 from ClientContext.utils.search_utils import build_search_query, fetch_and_filter_sources
 from ClientContext.utils.enrichment_analysis import generate_enriched_analysis
-from services.serper_search_service import SerperSearchService
+from ClientContext.utils.url_validation import close_validation_session
+from services.client_registry import close_loop_genai_clients
+from services.serper_search_service import SerperSearchService, close_serper_session
+from services.serper_result_cache import serper_result_cache
 from services.source_evaluator_service import SourceEvaluatorService
 from services.ai_service import AiService
+from services.eligible_user_cursor import EligibleUserCursor
 from services.semaphore_service import SemaphoreService
+from services.stage_limiter import StageLimiter
 from services.get_creator_profile_data import get_creator_profile_data
 
 logger = logging.getLogger(__name__)
@@ -23,6 +31,18 @@ logger = logging.getLogger(__name__)
 # Limite máximo de retries para contextos com falha
 MAX_ENRICHMENT_RETRIES = 3
 
+# Users enriched at once, and opportunity chains (search -> validate -> read ->
+# evaluate -> analysis) in flight across all of them
+ENRICHMENT_MAX_CONCURRENT_USERS = int(os.getenv('ENRICHMENT_MAX_CONCURRENT_USERS', 5))
+OPPORTUNITY_STAGE = 'enrichment_opportunity'
+ENRICHMENT_OPPORTUNITY_CONCURRENCY = int(os.getenv('ENRICHMENT_OPPORTUNITY_CONCURRENCY', 15))
+
+PENDING_CONTEXT_FIELDS = (
+    'id', 'user_id', 'user__email', 'user__first_name',
+    'tendencies_data', 'context_enrichment_status',
+    'context_enrichment_error',
+)
+
 # Map opportunity categories to source_quality sections
 CATEGORY_TO_SECTION = {
     'polemica': 'tendencias',
@@ -44,11 +64,16 @@ class ContextEnrichmentService:
         ai_service: Optional[AiService] = None,
         semaphore_service: Optional[SemaphoreService] = None,
         source_evaluator: Optional[SourceEvaluatorService] = None,
+        stage_limiter: Optional[StageLimiter] = None,
     ):
         self.search_service = search_service or SerperSearchService()
         self.ai_service = ai_service or AiService()
-        self.semaphore_service = semaphore_service or SemaphoreService()
+        self.semaphore_service = semaphore_service or SemaphoreService(
+            max_concurrent_users=ENRICHMENT_MAX_CONCURRENT_USERS)
         self.source_evaluator = source_evaluator or SourceEvaluatorService()
+        self.stage_limiter = stage_limiter or StageLimiter({OPPORTUNITY_STAGE: ENRICHMENT_OPPORTUNITY_CONCURRENCY})
+        self.context_cursor = EligibleUserCursor(
+            'context_enrichment', self._pending_contexts_queryset, fields=PENDING_CONTEXT_FIELDS)
 
     async def enrich_all_users_context(
         self,
@@ -58,19 +83,41 @@ class ContextEnrichmentService:
         """
         Enrich context for all users with pending enrichment status.
 
+        Contexts are claimed with a keyset cursor (like the user crons), so
+        invocations with different batch sizes never skip or repeat contexts.
+        Users are enriched concurrently through the SemaphoreService workers.
+
         Args:
             batch_number: Current batch number for processing
-            batch_size: Number of users to process per batch
+            batch_size: Number of users to process per batch (0 = all pending)
 
         Returns:
             Dict with processing results
         """
         start_time = timezone.now()
-        offset = (batch_number - 1) * batch_size
-        limit = batch_size if batch_size > 0 else None
 
-        contexts = await self._get_pending_contexts(offset=offset, limit=limit)
-        total = len(contexts)
+        total = 0
+        results = []
+        try:
+            # Each page is released only after its contexts were enriched
+            async for page in self.context_cursor.pages(batch_size):
+                total += len(page)
+                # Pre-fetch the page's users in a single query to avoid N+1
+                users_by_id = {
+                    user.id: user for user in await sync_to_async(list)(
+                        User.objects.filter(id__in=[ctx['user_id'] for ctx in page])
+                    )
+                }
+                results.extend(await self.semaphore_service.process_concurrently(
+                    users=page,
+                    function=lambda context, users_by_id=users_by_id: self._enrich_context(context, users_by_id)
+                ))
+        finally:
+            # The HTTP sessions and genai clients live as long as this batch's loop
+            await close_validation_session()
+            await close_serper_session()
+            await close_loop_genai_clients()
+        logger.info(f"Enrichment batch {batch_number}: {total} contexts")
 
         if total == 0:
             return {
@@ -80,38 +127,8 @@ class ContextEnrichmentService:
                 'message': 'No contexts pending enrichment',
             }
 
-        # Pre-fetch all users in a single query to avoid N+1
-        user_ids = [ctx['user_id'] for ctx in contexts]
-        users_queryset = await sync_to_async(list)(
-            User.objects.filter(id__in=user_ids)
-        )
-        users_by_id = {user.id: user for user in users_queryset}
-
-        results = []
-        processed = 0
-        failed = 0
-
-        for context in contexts:
-            try:
-                user = users_by_id.get(context['user_id'])
-                if not user:
-                    logger.error(f"User {context['user_id']} not found")
-                    failed += 1
-                    continue
-                result = await self.enrich_user_context(user, context)
-                results.append(result)
-                if result.get('status') == 'success':
-                    processed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                logger.error(f"Failed to enrich context for user {context['user_id']}: {str(e)}")
-                failed += 1
-                results.append({
-                    'user_id': context['user_id'],
-                    'status': 'failed',
-                    'error': str(e)
-                })
+        processed = sum(1 for result in results if result.get('status') == 'success')
+        failed = len(results) - processed
 
         end_time = timezone.now()
         duration = (end_time - start_time).total_seconds()
@@ -122,9 +139,23 @@ class ContextEnrichmentService:
             'failed': failed,
             'total_contexts': total,
             'duration_seconds': duration,
+            # Process-wide: includes earlier invocations on a warm worker
+            'serper_cache': serper_result_cache.stats(),
             'details': results,
         }
 
+    async def _enrich_context(self, context: Dict[str, Any], users_by_id: Dict[int, User]) -> Dict[str, Any]:
+        """Worker function of enrich_all_users_context: one pending context."""
+        user = users_by_id.get(context['user_id'])
+        if not user:
+            logger.error(f"User {context['user_id']} not found")
+            return {'user_id': context['user_id'], 'status': 'failed', 'error': 'user_not_found'}
+        try:
+            return await self.enrich_user_context(user, context)
+        except Exception as e:
+            logger.error(f"Failed to enrich context for user {context['user_id']}: {str(e)}")
+            return {'user_id': context['user_id'], 'status': 'failed', 'error': str(e)}
+
     async def enrich_user_context(
         self,
         user: User,
@@ -193,6 +224,13 @@ class ContextEnrichmentService:
         """
         Enrich all categories in tendencies_data.
 
+        Every opportunity of every category is enriched concurrently, bounded
+        by the OPPORTUNITY_STAGE limit shared with the other users in flight.
+        The opportunities share used_url_keys; each source is validated first
+        and then claimed in it (checked and added with no await in between),
+        so no two opportunities get the same URL and a failed validation never
+        holds a URL another opportunity could use.
+
         Args:
             tendencies_data: Dict with categories like 'polemica', 'educativo', etc.
             user: User instance for AI service calls
@@ -201,34 +239,33 @@ class ContextEnrichmentService:
         Returns:
             Enriched tendencies_data
         """
-        enriched_data = {}
-
         # Obter setor do cliente para avaliação de fontes
         user_data = await sync_to_async(get_creator_profile_data)(user)
         client_sector = user_data.get('specialization', '') or user_data.get('business_name', '')
 
+        opportunities = []
         for category_key, category_data in tendencies_data.items():
             if not isinstance(category_data, dict):
-                enriched_data[category_key] = category_data
-                continue
-
-            items = category_data.get('items', [])
-            if not items:
-                enriched_data[category_key] = category_data
                 continue
 
             section = CATEGORY_TO_SECTION.get(category_key, 'mercado')
-
-            enriched_items = []
-            for item in items[:3]:
-                enriched_item = await self._enrich_opportunity(
+            for item in category_data.get('items', [])[:3]:
+                opportunities.append(self.stage_limiter.run(
+                    OPPORTUNITY_STAGE, self._enrich_opportunity,
                     item, user, section, category_key, client_sector, used_url_keys
-                )
-                enriched_items.append(enriched_item)
+                ))
+
+        enriched_items = iter(await asyncio.gather(*opportunities))
+
+        enriched_data = {}
+        for category_key, category_data in tendencies_data.items():
+            if not isinstance(category_data, dict) or not category_data.get('items'):
+                enriched_data[category_key] = category_data
+                continue
 
             enriched_data[category_key] = {
                 'titulo': category_data.get('titulo', ''),
-                'items': enriched_items
+                'items': [next(enriched_items) for _ in category_data['items'][:3]]
             }
 
         return enriched_data
@@ -278,7 +315,7 @@ class ContextEnrichmentService:
 
             # Evaluate sources with AI for relevance to content type
             if raw_sources and self.source_evaluator.is_configured():
-                evaluated_sources = await sync_to_async(self.source_evaluator.evaluate_sources)(
+                evaluated_sources = await sync_to_async(self.source_evaluator.evaluate_sources, thread_sensitive=False)(
                     sources=raw_sources,
                     opportunity_title=titulo,
                     content_type=category_key,
@@ -306,23 +343,10 @@ class ContextEnrichmentService:
 
         return enriched_opportunity
 
-    @sync_to_async
-    def _get_pending_contexts(
-        self,
-        offset: int = 0,
-        limit: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        Fetch contexts pending enrichment.
-
-        Args:
-            offset: Offset for pagination
-            limit: Limit for pagination
-
-        Returns:
-            List of context dicts
-        """
-        queryset = ClientContext.objects.filter(
+    @staticmethod
+    def _pending_contexts_queryset() -> QuerySet:
+        """Contexts pending enrichment (failed ones until MAX_ENRICHMENT_RETRIES)."""
+        return ClientContext.objects.filter(
             weekly_context_error__isnull=True,
             context_enrichment_status__in=['pending', 'failed'],
         ).exclude(
@@ -330,15 +354,7 @@ class ContextEnrichmentService:
             # Usando o campo context_enrichment_error para contar tentativas
             context_enrichment_status='failed',
             context_enrichment_error__contains=f'[retry:{MAX_ENRICHMENT_RETRIES}]'
-        ).select_related('user').values(
-            'id', 'user_id', 'user__email', 'user__first_name',
-            'tendencies_data', 'context_enrichment_status',
-            'context_enrichment_error'
-        ).order_by('id')  # Ordenação determinística para paginação
-
-        if limit is not None:
-            return list(queryset[offset:offset + limit])
-        return list(queryset[offset:])
+        )
 
     @sync_to_async
     def _update_enrichment_status(
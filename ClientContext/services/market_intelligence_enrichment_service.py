@@ -16,7 +16,8 @@ from django.utils import timezone
 
 from ClientContext.models import ClientContext
 from ClientContext.utils.search_utils import fetch_and_filter_sources
-from services.serper_search_service import SerperSearchService
+from ClientContext.utils.url_validation import close_validation_session
+from services.serper_search_service import SerperSearchService, close_serper_session
 
 logger = logging.getLogger(__name__)
 
@@ -96,27 +97,32 @@ class MarketIntelligenceEnrichmentService:
         failed = 0
         results = []
 
-        for context_data in contexts:
-            try:
-                user = users_by_id.get(context_data['user_id'])
-                if not user:
-                    logger.error(f"User {context_data['user_id']} not found")
-                    failed += 1
-                    continue
-                result = await self.enrich_user_context(user, context_data)
-                results.append(result)
-                if result.get('status') == 'success':
-                    processed += 1
-                else:
+        try:
+            for context_data in contexts:
+                try:
+                    user = users_by_id.get(context_data['user_id'])
+                    if not user:
+                        logger.error(f"User {context_data['user_id']} not found")
+                        failed += 1
+                        continue
+                    result = await self.enrich_user_context(user, context_data)
+                    results.append(result)
+                    if result.get('status') == 'success':
+                        processed += 1
+                    else:
+                        failed += 1
+                except Exception as e:
+                    logger.error(f"Error enriching market intelligence for user {context_data['user_id']}: {e}")
                     failed += 1
-            except Exception as e:
-                logger.error(f"Error enriching market intelligence for user {context_data['user_id']}: {e}")
-                failed += 1
-                results.append({
-                    'user_id': context_data['user_id'],
-                    'status': 'failed',
-                    'error': str(e)
-                })
+                    results.append({
+                        'user_id': context_data['user_id'],
+                        'status': 'failed',
+                        'error': str(e)
+                    })
+        finally:
+            # The HTTP sessions live as long as this batch's loop
+            await close_validation_session()
+            await close_serper_session()
 
         return {
             'status': 'completed',
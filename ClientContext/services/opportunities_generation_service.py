@@ -16,7 +16,6 @@ Mudanças principais:
     - Cada oportunidade inclui search_keywords para facilitar busca de fontes
     - Score é penalizado se não houver tendência validada associada
 """
-import json
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -25,6 +24,8 @@ from django.contrib.auth.models import User
 from django.db.models import Q
 
 from ClientContext.models import ClientContext
+from services.ai_json_parser import AiJsonParseError, parse_ai_json
+from services.ai_response_schemas import OpportunitiesPayload
 from services.ai_service import AiService
 from services.get_creator_profile_data import get_creator_profile_data
 from services.trends_discovery_service import TrendsDiscoveryService
@@ -153,8 +154,8 @@ class OpportunitiesGenerationService:
             )
 
             # Chamar IA
-            response = await sync_to_async(self.ai_service.generate_text)(
-                [prompt], user
+            response = await self.ai_service.agenerate_text(
+                [prompt], user, self.ai_service.json_config(OpportunitiesPayload)
             )
 
             # Parsear resposta JSON
@@ -408,45 +409,24 @@ Todas as ideias devem ser em português brasileiro (PT-BR).
             Dict com as oportunidades ou dict vazio se falhar
         """
         try:
-            # Limpar resposta
-            cleaned = response.strip()
-
-            # Remover markdown code blocks se presentes
-            if cleaned.startswith('```json'):
-                cleaned = cleaned[7:]
-            elif cleaned.startswith('```'):
-                cleaned = cleaned[3:]
-
-            if cleaned.endswith('```'):
-                cleaned = cleaned[:-3]
-
-            cleaned = cleaned.strip()
-
-            # Parsear JSON
-            data = json.loads(cleaned)
-
-            # Validar estrutura básica
-            if not isinstance(data, dict):
-                logger.warning("Response is not a dict")
-                return {}
+            # Parsear (e reparar, se truncado) e validar o JSON
+            data = parse_ai_json(response, OpportunitiesPayload)
 
             # Validar categorias
             valid_categories = {'polemica', 'educativo', 'newsjacking', 'entretenimento', 'estudo_caso', 'futuro'}
             result = {}
 
             for category in valid_categories:
-                if category in data and isinstance(data[category], dict):
-                    result[category] = data[category]
-                else:
-                    # Criar categoria vazia se não existir
-                    result[category] = {
-                        'titulo': self._get_category_title(category),
-                        'items': []
-                    }
+                # Categorias ausentes viram categorias vazias com o título padrão
+                category_data = data.get(category, {})
+                result[category] = {
+                    'titulo': category_data.get('titulo') or self._get_category_title(category),
+                    'items': category_data.get('items', [])
+                }
 
             return result
 
-        except json.JSONDecodeError as e:
+        except AiJsonParseError as e:
             logger.error(f"Failed to parse opportunities JSON: {e}")
             logger.debug(f"Raw response: {response[:500]}")
             return {}
@@ -1,11 +1,14 @@
 import logging
 from typing import Any, Dict, Optional
 
-from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from django.utils import timezone
 
+from services.eligible_user_cursor import EligibleUserCursor
 from services.semaphore_service import SemaphoreService
+from services.client_registry import close_loop_genai_clients
+from services.serper_search_service import close_serper_session
 from .weekly_context_service import WeeklyContextService
 
 logger = logging.getLogger(__name__)
@@ -23,54 +26,39 @@ class RetryClientContext:
         weekly_context_service: Optional[WeeklyContextService] = None,
     ):
         self.semaphore_service = semaphore_service or SemaphoreService()
+        self.user_cursor = EligibleUserCursor('retry_weekly_context', self._eligible_users_queryset)
         self.weekly_context_service = weekly_context_service or WeeklyContextService()
 
-    @sync_to_async
-    def _get_eligible_users(self, offset: int, limit: int) -> list[dict[str, Any]]:
-        """Get a batch of users with weekly context errors"""
-        if limit is None:
-            return list(
-                User.objects.filter(
-                    usersubscription__status='active',
-                    is_active=True,
-                    client_context__weekly_context_error__isnull=False
-                ).distinct().order_by('id').values('id', 'email', 'username')[offset:]
-            )
-
-        return list(
+    def _eligible_users_queryset(self) -> QuerySet:
+        """Users with weekly context errors"""
+        return (
             User.objects.filter(
                 usersubscription__status='active',
                 is_active=True,
                 client_context__weekly_context_error__isnull=False
-            ).distinct().order_by('id').values('id', 'email', 'username')[offset:offset + limit]
+            ).distinct()
         )
 
-    async def process_all_users_context(self, batch_number: int = 1, batch_size: int = 0) -> Dict[str, Any]:
+    async def process_all_users_context(self, batch_number: int = 1, batch_size: int = 0, include_details: bool = False) -> Dict[str, Any]:
         """Process weekly context gen for all eligible users."""
         start_time = timezone.now()
-        offset = (batch_number - 1) * batch_size
-        limit = batch_size
-
-        if batch_size == 0:
-            offset = 0
-            limit = None  # Process all users with errors
-
-        eligible_users = await self._get_eligible_users(offset, limit)
-        total = len(eligible_users)
-
-        if total == 0:
-            return {
-                'status': 'completed',
-                'processed': 0,
-                'total_users': 0,
-                'message': 'No users with error found',
-            }
-
+        total = 0
         try:
-            results = await self.semaphore_service.process_concurrently(
-                users=eligible_users,
-                function=self.weekly_context_service.process_single_user
-            )
+            results = []
+            async for page in self.user_cursor.pages(batch_size):
+                total += len(page)
+                results.extend(await self.semaphore_service.process_concurrently(
+                    users=page,
+                    function=self.weekly_context_service.process_single_user
+                ))
+
+            if total == 0:
+                return {
+                    'status': 'completed',
+                    'processed': 0,
+                    'total_users': 0,
+                    'message': 'No users with error found',
+                }
 
             processed_count = sum(
                 1 for r in results if r.get('status') == 'success')
@@ -89,8 +77,9 @@ class RetryClientContext:
                 'skipped': skipped_count,
                 'total_users': total,
                 'duration_seconds': duration,
-                'details': results,
             }
+            if include_details:
+                result['details'] = results
 
             return result
 
@@ -101,3 +90,7 @@ class RetryClientContext:
                 'total_users': total,
                 'message': f'Error processing users: {str(e)}',
             }
+        finally:
+            # The Serper session and genai clients live as long as this batch's loop
+            await close_serper_session()
+            await close_loop_genai_clients()
@@ -6,6 +6,7 @@ from typing import Any, Dict, Optional
 
 from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from django.utils import timezone
 
 from AuditSystem.services import AuditService
@@ -13,7 +14,11 @@ from ClientContext.models import ClientContext
 from services.ai_prompt_service import AIPromptService
 from services.ai_service import AiService
 from services.mailjet_service import MailjetService
+from services.eligible_user_cursor import EligibleUserCursor
 from services.semaphore_service import SemaphoreService
+from services.client_registry import close_loop_genai_clients
+from services.serper_search_service import close_serper_session
+from services.serper_result_cache import serper_result_cache
 from services.get_creator_profile_data import get_creator_profile_data
 from services.trends_discovery_service import TrendsDiscoveryService
 from services.user_validation_service import UserValidationService
@@ -83,28 +88,20 @@ class WeeklyContextService:
     ):
         self.user_validation_service = user_validation_service or UserValidationService()
         self.semaphore_service = semaphore_service or SemaphoreService()
+        self.user_cursor = EligibleUserCursor('weekly_context', self._eligible_users_queryset)
         self.ai_service = ai_service or AiService()
         self.prompt_service = prompt_service or AIPromptService()
         self.audit_service = audit_service or AuditService()
         self.mailjet_service = mailjet_service or MailjetService()
         self.trends_discovery_service = trends_discovery_service or TrendsDiscoveryService()
 
-    @sync_to_async
-    def _get_eligible_users(self, offset: int, limit: int) -> list[dict[str, Any]]:
-        """Get a batch of users eligible for weekly context generation"""
-        if limit is None:
-            return list(
-                User.objects.filter(
-                    usersubscription__status='active',
-                    is_active=True
-                ).distinct().order_by('id').values('id', 'email', 'username')[offset:]
-            )
-
-        return list(
+    def _eligible_users_queryset(self) -> QuerySet:
+        """Users eligible for weekly context generation"""
+        return (
             User.objects.filter(
                 usersubscription__status='active',
                 is_active=True
-            ).distinct().order_by('id').values('id', 'email', 'username')[offset:offset + limit]
+            ).distinct()
         )
 
     async def process_single_user(self, user_data: dict) -> Dict[str, Any]:
@@ -117,32 +114,27 @@ class WeeklyContextService:
 
         return await self._process_user_context(user_id)
 
-    async def process_all_users_context(self, batch_number: int, batch_size: int) -> Dict[str, Any]:
+    async def process_all_users_context(self, batch_number: int, batch_size: int, include_details: bool = False) -> Dict[str, Any]:
         """Process weekly context gen for all eligible users."""
         start_time = timezone.now()
-        offset = (batch_number - 1) * batch_size
-        limit = batch_size
-
-        if batch_size == 0:
-            offset = 0
-            limit = None  # Process all users
-
-        eligible_users = await self._get_eligible_users(offset=offset, limit=limit)
-        total = len(eligible_users)
-
-        if total == 0:
-            return {
-                'status': 'completed',
-                'processed': 0,
-                'total_users': 0,
-                'message': 'No eligible users found',
-            }
-
+        total = 0
         try:
-            results = await self.semaphore_service.process_concurrently(
-                users=eligible_users,
-                function=self.process_single_user
-            )
+            results = []
+            async for page in self.user_cursor.pages(batch_size):
+                total += len(page)
+                await self.user_validation_service.prefetch_eligibility(page)
+                results.extend(await self.semaphore_service.process_concurrently(
+                    users=page,
+                    function=self.process_single_user
+                ))
+
+            if total == 0:
+                return {
+                    'status': 'completed',
+                    'processed': 0,
+                    'total_users': 0,
+                    'message': 'No eligible users found',
+                }
 
             processed_count = sum(
                 1 for r in results if r.get('status') == 'success')
@@ -161,8 +153,11 @@ class WeeklyContextService:
                 'skipped': skipped_count,
                 'total_users': total,
                 'duration_seconds': duration,
-                'details': results,
+                # Process-wide: includes earlier invocations on a warm worker
+                'serper_cache': serper_result_cache.stats(),
             }
+            if include_details:
+                result['details'] = results
 
             return result
 
@@ -173,6 +168,10 @@ class WeeklyContextService:
                 'total_users': total,
                 'message': f'Error processing users: {str(e)}',
             }
+        finally:
+            # The Serper session and genai clients live as long as this batch's loop
+            await close_serper_session()
+            await close_loop_genai_clients()
 
     async def _process_user_context(self, user_id: int) -> Dict[str, Any]:
         """Process weekly context generation for a single user.
@@ -210,7 +209,7 @@ class WeeklyContextService:
             discovered_trends = await self._discover_trends_for_user(user)
 
             # FASE 1: Gerar contexto com tendências como input
-            context_result = await sync_to_async(self._generate_context_for_user)(
+            context_result = await self._generate_context_for_user(
                 user, discovered_trends
             )
             # Remove markdown code block se presente (```json ... ```)
@@ -297,10 +296,8 @@ class WeeklyContextService:
                     'discovery_metadata': {'error': 'no_sector_defined'}
                 }
 
-            # Executar descoberta de tendências (sync, pois pytrends é síncrono)
-            discovered_trends = await sync_to_async(
-                self.trends_discovery_service.discover_trends_for_sector
-            )(
+            # Buscas pelo cliente async do Serper, sem thread por chamada
+            discovered_trends = await self.trends_discovery_service.adiscover_trends_for_sector(
                 sector=sector,
                 business_description=business_description,
                 location=location,
@@ -335,7 +332,7 @@ class WeeklyContextService:
                 value = section_data.get(json_key, default)
                 setattr(client_context, model_field, value)
 
-    def _generate_context_for_user(
+    async def _generate_context_for_user(
         self,
         user: User,
         discovered_trends: Dict[str, Any] = None
@@ -350,17 +347,26 @@ class WeeklyContextService:
             String JSON com o contexto gerado
         """
         try:
-            self.prompt_service.set_user(user)
-            prompt = self.prompt_service.build_context_prompts(
-                discovered_trends=discovered_trends
-            )
-            context_result = self.ai_service.generate_text(prompt, user)
+            prompt = await sync_to_async(self._build_context_prompt)(
+                user, discovered_trends)
+            context_result = await self.ai_service.agenerate_text(prompt, user)
 
             return context_result
         except Exception as e:
             raise Exception(
                 f"Failed to generate context for user {user.id}: {str(e)}")
 
+    def _build_context_prompt(
+        self,
+        user: User,
+        discovered_trends: Dict[str, Any] = None
+    ) -> list[str]:
+        """Build the context prompt; set_user and build stay in one sync call."""
+        self.prompt_service.set_user(user)
+        return self.prompt_service.build_context_prompts(
+            discovered_trends=discovered_trends
+        )
+
     async def _store_user_error(self, user, error_message: str):
         """Store error message in user model for retry processing."""
         client_context, created = await sync_to_async(ClientContext.objects.get_or_create)(user=user)
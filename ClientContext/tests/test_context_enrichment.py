@@ -0,0 +1,129 @@
+"""
+Testes para o enriquecimento concorrente de contexto.
+
+Estes testes verificam:
+- Oportunidades de todas as categorias são enriquecidas em paralelo, com limite
+- A estrutura das categorias é preservada na ordem original
+- Reserva de URLs: oportunidades concorrentes nunca recebem a mesma fonte
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from ClientContext.services.context_enrichment_service import OPPORTUNITY_STAGE, ContextEnrichmentService
+from ClientContext.utils import search_utils, url_validation
+from ClientContext.utils.url_validation import UrlCheck
+from services.stage_limiter import StageLimiter
+
+User = get_user_model()
+
+
+class EnrichAllCategoriesTestCase(TestCase):
+    """Testes para o fan-out de categorias e oportunidades."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='enrich', password='pass')
+        self.service = ContextEnrichmentService(
+            search_service=MagicMock(),
+            ai_service=MagicMock(),
+            source_evaluator=MagicMock(),
+            stage_limiter=StageLimiter({OPPORTUNITY_STAGE: 2}),
+        )
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fake_enrich(self, item, user, section, category_key, client_sector, used_url_keys):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {**item, 'enriched_sources': [category_key]}
+
+    @patch('ClientContext.services.context_enrichment_service.get_creator_profile_data',
+           return_value={'specialization': 'Marketing'})
+    def test_oportunidades_em_paralelo_com_limite(self, mock_profile):
+        """Teste: oportunidades rodam em paralelo até o limite e voltam na ordem das categorias"""
+        self.service._enrich_opportunity = self.fake_enrich
+        tendencies = {
+            'polemica': {'titulo': 'Polêmicas', 'items': [{'titulo_ideia': f'P{i}'} for i in range(4)]},
+            'resumo': 'texto solto',
+            'educativo': {'titulo': 'Educativos', 'items': [{'titulo_ideia': 'E0'}]},
+            'futuro': {'titulo': 'Futuro', 'items': []},
+        }
+
+        enriched = async_to_sync(self.service._enrich_all_categories)(tendencies, self.user, set())
+
+        self.assertEqual(self.max_in_flight, 2)
+        self.assertEqual(list(enriched), ['polemica', 'resumo', 'educativo', 'futuro'])
+        self.assertEqual([item['titulo_ideia'] for item in enriched['polemica']['items']], ['P0', 'P1', 'P2'])
+        self.assertEqual(enriched['educativo']['items'][0]['enriched_sources'], ['educativo'])
+        self.assertEqual(enriched['resumo'], 'texto solto')
+        self.assertEqual(enriched['futuro'], tendencies['futuro'])
+
+
+class ValidateSourcesReservationTestCase(TestCase):
+    """Testes para a reserva de URLs entre oportunidades concorrentes."""
+
+    def scored(self, *names):
+        return [
+            {'url': f'https://{name}.com/a', 'title': name, 'snippet': '', 'score': 1, 'url_key': f'{name}.com/a'}
+            for name in names
+        ]
+
+    def test_oportunidades_concorrentes_nao_compartilham_fontes(self):
+        """Teste: a mesma URL validada em paralelo vai para uma única oportunidade"""
+        async def slow_check(url):
+            await asyncio.sleep(0.01)
+            return UrlCheck('invalida' not in url, 200)
+
+        async def run():
+            used_url_keys = set()
+            first, second = await asyncio.gather(
+                search_utils._validate_sources(self.scored('g1', 'exame', 'invalida', 'valor'), used_url_keys),
+                search_utils._validate_sources(self.scored('g1', 'exame', 'infomoney'), used_url_keys),
+            )
+            return first, second, used_url_keys
+
+        with patch.object(url_validation, 'check_url_async', slow_check):
+            first, second, used_url_keys = async_to_sync(run)()
+
+        first_urls = {source['url'] for source in first}
+        second_urls = {source['url'] for source in second}
+        self.assertFalse(first_urls & second_urls)
+        self.assertEqual(
+            first_urls | second_urls,
+            {'https://g1.com/a', 'https://exame.com/a', 'https://valor.com/a', 'https://infomoney.com/a'})
+        self.assertNotIn('invalida.com/a', used_url_keys)
+
+    def test_reserva_apenas_as_fontes_escolhidas(self):
+        """Teste: candidatas válidas além das necessárias ficam livres para outras oportunidades"""
+        async def check(url):
+            return UrlCheck(True, 200)
+
+        used_url_keys = set()
+        with patch.object(url_validation, 'check_url_async', check):
+            sources = async_to_sync(search_utils._validate_sources)(
+                self.scored('g1', 'exame', 'valor', 'infomoney', 'estadao'), used_url_keys)
+
+        self.assertEqual(len(sources), 3)
+        self.assertEqual(used_url_keys, {'g1.com/a', 'exame.com/a', 'valor.com/a'})
+
+    def test_fonte_tomada_durante_validacao_e_substituida(self):
+        """Teste: URL pega por outra oportunidade durante a validação dá lugar à próxima válida"""
+        used_url_keys = set()
+
+        async def check(url):
+            # Outra oportunidade escolhe o g1 enquanto esta valida
+            used_url_keys.add('g1.com/a')
+            return UrlCheck(True, 200)
+
+        with patch.object(url_validation, 'check_url_async', check):
+            sources = async_to_sync(search_utils._validate_sources)(
+                self.scored('g1', 'exame', 'valor', 'estadao'), used_url_keys)
+
+        self.assertEqual(
+            [source['url'] for source in sources],
+            ['https://exame.com/a', 'https://valor.com/a', 'https://estadao.com/a'])
@@ -5,6 +5,7 @@ Estes testes verificam:
 - Validação síncrona de formato de URL
 - Validação assíncrona com requisições HTTP
 - Comportamento em caso de erro (deve retornar False)
+- Sessão compartilhada por event loop e validação em lote com retorno antecipado
 """
 
 import asyncio
@@ -12,10 +13,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 from django.test import TestCase
 
+from ClientContext.utils import url_validation
 from ClientContext.utils.url_validation import (
+    UrlCheck,
     _validate_with_get,
+    close_validation_session,
+    get_validation_session,
     validate_url_permissive_async,
     validate_url_sync,
+    validate_urls_async,
 )
 
 
@@ -202,3 +208,79 @@ class ValidateWithGetTestCase(TestCase):
         result = run_async(_validate_with_get(mock_session, "https://example.com"))
         # IMPORTANTE: Este é o teste da correção - antes retornava True
         self.assertFalse(result)
+
+
+class SharedSessionTestCase(TestCase):
+    """Testes para a sessão HTTP compartilhada por event loop."""
+
+    def test_sessao_reutilizada_no_loop_e_fechada(self):
+        """Teste: chamadas no mesmo loop usam a mesma sessão, fechada ao final do lote"""
+        async def run():
+            first = get_validation_session()
+            second = get_validation_session()
+            limit_per_host = first.connector.limit_per_host
+            await close_validation_session()
+            return first, second, limit_per_host
+
+        first, second, limit_per_host = run_async(run())
+
+        self.assertIs(first, second)
+        self.assertTrue(first.closed)
+        self.assertEqual(limit_per_host, url_validation.VALIDATION_MAX_CONNECTIONS_PER_HOST)
+
+    def test_loops_diferentes_tem_sessoes_diferentes(self):
+        """Teste: cada event loop recebe sua própria sessão"""
+        async def open_session():
+            session = get_validation_session()
+            await close_validation_session()
+            return session
+
+        self.assertIsNot(run_async(open_session()), run_async(open_session()))
+
+
+class ValidateUrlsAsyncTestCase(TestCase):
+    """Testes para a validação concorrente de várias URLs."""
+
+    def setUp(self):
+        self.checked = []
+        self.delays = {}
+
+    async def fake_check(self, url):
+        await asyncio.sleep(self.delays.get(url, 0.01))
+        self.checked.append(url)
+        return UrlCheck('invalida' not in url, 200)
+
+    def test_retorna_validas_na_ordem_de_entrada(self):
+        """Teste: URLs válidas voltam na ordem de prioridade, mesmo terminando fora de ordem"""
+        self.delays = {'https://a.com': 0.05}
+        urls = ['https://a.com', 'https://invalida.com', 'https://b.com']
+
+        with patch.object(url_validation, 'check_url_async', self.fake_check):
+            result = run_async(validate_urls_async(urls, use_cache=False))
+
+        self.assertEqual(result, ['https://a.com', 'https://b.com'])
+
+    def test_para_ao_encontrar_validas_suficientes(self):
+        """Teste: com needed, retorna assim que as primeiras válidas são conhecidas"""
+        self.delays = {'https://lenta.com': 5}
+        urls = ['https://a.com', 'https://invalida.com', 'https://b.com', 'https://lenta.com']
+
+        with patch.object(url_validation, 'check_url_async', self.fake_check):
+            result = run_async(validate_urls_async(urls, needed=2, use_cache=False))
+
+        self.assertEqual(result, ['https://a.com', 'https://b.com'])
+        self.assertNotIn('https://lenta.com', self.checked)
+
+    def test_espera_url_prioritaria_pendente(self):
+        """Teste: uma URL mais bem ranqueada ainda pendente não é ultrapassada"""
+        self.delays = {'https://a.com': 0.05}
+        urls = ['https://a.com', 'https://b.com', 'https://c.com']
+
+        with patch.object(url_validation, 'check_url_async', self.fake_check):
+            result = run_async(validate_urls_async(urls, needed=2, use_cache=False))
+
+        self.assertEqual(result, ['https://a.com', 'https://b.com'])
+
+    def test_lista_vazia(self):
+        """Teste: nenhuma URL, nenhuma validação"""
+        self.assertEqual(run_async(validate_urls_async([])), [])
@@ -0,0 +1,105 @@
+"""
+Testes para o cache persistente de validação de URL.
+
+Estes testes verificam:
+- Resultados recentes evitam novas requisições (TTL positivo e negativo)
+- Status e URL final são gravados por chave normalizada
+- Domínio com falhas seguidas fica em espera e volta após uma resposta
+"""
+from datetime import timedelta
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+from django.utils import timezone
+
+from ClientContext.models import DomainValidationHealth, UrlValidationResult
+from ClientContext.utils import url_validation
+from ClientContext.utils.url_validation import UrlCheck, validate_urls_async
+from ClientContext.utils.url_validation_cache import (
+    DOMAIN_FAILURE_THRESHOLD,
+    NEGATIVE_TTL,
+    POSITIVE_TTL,
+    get_cached_validity,
+    store_checks,
+)
+
+
+class UrlValidationCacheTestCase(TestCase):
+    """Testes para ClientContext.utils.url_validation_cache."""
+
+    def setUp(self):
+        self.checked = []
+        self.responses = {}
+
+    async def fake_check(self, url):
+        self.checked.append(url)
+        return self.responses.get(url, UrlCheck(True, 200, url))
+
+    def validate(self, urls, needed=None):
+        with patch.object(url_validation, 'check_url_async', self.fake_check):
+            return async_to_sync(validate_urls_async)(urls, needed=needed)
+
+    def age_results(self, delta):
+        UrlValidationResult.objects.update(checked_at=timezone.now() - delta)
+
+    def test_grava_status_e_url_final(self):
+        """Teste: resultado é salvo pela chave normalizada, com status e redirecionamento"""
+        self.responses = {'https://www.g1.com/a/?utm_source=x': UrlCheck(True, 200, 'https://g1.globo.com/a')}
+
+        self.validate(['https://www.g1.com/a/?utm_source=x'])
+
+        result = UrlValidationResult.objects.get()
+        self.assertEqual((result.url_key, result.domain), ('g1.com/a', 'g1.com'))
+        self.assertEqual((result.status_code, result.final_url), (200, 'https://g1.globo.com/a'))
+
+    def test_resultado_recente_evita_requisicao(self):
+        """Teste: mesma URL (com outra forma) validada de novo vem do cache"""
+        self.responses = {'https://exame.com/b': UrlCheck(False, 404, 'https://exame.com/b')}
+        self.validate(['https://g1.com/a', 'https://exame.com/b'])
+        self.checked.clear()
+
+        result = self.validate(['https://www.g1.com/a/', 'https://exame.com/b'])
+
+        self.assertEqual(result, ['https://www.g1.com/a/'])
+        self.assertEqual(self.checked, [])
+
+    def test_ttl_negativo_menor_que_positivo(self):
+        """Teste: falha expira antes do sucesso e é validada de novo"""
+        self.responses = {'https://exame.com/b': UrlCheck(False, 404, 'https://exame.com/b')}
+        self.validate(['https://g1.com/a', 'https://exame.com/b'])
+        self.age_results(NEGATIVE_TTL + timedelta(minutes=1))
+        self.checked.clear()
+
+        self.validate(['https://g1.com/a', 'https://exame.com/b'])
+        self.assertEqual(self.checked, ['https://exame.com/b'])
+
+        self.age_results(POSITIVE_TTL + timedelta(minutes=1))
+        self.assertEqual(get_cached_validity(['https://g1.com/a']), {})
+
+    def test_dominio_com_falhas_seguidas_fica_em_espera(self):
+        """Teste: após várias falhas de conexão, novas URLs do domínio são rejeitadas sem requisição"""
+        store_checks({f'https://fora.com/{i}': UrlCheck(False) for i in range(DOMAIN_FAILURE_THRESHOLD)})
+        self.checked.clear()
+
+        result = self.validate(['https://fora.com/nova', 'https://g1.com/a'])
+
+        self.assertEqual(result, ['https://g1.com/a'])
+        self.assertEqual(self.checked, ['https://g1.com/a'])
+
+    def test_404_nao_conta_como_falha_do_dominio(self):
+        """Teste: artigo inexistente não penaliza o domínio"""
+        store_checks({f'https://g1.com/{i}': UrlCheck(False, 404) for i in range(DOMAIN_FAILURE_THRESHOLD)})
+
+        self.assertEqual(DomainValidationHealth.objects.get(domain='g1.com').consecutive_failures, 0)
+
+    def test_resposta_do_dominio_zera_falhas(self):
+        """Teste: uma resposta válida zera a memória de falhas do domínio"""
+        store_checks({'https://fora.com/1': UrlCheck(False), 'https://fora.com/2': UrlCheck(False, 503)})
+        self.assertEqual(DomainValidationHealth.objects.get(domain='fora.com').consecutive_failures, 2)
+
+        store_checks({'https://fora.com/3': UrlCheck(True, 200)})
+
+        health = DomainValidationHealth.objects.get(domain='fora.com')
+        self.assertEqual(health.consecutive_failures, 0)
+        self.assertIsNotNone(health.last_success_at)
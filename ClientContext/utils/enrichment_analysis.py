@@ -5,7 +5,6 @@ Extracted from context_enrichment_service.py to keep files under 400 lines.
 import logging
 from typing import Any, Dict, List
 
-from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
 
 logger = logging.getLogger(__name__)
@@ -39,7 +38,7 @@ async def generate_enriched_analysis(
 
         prompt = _build_analysis_prompt(titulo, tipo, descricao, sources_text)
 
-        analysis = await sync_to_async(ai_service.generate_text)(
+        analysis = await ai_service.agenerate_text(
             [prompt], user
         )
 
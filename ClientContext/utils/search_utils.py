@@ -6,6 +6,7 @@ Search providers:
 - Serper API (primary): Real Google results via commercial API
 - Jina Reader: Extracts clean content from URLs (free tier: 1M tokens/month)
 """
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
@@ -14,7 +15,7 @@ from asgiref.sync import sync_to_async
 
 from ClientContext.utils.source_quality import is_denied, score_source
 from ClientContext.utils.url_dedupe import normalize_url_key
-from ClientContext.utils.url_validation import validate_url_permissive_async
+from ClientContext.utils.url_validation import validate_urls_async
 from services.jina_reader_service import JinaReaderService
 
 logger = logging.getLogger(__name__)
@@ -222,12 +223,18 @@ async def _fetch_with_diagnosis(
 
 
 async def _execute_search(search_service, query: str, news_query: str, use_news: bool) -> list:
-    """Execute the appropriate search type."""
+    """Execute the appropriate search type (natively async when the service supports it)."""
     if use_news and hasattr(search_service, 'search_news'):
-        return await sync_to_async(search_service.search_news)(
+        if hasattr(search_service, 'asearch_news'):
+            return await search_service.asearch_news(
+                query=news_query or query, num_results=SEARCH_RESULTS_TO_FETCH
+            )
+        return await sync_to_async(search_service.search_news, thread_sensitive=False)(
             query=news_query or query, num_results=SEARCH_RESULTS_TO_FETCH
         )
-    return await sync_to_async(search_service.search)(
+    if hasattr(search_service, 'asearch'):
+        return await search_service.asearch(query=query, num_results=SEARCH_RESULTS_TO_FETCH)
+    return await sync_to_async(search_service.search, thread_sensitive=False)(
         query=query, num_results=SEARCH_RESULTS_TO_FETCH
     )
 
@@ -268,23 +275,51 @@ def _score_results_with_tracking(
 async def _validate_sources(
     scored_sources: List[Dict[str, Any]], used_url_keys: Set[str]
 ) -> List[Dict[str, str]]:
-    """Validate URLs and return top valid sources."""
-    validated = []
-    for source in scored_sources:
-        if len(validated) >= ENRICHMENT_SOURCES_PER_OPPORTUNITY:
-            break
-
-        if not await validate_url_permissive_async(source['url']):
-            continue
+    """
+    Validate URLs concurrently and return top valid sources.
 
-        if source['url_key']:
-            used_url_keys.add(source['url_key'])
+    Opportunities enriched concurrently share used_url_keys. Candidates are
+    validated without reserving them; each valid source is then checked and
+    added to used_url_keys with no await in between, and a source taken by
+    another opportunity during the validation is replaced by the next valid
+    candidate.
+    """
+    validated, seen_urls = [], set()
+    position = 0
+
+    while len(validated) < ENRICHMENT_SOURCES_PER_OPPORTUNITY and position < len(scored_sources):
+        candidates = [
+            (index, source)
+            for index, source in enumerate(scored_sources[position:], start=position)
+            if source['url'] not in seen_urls and not (source['url_key'] and source['url_key'] in used_url_keys)
+        ]
+        if not candidates:
+            break
 
-        validated.append({
-            'url': source['url'],
-            'title': source['title'],
-            'snippet': source['snippet']
-        })
+        needed = ENRICHMENT_SOURCES_PER_OPPORTUNITY - len(validated)
+        valid_urls = await validate_urls_async([source['url'] for _, source in candidates], needed=needed)
+
+        # No await from here on: the check and the add are atomic for the other opportunities
+        for index, source in candidates:
+            if source['url'] not in valid_urls:
+                continue
+            # Candidates up to the last valid one were all checked
+            position = index + 1
+            url_key = source['url_key']
+            if source['url'] in seen_urls or (url_key and url_key in used_url_keys):
+                continue
+            if url_key:
+                used_url_keys.add(url_key)
+            seen_urls.add(source['url'])
+            validated.append({
+                'url': source['url'],
+                'title': source['title'],
+                'snippet': source['snippet']
+            })
+
+        if len(valid_urls) < needed:
+            # Every remaining candidate was checked
+            break
 
     return validated
 
@@ -307,7 +342,8 @@ async def _generate_ai_queries(query: str, api_key: str) -> List[str]:
     from anthropic import Anthropic
     client = Anthropic(api_key=api_key)
 
-    response = client.messages.create(
+    # Sync client: run it off the event loop so other opportunities keep going
+    response = await sync_to_async(client.messages.create, thread_sensitive=False)(
         model='claude-3-5-haiku-20241022',
         max_tokens=200,
         messages=[{
@@ -397,14 +433,18 @@ def _log_search_failure(diagnosis: dict, final_count: int) -> None:
 async def _enrich_with_content(sources: List[Dict[str, str]]) -> List[Dict[str, str]]:
     """Add full page content via Jina Reader, falling back to Serper snippet."""
     jina = get_jina_reader()
-    for source in sources:
+
+    async def read(source: Dict[str, str]) -> None:
         try:
-            content = await sync_to_async(jina.read_url)(source['url'])
+            content = await sync_to_async(jina.read_url, thread_sensitive=False)(source['url'])
             # Fall back to Serper snippet so the AI always has some context
             source['content'] = content or source.get('snippet', '')
         except Exception as e:
             logger.debug(f"[ENRICHMENT] Content read failed: {e}")
             source['content'] = source.get('snippet', '')
+
+    # Jina's token bucket paces the reads
+    await asyncio.gather(*(read(source) for source in sources))
     return sources
 
 
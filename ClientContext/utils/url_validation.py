@@ -1,17 +1,36 @@
 """
 URL validation utilities.
 Checks if URLs are valid and accessible (not 404, soft-404, etc.)
+
+Validations share one aiohttp session per event loop, whose connector pools
+connections (with a per-host limit) and caches DNS, instead of paying DNS,
+TCP and TLS setup for every URL. The owner of the loop closes it with
+`close_validation_session()` when the batch ends.
 """
+import asyncio
 import logging
+import os
+import weakref
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
 from urllib.parse import urlparse
 
 import aiohttp
+from asgiref.sync import sync_to_async
 
 logger = logging.getLogger(__name__)
 
 # Timeout for URL validation (seconds)
 VALIDATION_TIMEOUT = 5
 
+# Connection pool of the shared validation session
+VALIDATION_MAX_CONNECTIONS = int(os.getenv('URL_VALIDATION_MAX_CONNECTIONS', 50))
+VALIDATION_MAX_CONNECTIONS_PER_HOST = int(os.getenv('URL_VALIDATION_MAX_CONNECTIONS_PER_HOST', 4))
+VALIDATION_DNS_CACHE_SECONDS = 300
+
+# URLs validated at once by validate_urls_async
+VALIDATION_CONCURRENCY = 10
+
 # Soft-404 indicators in page content
 SOFT_404_PATTERNS = [
     r'página não encontrada',
@@ -30,6 +49,47 @@ USER_AGENT = (
 )
 
 
+_sessions: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_validation_session() -> aiohttp.ClientSession:
+    """Shared validation session of the running event loop (created on first use)."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=VALIDATION_MAX_CONNECTIONS,
+                limit_per_host=VALIDATION_MAX_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=VALIDATION_DNS_CACHE_SECONDS,
+            ),
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_validation_session() -> None:
+    """Close the running loop's validation session, if one was opened."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+@dataclass(frozen=True)
+class UrlCheck:
+    """Outcome of one URL accessibility check."""
+    is_valid: bool
+    status_code: Optional[int] = None
+    final_url: str = ''
+
+    @property
+    def unreachable(self) -> bool:
+        """The host did not answer properly (timeout, connection error, 5xx)."""
+        return self.status_code is None or self.status_code >= 500
+
+
 async def validate_url_permissive_async(url: str) -> bool:
     """
     Validate a URL by checking if it's accessible.
@@ -43,51 +103,58 @@ async def validate_url_permissive_async(url: str) -> bool:
     Returns:
         True if URL is likely valid, False if clearly invalid
     """
+    return (await check_url_async(url)).is_valid
+
+
+async def check_url_async(url: str) -> UrlCheck:
+    """
+    Check a URL like validate_url_permissive_async, keeping the HTTP status
+    and the final URL after redirects.
+    """
     try:
         # Basic URL validation
         parsed = urlparse(url)
         if not parsed.scheme or not parsed.netloc:
-            return False
+            return UrlCheck(False)
 
         if parsed.scheme not in ('http', 'https'):
-            return False
+            return UrlCheck(False)
 
         # Try HEAD request first (faster)
         # Nota: ssl=False é usado para evitar falsos negativos em sites com
         # certificados auto-assinados ou expirados. O risco é aceitável pois
         # apenas validamos acessibilidade, não transmitimos dados sensíveis.
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.head(
-                    url,
-                    timeout=aiohttp.ClientTimeout(total=VALIDATION_TIMEOUT),
-                    headers={'User-Agent': USER_AGENT},
-                    allow_redirects=True,
-                    ssl=False  # Risco aceito: apenas validação de acessibilidade
-                ) as response:
-                    # Accept 2xx and 3xx status codes
-                    if response.status < 400:
-                        return True
-
-                    # Reject 4xx (except 403 which might be rate limiting)
-                    if 400 <= response.status < 500 and response.status != 403:
-                        logger.debug(f"URL validation failed ({response.status}): {url}")
-                        return False
-
-                    # For 5xx or 403, try GET as fallback
-                    if response.status >= 500 or response.status == 403:
-                        return await _validate_with_get(session, url)
-
-                    return True
-
-            except aiohttp.ClientError:
-                # Network error, try GET
-                return await _validate_with_get(session, url)
+        session = get_validation_session()
+        try:
+            async with session.head(
+                url,
+                timeout=aiohttp.ClientTimeout(total=VALIDATION_TIMEOUT),
+                headers={'User-Agent': USER_AGENT},
+                allow_redirects=True,
+                ssl=False  # Risco aceito: apenas validação de acessibilidade
+            ) as response:
+                status = response.status
+
+                # Accept 2xx and 3xx status codes
+                if status < 400:
+                    return UrlCheck(True, status, str(response.url))
+
+                # Reject 4xx (except 403 which might be rate limiting)
+                if 400 <= status < 500 and status != 403:
+                    logger.debug(f"URL validation failed ({status}): {url}")
+                    return UrlCheck(False, status, str(response.url))
+
+                # For 5xx or 403, try GET as fallback
+                return await _check_with_get(session, url)
+
+        except aiohttp.ClientError:
+            # Network error, try GET
+            return await _check_with_get(session, url)
 
     except Exception as e:
         logger.debug(f"URL validation error for {url}: {str(e)}")
         # On error, assume URL is invalid
-        return False
+        return UrlCheck(False)
 
 
 async def _validate_with_get(session: aiohttp.ClientSession, url: str) -> bool:
@@ -101,6 +168,10 @@ async def _validate_with_get(session: aiohttp.ClientSession, url: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
+    return (await _check_with_get(session, url)).is_valid
+
+
+async def _check_with_get(session: aiohttp.ClientSession, url: str) -> UrlCheck:
     try:
         async with session.get(
             url,
@@ -109,15 +180,93 @@ async def _validate_with_get(session: aiohttp.ClientSession, url: str) -> bool:
             allow_redirects=True,
             ssl=False
         ) as response:
-            if response.status < 400:
-                return True
-            if response.status == 403:
-                # Rate limited, assume valid
-                return True
-            return False
+            status = response.status
+            # 403 is usually rate limiting, assume valid
+            return UrlCheck(status < 400 or status == 403, status, str(response.url))
     except Exception:
         # On error, assume URL is invalid
-        return False
+        return UrlCheck(False)
+
+
+def _first_valid_settled(results: List[Optional[bool]], needed: int) -> bool:
+    """True once the first `needed` valid URLs (in input order) are known."""
+    found = 0
+    for ok in results:
+        if ok is None:
+            return False
+        if ok:
+            found += 1
+            if found >= needed:
+                return True
+    return False
+
+
+async def validate_urls_async(
+        urls: Iterable[str],
+        needed: Optional[int] = None,
+        concurrency: int = VALIDATION_CONCURRENCY,
+        use_cache: bool = True,
+) -> List[str]:
+    """
+    Validate several URLs concurrently over the shared session.
+
+    URLs with a fresh result in the validation cache (or on a domain cooling
+    down after repeated failures) are resolved without a request, and the
+    new results are saved back to the cache.
+
+    Args:
+        urls: URLs to validate, in priority order
+        needed: Stop once the first `needed` valid URLs are known; the
+            remaining checks are cancelled
+        concurrency: Maximum validations in flight
+        use_cache: Read and write the persistent validation cache
+
+    Returns:
+        Valid URLs in input order (at most `needed`)
+    """
+    # The cache module imports UrlCheck from here
+    from ClientContext.utils.url_validation_cache import get_cached_validity, store_checks
+
+    urls = list(urls)
+    if not urls:
+        return []
+
+    cached = await sync_to_async(get_cached_validity)(urls) if use_cache else {}
+    results: List[Optional[bool]] = [cached.get(url) for url in urls]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def check(url: str) -> UrlCheck:
+        async with semaphore:
+            return await check_url_async(url)
+
+    index_of = {}
+    if not (needed and _first_valid_settled(results, needed)):
+        index_of = {
+            asyncio.ensure_future(check(url)): index
+            for index, url in enumerate(urls) if results[index] is None
+        }
+    checks = {}
+    try:
+        pending = set(index_of)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = index_of[task]
+                checks[urls[index]] = task.result()
+                results[index] = checks[urls[index]].is_valid
+            if needed and _first_valid_settled(results, needed):
+                break
+    finally:
+        for task in index_of:
+            task.cancel()
+        await asyncio.gather(*index_of, return_exceptions=True)
+
+    if use_cache and checks:
+        await sync_to_async(store_checks)(checks)
+
+    valid = [url for url, ok in zip(urls, results) if ok]
+    return valid[:needed] if needed else valid
 
 
 def validate_url_sync(url: str) -> bool:
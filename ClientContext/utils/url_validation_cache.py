@@ -0,0 +1,128 @@
+"""
+Persistent cache of URL validation results.
+
+The same articles and domains are validated again for every user and every
+week. Results are stored per normalized URL key (see url_dedupe) with
+separate TTLs: a valid URL stays valid for days, while a failed one is
+retried after a few hours because the failure may have been transient.
+
+Domains also keep a count of consecutive unreachable checks (timeouts,
+connection errors, 5xx). After DOMAIN_FAILURE_THRESHOLD of them, new URLs
+of the domain are treated as invalid without a request until
+DOMAIN_COOLDOWN has passed since the last failure.
+"""
+import hashlib
+import logging
+import os
+from datetime import timedelta
+from typing import Dict, Iterable
+
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from ClientContext.models import DomainValidationHealth, UrlValidationResult
+from ClientContext.utils.url_dedupe import normalize_url_key
+from ClientContext.utils.url_validation import UrlCheck
+
+logger = logging.getLogger(__name__)
+
+POSITIVE_TTL = timedelta(hours=int(os.getenv('URL_VALIDATION_POSITIVE_TTL_HOURS', 72)))
+NEGATIVE_TTL = timedelta(hours=int(os.getenv('URL_VALIDATION_NEGATIVE_TTL_HOURS', 6)))
+DOMAIN_FAILURE_THRESHOLD = 3
+DOMAIN_COOLDOWN = timedelta(minutes=30)
+
+
+def url_key_hash(url_key: str) -> str:
+    return hashlib.sha256(url_key.encode('utf-8')).hexdigest()
+
+
+def _domain(url_key: str) -> str:
+    return url_key.split('/', 1)[0].split('?', 1)[0]
+
+
+def get_cached_validity(urls: Iterable[str]) -> Dict[str, bool]:
+    """
+    Known verdicts for the given URLs, without any request.
+
+    Returns:
+        {url: is_valid} for URLs with a fresh cached result or whose domain
+        is cooling down after repeated failures. Other URLs are absent.
+    """
+    keys = {url: normalize_url_key(url) for url in urls}
+    keys = {url: key for url, key in keys.items() if key}
+    if not keys:
+        return {}
+
+    now = timezone.now()
+    hashes = {url_key_hash(key): key for key in set(keys.values())}
+    cached = {}
+    for key_hash, is_valid, checked_at in UrlValidationResult.objects.filter(
+            key_hash__in=hashes).values_list('key_hash', 'is_valid', 'checked_at'):
+        if checked_at >= now - (POSITIVE_TTL if is_valid else NEGATIVE_TTL):
+            cached[hashes[key_hash]] = is_valid
+
+    verdicts = {url: cached[key] for url, key in keys.items() if key in cached}
+
+    unknown = {url: _domain(key) for url, key in keys.items() if url not in verdicts}
+    if unknown:
+        cooling_down = set(DomainValidationHealth.objects.filter(
+            domain__in=set(unknown.values()),
+            consecutive_failures__gte=DOMAIN_FAILURE_THRESHOLD,
+            last_failure_at__gte=now - DOMAIN_COOLDOWN,
+        ).values_list('domain', flat=True))
+        for url, domain in unknown.items():
+            if domain in cooling_down:
+                verdicts[url] = False
+
+    if verdicts:
+        logger.debug(f"URL validation cache: {len(verdicts)}/{len(keys)} URLs resolved without requests")
+    return verdicts
+
+
+def store_checks(checks: Dict[str, UrlCheck]) -> None:
+    """Save fresh check results and update the failure memory of their domains."""
+    now = timezone.now()
+    results, reachable, failures = {}, set(), {}
+    for url, check in checks.items():
+        key = normalize_url_key(url)
+        if not key:
+            continue
+        domain = _domain(key)
+        results[key] = UrlValidationResult(
+            key_hash=url_key_hash(key),
+            url_key=key,
+            domain=domain,
+            is_valid=check.is_valid,
+            status_code=check.status_code,
+            final_url=check.final_url,
+            checked_at=now,
+        )
+        if check.unreachable:
+            failures[domain] = failures.get(domain, 0) + 1
+        else:
+            reachable.add(domain)
+    if not results:
+        return
+
+    # MySQL upserts on any unique key and does not accept the conflict target
+    unique_fields = ['key_hash'] if connection.features.supports_update_conflicts_with_target else None
+    UrlValidationResult.objects.bulk_create(
+        list(results.values()),
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=['is_valid', 'status_code', 'final_url', 'checked_at'],
+    )
+
+    DomainValidationHealth.objects.bulk_create(
+        [DomainValidationHealth(domain=domain) for domain in reachable | set(failures)],
+        ignore_conflicts=True,
+    )
+    # One answer from the domain in this batch is enough to reset its memory
+    if reachable:
+        DomainValidationHealth.objects.filter(domain__in=reachable).update(
+            consecutive_failures=0, last_success_at=now)
+    for domain, count in failures.items():
+        if domain not in reachable:
+            DomainValidationHealth.objects.filter(domain=domain).update(
+                consecutive_failures=F('consecutive_failures') + count, last_failure_at=now)
@@ -15,6 +15,10 @@ from rest_framework.response import Response
 from AuditSystem.services import AuditService
 from IdeaBank.serializers import UserSerializer
 from IdeaBank.services.weekly_feed_creation import WeeklyFeedCreationService
+from IdeaBank.utils.cron_progress import wants_details
+from services.adaptive_batch_sizer import AdaptiveBatchSizer
+from services.client_registry import close_loop_genai_clients
+from services.serper_search_service import close_serper_session
 
 from ClientContext.models import ClientContext
 from ClientContext.services.context_enrichment_service import ContextEnrichmentService
@@ -34,10 +38,18 @@ from ClientContext.utils.context_helpers import (
     build_full_context_data,
     check_step_result,
 )
+from ClientContext.utils.url_validation import close_validation_session
 
 logger = logging.getLogger(__name__)
 
 
+def _close_http_sessions(loop: asyncio.AbstractEventLoop) -> None:
+    """Close the Serper, URL validation and genai sessions opened on a view's loop."""
+    loop.run_until_complete(close_serper_session())
+    loop.run_until_complete(close_validation_session())
+    loop.run_until_complete(close_loop_genai_clients())
+
+
 @csrf_exempt
 @api_view(['GET'])
 @authentication_classes([])
@@ -55,7 +67,12 @@ def generate_client_context(request):
     try:
         # Get batch number from query params (default to 1)
         batch_number = validate_batch_number(request.GET.get('batch', '1'))
-        batch_size = 3  # Process 3 users per batch, to avoid vercel timeouts
+        context_service = WeeklyContextService()
+        # Sized from recent invocations; starts at 3 users until there is history
+        sizer = AdaptiveBatchSizer(
+            'weekly_context', default_batch_size=3,
+            concurrency=context_service.semaphore_service.max_concurrent_users)
+        batch_size = sizer.choose_batch_size()
 
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -68,10 +85,10 @@ def generate_client_context(request):
         )
 
         try:
-            context_service = WeeklyContextService()
             result = loop.run_until_complete(
-                context_service.process_all_users_context(
-                    batch_number=batch_number, batch_size=batch_size)
+                sizer.measure(batch_size, context_service.process_all_users_context(
+                    batch_number=batch_number, batch_size=batch_size,
+                    include_details=wants_details(request)))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -127,7 +144,8 @@ def manual_generate_client_context(request):
             context_service = WeeklyContextService()
             result = loop.run_until_complete(
                 context_service.process_all_users_context(
-                    batch_number=1, batch_size=0)
+                    batch_number=1, batch_size=0,
+                    include_details=wants_details(request))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -343,6 +361,7 @@ def generate_single_client_context(request):
             }, status=http_status)
 
         finally:
+            _close_http_sessions(loop)
             loop.close()
 
     except Exception as e:
@@ -399,7 +418,8 @@ def retry_generate_client_context(request):
             retry_context_service = RetryClientContext()
             result = loop.run_until_complete(
                 retry_context_service.process_all_users_context(
-                    batch_number=batch_number, batch_size=batch_size)
+                    batch_number=batch_number, batch_size=batch_size,
+                    include_details=wants_details(request))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -492,6 +512,7 @@ def generate_opportunities(request):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         finally:
+            loop.run_until_complete(close_loop_genai_clients())
             loop.close()
 
     except Exception as e:
@@ -557,6 +578,13 @@ def enrich_and_send_opportunities_email(request):
         batch_number = validate_batch_number(request.GET.get('batch', '1'))
         batch_size = 2  # Process 2 users per batch to avoid timeouts
 
+        enrichment_service = ContextEnrichmentService()
+        # Enrichment claims its contexts with a cursor, so its size can follow recent invocations
+        sizer = AdaptiveBatchSizer(
+            'context_enrichment', default_batch_size=batch_size,
+            concurrency=enrichment_service.semaphore_service.max_concurrent_users)
+        enrichment_batch_size = sizer.choose_batch_size()
+
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
@@ -569,11 +597,14 @@ def enrich_and_send_opportunities_email(request):
                 resource_type='ContextEnrichment',
             )
 
-            enrichment_service = ContextEnrichmentService()
             enrichment_result = loop.run_until_complete(
-                enrichment_service.enrich_all_users_context(
-                    batch_number=batch_number,
-                    batch_size=batch_size
+                sizer.measure(
+                    enrichment_batch_size,
+                    enrichment_service.enrich_all_users_context(
+                        batch_number=batch_number,
+                        batch_size=enrichment_batch_size
+                    ),
+                    count_key='total_contexts',
                 )
             )
 
@@ -854,4 +885,5 @@ def test_enrichment_for_user(request):
         result['error'] = str(e)
         return Response(result, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     finally:
+        _close_http_sessions(loop)
         loop.close()
@@ -85,19 +85,8 @@ class CreditService:
             if active_subscription.status != 'active':
                 return False
 
-            # Atualiza o status do usuário
-            status, created = UserSubscriptionStatus.objects.get_or_create(
-                user=user,
-                defaults={
-                    'has_active_subscription': True,
-                    'current_subscription': active_subscription
-                }
-            )
-
-            if not created:
-                status.has_active_subscription = True
-                status.current_subscription = active_subscription
-                status.save()
+            # Atualiza o status do usuário (só grava quando algo mudou)
+            CreditService.sync_subscription_statuses({user.id: active_subscription.id})
 
             return True
 
@@ -105,6 +94,50 @@ class CreditService:
             print(f"[SUBSCRIPTION VALIDATION ERROR] Unexpected error for user {user.id}: {str(e)}")
             return False
 
+    @staticmethod
+    def sync_subscription_statuses(active_subscriptions: dict) -> int:
+        """
+        Marca como ativos os UserSubscriptionStatus de vários usuários de uma vez
+
+        Args:
+            active_subscriptions: {user_id: id da assinatura ativa}
+
+        Returns:
+            int: Número de registros criados ou alterados. Registros que já
+                 estão corretos não são gravados.
+        """
+        if not active_subscriptions:
+            return 0
+
+        existing = {
+            status.user_id: status
+            for status in UserSubscriptionStatus.objects.filter(user_id__in=active_subscriptions.keys())
+        }
+
+        now = timezone.now()
+        to_create, to_update = [], []
+        for user_id, subscription_id in active_subscriptions.items():
+            status = existing.get(user_id)
+            if status is None:
+                to_create.append(UserSubscriptionStatus(
+                    user_id=user_id,
+                    has_active_subscription=True,
+                    current_subscription_id=subscription_id,
+                ))
+            elif not status.has_active_subscription or status.current_subscription_id != subscription_id:
+                status.has_active_subscription = True
+                status.current_subscription_id = subscription_id
+                status.last_subscription_check = now
+                to_update.append(status)
+
+        if to_create:
+            UserSubscriptionStatus.objects.bulk_create(to_create, ignore_conflicts=True)
+        if to_update:
+            UserSubscriptionStatus.objects.bulk_update(
+                to_update, ['has_active_subscription', 'current_subscription', 'last_subscription_check'])
+
+        return len(to_create) + len(to_update)
+
     @staticmethod
     def check_and_reset_monthly_credits(user):
         """
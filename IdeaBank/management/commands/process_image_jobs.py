@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from IdeaBank.services.image_generation_job_service import ImageGenerationJobService
+
+
+class Command(BaseCommand):
+    help = 'Process queued image generation jobs (PostIdea images).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=5,
+            help='Number of jobs to claim per iteration (default: 5)',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the queue instead of exiting after one iteration',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between polls when the queue is empty (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        service = ImageGenerationJobService()
+
+        while True:
+            result = service.process_pending_jobs(limit=limit)
+
+            if result['processed']:
+                self.stdout.write(
+                    f"Processed {result['processed']} jobs: "
+                    f"{result['completed']} completed, {result['retrying']} retrying, "
+                    f"{result['failed']} failed"
+                )
+
+            if not options['loop']:
+                break
+            if not result['processed']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS('Image job processing finished'))
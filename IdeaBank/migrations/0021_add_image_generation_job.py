@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-16 18:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('IdeaBank', '0020_alter_post_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageGenerationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(help_text='Chave que impede jobs duplicados para a mesma imagem', max_length=100, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pendente'), ('running', 'Em execução'), ('completed', 'Concluído'), ('failed', 'Falhou')], default='pending', max_length=20)),
+                ('custom_prompt', models.TextField(blank=True, help_text='Prompt personalizado (se vazio, usa a análise semântica do conteúdo)', null=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('run_after', models.DateTimeField(help_text='Job só é processado a partir deste momento (backoff entre tentativas)')),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('image_url', models.TextField(blank=True, default='')),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('post_idea', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='image_jobs', to='IdeaBank.postidea')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Image Generation Job',
+                'verbose_name_plural': 'Image Generation Jobs',
+                'db_table': 'image_generation_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='image_gener_status_424a38_idx')],
+            },
+        ),
+    ]
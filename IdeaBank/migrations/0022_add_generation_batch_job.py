@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-16 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('IdeaBank', '0021_add_image_generation_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationBatchJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_name', models.CharField(help_text='Nome do batch job no Gemini', max_length=200, unique=True)),
+                ('kind', models.CharField(choices=[('weekly_feed', 'Feed Semanal'), ('daily_campaign', 'Campanha Diária')], max_length=30)),
+                ('status', models.CharField(choices=[('submitted', 'Enviado'), ('processed', 'Processado'), ('failed', 'Falhou')], default='submitted', max_length=20)),
+                ('model_name', models.CharField(blank=True, default='', max_length=100)),
+                ('entries', models.JSONField(default=list, help_text='Uma entrada por request, na ordem do batch (user_id e metadados)')),
+                ('result', models.JSONField(blank=True, default=dict, help_text='Resumo do processamento')),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Generation Batch Job',
+                'verbose_name_plural': 'Generation Batch Jobs',
+                'db_table': 'generation_batch_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
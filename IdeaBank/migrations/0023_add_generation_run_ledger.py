@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-16 18:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('IdeaBank', '0022_add_generation_batch_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text='Cron da execução (daily_ideas, weekly_feed)', max_length=30)),
+                ('run_key', models.CharField(help_text='Cron + dia da execução', max_length=100, unique=True)),
+                ('status', models.CharField(choices=[('running', 'Em execução'), ('completed', 'Concluído')], default='running', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Generation Run',
+                'verbose_name_plural': 'Generation Runs',
+                'db_table': 'generation_runs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='GenerationWorkItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_data', models.JSONField(default=dict, help_text='Dados do usuário passados para process_single_user')),
+                ('status', models.CharField(choices=[('pending', 'Pendente'), ('running', 'Em execução'), ('succeeded', 'Sucesso'), ('failed', 'Falhou'), ('skipped', 'Ignorado')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='work_items', to='IdeaBank.generationrun')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Generation Work Item',
+                'verbose_name_plural': 'Generation Work Items',
+                'db_table': 'generation_work_items',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['run', 'status'], name='generation__run_id_654b24_idx')],
+                'unique_together': {('run', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-16 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('IdeaBank', '0023_add_generation_run_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationrun',
+            name='created_posts_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='generationrun',
+            name='failed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='generationrun',
+            name='skipped_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='generationrun',
+            name='succeeded_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-16 19:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('IdeaBank', '0024_add_generation_run_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeekPlanEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('iso_year', models.PositiveSmallIntegerField()),
+                ('iso_week', models.PositiveSmallIntegerField()),
+                ('weekday', models.PositiveSmallIntegerField(help_text='Dia da semana ISO (1 = segunda, 7 = domingo)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='week_plan_entries', to='IdeaBank.post')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='week_plan_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Week Plan Entry',
+                'verbose_name_plural': 'Week Plan Entries',
+                'db_table': 'week_plan_entries',
+                'ordering': ['iso_year', 'iso_week', 'weekday'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'iso_year', 'iso_week', 'weekday'), name='unique_week_plan_day')],
+            },
+        ),
+    ]
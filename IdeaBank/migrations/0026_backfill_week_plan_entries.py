@@ -0,0 +1,52 @@
+import re
+
+from django.db import migrations
+
+WEEK_ID_PATTERN = re.compile(r'^([1-7])_week_(\d{1,2})$')
+CHUNK_SIZE = 1000
+
+
+def backfill_week_plan_entries(apps, schema_editor):
+    """Index existing weekly feed posts ('<weekday>_week_<iso week>') in the week plan.
+
+    The ISO year is not part of further_details; it comes from the post's
+    created_at, which is always in the planned week. Posts are read newest
+    first, so for a day generated twice the latest post wins.
+    """
+    Post = apps.get_model('IdeaBank', 'Post')
+    WeekPlanEntry = apps.get_model('IdeaBank', 'WeekPlanEntry')
+
+    posts = Post.objects.filter(
+        type='feed', is_automatically_generated=True, further_details__regex=r'^[1-7]_week_[0-9]{1,2}$'
+    ).order_by('-created_at', '-id').values_list('id', 'user_id', 'further_details', 'created_at')
+
+    seen, entries = set(), []
+    for post_id, user_id, further_details, created_at in posts.iterator(chunk_size=CHUNK_SIZE):
+        match = WEEK_ID_PATTERN.match(further_details)
+        created = created_at.isocalendar()
+        if not match or int(match.group(2)) != created.week:
+            continue
+
+        key = (user_id, created.year, created.week, int(match.group(1)))
+        if key in seen:
+            continue
+        seen.add(key)
+        entries.append(WeekPlanEntry(
+            user_id=user_id, iso_year=key[1], iso_week=key[2], weekday=key[3], post_id=post_id))
+
+        if len(entries) >= CHUNK_SIZE:
+            WeekPlanEntry.objects.bulk_create(entries, ignore_conflicts=True)
+            entries = []
+
+    WeekPlanEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('IdeaBank', '0025_add_week_plan_entry'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_week_plan_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-16 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('IdeaBank', '0026_backfill_week_plan_entries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationbatchjob',
+            name='collecting_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='generationbatchjob',
+            name='progress',
+            field=models.JSONField(blank=True, default=dict, help_text='Estado de cada entrada já coletada, pelo índice no batch (saved, finished, failed)'),
+        ),
+        migrations.AlterField(
+            model_name='generationbatchjob',
+            name='status',
+            field=models.CharField(choices=[('submitted', 'Enviado'), ('collecting', 'Coletando'), ('processed', 'Processado'), ('failed', 'Falhou')], default='submitted', max_length=20),
+        ),
+    ]
@@ -111,3 +111,227 @@ class PostIdea(models.Model):
     def content_preview(self):
         """Return a preview of the content (first 100 characters)."""
         return self.content[:100] + "..." if len(self.content) > 100 else self.content
+
+
+class ImageGenerationJobStatus(models.TextChoices):
+    PENDING = 'pending', 'Pendente'
+    RUNNING = 'running', 'Em execução'
+    COMPLETED = 'completed', 'Concluído'
+    FAILED = 'failed', 'Falhou'
+
+
+class ImageGenerationJob(models.Model):
+    """Queued image generation for a PostIdea, processed by a background worker."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    post_idea = models.ForeignKey(
+        PostIdea, on_delete=models.CASCADE, related_name='image_jobs')
+
+    idempotency_key = models.CharField(
+        max_length=100, unique=True,
+        help_text="Chave que impede jobs duplicados para a mesma imagem"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=ImageGenerationJobStatus.choices,
+        default=ImageGenerationJobStatus.PENDING
+    )
+    custom_prompt = models.TextField(
+        blank=True,
+        null=True,
+        help_text="Prompt personalizado (se vazio, usa a análise semântica do conteúdo)"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(
+        help_text="Job só é processado a partir deste momento (backoff entre tentativas)"
+    )
+    locked_at = models.DateTimeField(blank=True, null=True)
+    image_url = models.TextField(blank=True, default='')
+    error_message = models.TextField(blank=True, default='')
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'image_generation_jobs'
+        verbose_name = 'Image Generation Job'
+        verbose_name_plural = 'Image Generation Jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"Imagem para ideia {self.post_idea_id} ({self.get_status_display()})"
+
+
+class GenerationBatchKind(models.TextChoices):
+    WEEKLY_FEED = 'weekly_feed', 'Feed Semanal'
+    DAILY_CAMPAIGN = 'daily_campaign', 'Campanha Diária'
+
+
+class GenerationBatchStatus(models.TextChoices):
+    SUBMITTED = 'submitted', 'Enviado'
+    COLLECTING = 'collecting', 'Coletando'
+    PROCESSED = 'processed', 'Processado'
+    FAILED = 'failed', 'Falhou'
+
+
+class GenerationBatchJob(models.Model):
+    """Gemini batch job submitted by the nightly crons, collected later."""
+    job_name = models.CharField(
+        max_length=200, unique=True, help_text="Nome do batch job no Gemini")
+    kind = models.CharField(max_length=30, choices=GenerationBatchKind.choices)
+    status = models.CharField(
+        max_length=20,
+        choices=GenerationBatchStatus.choices,
+        default=GenerationBatchStatus.SUBMITTED
+    )
+    model_name = models.CharField(max_length=100, blank=True, default='')
+    entries = models.JSONField(
+        default=list,
+        help_text="Uma entrada por request, na ordem do batch (user_id e metadados)"
+    )
+    progress = models.JSONField(
+        default=dict, blank=True,
+        help_text="Estado de cada entrada já coletada, pelo índice no batch (saved, finished, failed)"
+    )
+    result = models.JSONField(default=dict, blank=True, help_text="Resumo do processamento")
+    error_message = models.TextField(blank=True, default='')
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    collecting_started_at = models.DateTimeField(blank=True, null=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'generation_batch_jobs'
+        verbose_name = 'Generation Batch Job'
+        verbose_name_plural = 'Generation Batch Jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.get_kind_display()} - {self.job_name} ({self.get_status_display()})"
+
+
+class GenerationRunStatus(models.TextChoices):
+    RUNNING = 'running', 'Em execução'
+    COMPLETED = 'completed', 'Concluído'
+
+
+class GenerationWorkItemStatus(models.TextChoices):
+    PENDING = 'pending', 'Pendente'
+    RUNNING = 'running', 'Em execução'
+    SUCCEEDED = 'succeeded', 'Sucesso'
+    FAILED = 'failed', 'Falhou'
+    SKIPPED = 'skipped', 'Ignorado'
+
+
+class GenerationRun(models.Model):
+    """One day's run of a generation cron, shared by all of its invocations."""
+    kind = models.CharField(
+        max_length=30, help_text="Cron da execução (daily_ideas, weekly_feed)")
+    run_key = models.CharField(
+        max_length=100, unique=True, help_text="Cron + dia da execução")
+    status = models.CharField(
+        max_length=20,
+        choices=GenerationRunStatus.choices,
+        default=GenerationRunStatus.RUNNING
+    )
+
+    # Progress counters, incremented as each work item finishes
+    succeeded_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    created_posts_count = models.PositiveIntegerField(default=0)
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'generation_runs'
+        verbose_name = 'Generation Run'
+        verbose_name_plural = 'Generation Runs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.run_key} ({self.get_status_display()})"
+
+
+class GenerationWorkItem(models.Model):
+    """A user to process in a GenerationRun; claimed by one worker at a time."""
+    run = models.ForeignKey(
+        GenerationRun, on_delete=models.CASCADE, related_name='work_items')
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    user_data = models.JSONField(
+        default=dict, help_text="Dados do usuário passados para process_single_user")
+    status = models.CharField(
+        max_length=20,
+        choices=GenerationWorkItemStatus.choices,
+        default=GenerationWorkItemStatus.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    result = models.JSONField(default=dict, blank=True)
+    error_message = models.TextField(blank=True, default='')
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'generation_work_items'
+        verbose_name = 'Generation Work Item'
+        verbose_name_plural = 'Generation Work Items'
+        ordering = ['id']
+        unique_together = ['run', 'user']
+        indexes = [
+            models.Index(fields=['run', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.run.run_key} - usuário {self.user_id} ({self.get_status_display()})"
+
+
+class WeekPlanEntry(models.Model):
+    """Feed post planned for one day of a user's ISO week, written by the weekly feed job."""
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='week_plan_entries')
+    iso_year = models.PositiveSmallIntegerField()
+    iso_week = models.PositiveSmallIntegerField()
+    weekday = models.PositiveSmallIntegerField(
+        help_text="Dia da semana ISO (1 = segunda, 7 = domingo)")
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name='week_plan_entries')
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'week_plan_entries'
+        verbose_name = 'Week Plan Entry'
+        verbose_name_plural = 'Week Plan Entries'
+        ordering = ['iso_year', 'iso_week', 'weekday']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'iso_year', 'iso_week', 'weekday'], name='unique_week_plan_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.iso_year}-W{self.iso_week} dia {self.weekday}"
+
+    @classmethod
+    def get_feed_post(cls, user: User, day: tuple[int, int, int]) -> 'Post | None':
+        """Feed post planned for (iso_year, iso_week, weekday), if the week was generated."""
+        iso_year, iso_week, weekday = day
+        entry = cls.objects.select_related('post').filter(
+            user=user, iso_year=iso_year, iso_week=iso_week, weekday=weekday
+        ).first()
+        return entry.post if entry else None
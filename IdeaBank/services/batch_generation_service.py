@@ -0,0 +1,353 @@
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+try:
+    from google.genai import types
+except ImportError:
+    types = None
+
+from IdeaBank.models import (
+    GenerationBatchJob,
+    GenerationBatchKind,
+    GenerationBatchStatus,
+    PostIdea,
+    WeekPlanEntry,
+)
+from IdeaBank.services.daily_ideas_service import DailyIdeasService
+from IdeaBank.services.image_generation_job_service import ImageGenerationJobService
+from IdeaBank.services.post_bulk_writer import PostBulkWriter
+from IdeaBank.services.weekly_feed_creation import WeeklyFeedCreationService
+from IdeaBank.utils.current_week import get_current_week, get_current_week_day
+from services.ai_batch_backend import BATCH_FAILED, BATCH_PENDING
+from services.ai_response_schemas import CampaignPayload, WeeklyFeedPayload
+from services.ai_service import AiService
+from services.user_validation_service import UserValidationService
+
+logger = logging.getLogger(__name__)
+
+# A collection that died midway (timeout, crash) is reclaimed after this long
+STALE_COLLECT_MINUTES = 15
+
+# States of a job entry in GenerationBatchJob.progress
+ENTRY_SAVED = 'saved'
+ENTRY_FINISHED = 'finished'
+ENTRY_FAILED = 'failed'
+
+
+class BatchGenerationService:
+    """Offline (Gemini batch mode) path for the nightly generation crons.
+
+    `submit` collects the prompts of a batch of eligible users into a single
+    Gemini batch job and stores a GenerationBatchJob; `collect` polls the
+    submitted jobs and fans finished results out into Post/PostIdea using the
+    same save routines as the interactive services.
+
+    Both run from the Generation Batch Mode workflow, dispatched on demand;
+    the nightly workflows keep using the interactive crons.
+    """
+
+    def __init__(
+            self,
+            ai_service: Optional[AiService] = None,
+            weekly_feed_service: Optional[WeeklyFeedCreationService] = None,
+            daily_ideas_service: Optional[DailyIdeasService] = None,
+            user_validation_service: Optional[UserValidationService] = None,
+    ):
+        self.ai_service = ai_service or AiService()
+        self.weekly_feed_service = weekly_feed_service or WeeklyFeedCreationService()
+        self.daily_ideas_service = daily_ideas_service or DailyIdeasService(ai_service=self.ai_service)
+        self.user_validation_service = user_validation_service or UserValidationService()
+
+    async def submit(self, kind: str, batch_number: int, batch_size: int) -> Dict[str, Any]:
+        """Build prompts for a batch of users and submit them as one batch job."""
+        if kind == GenerationBatchKind.WEEKLY_FEED:
+            user_cursor = self.weekly_feed_service.user_cursor
+        else:
+            user_cursor = self.daily_ideas_service.user_cursor
+        if batch_size == 0:
+            eligible_users = [user async for page in user_cursor.iter_pages() for user in page]
+            return await self._submit_users(kind, batch_number, eligible_users)
+
+        # Same cursor (and checkpoint) as the interactive cron, so a user is never in both
+        eligible_users = await user_cursor.claim_page(batch_size)
+        result = await self._submit_users(kind, batch_number, eligible_users)
+        # Released once the batch job holds the users; a crash before this re-serves them
+        await user_cursor.complete_page(eligible_users)
+        return result
+
+    async def _submit_users(self, kind: str, batch_number: int, eligible_users: list[dict]) -> Dict[str, Any]:
+        await self.user_validation_service.prefetch_eligibility(eligible_users)
+
+        entries, prompts, skipped = [], [], []
+        for user_data in eligible_users:
+            user_id = user_data['id']
+            prepared = await self._prepare_user(kind, user_id)
+
+            if prepared['status'] == 'ready':
+                entries.append(prepared['entry'])
+                prompts.append(prepared['prompt'])
+            else:
+                skipped.append({'user_id': user_id, 'reason': prepared['reason']})
+
+        if not prompts:
+            return {
+                'status': 'completed',
+                'submitted': 0,
+                'skipped': len(skipped),
+                'total_users': len(eligible_users),
+                'message': 'No prompts to submit',
+            }
+
+        schema = WeeklyFeedPayload if kind == GenerationBatchKind.WEEKLY_FEED else CampaignPayload
+        job_name, model = await sync_to_async(self.ai_service.submit_text_batch)(
+            prompts,
+            self.ai_service.json_config(
+                schema,
+                types.GenerateContentConfig(
+                    temperature=0.7,
+                    top_p=0.9,
+                    response_modalities=[
+                        "TEXT",
+                    ],
+                )
+            ),
+            f"{kind}-{timezone.now():%Y%m%d}-{batch_number}",
+        )
+        await sync_to_async(GenerationBatchJob.objects.create)(
+            job_name=job_name,
+            kind=kind,
+            model_name=model,
+            entries=entries,
+        )
+
+        return {
+            'status': 'submitted',
+            'job_name': job_name,
+            'submitted': len(entries),
+            'skipped': len(skipped),
+            'total_users': len(eligible_users),
+        }
+
+    @staticmethod
+    def claim_jobs() -> list[GenerationBatchJob]:
+        """Atomically move the submitted jobs (and stale collections) to collecting.
+
+        Concurrent collections skip the locked rows, so a job is fanned out by
+        one invocation only; a collection that died midway is reclaimed after
+        STALE_COLLECT_MINUTES and resumed from the job's progress.
+        """
+        now = timezone.now()
+        stale_before = now - timedelta(minutes=STALE_COLLECT_MINUTES)
+
+        with transaction.atomic():
+            jobs = list(
+                GenerationBatchJob.objects.select_for_update(skip_locked=True).filter(
+                    Q(status=GenerationBatchStatus.SUBMITTED) |
+                    Q(status=GenerationBatchStatus.COLLECTING, collecting_started_at__lt=stale_before)
+                ).order_by('created_at')
+            )
+            for job in jobs:
+                job.status = GenerationBatchStatus.COLLECTING
+                job.collecting_started_at = now
+            GenerationBatchJob.objects.bulk_update(jobs, ['status', 'collecting_started_at', 'updated_at'])
+
+        return jobs
+
+    async def collect(self) -> Dict[str, Any]:
+        """Poll submitted batch jobs and save the results of finished ones."""
+        jobs = await sync_to_async(self.claim_jobs)()
+
+        summary = {'pending': 0, 'processed': 0, 'failed': 0, 'jobs': []}
+        for position, job in enumerate(jobs):
+            try:
+                await self._collect_job(job, summary)
+            except Exception:
+                # Back to the next collection; entries already saved are skipped then
+                for unfinished in jobs[position:]:
+                    await self._release(unfinished)
+                raise
+
+        return summary
+
+    async def _collect_job(self, job: GenerationBatchJob, summary: Dict[str, Any]) -> None:
+        batch = await sync_to_async(self.ai_service.get_text_batch)(job.job_name)
+
+        if batch['state'] == BATCH_PENDING:
+            await self._release(job)
+            summary['pending'] += 1
+            return
+
+        if batch['state'] == BATCH_FAILED:
+            job.status = GenerationBatchStatus.FAILED
+            job.error_message = batch['error'] or ''
+            job.completed_at = timezone.now()
+            await sync_to_async(job.save)()
+            await self._store_errors(job, batch['error'] or 'Batch job failed')
+            summary['failed'] += 1
+            summary['jobs'].append({'job_name': job.job_name, 'status': job.status})
+            return
+
+        result = await self._fan_out(job, batch['results'] or [])
+        job.status = GenerationBatchStatus.PROCESSED
+        job.result = result
+        job.completed_at = timezone.now()
+        await sync_to_async(job.save)()
+        summary['processed'] += 1
+        summary['jobs'].append({'job_name': job.job_name, 'status': job.status, **result})
+
+    @staticmethod
+    async def _release(job: GenerationBatchJob) -> None:
+        """Give a claimed job that is still running at Gemini back to the next collection."""
+        job.status = GenerationBatchStatus.SUBMITTED
+        job.collecting_started_at = None
+        await sync_to_async(job.save)(update_fields=['status', 'collecting_started_at', 'updated_at'])
+
+    async def _prepare_user(self, kind: str, user_id: int) -> Dict[str, Any]:
+        """Validate a user and build their prompt for the batch."""
+        user_data = await self.user_validation_service.get_user_data(user_id)
+        if not user_data:
+            return {'status': 'skipped', 'reason': 'user_not_found'}
+
+        validation_result = await self.user_validation_service.validate_user_eligibility(user_data)
+        if validation_result['status'] != 'eligible':
+            return {'status': 'skipped', 'reason': validation_result['reason']}
+
+        user = await sync_to_async(User.objects.get)(id=user_id)
+        if not await self.ai_service._avalidate_credits(user=user, operation='text_generation'):
+            return {'status': 'skipped', 'reason': 'insufficient_credits'}
+
+        bundle = await self.user_validation_service.get_generation_bundle(user_data, validation_result)
+
+        if kind == GenerationBatchKind.WEEKLY_FEED:
+            prompt = await sync_to_async(self.weekly_feed_service._build_feed_prompt)(user, bundle)
+            return {'status': 'ready', 'prompt': prompt, 'entry': {'user_id': user_id}}
+
+        week_id = get_current_week()
+        feed_base_post = await sync_to_async(WeekPlanEntry.get_feed_post)(user, get_current_week_day())
+        if not feed_base_post:
+            # Flagged for the retry cron, which runs after the week plan backfill
+            await self._store_user_error(kind, user, f"No week plan for {week_id}")
+            return {'status': 'skipped', 'reason': 'missing_week_plan'}
+
+        post_idea = await sync_to_async(lambda: feed_base_post.ideas.first())()
+        post_text_feed = {
+            'titulo': feed_base_post.name,
+            'type': 'feed',
+            'content': post_idea.content,
+        }
+        prompt = await sync_to_async(self.daily_ideas_service._build_campaign_prompt)(user, post_text_feed, bundle)
+        return {
+            'status': 'ready',
+            'prompt': prompt,
+            'entry': {'user_id': user_id, 'week_id': week_id, 'feed_post_idea_id': post_idea.id},
+        }
+
+    async def _fan_out(self, job: GenerationBatchJob, results: list) -> Dict[str, Any]:
+        """Save each batch result for its user; the posts of the whole job go in one bulk write.
+
+        The state of every entry is recorded in job.progress as it advances, so
+        a collection resumed after a timeout skips the users already saved.
+        """
+        progress = job.progress
+        writer = PostBulkWriter()
+        parsed = []
+
+        for index, (entry, batch_result) in enumerate(zip(job.entries, results)):
+            if str(index) in progress:
+                continue
+
+            user = None
+            try:
+                user = await sync_to_async(User.objects.get)(id=entry['user_id'])
+                if batch_result['error'] or not batch_result['text']:
+                    raise Exception(batch_result['error'] or 'Empty batch response')
+
+                if job.kind == GenerationBatchKind.WEEKLY_FEED:
+                    self.weekly_feed_service._add_feed_content(writer, user, batch_result['text'])
+                else:
+                    campaign = self.daily_ideas_service._parse_campaign_content(batch_result['text'])
+                    self.daily_ideas_service._add_campaign_posts(writer, user, campaign, entry['week_id'])
+                parsed.append(index)
+            except Exception as e:
+                logger.warning(f"Batch {job.job_name}: failed to save result for user {entry['user_id']}: {str(e)}")
+                await self._fail_entry(job, index, user, str(e))
+
+        if parsed:
+            try:
+                await writer.acquire_db()
+                await sync_to_async(self._save_posts)(job, writer, parsed)
+            except Exception as e:
+                logger.error(f"Batch {job.job_name}: failed to save posts: {str(e)}")
+                for index in parsed:
+                    user = await sync_to_async(User.objects.filter(id=job.entries[index]['user_id']).first)()
+                    await self._fail_entry(job, index, user, str(e))
+
+        # Entries saved by this collection or by an earlier one that died before finishing them
+        for index, entry in enumerate(job.entries):
+            if progress.get(str(index)) != ENTRY_SAVED:
+                continue
+
+            user = None
+            try:
+                user = await sync_to_async(User.objects.get)(id=entry['user_id'])
+                if job.kind == GenerationBatchKind.WEEKLY_FEED:
+                    await self.weekly_feed_service._clear_user_error(user)
+                else:
+                    feed_post_idea = await sync_to_async(PostIdea.objects.get)(id=entry['feed_post_idea_id'])
+                    await sync_to_async(ImageGenerationJobService.enqueue)(feed_post_idea, user)
+                    await self.daily_ideas_service._clear_user_error(user)
+
+                await self.ai_service._adeduct_credits(
+                    user=user, model=job.model_name, operation='text_generation',
+                    description='Geração de texto via Gemini (batch)'
+                )
+                await self._record_progress(job, index, ENTRY_FINISHED)
+            except Exception as e:
+                logger.warning(f"Batch {job.job_name}: failed to finish result for user {entry['user_id']}: {str(e)}")
+                await self._fail_entry(job, index, user, str(e))
+
+        for index in range(len(results), len(job.entries)):
+            if str(index) not in progress:
+                user = await sync_to_async(User.objects.filter(id=job.entries[index]['user_id']).first)()
+                await self._fail_entry(job, index, user, 'Missing batch response')
+
+        states = list(progress.values())
+        return {'succeeded': states.count(ENTRY_FINISHED), 'failed': states.count(ENTRY_FAILED)}
+
+    @staticmethod
+    def _save_posts(job: GenerationBatchJob, writer: PostBulkWriter, indexes: list[int]) -> None:
+        """Save the posts and mark their entries saved in the same transaction."""
+        with transaction.atomic():
+            writer.flush()
+            for index in indexes:
+                job.progress[str(index)] = ENTRY_SAVED
+            job.save(update_fields=['progress', 'updated_at'])
+
+    @staticmethod
+    async def _record_progress(job: GenerationBatchJob, index: int, state: str) -> None:
+        job.progress[str(index)] = state
+        await sync_to_async(job.save)(update_fields=['progress', 'updated_at'])
+
+    async def _fail_entry(self, job: GenerationBatchJob, index: int, user: Optional[User], error_message: str) -> None:
+        if user is not None:
+            await self._store_user_error(job.kind, user, error_message)
+        await self._record_progress(job, index, ENTRY_FAILED)
+
+    async def _store_errors(self, job: GenerationBatchJob, error_message: str) -> None:
+        """Flag every user of a failed batch so the retry crons pick them up."""
+        for entry in job.entries:
+            user = await sync_to_async(User.objects.get)(id=entry['user_id'])
+            await self._store_user_error(job.kind, user, error_message)
+
+    async def _store_user_error(self, kind: str, user: User, error_message: str) -> None:
+        if kind == GenerationBatchKind.WEEKLY_FEED:
+            await self.weekly_feed_service._store_user_error(user, error_message)
+        else:
+            await self.daily_ideas_service._store_user_error(user, error_message)
@@ -1,10 +1,11 @@
 import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
 from django.db import connection
+from django.db.models import QuerySet
 from django.utils import timezone
 
 try:
@@ -14,13 +15,19 @@ except ImportError:
 
 from AuditSystem.services import AuditService
 from CreatorProfile.models import CreatorProfile
-from IdeaBank.models import Post, PostIdea
-from IdeaBank.services.weekly_feed_creation import WeeklyFeedCreationService
-from IdeaBank.utils.current_week import get_current_week
+from IdeaBank.models import PostIdea, WeekPlanEntry
+from IdeaBank.services.generation_ledger_service import GenerationLedgerService
+from IdeaBank.services.post_bulk_writer import PostBulkWriter
+from IdeaBank.utils.current_week import get_current_week, get_current_week_day
+from services.ai_json_parser import parse_ai_json
 from services.ai_prompt_service import AIPromptService
+from services.ai_response_schemas import CampaignPayload, SemanticAnalysisPayload
 from services.ai_service import AiService
 from services.s3_sevice import S3Service
+from services.eligible_user_cursor import EligibleUserCursor
 from services.semaphore_service import SemaphoreService
+from services.stage_limiter import IMAGE_STAGE, TEXT_STAGE, UPLOAD_STAGE, StageLimiter, gather_stages
+from services.user_generation_bundle import UserGenerationBundle, strip_logo_data_url
 from services.user_validation_service import UserValidationService
 
 logger = logging.getLogger(__name__)
@@ -36,71 +43,59 @@ class DailyIdeasService:
             self,
             user_validation_service: Optional[UserValidationService] = None,
             semaphore_service: Optional[SemaphoreService] = None,
-            weekly_feed_creation_service: Optional[WeeklyFeedCreationService] = None,
             ai_service: Optional[AiService] = None,
             prompt_service: Optional[AIPromptService] = None,
             audit_service: Optional[AuditService] = None,
             s3_service: Optional[S3Service] = None,
+            stage_limiter: Optional[StageLimiter] = None,
     ):
         self.user_validation_service = user_validation_service or UserValidationService()
         self.semaphore_service = semaphore_service or SemaphoreService()
-        self.weekly_feed_creation_service = weekly_feed_creation_service or WeeklyFeedCreationService()
+        self.user_cursor = EligibleUserCursor('daily_ideas', self._eligible_users_queryset)
+        self.generation_ledger = GenerationLedgerService(
+            'daily_ideas', self.user_cursor, self.semaphore_service,
+            prepare_items=self.user_validation_service.prefetch_eligibility,
+        )
         self.ai_service = ai_service or AiService()
         self.prompt_service = prompt_service or AIPromptService()
         self.audit_service = audit_service or AuditService()
         self.s3_service = s3_service or S3Service()
+        self.stage_limiter = stage_limiter or StageLimiter()
 
-    @sync_to_async
-    def _get_eligible_users(self, offset: int, limit: int) -> list[dict[str, Any]]:
-        """Get a batch of users eligible for weekly context generation"""
-        if limit is None:
-            return list(
-                User.objects.extra(
-                    where=["daily_generation_error IS NULL"]
-                ).filter(
-                    usersubscription__status='active',
-                    is_active=True
-                ).distinct().values('id', 'email', 'username')[offset:]
-            )
-
-        return list(
+    def _eligible_users_queryset(self) -> QuerySet:
+        """Users eligible for daily ideas generation"""
+        return (
             User.objects.extra(
                 where=["daily_generation_error IS NULL"]
             ).filter(
                 usersubscription__status='active',
                 is_active=True
-            ).distinct().values('id', 'email', 'username')[offset:offset + limit]
+            ).distinct()
         )
 
-    async def process_daily_ideas_for_users(self, batch_number: int, batch_size: int) -> Dict[str, Any]:
+    async def process_daily_ideas_for_users(
+            self,
+            batch_number: int,
+            batch_size: int,
+            include_details: bool = False,
+            on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> Dict[str, Any]:
         """Process daily ideas generation for a batch of users"""
         start_time = timezone.now()
 
-        offset = (batch_number - 1) * batch_size
-        limit = batch_size
-
-        if batch_size == 0:
-            offset = 0
-            limit = None  # Process all users
-
-        eligible_users = await self._get_eligible_users(offset=offset, limit=limit)
-        total = len(eligible_users)
-
-        print(f"Batch {batch_number} - Total eligible users: {total}")
+        total = 0
+        try:
+            results = await self.generation_ledger.process(batch_size, self.process_single_user, on_result)
+            total = len(results)
 
-        if total == 0:
-            return {
-                'status': 'completed',
-                'processed': 0,
-                'total_users': 0,
-                'message': 'No eligible users found',
-            }
+            print(f"Batch {batch_number} - Total eligible users: {total}")
 
-        try:
-            results = await self.semaphore_service.process_concurrently(
-                users=eligible_users,
-                function=self.process_single_user
-            )
+            if total == 0:
+                return {
+                    'status': 'completed',
+                    'processed': 0,
+                    'total_users': 0,
+                    'message': 'No eligible users found',
+                }
 
             processed_count = sum(
                 1 for r in results if r.get('status') == 'success')
@@ -123,8 +118,10 @@ class DailyIdeasService:
                 'skipped': skipped_count,
                 'total_users': total,
                 'duration_seconds': duration,
-                'details': results,
+                'run': await sync_to_async(self.generation_ledger.run_progress)(),
             }
+            if include_details:
+                result['details'] = results
 
             return result
         except Exception as e:
@@ -164,23 +161,14 @@ class DailyIdeasService:
                     'user_id': user_id
                 }
 
-            user_posts = []
+            bundle = await self.user_validation_service.get_generation_bundle(user_data, validation_result)
 
             week_id = get_current_week()
 
-            feed_base_post = await sync_to_async(Post.objects.filter(
-                user=user,
-                type='feed',
-                further_details=week_id
-            ).order_by('-created_at').first)()
-
+            # The week is generated by the weekly feed job (or its backfill), never inline
+            feed_base_post = await sync_to_async(WeekPlanEntry.get_feed_post)(user, get_current_week_day())
             if not feed_base_post:
-                await self.weekly_feed_creation_service.process_user_weekly_ideas(user_id)
-                feed_base_post = await sync_to_async(Post.objects.filter(
-                    user=user,
-                    type='feed',
-                    further_details=week_id
-                ).order_by('-created_at').first)()
+                raise Exception(f"No week plan for {week_id}; waiting for the week plan backfill")
 
             post_idea = await sync_to_async(lambda: feed_base_post.ideas.first())()
 
@@ -196,27 +184,18 @@ class DailyIdeasService:
                 status='info',
             )
 
-            content_result = await sync_to_async(self._generate_content_for_user)(user, post_text_feed)
-
-            content_json = content_result.replace(
-                'json', '', 1).strip('`').strip()
-            content_loaded = json.loads(content_json)
-
-            post_text_stories = content_loaded.get('post_text_stories')
-            post_text_reels = content_loaded.get('post_text_reels')
-
-            post_content_stories = f"""{post_text_stories.get('roteiro', '').strip()}"""
-            post_content_reels = f"""{post_text_reels.get('roteiro', '').strip()}\n\n\n"""
-
-            await sync_to_async(self._generate_image_for_feed_post)(
-                user, post_idea, post_text_feed['content'])
+            # Stories/reels text and the feed image only depend on the feed post,
+            # so both branches run concurrently; posts are saved once both succeed
+            campaign, _ = await gather_stages(
+                self._generate_campaign_for_user(user, post_text_feed, bundle=bundle),
+                self._generate_image_for_feed_post(user, post_idea, post_text_feed['content'], bundle=bundle),
+            )
 
-            await self._save_text_to_db(user, post_text_stories, post_content_stories, user_posts, week_id, 'story')
-            await self._save_text_to_db(user, post_text_reels, post_content_reels, user_posts, week_id, 'reels')
+            user_posts = await self._save_campaign_posts(user, campaign, week_id)
 
             await self._clear_user_error(user)
 
-            return {'status': 'success', 'user_id': user_id, 'created_posts': []}
+            return {'status': 'success', 'user_id': user_id, 'created_posts': user_posts}
         except Exception as e:
             await self._store_user_error(user, str(e))
             await sync_to_async(self.audit_service.log_daily_content_generation)(
@@ -231,109 +210,160 @@ class DailyIdeasService:
             }
 
     @staticmethod
-    async def _save_text_to_db(
-            user: User,
-            post_data: dict,
-            post_content: str,
-            user_posts: list,
-            week_id: str,
-            post_type: str) -> None:
-        post = await sync_to_async(Post.objects.create)(
-            user=user,
-            name=post_data.get('titulo', 'Conteúdo Diário'),
-            type=post_type,
-            further_details=week_id,
-            include_image=True if post_type == 'feed' else False,
-            is_automatically_generated=True,
-            is_active=False
-        )
+    def _parse_campaign_content(content_result: str) -> dict:
+        """Parse the generated stories/reels JSON into post data and content."""
+        content_loaded = parse_ai_json(content_result, CampaignPayload)
 
-        post_idea = await sync_to_async(PostIdea.objects.create)(
-            post=post,
-            content=post_content,
-            image_url='',
-            image_description=''
-        )
+        post_text_stories = content_loaded.get('post_text_stories')
+        post_text_reels = content_loaded.get('post_text_reels')
+
+        return {
+            'stories': (post_text_stories, f"""{post_text_stories.get('roteiro', '').strip()}"""),
+            'reels': (post_text_reels, f"""{post_text_reels.get('roteiro', '').strip()}\n\n\n"""),
+        }
 
-        user_posts.append({
-            'post_id': post_idea.id,
-            'post_idea_id': post_idea.id,
-            'type': post.type,
-            'title': post.name
-        })
+    async def _save_campaign_posts(self, user: User, campaign: dict, week_id: str) -> list:
+        """Save the stories and reels posts of a parsed campaign."""
+        writer = PostBulkWriter()
+        self._add_campaign_posts(writer, user, campaign, week_id)
+        return await writer.aflush()
 
-    def _generate_image_for_feed_post(self, user: User, post_idea: PostIdea, post_content: str) -> str:
+    @staticmethod
+    def _add_campaign_posts(writer: PostBulkWriter, user: User, campaign: dict, week_id: str) -> None:
+        """Queue the stories and reels posts of a parsed campaign on the writer."""
+        for post_type, key in (('story', 'stories'), ('reels', 'reels')):
+            post_data, post_content = campaign[key]
+            writer.add(
+                user,
+                name=post_data.get('titulo', 'Conteúdo Diário'),
+                post_type=post_type,
+                further_details=week_id,
+                content=post_content,
+            )
+
+    async def _generate_image_for_feed_post(
+            self,
+            user: User,
+            post_idea: PostIdea,
+            post_content: str,
+            bundle: Optional[UserGenerationBundle] = None) -> str:
         """AI service call to generate image for feed post."""
         try:
-            user_logo = CreatorProfile.objects.filter(user=user).first().logo
-
-            if user_logo and "data:image/" in user_logo and ";base64," in user_logo:
-                user_logo = user_logo.split(",")[1]
+            user_logo, semantic_prompt = await sync_to_async(self._build_semantic_prompt)(
+                user, post_content, bundle)
 
             image_url = ''
-            self.prompt_service.set_user(user)
-
-            semantic_prompt = self.prompt_service.semantic_analysis_prompt(
-                post_content)
-            semantic_result = self.ai_service.generate_text(
-                semantic_prompt, user)
-            semantic_json = semantic_result.replace(
-                'json', '', 1).strip('`').strip()
-            semantic_loaded = json.loads(semantic_json)
+            semantic_loaded = await self.stage_limiter.run(
+                TEXT_STAGE, self.ai_service.agenerate_json,
+                semantic_prompt, user, SemanticAnalysisPayload, cache=True)
 
             semantic_analysis = semantic_loaded.get(
                 'analise_semantica', {})
 
-            image_prompt = self.prompt_service.image_generation_prompt(
-                semantic_analysis)
-
-            image_result = self.ai_service.generate_image(image_prompt, user_logo, user, types.GenerateContentConfig(
-                temperature=0.7,
-                top_p=0.9,
-                response_modalities=[
-                    "IMAGE",
-                ],
-                image_config=types.ImageConfig(
-                    aspect_ratio="4:5",
-                ),
-            ))
+            image_prompt = await sync_to_async(self._build_image_prompt)(
+                user, semantic_analysis, bundle)
+
+            image_result = await self.stage_limiter.run(
+                IMAGE_STAGE, self.ai_service.agenerate_image,
+                image_prompt, user_logo, user, types.GenerateContentConfig(
+                    temperature=0.7,
+                    top_p=0.9,
+                    response_modalities=[
+                        "IMAGE",
+                    ],
+                    image_config=types.ImageConfig(
+                        aspect_ratio="4:5",
+                    ),
+                ))
 
             if not image_result:
                 image_url = ''
             else:
-                image_url = self.s3_service.upload_image(
+                image_url = await self.stage_limiter.run(
+                    UPLOAD_STAGE, sync_to_async(self.s3_service.upload_image, thread_sensitive=False),
                     user, image_result)
 
             post_idea.image_description = json.dumps(semantic_analysis)
             post_idea.image_url = image_url
-            post_idea.save()
+            await sync_to_async(post_idea.save)()
 
             return image_url
         except Exception as e:
             raise Exception(
                 f"Failed to generate image for user {user.id}: {str(e)}")
 
-    def _generate_content_for_user(self, user: User, post_text_feed: dict) -> str:
+    async def _generate_content_for_user(
+            self,
+            user: User,
+            post_text_feed: dict,
+            bundle: Optional[UserGenerationBundle] = None) -> str:
         """AI service call to generate daily ideas for a user."""
         try:
-            self.prompt_service.set_user(user)
-
-            prompt = self.prompt_service.build_campaign_prompts(
-                post_text_feed)
-
-            content_result = self.ai_service.generate_text(prompt, user, types.GenerateContentConfig(
-                temperature=0.7,
-                top_p=0.9,
-                response_modalities=[
-                    "TEXT",
-                ],
-            ))
+            prompt = await sync_to_async(self._build_campaign_prompt)(user, post_text_feed, bundle)
+
+            content_result = await self.stage_limiter.run(
+                TEXT_STAGE, self.ai_service.agenerate_text,
+                prompt, user, self.ai_service.json_config(
+                    CampaignPayload,
+                    types.GenerateContentConfig(
+                        temperature=0.7,
+                        top_p=0.9,
+                        response_modalities=[
+                            "TEXT",
+                        ],
+                    )
+                ))
 
             return content_result
         except Exception as e:
             raise Exception(
                 f"Failed to generate context for user {user.id}: {str(e)}")
 
+    async def _generate_campaign_for_user(
+            self,
+            user: User,
+            post_text_feed: dict,
+            bundle: Optional[UserGenerationBundle] = None) -> dict:
+        """Text branch of the daily flow: generate and parse the stories/reels campaign."""
+        content_result = await self._generate_content_for_user(user, post_text_feed, bundle=bundle)
+        return self._parse_campaign_content(content_result)
+
+    def _build_semantic_prompt(
+            self,
+            user: User,
+            post_content: str,
+            bundle: Optional[UserGenerationBundle] = None) -> tuple[str, list[str]]:
+        """Load the user logo and build the semantic analysis prompt.
+
+        set_user and the prompt build run in the same sync call so concurrent
+        users never interleave on the shared prompt service.
+        """
+        if bundle is not None:
+            user_logo = bundle.logo
+        else:
+            user_logo = strip_logo_data_url(CreatorProfile.objects.filter(user=user).first().logo)
+
+        self.prompt_service.set_user(user, bundle)
+        return user_logo, self.prompt_service.semantic_analysis_prompt(post_content)
+
+    def _build_image_prompt(
+            self,
+            user: User,
+            semantic_analysis: dict,
+            bundle: Optional[UserGenerationBundle] = None) -> list[str]:
+        """Build the image generation prompt for the user."""
+        self.prompt_service.set_user(user, bundle)
+        return self.prompt_service.image_generation_prompt(semantic_analysis)
+
+    def _build_campaign_prompt(
+            self,
+            user: User,
+            post_text_feed: dict,
+            bundle: Optional[UserGenerationBundle] = None) -> list[str]:
+        """Build the stories/reels campaign prompt for the user."""
+        self.prompt_service.set_user(user, bundle)
+        return self.prompt_service.build_campaign_prompts(post_text_feed)
+
     @staticmethod
     async def _store_user_error(user, error_message: str):
         """Store error message in user model for retry processing."""
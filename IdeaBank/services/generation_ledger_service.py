@@ -0,0 +1,261 @@
+import logging
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from IdeaBank.models import (
+    GenerationRun,
+    GenerationRunStatus,
+    GenerationWorkItem,
+    GenerationWorkItemStatus,
+)
+from services.client_registry import close_loop_genai_clients
+from services.eligible_user_cursor import EligibleUserCursor
+from services.resource_limiter import DB, resource_limiter
+from services.semaphore_service import SemaphoreService
+
+logger = logging.getLogger(__name__)
+
+# A running item whose invocation died (timeout, crash) is reclaimed after this long
+STALE_LOCK_MINUTES = 15
+
+# Items claimed per round when a manual trigger processes the whole run
+DEFAULT_CLAIM_SIZE = 50
+
+_RESULT_STATUSES = {
+    'success': GenerationWorkItemStatus.SUCCEEDED,
+    'failed': GenerationWorkItemStatus.FAILED,
+    'skipped': GenerationWorkItemStatus.SKIPPED,
+}
+
+
+class GenerationLedgerService:
+    """Durable ledger of a generation cron run.
+
+    Every invocation of the cron moves the user cursor forward and enqueues
+    one GenerationWorkItem per newly claimed user, then claims pending items
+    with SELECT ... FOR UPDATE SKIP LOCKED. Several invocations (or workers)
+    can share a run without processing a user twice, and an invocation that
+    died mid-run leaves its items to be resumed by the next one.
+    """
+
+    def __init__(
+            self,
+            kind: str,
+            user_cursor: EligibleUserCursor,
+            semaphore_service: Optional[SemaphoreService] = None,
+            prepare_items: Optional[Callable[[list[dict]], Awaitable[None]]] = None,
+    ):
+        self.kind = kind
+        self.user_cursor = user_cursor
+        self.semaphore_service = semaphore_service or SemaphoreService()
+        # Called with the user_data of each claimed round before it is processed
+        self.prepare_items = prepare_items
+
+    def get_run(self) -> GenerationRun:
+        """Today's run of this cron (created on first use)."""
+        run, _ = GenerationRun.objects.get_or_create(
+            run_key=f"{self.kind}:{timezone.localdate().isoformat()}",
+            defaults={'kind': self.kind},
+        )
+        return run
+
+    @staticmethod
+    def enqueue(run: GenerationRun, users: list[dict[str, Any]]) -> None:
+        """Add a work item per user; users already in the run are ignored."""
+        GenerationWorkItem.objects.bulk_create(
+            [GenerationWorkItem(run=run, user_id=user['id'], user_data=user) for user in users],
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def claim_items(run: GenerationRun, limit: int) -> list[GenerationWorkItem]:
+        """Atomically move up to `limit` unfinished items to running."""
+        now = timezone.now()
+        stale_before = now - timedelta(minutes=STALE_LOCK_MINUTES)
+
+        with transaction.atomic():
+            items = list(
+                GenerationWorkItem.objects.select_for_update(skip_locked=True).filter(
+                    Q(status=GenerationWorkItemStatus.PENDING) |
+                    Q(status=GenerationWorkItemStatus.RUNNING, locked_at__lt=stale_before),
+                    run=run,
+                ).order_by('id')[:limit]
+            )
+            for item in items:
+                item.status = GenerationWorkItemStatus.RUNNING
+                item.locked_at = now
+                item.attempts += 1
+            GenerationWorkItem.objects.bulk_update(items, ['status', 'locked_at', 'attempts', 'updated_at'])
+
+        return items
+
+    @staticmethod
+    def complete_items(items: list[GenerationWorkItem], results: list[Dict[str, Any]]) -> None:
+        """Store the outcome of processed items (results in the same order) and bump the run counters."""
+        now = timezone.now()
+        counters = {'succeeded_count': 0, 'failed_count': 0, 'skipped_count': 0, 'created_posts_count': 0}
+        for item, result in zip(items, results):
+            item.status = _RESULT_STATUSES.get(result.get('status'), GenerationWorkItemStatus.FAILED)
+            item.error_message = str(result.get('error') or result.get('reason') or '')
+            item.result = {
+                'status': result.get('status'),
+                'created_posts': len(result.get('created_posts', [])),
+            }
+            item.locked_at = None
+            item.completed_at = now
+            item.updated_at = now
+
+            counters[f'{item.status}_count'] += 1
+            counters['created_posts_count'] += item.result['created_posts']
+
+        with transaction.atomic():
+            GenerationWorkItem.objects.bulk_update(
+                items, ['status', 'error_message', 'result', 'locked_at', 'completed_at', 'updated_at'])
+            GenerationRun.objects.filter(pk=items[0].run_id).update(
+                updated_at=now, **{field: F(field) + value for field, value in counters.items() if value})
+
+    def run_progress(self) -> Dict[str, Any]:
+        """Persisted counters of today's run, across all of its invocations."""
+        run = self.get_run()
+        return {
+            'run_key': run.run_key,
+            'status': run.status,
+            'succeeded': run.succeeded_count,
+            'failed': run.failed_count,
+            'skipped': run.skipped_count,
+            'created_posts': run.created_posts_count,
+            'unfinished': run.work_items.filter(
+                status__in=[GenerationWorkItemStatus.PENDING, GenerationWorkItemStatus.RUNNING]
+            ).count(),
+        }
+
+    @staticmethod
+    def list_items(run_key: str, status: Optional[str] = None, page: int = 1,
+                   page_size: int = 100) -> Dict[str, Any]:
+        """One page of a run's work items, for the details endpoint."""
+        run = GenerationRun.objects.get(run_key=run_key)
+        items = run.work_items.order_by('id')
+        if status:
+            items = items.filter(status=status)
+
+        total = items.count()
+        offset = (page - 1) * page_size
+        return {
+            'run_key': run.run_key,
+            'status': run.status,
+            'page': page,
+            'page_size': page_size,
+            'total': total,
+            'has_next': offset + page_size < total,
+            'items': [
+                {
+                    'user_id': item.user_id,
+                    'status': item.status,
+                    'attempts': item.attempts,
+                    'error_message': item.error_message,
+                    'created_posts': item.result.get('created_posts', 0),
+                    'completed_at': item.completed_at.isoformat() if item.completed_at else None,
+                }
+                for item in items[offset:offset + page_size]
+            ],
+        }
+
+    def refresh_run_status(self, run: GenerationRun, users_exhausted: bool) -> None:
+        """Close the run once no user is left to enqueue and no item is unfinished."""
+        unfinished = run.work_items.filter(
+            status__in=[GenerationWorkItemStatus.PENDING, GenerationWorkItemStatus.RUNNING]
+        ).exists()
+        if users_exhausted and not unfinished and run.status != GenerationRunStatus.COMPLETED:
+            run.status = GenerationRunStatus.COMPLETED
+            run.completed_at = timezone.now()
+            run.save(update_fields=['status', 'completed_at', 'updated_at'])
+
+    async def _process_item(
+            self,
+            item: GenerationWorkItem,
+            function: Callable[[dict], Awaitable[Dict[str, Any]]],
+            on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
+    ) -> Dict[str, Any]:
+        try:
+            result = await function(item.user_data)
+        except Exception as e:
+            result = {'user_id': item.user_id, 'status': 'failed', 'error': str(e)}
+
+        # Persisted as soon as the user finishes, so a timed-out invocation keeps its progress
+        await resource_limiter.acquire(DB)
+        await sync_to_async(self.complete_items)([item], [result])
+        if on_result:
+            await on_result(result)
+        return result
+
+    async def process(
+            self,
+            batch_size: int,
+            function: Callable[[dict], Awaitable[Dict[str, Any]]],
+            on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    ) -> list[Dict[str, Any]]:
+        """
+        Run one cron invocation and return the results of the items it processed.
+
+        With batch_size > 0 the next page of users is enqueued and one round of
+        up to batch_size items is processed (unfinished items of earlier
+        invocations first). With batch_size == 0 every eligible user is
+        enqueued and the run is processed until no item is left.
+
+        Each item is completed (and the run counters updated) as soon as it
+        finishes; `on_result` is then awaited with its result, for progress
+        streaming.
+        """
+        try:
+            return await self._process_run(batch_size, function, on_result)
+        finally:
+            # The genai clients live as long as this invocation's loop
+            await close_loop_genai_clients()
+
+    async def _process_run(
+            self,
+            batch_size: int,
+            function: Callable[[dict], Awaitable[Dict[str, Any]]],
+            on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]],
+    ) -> list[Dict[str, Any]]:
+        run = await sync_to_async(self.get_run)()
+
+        if batch_size == 0:
+            async for page in self.user_cursor.iter_pages():
+                await sync_to_async(self.enqueue)(run, page)
+            users_exhausted = True
+        else:
+            page = await self.user_cursor.claim_page(batch_size)
+            await sync_to_async(self.enqueue)(run, page)
+            # The work items now carry the page; a crash before this re-serves it
+            await self.user_cursor.complete_page(page)
+            users_exhausted = not page
+
+        results = []
+        while True:
+            await resource_limiter.acquire(DB)
+            items = await sync_to_async(self.claim_items)(run, batch_size or DEFAULT_CLAIM_SIZE)
+            if not items:
+                break
+
+            if self.prepare_items:
+                await self.prepare_items([item.user_data for item in items])
+
+            items_by_user = {item.user_id: item for item in items}
+            item_results = await self.semaphore_service.process_concurrently(
+                users=[{**item.user_data, 'id': item.user_id} for item in items],
+                function=lambda user: self._process_item(items_by_user[user['id']], function, on_result)
+            )
+            results.extend(item_results)
+
+            if batch_size:
+                break
+
+        await sync_to_async(self.refresh_run_status)(run, users_exhausted)
+        logger.info(f"[{run.run_key}] processed {len(results)} work items")
+        return results
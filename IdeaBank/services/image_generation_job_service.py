@@ -0,0 +1,228 @@
+import json
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+try:
+    from google.genai import types
+except ImportError:
+    types = None
+
+from CreatorProfile.models import CreatorProfile
+from IdeaBank.models import (
+    ImageGenerationJob,
+    ImageGenerationJobStatus,
+    PostIdea,
+)
+from services.ai_prompt_service import AIPromptService
+from services.ai_response_schemas import SemanticAnalysisPayload
+from services.ai_service import AiService
+from services.s3_sevice import S3Service
+from services.user_generation_bundle import strip_logo_data_url
+
+logger = logging.getLogger(__name__)
+
+# Base delay before retrying a failed job (doubles at every attempt)
+RETRY_BASE_SECONDS = 30
+
+# A running job whose worker died is reclaimed after this long
+STALE_LOCK_MINUTES = 10
+
+
+class ImageGenerationJobService:
+    """DB-backed queue for PostIdea image generation.
+
+    Views enqueue a job and return immediately; a worker (management command
+    `process_image_jobs` or the cron endpoint, called every 5 minutes by the
+    Image Jobs Processing workflow) claims and runs pending jobs.
+    """
+
+    def __init__(
+            self,
+            ai_service: Optional[AiService] = None,
+            prompt_service: Optional[AIPromptService] = None,
+            s3_service: Optional[S3Service] = None,
+    ):
+        self._ai_service = ai_service
+        self.prompt_service = prompt_service or AIPromptService()
+        self._s3_service = s3_service
+
+    @property
+    def ai_service(self) -> AiService:
+        if self._ai_service is None:
+            self._ai_service = AiService()
+        return self._ai_service
+
+    @property
+    def s3_service(self) -> S3Service:
+        if self._s3_service is None:
+            self._s3_service = S3Service()
+        return self._s3_service
+
+    @staticmethod
+    def enqueue(post_idea: PostIdea, user: User, custom_prompt: Optional[str] = None,
+                idempotency_key: Optional[str] = None) -> ImageGenerationJob:
+        """Create (or return the existing) image job for a PostIdea.
+
+        The default idempotency key is one job per PostIdea: repeated calls
+        return the same job, and a failed job is put back in the queue.
+        """
+        key = idempotency_key or f"post_idea:{post_idea.id}:image"
+        job, created = ImageGenerationJob.objects.get_or_create(
+            idempotency_key=key,
+            defaults={
+                'user': user,
+                'post_idea': post_idea,
+                'custom_prompt': custom_prompt,
+                'run_after': timezone.now(),
+            }
+        )
+
+        if not created and job.status == ImageGenerationJobStatus.FAILED:
+            job.status = ImageGenerationJobStatus.PENDING
+            job.attempts = 0
+            job.error_message = ''
+            job.run_after = timezone.now()
+            job.save(update_fields=['status', 'attempts', 'error_message', 'run_after', 'updated_at'])
+
+        return job
+
+    @staticmethod
+    def claim_jobs(limit: int) -> list[ImageGenerationJob]:
+        """Atomically move up to `limit` due jobs to running.
+
+        Uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never
+        claim the same job. Running jobs with a stale lock are reclaimed.
+        The attempt is counted at claim time, so a job whose worker keeps
+        dying (timeout, crash) fails once it reaches max_attempts instead of
+        being reclaimed forever.
+        """
+        now = timezone.now()
+        stale_before = now - timedelta(minutes=STALE_LOCK_MINUTES)
+
+        with transaction.atomic():
+            candidates = list(
+                ImageGenerationJob.objects.select_for_update(skip_locked=True).filter(
+                    Q(status=ImageGenerationJobStatus.PENDING, run_after__lte=now) |
+                    Q(status=ImageGenerationJobStatus.RUNNING, locked_at__lt=stale_before)
+                ).order_by('run_after')[:limit]
+            )
+            jobs = [job for job in candidates if job.attempts < job.max_attempts]
+            exhausted = [job for job in candidates if job.attempts >= job.max_attempts]
+
+            for job in jobs:
+                job.status = ImageGenerationJobStatus.RUNNING
+                job.locked_at = now
+                job.attempts += 1
+                job.updated_at = now
+            for job in exhausted:
+                logger.warning(f"Image job {job.id} failed: worker died on its last attempt")
+                job.status = ImageGenerationJobStatus.FAILED
+                job.locked_at = None
+                job.error_message = job.error_message or 'Worker died while generating the image'
+                job.updated_at = now
+
+            ImageGenerationJob.objects.bulk_update(jobs, ['status', 'locked_at', 'attempts', 'updated_at'])
+            ImageGenerationJob.objects.bulk_update(
+                exhausted, ['status', 'locked_at', 'error_message', 'updated_at'])
+
+        return jobs
+
+    def process_pending_jobs(self, limit: int = 5) -> Dict[str, Any]:
+        """Claim and run due jobs, returning a summary."""
+        jobs = self.claim_jobs(limit)
+        results = [self.process_job(job) for job in jobs]
+
+        return {
+            'status': 'completed',
+            'processed': len(results),
+            'completed': sum(1 for r in results if r['status'] == ImageGenerationJobStatus.COMPLETED),
+            'retrying': sum(1 for r in results if r['status'] == ImageGenerationJobStatus.PENDING),
+            'failed': sum(1 for r in results if r['status'] == ImageGenerationJobStatus.FAILED),
+            'details': results,
+        }
+
+    def process_job(self, job: ImageGenerationJob) -> Dict[str, Any]:
+        """Run a claimed job, scheduling a retry with backoff on failure."""
+        post_idea = job.post_idea
+
+        try:
+            image_url, image_description = self.generate_image_url(
+                job.user, post_idea.content, job.custom_prompt)
+
+            post_idea.image_url = image_url
+            post_idea.image_description = image_description
+            post_idea.save(update_fields=['image_url', 'image_description', 'updated_at'])
+
+            job.status = ImageGenerationJobStatus.COMPLETED
+            job.image_url = image_url
+            job.error_message = ''
+            job.completed_at = timezone.now()
+        except Exception as e:
+            logger.warning(f"Image job {job.id} failed on attempt {job.attempts}: {str(e)}")
+            job.error_message = str(e)
+            if job.attempts < job.max_attempts:
+                job.status = ImageGenerationJobStatus.PENDING
+                job.run_after = timezone.now() + timedelta(
+                    seconds=RETRY_BASE_SECONDS * (2 ** (job.attempts - 1)))
+            else:
+                job.status = ImageGenerationJobStatus.FAILED
+
+        job.locked_at = None
+        job.save()
+
+        return {
+            'job_id': job.id,
+            'post_idea_id': job.post_idea_id,
+            'status': job.status,
+            'attempts': job.attempts,
+        }
+
+    def generate_image_url(self, user: User, post_content, custom_prompt: Optional[str] = None) -> tuple[str, str]:
+        """Generate the image for a post and upload it to S3.
+
+        Returns (image_url, image_description). Without a custom prompt the
+        image prompt comes from the semantic analysis of the post content.
+        """
+        user_logo = strip_logo_data_url(CreatorProfile.objects.filter(user=user).first().logo)
+
+        if custom_prompt:
+            image_prompt = [custom_prompt]
+            image_description = json.dumps(custom_prompt)
+        else:
+            self.prompt_service.set_user(user)
+            semantic_prompt = self.prompt_service.semantic_analysis_prompt(
+                post_content)
+            semantic_loaded = self.ai_service.generate_json(
+                semantic_prompt, user, SemanticAnalysisPayload, cache=True)
+
+            semantic_analysis = semantic_loaded.get(
+                'analise_semantica', {})
+            image_description = json.dumps(semantic_analysis)
+
+            image_prompt = self.prompt_service.image_generation_prompt(
+                semantic_analysis)
+
+        image_result = self.ai_service.generate_image(
+            image_prompt,
+            user_logo,
+            user,
+            types.GenerateContentConfig(
+                temperature=0.7,
+                top_p=0.9,
+                response_modalities=[
+                    "IMAGE",
+                ],
+                image_config=types.ImageConfig(
+                    aspect_ratio="4:5",
+                ),
+            ))
+
+        if not image_result:
+            return '', image_description
+        return self.s3_service.upload_image(user, image_result), image_description
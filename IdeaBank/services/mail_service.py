@@ -5,7 +5,9 @@ from datetime import datetime
 from typing import Any, Dict, List
 
 import requests
-from mailjet_rest import Client
+
+from services.client_registry import get_mailjet_client
+from services.resource_limiter import MAILJET, resource_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -17,11 +19,9 @@ class MailService():
         self.sender_email = os.getenv("SENDER_EMAIL")
         self.sender_name = os.getenv("SENDER_NAME")
         self.base_url = "https://api.mailjet.com/v3.1/send"
-        self.mailjet_client = Client(
-            auth=(self.api_key, self.secret_key), version='v3.1')
-        # Create v3 client for statistics API
-        self.mailjet_client_v3 = Client(
-            auth=(self.api_key, self.secret_key), version='v3')
+        self.mailjet_client = get_mailjet_client('v3.1')
+        # v3 client for statistics API
+        self.mailjet_client_v3 = get_mailjet_client('v3')
 
     def send_email(self, recipient_email, subject, html_content, attachments=None) -> tuple:
         """
@@ -75,6 +75,7 @@ class MailService():
                 'Messages': [message_data]
             }
 
+            resource_limiter.acquire_sync(MAILJET)
             result = self.mailjet_client.send.create(data=data)
 
             if result.status_code == 200:
@@ -0,0 +1,152 @@
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+
+from IdeaBank.models import Post, PostIdea, WeekPlanEntry
+from services.resource_limiter import DB, resource_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class PostBulkWriter:
+    """Accumulates generated Post/PostIdea pairs and saves them with bulk_create.
+
+    The generation services used to save every post with two `objects.create`
+    round-trips. The writer takes the posts of one user (or of a whole batch
+    of users) and saves them in a single transaction: one INSERT for the
+    posts and one for their ideas.
+
+    MySQL does not return the ids of a multi-row INSERT, so on backends
+    without `can_return_rows_from_bulk_insert` the new rows are selected back
+    by their natural key (user, type, name, further_details, created_at).
+
+    Weekly feed posts carry their day of the week plan; the WeekPlanEntry
+    rows are upserted in the same transaction, so a later generation of the
+    same day replaces the planned post.
+    """
+
+    def __init__(self):
+        self._pending: list[tuple[Post, str, Optional[tuple[int, int, int]]]] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(
+            self,
+            user: User,
+            name: str,
+            post_type: str,
+            further_details: str,
+            content: str,
+            include_image: bool = False,
+            week_plan_day: Optional[tuple[int, int, int]] = None,
+    ) -> None:
+        """Queue one automatically generated post and its idea.
+
+        week_plan_day: (iso_year, iso_week, weekday) the post is planned for, if any.
+        """
+        post = Post(
+            user=user,
+            name=name,
+            type=post_type,
+            further_details=further_details,
+            include_image=include_image,
+            is_automatically_generated=True,
+            is_active=False
+        )
+        self._pending.append((post, content, week_plan_day))
+
+    def flush(self) -> list[Dict[str, Any]]:
+        """Save every queued post; returns one summary per post, in insertion order."""
+        if not self._pending:
+            return []
+        pending, self._pending = self._pending, []
+        posts = [post for post, _, _ in pending]
+
+        with transaction.atomic():
+            Post.objects.bulk_create(posts)
+            if posts[0].pk is None:
+                self._reselect_posts(posts)
+
+            ideas = [
+                PostIdea(post=post, content=content, image_url='', image_description='')
+                for post, content, _ in pending
+            ]
+            PostIdea.objects.bulk_create(ideas)
+            if ideas[0].pk is None:
+                self._reselect_ideas(ideas)
+
+            self._save_week_plan(pending)
+
+        logger.info(f"Saved {len(posts)} generated posts")
+        return [
+            {
+                'post_id': post.id,
+                'post_idea_id': idea.id,
+                'type': post.type,
+                'title': post.name
+            }
+            for post, idea in zip(posts, ideas)
+        ]
+
+    async def acquire_db(self) -> None:
+        """Wait on the database bucket, one token per queued post (capped at the bucket burst)."""
+        await resource_limiter.acquire(DB, min(max(len(self._pending), 1), resource_limiter.bucket(DB).capacity))
+
+    async def aflush(self) -> list[Dict[str, Any]]:
+        await self.acquire_db()
+        return await sync_to_async(self.flush)()
+
+    @staticmethod
+    def _save_week_plan(pending: list[tuple[Post, str, Optional[tuple[int, int, int]]]]) -> None:
+        entries = {}
+        for post, _, day in pending:
+            if day is not None:
+                # The last post queued for a day wins
+                entries[(post.user_id, *day)] = WeekPlanEntry(
+                    user_id=post.user_id, iso_year=day[0], iso_week=day[1], weekday=day[2], post=post)
+        if not entries:
+            return
+
+        # MySQL upserts on any unique key and does not accept the conflict target
+        unique_fields = ['user', 'iso_year', 'iso_week', 'weekday'] \
+            if connection.features.supports_update_conflicts_with_target else None
+        WeekPlanEntry.objects.bulk_create(
+            list(entries.values()),
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=['post', 'updated_at'],
+        )
+
+    @staticmethod
+    def _post_key(user_id, post_type, name, further_details, created_at) -> tuple:
+        return user_id, post_type, name, further_details, created_at
+
+    def _reselect_posts(self, posts: list[Post]) -> None:
+        rows = Post.objects.filter(
+            user_id__in={post.user_id for post in posts},
+            created_at__in={post.created_at for post in posts},
+        ).order_by('id').values_list('id', 'user_id', 'type', 'name', 'further_details', 'created_at')
+
+        ids_by_key = defaultdict(list)
+        for post_id, *key in rows:
+            ids_by_key[self._post_key(*key)].append(post_id)
+
+        for post in posts:
+            key = self._post_key(post.user_id, post.type, post.name, post.further_details, post.created_at)
+            if not ids_by_key[key]:
+                raise RuntimeError(f"Could not find the inserted post '{post.name}' of user {post.user_id}")
+            post.pk = ids_by_key[key].pop(0)
+
+    @staticmethod
+    def _reselect_ideas(ideas: list[PostIdea]) -> None:
+        # Every post was created in this transaction with exactly one idea
+        ids_by_post = dict(
+            PostIdea.objects.filter(post_id__in=[idea.post_id for idea in ideas]).values_list('post_id', 'id')
+        )
+        for idea in ideas:
+            idea.pk = ids_by_post[idea.post_id]
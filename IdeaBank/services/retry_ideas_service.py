@@ -1,10 +1,11 @@
 import logging
 from typing import Any, Dict
 
-from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from django.utils import timezone
 
+from services.eligible_user_cursor import EligibleUserCursor
 from services.semaphore_service import SemaphoreService
 from .daily_ideas_service import DailyIdeasService
 
@@ -14,52 +15,41 @@ logger = logging.getLogger(__name__)
 class RetryIdeasService:
     def __init__(self):
         self.semaphore_service = SemaphoreService()
+        self.user_cursor = EligibleUserCursor(
+            'retry_daily_ideas', self._eligible_users_queryset, fields=('id', 'email', 'username', 'first_name'))
         self.daily_ideas_service = DailyIdeasService()
 
-    @sync_to_async
-    def _get_users_with_errors(self, offset: int, limit: int) -> list[dict[str, Any]]:
-        """Get all users who have daily generation errors."""
-        if limit is None:
-            return list(
-                User.objects.extra(
-                    where=["daily_generation_error IS NOT NULL"]
-                ).filter(
-                    usersubscription__status='active',
-                    is_active=True
-                ).distinct().values('id', 'email', 'username', 'first_name')[offset:]
-            )
-
-        return list(
+    def _eligible_users_queryset(self) -> QuerySet:
+        """Users who have daily generation errors"""
+        return (
             User.objects.extra(
                 where=["daily_generation_error IS NOT NULL"]
             ).filter(
                 usersubscription__status='active',
                 is_active=True
-            ).distinct().values('id', 'email', 'username', 'first_name')[offset:offset + limit]
+            ).distinct()
         )
 
-    async def process_daily_ideas_for_failed_users(self, batch_number: int, batch_size: int) -> Dict[str, Any]:
+    async def process_daily_ideas_for_failed_users(self, batch_number: int, batch_size: int, include_details: bool = False) -> Dict[str, Any]:
         """Process daily ideas generation for a batch of users"""
         start_time = timezone.now()
-        offset = (batch_number - 1) * batch_size
-        limit = batch_size
-
-        eligible_users = await self._get_users_with_errors(offset=offset, limit=limit)
-        total = len(eligible_users)
-
-        if total == 0:
-            return {
-                'status': 'completed',
-                'processed': 0,
-                'total_users': 0,
-                'message': 'No eligible users found',
-            }
-
+        total = 0
         try:
-            results = await self.semaphore_service.process_concurrently(
-                users=eligible_users,
-                function=self.daily_ideas_service.process_single_user
-            )
+            results = []
+            async for page in self.user_cursor.pages(batch_size):
+                total += len(page)
+                results.extend(await self.semaphore_service.process_concurrently(
+                    users=page,
+                    function=self.daily_ideas_service.process_single_user
+                ))
+
+            if total == 0:
+                return {
+                    'status': 'completed',
+                    'processed': 0,
+                    'total_users': 0,
+                    'message': 'No eligible users found',
+                }
 
             processed_count = sum(
                 1 for r in results if r.get('status') == 'success')
@@ -82,8 +72,9 @@ class RetryIdeasService:
                 'skipped': skipped_count,
                 'total_users': total,
                 'duration_seconds': duration,
-                'details': results,
             }
+            if include_details:
+                result['details'] = results
 
             return result
         except Exception as e:
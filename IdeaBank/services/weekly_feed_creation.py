@@ -1,11 +1,11 @@
 import datetime
-import json
 import logging
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
 from django.db import connection
+from django.db.models import Exists, OuterRef, QuerySet
 from django.utils import timezone
 
 try:
@@ -16,10 +16,18 @@ except ImportError:
 from AuditSystem.services import AuditService
 from ClientContext.models import ClientContext
 from ClientContext.serializers import ClientContextSerializer
-from IdeaBank.models import Post, PostIdea
+from IdeaBank.models import WeekPlanEntry
+from IdeaBank.services.generation_ledger_service import GenerationLedgerService
+from IdeaBank.services.post_bulk_writer import PostBulkWriter
+from IdeaBank.utils.current_week import get_current_week_day
+from services.ai_json_parser import parse_ai_json
 from services.ai_prompt_service import AIPromptService
+from services.ai_response_schemas import WeeklyFeedPayload
 from services.ai_service import AiService
+from services.client_registry import close_loop_genai_clients
+from services.eligible_user_cursor import EligibleUserCursor
 from services.semaphore_service import SemaphoreService
+from services.user_generation_bundle import UserGenerationBundle
 from services.user_validation_service import UserValidationService
 
 logger = logging.getLogger(__name__)
@@ -29,59 +37,59 @@ class WeeklyFeedCreationService:
     def __init__(self):
         self.user_validation_service = UserValidationService()
         self.semaphore_service = SemaphoreService()
+        self.user_cursor = EligibleUserCursor('weekly_feed', self._eligible_users_queryset)
+        self.generation_ledger = GenerationLedgerService(
+            'weekly_feed', self.user_cursor, self.semaphore_service,
+            prepare_items=self.user_validation_service.prefetch_eligibility,
+        )
+        self.backfill_cursor = EligibleUserCursor('week_plan_backfill', self._missing_week_plan_queryset)
         self.ai_service = AiService()
         self.prompt_service = AIPromptService()
         self.audit_service = AuditService()
 
-    @sync_to_async
-    def _get_eligible_users(self, offset: int, limit: int) -> list[dict[str, Any]]:
-        """Get a batch of users eligible for weekly context generation"""
-
-        if limit is None:
-            return list(
-                User.objects.extra(
-                    where=["weekly_feed_generation_error IS NULL"]
-                ).filter(
-                    usersubscription__status='active',
-                    is_active=True
-                ).distinct().values('id', 'email', 'username')[offset:]
-            )
-
-        return list(
+    def _eligible_users_queryset(self) -> QuerySet:
+        """Users eligible for weekly feed generation"""
+        return (
             User.objects.extra(
                 where=["weekly_feed_generation_error IS NULL"]
             ).filter(
                 usersubscription__status='active',
                 is_active=True
-            ).distinct().values('id', 'email', 'username')[offset:offset + limit]
+            ).distinct()
+        )
+
+    def _missing_week_plan_queryset(self) -> QuerySet:
+        """Subscribed users without a week plan for the current week"""
+        iso_year, iso_week, _ = get_current_week_day()
+        return (
+            User.objects.filter(
+                usersubscription__status='active',
+                is_active=True
+            ).filter(
+                ~Exists(WeekPlanEntry.objects.filter(user=OuterRef('pk'), iso_year=iso_year, iso_week=iso_week))
+            ).distinct()
         )
 
-    async def process_weekly_ideas_for_users(self, batch_number: int, batch_size: int) -> Dict[str, Any]:
+    async def process_weekly_ideas_for_users(
+            self,
+            batch_number: int,
+            batch_size: int,
+            include_details: bool = False,
+            on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None) -> Dict[str, Any]:
         """Process daily ideas generation for a batch of users"""
         start_time = timezone.now()
-        offset = (batch_number - 1) * batch_size
-        limit = batch_size
-
-        if batch_size == 0:
-            offset = 0
-            limit = None  # Process all users
-
-        eligible_users = await self._get_eligible_users(offset=offset, limit=limit)
-        total = len(eligible_users)
-
-        if total == 0:
-            return {
-                'status': 'completed',
-                'processed': 0,
-                'total_users': 0,
-                'message': 'No eligible users found',
-            }
-
+        total = 0
         try:
-            results = await self.semaphore_service.process_concurrently(
-                users=eligible_users,
-                function=self.process_single_user
-            )
+            results = await self.generation_ledger.process(batch_size, self.process_single_user, on_result)
+            total = len(results)
+
+            if total == 0:
+                return {
+                    'status': 'completed',
+                    'processed': 0,
+                    'total_users': 0,
+                    'message': 'No eligible users found',
+                }
 
             processed_count = sum(
                 1 for r in results if r.get('status') == 'success')
@@ -104,8 +112,60 @@ class WeeklyFeedCreationService:
                 'skipped': skipped_count,
                 'total_users': total,
                 'duration_seconds': duration,
-                'details': results,
+                'run': await sync_to_async(self.generation_ledger.run_progress)(),
+            }
+            if include_details:
+                result['details'] = results
+
+            return result
+        except Exception as e:
+            return {
+                'status': 'error',
+                'processed': 0,
+                'total_users': total,
+                'message': f'Error processing users: {str(e)}',
+            }
+
+    async def backfill_missing_week_plans(
+            self,
+            batch_number: int,
+            batch_size: int,
+            include_details: bool = False) -> Dict[str, Any]:
+        """Generate the current week's feed for users the weekly job missed.
+
+        The daily job only reads the week plan; users that subscribed after
+        the weekly run (or whose weekly generation failed) get their week here.
+        """
+        start_time = timezone.now()
+        total = 0
+        try:
+            results = []
+            async for page in self.backfill_cursor.pages(batch_size):
+                total += len(page)
+                await self.user_validation_service.prefetch_eligibility(page)
+                results.extend(await self.semaphore_service.process_concurrently(
+                    users=page,
+                    function=self.process_single_user
+                ))
+
+            if total == 0:
+                return {
+                    'status': 'completed',
+                    'processed': 0,
+                    'total_users': 0,
+                    'message': 'No users without a week plan',
+                }
+
+            result = {
+                'status': 'completed',
+                'processed': sum(1 for r in results if r.get('status') == 'success'),
+                'failed': sum(1 for r in results if r.get('status') == 'failed'),
+                'skipped': sum(1 for r in results if r.get('status') == 'skipped'),
+                'total_users': total,
+                'duration_seconds': (timezone.now() - start_time).total_seconds(),
             }
+            if include_details:
+                result['details'] = results
 
             return result
         except Exception as e:
@@ -115,6 +175,9 @@ class WeeklyFeedCreationService:
                 'total_users': total,
                 'message': f'Error processing users: {str(e)}',
             }
+        finally:
+            # The genai clients live as long as this batch's loop
+            await close_loop_genai_clients()
 
     async def process_single_user(self, user_data: dict) -> Dict[str, Any]:
         """Process daily ideas generation for a single user"""
@@ -144,25 +207,17 @@ class WeeklyFeedCreationService:
                     'user_id': user_id
                 }
 
-            user_posts = []
+            bundle = await self.user_validation_service.get_generation_bundle(user_data, validation_result)
+
             await sync_to_async(self.audit_service.log_daily_content_generation)(
                 user=user,
                 action='daily_content_generation_started',
                 status='info',
             )
 
-            content_result = await sync_to_async(self._generate_content_for_user)(user)
-
-            content_json = content_result.replace(
-                'json', '', 1).strip('`').strip()
-            content_loaded = json.loads(content_json)
-
-            for post_text_feed in content_loaded:
-                post_content_feed = f"""
-                    {post_text_feed.get('legenda', '').strip()}\n\n\n{' '.join(post_text_feed.get('hashtags', []))}\n\n\n{post_text_feed.get('cta', '').strip()}
-                   """
+            content_result = await self._generate_content_for_user(user, bundle=bundle)
 
-                await self._save_text_to_db(user, post_text_feed, post_content_feed, user_posts)
+            user_posts = await self._save_feed_content(user, content_result)
 
             await self._clear_user_error(user)
 
@@ -180,51 +235,50 @@ class WeeklyFeedCreationService:
                 'user_id': user_id
             }
 
+    async def _save_feed_content(self, user: User, content_result: str) -> list:
+        """Parse the generated weekly feed JSON and save one Post/PostIdea per item."""
+        writer = PostBulkWriter()
+        self._add_feed_content(writer, user, content_result)
+        return await writer.aflush()
+
     @staticmethod
-    async def _save_text_to_db(user: User, post_data: dict, post_content: str, user_posts: list) -> None:
+    def _add_feed_content(writer: PostBulkWriter, user: User, content_result: str) -> None:
+        """Parse the generated weekly feed JSON and queue its posts on the writer."""
+        content_loaded = parse_ai_json(content_result, WeeklyFeedPayload)
         current_week = datetime.datetime.now().isocalendar()[1]
-        week_id = str(post_data.get('id')) + '_week_' + str(current_week)
-        post = await sync_to_async(Post.objects.create)(
-            user=user,
-            name=post_data.get('titulo', 'Conteúdo Diário'),
-            type='feed',
-            further_details=week_id,
-            include_image=True,
-            is_automatically_generated=True,
-            is_active=False
-        )
+        iso_year, iso_week, _ = get_current_week_day()
 
-        post_idea = await sync_to_async(PostIdea.objects.create)(
-            post=post,
-            content=post_content,
-            image_url='',
-            image_description=''
-        )
-
-        user_posts.append({
-            'post_id': post_idea.id,
-            'post_idea_id': post_idea.id,
-            'type': 'feed',
-            'title': post.name
-        })
+        for post_text_feed in content_loaded:
+            post_content_feed = f"""
+                    {post_text_feed.get('legenda', '').strip()}\n\n\n{' '.join(post_text_feed.get('hashtags', []))}\n\n\n{post_text_feed.get('cta', '').strip()}
+                   """
+            # The item id is the day of the week the post is planned for
+            weekday = post_text_feed.get('id')
+
+            writer.add(
+                user,
+                name=post_text_feed.get('titulo', 'Conteúdo Diário'),
+                post_type='feed',
+                further_details=str(post_text_feed.get('id')) + '_week_' + str(current_week),
+                content=post_content_feed,
+                include_image=True,
+                week_plan_day=(iso_year, iso_week, weekday) if weekday in range(1, 8) else None,
+            )
 
-    def _generate_content_for_user(self, user: User) -> str:
+    async def _generate_content_for_user(self, user: User, bundle: Optional[UserGenerationBundle] = None) -> str:
         """AI service call to generate daily ideas for a user."""
         try:
-            self.prompt_service.set_user(user)
-            context = ClientContext.objects.filter(user=user).first()
-            serializer = ClientContextSerializer(context)
-            context_data = serializer.data if serializer else {}
-
-            prompt = self.prompt_service.build_feed_prompts(
-                context_data)
-
-            content_result = self.ai_service.generate_text(prompt, user, types.GenerateContentConfig(
-                temperature=0.7,
-                top_p=0.9,
-                response_modalities=[
-                    "TEXT",
-                ],
+            prompt = await sync_to_async(self._build_feed_prompt)(user, bundle)
+
+            content_result = await self.ai_service.agenerate_text(prompt, user, self.ai_service.json_config(
+                WeeklyFeedPayload,
+                types.GenerateContentConfig(
+                    temperature=0.7,
+                    top_p=0.9,
+                    response_modalities=[
+                        "TEXT",
+                    ],
+                )
             ))
 
             return content_result
@@ -232,6 +286,19 @@ class WeeklyFeedCreationService:
             raise Exception(
                 f"Failed to generate context for user {user.id}: {str(e)}")
 
+    def _build_feed_prompt(self, user: User, bundle: Optional[UserGenerationBundle] = None) -> list[str]:
+        """Build the weekly feed prompt from the user's client context."""
+        self.prompt_service.set_user(user, bundle)
+        if bundle is not None:
+            context_data = bundle.client_context
+        else:
+            context = ClientContext.objects.filter(user=user).first()
+            serializer = ClientContextSerializer(context)
+            context_data = serializer.data if serializer else {}
+
+        return self.prompt_service.build_feed_prompts(
+            context_data)
+
     @staticmethod
     async def _store_user_error(user, error_message: str):
         """Store error message in user model for retry processing."""
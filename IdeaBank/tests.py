@@ -1,3 +1,621 @@
+"""
+Testes para a geração de ideias do IdeaBank.
+
+Testa:
+- Endpoint de geração via Server-Sent Events
+- Fila de jobs de geração de imagem (idempotência, retries, status)
+- Geração em batch (envio do batch e distribuição dos resultados)
+- Ledger das execuções dos crons (work items por usuário, retomada, contadores)
+- Progresso dos crons (streaming NDJSON, endpoint de detalhes)
+- Pipeline diário (texto e imagem do feed em paralelo)
+- Gravação em lote de Post/PostIdea (bulk_create)
+"""
+import asyncio
+import json
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from IdeaBank.models import (
+    GenerationBatchJob,
+    GenerationBatchStatus,
+    GenerationRun,
+    GenerationRunStatus,
+    GenerationWorkItem,
+    GenerationWorkItemStatus,
+    ImageGenerationJob,
+    ImageGenerationJobStatus,
+    Post,
+    PostIdea,
+    WeekPlanEntry,
+)
+from IdeaBank.services.batch_generation_service import STALE_COLLECT_MINUTES, BatchGenerationService
+from IdeaBank.services.daily_ideas_service import DailyIdeasService
+from IdeaBank.services.generation_ledger_service import STALE_LOCK_MINUTES, GenerationLedgerService
+from IdeaBank.services.image_generation_job_service import (
+    STALE_LOCK_MINUTES as IMAGE_JOB_STALE_LOCK_MINUTES,
+    ImageGenerationJobService,
+)
+from IdeaBank.services.post_bulk_writer import PostBulkWriter
+from IdeaBank.services.weekly_feed_creation import WeeklyFeedCreationService
+from IdeaBank.utils.cron_progress import ndjson_progress_response
+from IdeaBank.utils.current_week import get_current_week, get_current_week_day
+from services.ai_batch_backend import BATCH_PENDING, FakeBatchBackend
+from services.ai_service import AiService
+from services.eligible_user_cursor import EligibleUserCursor
+from services.resource_limiter import DB
+
+
+def plan_week_day(user, post):
+    """Registra o post como o feed de hoje no plano da semana."""
+    iso_year, iso_week, weekday = get_current_week_day()
+    return WeekPlanEntry.objects.create(
+        user=user, iso_year=iso_year, iso_week=iso_week, weekday=weekday, post=post)
+
+
+def parse_sse(content: bytes) -> list[tuple[str, dict]]:
+    """Converte o corpo SSE em uma lista de (evento, dados)."""
+    events = []
+    for block in content.decode('utf-8').strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+class GeneratePostIdeaStreamTestCase(APITestCase):
+    """Testes para generate_post_idea_stream."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='streamer', password='pass')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('ideabank:generate-post-idea-stream')
+        self.payload = {'objective': 'sales', 'type': 'reels', 'name': 'Post'}
+
+    @patch('IdeaBank.views.AIPromptService')
+    @patch('IdeaBank.views.AiService')
+    def test_envia_chunks_e_post(self, mock_ai_service, mock_prompt_service):
+        """Teste: chunks de texto são enviados antes do evento com o post salvo"""
+        mock_ai_service.return_value.generate_text_stream.return_value = iter(
+            ['{"roteiro": ', '"Roteiro do reel"}'])
+
+        response = self.client.post(self.url, self.payload, format='json')
+        events = parse_sse(b''.join(response.streaming_content))
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual([name for name, _ in events], ['chunk', 'chunk', 'post', 'done'])
+        self.assertEqual(events[2][1]['content'], 'Roteiro do reel')
+        self.assertTrue(PostIdea.objects.filter(id=events[2][1]['idea_id']).exists())
+
+    @patch('IdeaBank.views.AIPromptService')
+    @patch('IdeaBank.views.AiService')
+    def test_erro_vira_evento(self, mock_ai_service, mock_prompt_service):
+        """Teste: falhas de geração são enviadas como evento de erro"""
+        mock_ai_service.return_value.generate_text_stream.side_effect = Exception('sem créditos')
+
+        response = self.client.post(self.url, self.payload, format='json')
+        events = parse_sse(b''.join(response.streaming_content))
+
+        self.assertEqual([name for name, _ in events], ['error', 'done'])
+        self.assertFalse(Post.objects.filter(user=self.user).exists())
+
+
+def create_post_idea(user):
+    """Cria um Post com uma PostIdea para os testes."""
+    post = Post.objects.create(user=user, name='Post', objective='sales', type='feed')
+    return PostIdea.objects.create(post=post, content='Conteúdo do post')
+
+
+class ImageGenerationJobServiceTestCase(TestCase):
+    """Testes para a fila de geração de imagens."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='jobs', password='pass')
+        self.post_idea = create_post_idea(self.user)
+        self.service = ImageGenerationJobService(
+            ai_service=MagicMock(), prompt_service=MagicMock(), s3_service=MagicMock())
+
+    def test_enqueue_e_idempotente(self):
+        """Teste: enfileirar a mesma ideia duas vezes retorna o mesmo job"""
+        first = ImageGenerationJobService.enqueue(self.post_idea, self.user)
+        second = ImageGenerationJobService.enqueue(self.post_idea, self.user)
+
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(ImageGenerationJob.objects.count(), 1)
+
+    @patch.object(ImageGenerationJobService, 'generate_image_url',
+                  return_value=('https://s3/img.png', '{}'))
+    def test_processa_job_e_atualiza_ideia(self, mock_generate):
+        """Teste: job concluído grava a URL na PostIdea"""
+        job = ImageGenerationJobService.enqueue(self.post_idea, self.user)
+
+        result = self.service.process_pending_jobs(limit=5)
+
+        job.refresh_from_db()
+        self.post_idea.refresh_from_db()
+        self.assertEqual(result['completed'], 1)
+        self.assertEqual(job.status, ImageGenerationJobStatus.COMPLETED)
+        self.assertEqual(self.post_idea.image_url, 'https://s3/img.png')
+
+    @patch.object(ImageGenerationJobService, 'generate_image_url', side_effect=Exception('503'))
+    def test_falha_agenda_retry_e_depois_falha(self, mock_generate):
+        """Teste: falhas voltam para a fila com backoff até max_attempts"""
+        job = ImageGenerationJobService.enqueue(self.post_idea, self.user)
+
+        self.service.process_pending_jobs(limit=5)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageGenerationJobStatus.PENDING)
+        self.assertGreater(job.run_after, timezone.now())
+
+        # Job em backoff não é reprocessado antes do tempo
+        self.assertEqual(self.service.process_pending_jobs(limit=5)['processed'], 0)
+
+        ImageGenerationJob.objects.filter(id=job.id).update(attempts=job.max_attempts - 1,
+                                                            run_after=timezone.now())
+        self.service.process_pending_jobs(limit=5)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageGenerationJobStatus.FAILED)
+        self.assertEqual(job.error_message, '503')
+
+    def test_job_travado_conta_tentativa_e_falha_no_limite(self):
+        """Teste: job cujo worker morreu é retomado contando a tentativa e falha ao atingir o limite"""
+        job = ImageGenerationJobService.enqueue(self.post_idea, self.user)
+        stale_lock = timezone.now() - timedelta(minutes=IMAGE_JOB_STALE_LOCK_MINUTES + 1)
+        ImageGenerationJob.objects.filter(id=job.id).update(
+            status=ImageGenerationJobStatus.RUNNING, locked_at=stale_lock, attempts=1)
+
+        claimed = ImageGenerationJobService.claim_jobs(limit=5)
+        self.assertEqual([claimed_job.attempts for claimed_job in claimed], [2])
+        ImageGenerationJob.objects.filter(id=job.id).update(locked_at=stale_lock, attempts=job.max_attempts)
+
+        self.assertEqual(ImageGenerationJobService.claim_jobs(limit=5), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImageGenerationJobStatus.FAILED)
+
+
+class ImageJobEndpointsTestCase(APITestCase):
+    """Testes para o enfileiramento no generate_post_idea e o status do job."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass')
+        self.client.force_authenticate(user=self.user)
+
+    @patch('IdeaBank.views.AIPromptService')
+    @patch('IdeaBank.views.AiService')
+    def test_generate_post_idea_enfileira_imagem(self, mock_ai_service, mock_prompt_service):
+        """Teste: com include_image, a resposta volta com o job pendente"""
+        mock_ai_service.return_value.generate_text.return_value = '{"legenda": "Texto", "hashtags": [], "cta": ""}'
+
+        response = self.client.post(
+            reverse('ideabank:generate-post-idea'),
+            {'objective': 'sales', 'type': 'feed', 'include_image': True},
+            format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['image_job']['status'], ImageGenerationJobStatus.PENDING)
+        mock_ai_service.return_value.generate_image.assert_not_called()
+
+    def test_status_do_job_restrito_ao_dono(self):
+        """Teste: o status do job só é visível para o dono"""
+        job = ImageGenerationJobService.enqueue(create_post_idea(self.user), self.user)
+        url = reverse('ideabank:image-job-status', args=[job.id])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], ImageGenerationJobStatus.PENDING)
+
+        self.client.force_authenticate(user=User.objects.create_user(username='other', password='pass'))
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+@patch.object(AiService, '_deduct_credits', return_value=True)
+@patch.object(AiService, '_validate_credits', return_value=True)
+class BatchGenerationServiceTestCase(TestCase):
+    """Testes para o caminho offline (batch) das gerações noturnas."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='batch', password='pass')
+
+    def build_service(self, responder):
+        with patch('services.ai_service.genai.Client'):
+            ai_service = AiService()
+            weekly_service = WeeklyFeedCreationService()
+            daily_service = DailyIdeasService(ai_service=ai_service, s3_service=MagicMock())
+        ai_service.batch_backend = FakeBatchBackend(responder)
+
+        for feed_service in (weekly_service, daily_service):
+            feed_service.user_cursor.claim_page = AsyncMock(return_value=[{'id': self.user.id}])
+            feed_service.user_cursor.complete_page = AsyncMock()
+        weekly_service._build_feed_prompt = MagicMock(return_value=['feed prompt'])
+        for feed_service in (weekly_service, daily_service):
+            feed_service._store_user_error = AsyncMock()
+            feed_service._clear_user_error = AsyncMock()
+        daily_service._build_campaign_prompt = MagicMock(return_value=['campaign prompt'])
+
+        validation = MagicMock()
+        validation.get_user_data = AsyncMock(return_value=(self.user, MagicMock()))
+        validation.validate_user_eligibility = AsyncMock(return_value={'status': 'eligible'})
+        validation.get_generation_bundle = AsyncMock(return_value=MagicMock())
+        validation.prefetch_eligibility = AsyncMock()
+
+        return BatchGenerationService(
+            ai_service=ai_service,
+            weekly_feed_service=weekly_service,
+            daily_ideas_service=daily_service,
+            user_validation_service=validation,
+        )
+
+    def test_batch_semanal_cria_posts_do_feed(self, mock_validate, mock_deduct):
+        """Teste: resultados do batch semanal viram Post/PostIdea do feed"""
+        service = self.build_service(lambda request: json.dumps([
+            {'id': 1, 'titulo': 'Post 1', 'legenda': 'Legenda', 'hashtags': ['#a'], 'cta': 'CTA'},
+            {'id': 2, 'titulo': 'Post 2', 'legenda': 'Legenda', 'hashtags': [], 'cta': 'CTA'},
+        ]))
+
+        submitted = async_to_sync(service.submit)(kind='weekly_feed', batch_number=1, batch_size=10)
+        collected = async_to_sync(service.collect)()
+
+        self.assertEqual(submitted['submitted'], 1)
+        self.assertEqual(collected['processed'], 1)
+        self.assertEqual(Post.objects.filter(user=self.user, type='feed').count(), 2)
+        self.assertEqual(GenerationBatchJob.objects.get().status, GenerationBatchStatus.PROCESSED)
+        self.assertEqual(sorted(WeekPlanEntry.objects.filter(user=self.user).values_list('weekday', flat=True)), [1, 2])
+        mock_deduct.assert_called_once()
+
+    def test_batch_diario_cria_stories_reels_e_enfileira_imagem(self, mock_validate, mock_deduct):
+        """Teste: batch diário salva stories/reels e enfileira a imagem do feed"""
+        feed_post = Post.objects.create(
+            user=self.user, name='Feed', objective='sales', type='feed', further_details=get_current_week())
+        feed_idea = PostIdea.objects.create(post=feed_post, content='Conteúdo do feed')
+        plan_week_day(self.user, feed_post)
+        service = self.build_service(lambda request: json.dumps({
+            'post_text_stories': {'titulo': 'Story', 'roteiro': 'Roteiro story'},
+            'post_text_reels': {'titulo': 'Reels', 'roteiro': 'Roteiro reels'},
+        }))
+
+        async_to_sync(service.submit)(kind='daily_campaign', batch_number=1, batch_size=10)
+        async_to_sync(service.collect)()
+
+        self.assertTrue(Post.objects.filter(user=self.user, type='story').exists())
+        self.assertTrue(Post.objects.filter(user=self.user, type='reels').exists())
+        self.assertTrue(ImageGenerationJob.objects.filter(post_idea=feed_idea).exists())
+
+    def test_resultado_com_erro_marca_usuario_para_retry(self, mock_validate, mock_deduct):
+        """Teste: falha de um request grava o erro do usuário e não cobra créditos"""
+        def responder(request):
+            raise Exception('safety block')
+
+        service = self.build_service(responder)
+
+        async_to_sync(service.submit)(kind='weekly_feed', batch_number=1, batch_size=10)
+        collected = async_to_sync(service.collect)()
+
+        self.assertEqual(collected['jobs'][0]['failed'], 1)
+        service.weekly_feed_service._store_user_error.assert_awaited_once_with(self.user, 'safety block')
+        mock_deduct.assert_not_called()
+
+    def test_job_em_coleta_nao_e_coletado_de_novo(self, mock_validate, mock_deduct):
+        """Teste: job já reservado por outra coleta é ignorado; job ainda pendente volta para enviado"""
+        service = self.build_service(lambda request: '[]')
+        async_to_sync(service.submit)(kind='weekly_feed', batch_number=1, batch_size=10)
+        job = GenerationBatchJob.objects.get()
+        GenerationBatchJob.objects.filter(pk=job.pk).update(
+            status=GenerationBatchStatus.COLLECTING, collecting_started_at=timezone.now())
+
+        self.assertEqual(async_to_sync(service.collect)()['jobs'], [])
+
+        GenerationBatchJob.objects.filter(pk=job.pk).update(status=GenerationBatchStatus.SUBMITTED)
+        service.ai_service.batch_backend.jobs[job.job_name]['state'] = BATCH_PENDING
+        collected = async_to_sync(service.collect)()
+
+        self.assertEqual(collected['pending'], 1)
+        self.assertEqual(GenerationBatchJob.objects.get().status, GenerationBatchStatus.SUBMITTED)
+
+    def test_coleta_interrompida_retoma_sem_duplicar_posts(self, mock_validate, mock_deduct):
+        """Teste: coleta que morreu após salvar os posts só conclui o usuário, sem salvar de novo"""
+        service = self.build_service(lambda request: json.dumps([
+            {'id': 1, 'titulo': 'Post 1', 'legenda': 'Legenda', 'hashtags': [], 'cta': 'CTA'},
+        ]))
+        async_to_sync(service.submit)(kind='weekly_feed', batch_number=1, batch_size=10)
+        GenerationBatchJob.objects.update(
+            status=GenerationBatchStatus.COLLECTING,
+            collecting_started_at=timezone.now() - timedelta(minutes=STALE_COLLECT_MINUTES + 1),
+            progress={'0': 'saved'},
+        )
+
+        collected = async_to_sync(service.collect)()
+
+        self.assertEqual(collected['jobs'][0]['succeeded'], 1)
+        self.assertFalse(Post.objects.filter(user=self.user).exists())
+        self.assertEqual(GenerationBatchJob.objects.get().progress, {'0': 'finished'})
+        mock_deduct.assert_called_once()
+
+
+class GenerationLedgerServiceTestCase(TestCase):
+    """Testes para o ledger de execuções dos crons de geração."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'ledger{i}', password='pass') for i in range(3)]
+        cursor = EligibleUserCursor('test_ledger', lambda: User.objects.filter(username__startswith='ledger'))
+        self.ledger = GenerationLedgerService('test_ledger', cursor)
+        self.processed = []
+
+    async def process_user(self, user_data):
+        self.processed.append(user_data['id'])
+        if user_data['id'] == self.users[1].id:
+            return {'status': 'failed', 'error': 'Gemini indisponível', 'user_id': user_data['id']}
+        return {'status': 'success', 'user_id': user_data['id'], 'created_posts': [{'post_id': 1}]}
+
+    def test_invocacoes_compartilham_a_execucao(self):
+        """Teste: cada invocação processa a próxima página e registra o resultado por usuário"""
+        async_to_sync(self.ledger.process)(2, self.process_user)
+        async_to_sync(self.ledger.process)(2, self.process_user)
+        async_to_sync(self.ledger.process)(2, self.process_user)
+
+        run = self.ledger.get_run()
+        statuses = dict(run.work_items.values_list('user_id', 'status'))
+        self.assertEqual(self.processed, [user.id for user in self.users])
+        self.assertEqual(statuses[self.users[0].id], GenerationWorkItemStatus.SUCCEEDED)
+        self.assertEqual(statuses[self.users[1].id], GenerationWorkItemStatus.FAILED)
+        self.assertEqual(run.work_items.get(user=self.users[1]).error_message, 'Gemini indisponível')
+        self.assertEqual(run.status, GenerationRunStatus.COMPLETED)
+
+    def test_retoma_apenas_itens_inacabados(self):
+        """Teste: item travado por invocação que morreu é retomado; concluídos não são refeitos"""
+        run = self.ledger.get_run()
+        GenerationLedgerService.enqueue(run, [{'id': user.id} for user in self.users])
+        GenerationWorkItem.objects.filter(user=self.users[0]).update(
+            status=GenerationWorkItemStatus.SUCCEEDED)
+        GenerationWorkItem.objects.filter(user=self.users[2]).update(
+            status=GenerationWorkItemStatus.RUNNING,
+            locked_at=timezone.now() - timedelta(minutes=STALE_LOCK_MINUTES + 1))
+
+        async_to_sync(self.ledger.process)(0, self.process_user)
+
+        self.assertEqual(sorted(self.processed), [self.users[1].id, self.users[2].id])
+        self.assertEqual(run.work_items.get(user=self.users[2]).attempts, 1)
+
+    def test_fecha_clientes_genai_mesmo_com_erro(self):
+        """Teste: a invocação fecha os clientes genai do loop mesmo quando falha no meio"""
+        self.ledger.prepare_items = AsyncMock(side_effect=RuntimeError('prepare'))
+        with patch('IdeaBank.services.generation_ledger_service.close_loop_genai_clients',
+                   new_callable=AsyncMock) as mock_close:
+            with self.assertRaises(RuntimeError):
+                async_to_sync(self.ledger.process)(2, self.process_user)
+
+        mock_close.assert_awaited_once()
+
+    def test_enqueue_idempotente(self):
+        """Teste: enfileirar o mesmo usuário duas vezes não duplica o work item"""
+        run = self.ledger.get_run()
+        GenerationLedgerService.enqueue(run, [{'id': self.users[0].id}])
+        GenerationLedgerService.enqueue(run, [{'id': self.users[0].id}])
+
+        self.assertEqual(run.work_items.count(), 1)
+
+    def test_contadores_persistidos_e_progresso(self):
+        """Teste: contadores da execução somam entre invocações e on_result recebe cada usuário"""
+        reported = []
+
+        async def on_result(result):
+            reported.append(result['user_id'])
+
+        async_to_sync(self.ledger.process)(2, self.process_user, on_result)
+        async_to_sync(self.ledger.process)(2, self.process_user, on_result)
+
+        run = self.ledger.get_run()
+        self.assertEqual(sorted(reported), sorted(user.id for user in self.users))
+        self.assertEqual((run.succeeded_count, run.failed_count, run.skipped_count), (2, 1, 0))
+        self.assertEqual(run.created_posts_count, 2)
+        self.assertEqual(self.ledger.run_progress()['unfinished'], 0)
+
+    def test_list_items_paginado(self):
+        """Teste: detalhes da execução são paginados e filtráveis por status"""
+        async_to_sync(self.ledger.process)(0, self.process_user)
+        run_key = self.ledger.get_run().run_key
+
+        first_page = GenerationLedgerService.list_items(run_key, page=1, page_size=2)
+        failed = GenerationLedgerService.list_items(run_key, status=GenerationWorkItemStatus.FAILED)
+
+        self.assertEqual((first_page['total'], len(first_page['items']), first_page['has_next']), (3, 2, True))
+        self.assertEqual([item['user_id'] for item in failed['items']], [self.users[1].id])
+        self.assertEqual(failed['items'][0]['error_message'], 'Gemini indisponível')
+        with self.assertRaises(GenerationRun.DoesNotExist):
+            GenerationLedgerService.list_items('inexistente')
+
+
+class CronProgressTestCase(APITestCase):
+    """Testes para o resumo compacto, o streaming NDJSON e o endpoint de detalhes dos crons."""
+
+    def test_stream_ndjson_por_usuario_e_resumo(self):
+        """Teste: cada usuário concluído vira uma linha e a última linha é o resumo"""
+        async def run(on_result):
+            await on_result({'user_id': 1, 'status': 'success', 'created_posts': [{'post_id': 1}, {'post_id': 2}]})
+            await on_result({'user_id': 2, 'status': 'failed', 'error': 'timeout'})
+            return {'status': 'completed', 'processed': 1}
+
+        with patch('IdeaBank.utils.cron_progress.AuditService') as audit:
+            response = ndjson_progress_response(run, 'daily_content_generation', 'DailyContentGeneration')
+            lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(lines[0], {'event': 'result', 'user_id': 1, 'status': 'success', 'created_posts': 2})
+        self.assertEqual(lines[1]['error'], 'timeout')
+        self.assertEqual(lines[2], {'event': 'summary', 'result': {'status': 'completed', 'processed': 1}})
+        self.assertEqual(audit.log_system_operation.call_count, 2)
+
+    def test_endpoint_detalhes_da_execucao(self):
+        """Teste: admin pagina os itens da execução; execução inexistente retorna 404 e paginação inválida 400"""
+        admin = User.objects.create_superuser(username='admin', password='pass', email='admin@test.com')
+        user = User.objects.create_user(username='item', password='pass')
+        run = GenerationRun.objects.create(run_key='daily:2026-01-01', kind='daily')
+        GenerationWorkItem.objects.create(run=run, user=user, status=GenerationWorkItemStatus.SUCCEEDED)
+        self.client.force_authenticate(admin)
+
+        response = self.client.get(reverse('ideabank:admin-generation-run-items', args=[run.run_key]))
+        missing = self.client.get(reverse('ideabank:admin-generation-run-items', args=['daily:1999-01-01']))
+        invalid_page = self.client.get(
+            reverse('ideabank:admin-generation-run-items', args=[run.run_key]), {'page': 'abc'})
+        invalid_page_size = self.client.get(
+            reverse('ideabank:admin-generation-run-items', args=[run.run_key]), {'page_size': '1.5'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['items'][0]['user_id'], user.id)
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(invalid_page.status_code, 400)
+        self.assertEqual(invalid_page_size.status_code, 400)
+
+
+class DailyIdeasPipelineTestCase(TestCase):
+    """Testes para o fluxo diário por usuário (estágios em paralelo)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='pipeline', password='pass')
+        feed_post = Post.objects.create(
+            user=self.user, name='Feed', objective='sales', type='feed', further_details=get_current_week())
+        PostIdea.objects.create(post=feed_post, content='Conteúdo do feed')
+        plan_week_day(self.user, feed_post)
+
+        validation = MagicMock()
+        validation.get_user_data = AsyncMock(return_value=(self.user, MagicMock()))
+        validation.validate_user_eligibility = AsyncMock(return_value={'status': 'eligible'})
+        validation.get_generation_bundle = AsyncMock(return_value=MagicMock())
+        validation.prefetch_eligibility = AsyncMock()
+
+        with patch('services.ai_service.genai.Client'):
+            self.service = DailyIdeasService(
+                user_validation_service=validation,
+                audit_service=MagicMock(),
+                s3_service=MagicMock(),
+            )
+        self.service._store_user_error = AsyncMock()
+        self.service._clear_user_error = AsyncMock()
+        self.events = []
+
+    async def generate_content(self, user, post_text_feed, bundle=None):
+        self.events.append('texto:inicio')
+        await asyncio.sleep(0.01)
+        self.events.append('texto:fim')
+        return json.dumps({
+            'post_text_stories': {'titulo': 'Story', 'roteiro': 'Roteiro story'},
+            'post_text_reels': {'titulo': 'Reels', 'roteiro': 'Roteiro reels'},
+        })
+
+    async def generate_image(self, user, post_idea, post_content, bundle=None):
+        self.events.append('imagem:inicio')
+        await asyncio.sleep(0.01)
+        self.events.append('imagem:fim')
+        return 'https://bucket/feed.png'
+
+    def test_texto_e_imagem_em_paralelo(self):
+        """Teste: a imagem do feed começa antes do texto de stories/reels terminar"""
+        self.service._generate_content_for_user = self.generate_content
+        self.service._generate_image_for_feed_post = self.generate_image
+
+        result = async_to_sync(self.service._process_user_daily_ideas)(self.user.id)
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(self.events[:2], ['texto:inicio', 'imagem:inicio'])
+        self.assertTrue(Post.objects.filter(user=self.user, type='story').exists())
+        self.assertTrue(Post.objects.filter(user=self.user, type='reels').exists())
+
+    def test_falha_da_imagem_nao_salva_campanha(self):
+        """Teste: se a imagem falha, o texto é cancelado, stories/reels não são salvos e o erro é registrado"""
+        async def failing_image(user, post_idea, post_content, bundle=None):
+            raise Exception('Failed to generate image for user')
+
+        self.service._generate_content_for_user = self.generate_content
+        self.service._generate_image_for_feed_post = failing_image
+
+        result = async_to_sync(self.service._process_user_daily_ideas)(self.user.id)
+
+        self.assertEqual(result['status'], 'failed')
+        self.assertEqual(result['error'], 'Failed to generate image for user')
+        # O ramo de texto é cancelado assim que a imagem falha
+        self.assertNotIn('texto:fim', self.events)
+        self.assertFalse(Post.objects.filter(user=self.user, type__in=['story', 'reels']).exists())
+        self.service._store_user_error.assert_awaited_once()
+
+    def test_sem_plano_da_semana_nao_gera_semana_inline(self):
+        """Teste: sem entrada no plano da semana o usuário falha e fica para o backfill/retry"""
+        WeekPlanEntry.objects.all().delete()
+        self.service._generate_content_for_user = self.generate_content
+        self.service._generate_image_for_feed_post = self.generate_image
+
+        result = async_to_sync(self.service._process_user_daily_ideas)(self.user.id)
+
+        self.assertEqual(result['status'], 'failed')
+        self.assertIn('week plan', result['error'])
+        self.assertEqual(self.events, [])
+        self.service._store_user_error.assert_awaited_once()
+
+
+class PostBulkWriterTestCase(TestCase):
+    """Testes para a gravação em lote dos posts gerados."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'bulk{i}', password='pass') for i in range(2)]
+        self.writer = PostBulkWriter()
+        for user in self.users:
+            for i in range(3):
+                self.writer.add(user, name=f'Post {i}', post_type='feed', further_details=f'{i}_week_1',
+                                content=f'Conteúdo {i}', include_image=True)
+
+    def assert_saved(self, saved):
+        self.assertEqual(len(saved), 6)
+        for summary in saved:
+            idea = PostIdea.objects.get(id=summary['post_idea_id'])
+            self.assertEqual(idea.post_id, summary['post_id'])
+            self.assertEqual(idea.post.name, summary['title'])
+            self.assertEqual(idea.content, f"Conteúdo {summary['title'][-1]}")
+        self.assertEqual(Post.objects.filter(is_automatically_generated=True, include_image=True).count(), 6)
+
+    def test_grava_varios_usuarios_com_poucas_queries(self):
+        """Teste: posts de vários usuários gravados com um INSERT por tabela"""
+        # SAVEPOINT + INSERT Post + INSERT PostIdea + RELEASE
+        with self.assertNumQueries(4):
+            saved = self.writer.flush()
+
+        self.assert_saved(saved)
+        self.assertEqual(len(self.writer), 0)
+
+    def test_banco_sem_retorno_de_ids(self):
+        """Teste: sem RETURNING (MySQL) os ids são recuperados pela chave natural"""
+        with patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False):
+            saved = self.writer.flush()
+
+        self.assert_saved(saved)
+
+    def test_plano_da_semana_aponta_para_o_post_mais_recente(self):
+        """Teste: regerar um dia da semana substitui o post do plano em vez de duplicar"""
+        user = self.users[0]
+        day = (2026, 10, 3)
+        for name in ('Primeiro', 'Segundo'):
+            writer = PostBulkWriter()
+            writer.add(user, name=name, post_type='feed', further_details='3_week_10',
+                       content='Conteúdo', week_plan_day=day)
+            writer.flush()
+
+        self.assertEqual(WeekPlanEntry.objects.filter(user=user).count(), 1)
+        self.assertEqual(WeekPlanEntry.get_feed_post(user, day).name, 'Segundo')
+        self.assertIsNone(WeekPlanEntry.get_feed_post(user, (2026, 10, 4)))
+
+    def test_flush_vazio(self):
+        """Teste: flush sem posts não toca o banco"""
+        with self.assertNumQueries(0):
+            self.assertEqual(PostBulkWriter().flush(), [])
+
+    def test_aflush_espera_o_bucket_do_banco(self):
+        """Teste: o flush async consome um token do bucket do banco por post"""
+        with patch('IdeaBank.services.post_bulk_writer.resource_limiter.acquire',
+                   new_callable=AsyncMock) as mock_acquire:
+            saved = async_to_sync(self.writer.aflush)()
 
-# Create your tests here.
+        self.assert_saved(saved)
+        mock_acquire.assert_awaited_once_with(DB, 6)
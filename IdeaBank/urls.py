@@ -22,16 +22,22 @@ urlpatterns = [
          name='post-idea-detail'),
     path('admin/fetch-all-daily/', views.admin_fetch_all_daily_posts,
          name='admin-fetch-all-daily-posts'),
+    path('admin/generation-runs/<str:run_key>/items/', views.admin_generation_run_items,
+         name='admin-generation-run-items'),
 
     # AI-powered generation endpoints
     path('generate/post-idea/', views.generate_post_idea,
          name='generate-post-idea'),
+    path('generate/post-idea/stream/', views.generate_post_idea_stream,
+         name='generate-post-idea-stream'),
     path('ideas/<int:idea_id>/generate-image/',
          views.generate_image_for_idea, name='generate-image-for-idea'),
     path('ideas/<int:idea_id>/edit/',
          views.edit_post_idea, name='edit-post-idea'),
     path('ideas/<int:idea_id>/regenerate-image/',
          views.generate_image_for_idea, name='regenerate-image-for-idea'),
+    path('image-jobs/<int:job_id>/', views.get_image_job_status,
+         name='image-job-status'),
 
     # Helper endpoints
     path('options/', views.get_post_options, name='post-options'),
@@ -50,6 +56,14 @@ urlpatterns = [
     path('admin/manual-retry-failed/', views.manual_trigger_retry_failed,
          name='manual_retry_failed'),
 
+    path('cron/batch-generation/submit/', views.vercel_cron_submit_generation_batch,
+         name='vercel_cron_submit_generation_batch'),
+    path('cron/batch-generation/collect/', views.vercel_cron_collect_generation_batches,
+         name='vercel_cron_collect_generation_batches'),
+
+    path('cron/process-image-jobs/', views.vercel_cron_process_image_jobs,
+         name='vercel_cron_process_image_jobs'),
+
     path('cron/mail-automatic-posts/',
          views.mail_all_generated_content, name='mail_automatic_posts'),
     path('cron/mail-daily-errors/',
@@ -59,6 +73,8 @@ urlpatterns = [
          name='vercel_cron_weekly_feed_generation'),
     path('admin/manual-weekly-feed-generation/', views.manual_trigger_weekly_feed_generation,
          name='manual_trigger_weekly_feed_generation'),
+    path('cron/week-plan-backfill/', views.vercel_cron_week_plan_backfill,
+         name='vercel_cron_week_plan_backfill'),
 
     path('cron/weekly-feed-retry-failed-users/', views.vercel_cron_retry_weekly_feed_failed_users,
          name='vercel_cron_retry_weekly_feed_failed_users'),
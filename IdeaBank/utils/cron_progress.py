@@ -0,0 +1,102 @@
+"""
+Progress reporting helpers for the generation cron endpoints.
+
+By default the crons answer with a compact summary (counters only);
+`?details=1` adds the per-user results and `?stream=ndjson` streams one JSON
+line per finished user followed by the summary, so a client (or a Vercel
+timeout) still sees everything that finished before the connection dropped.
+"""
+import asyncio
+import json
+import queue
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+from django.db import connections
+from django.http import HttpRequest, StreamingHttpResponse
+
+from AuditSystem.services import AuditService
+
+_DONE = object()
+
+
+def wants_details(request: HttpRequest) -> bool:
+    return request.GET.get('details') in ('1', 'true')
+
+
+def wants_ndjson(request: HttpRequest) -> bool:
+    return request.GET.get('stream') == 'ndjson'
+
+
+def compact_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-user progress line: status, counts and the error, without payloads."""
+    line = {
+        'user_id': result.get('user_id'),
+        'status': result.get('status'),
+        'created_posts': len(result.get('created_posts', [])),
+    }
+    if result.get('error') or result.get('reason'):
+        line['error'] = str(result.get('error') or result.get('reason'))
+    return line
+
+
+def ndjson_progress_response(
+        run: Callable[[Callable[[Dict[str, Any]], Awaitable[None]]], Awaitable[Dict[str, Any]]],
+        audit_action: str,
+        resource_type: str,
+) -> StreamingHttpResponse:
+    """
+    Stream a cron run as NDJSON.
+
+    `run` receives the on_result callback and returns the run coroutine. It
+    runs on its own event loop in a worker thread; the response yields a
+    `{"event": "result", ...}` line per finished user and ends with a
+    `summary` (or `error`) line. Audit logs mirror the non-streaming views.
+    """
+    events: queue.Queue = queue.Queue()
+
+    async def on_result(result: Dict[str, Any]) -> None:
+        events.put({'event': 'result', **compact_result(result)})
+
+    def worker():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            AuditService.log_system_operation(
+                user=None,
+                action=f'{audit_action}_started',
+                status='info',
+                resource_type=resource_type,
+            )
+            summary = loop.run_until_complete(run(on_result))
+            AuditService.log_system_operation(
+                user=None,
+                action=f'{audit_action}_completed',
+                status='success',
+                resource_type=resource_type,
+            )
+            events.put({'event': 'summary', 'result': summary})
+        except Exception as e:
+            AuditService.log_system_operation(
+                user=None,
+                action=f'{audit_action}_failed',
+                status='error',
+                resource_type=resource_type,
+                details=str(e)
+            )
+            events.put({'event': 'error', 'error': str(e)})
+        finally:
+            loop.close()
+            connections.close_all()
+            events.put(_DONE)
+
+    def stream():
+        while (event := events.get()) is not _DONE:
+            yield json.dumps(event, ensure_ascii=False, default=str) + '\n'
+
+    threading.Thread(target=worker, daemon=True).start()
+
+    response = StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -7,3 +7,9 @@ def get_current_week() -> str:
     today_number = date.today().weekday() + 1
     week_id = str(today_number) + '_week_' + str(current_week)
     return week_id
+
+
+def get_current_week_day() -> tuple[int, int, int]:
+    """(iso_year, iso_week, weekday) of today, the key of the week plan."""
+    today = date.today().isocalendar()
+    return today.year, today.week, today.weekday
@@ -7,7 +7,7 @@ import json
 import logging
 
 from django.db.models import Q
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
@@ -28,12 +28,23 @@ from AuditSystem.services import AuditService
 from ClientContext.models import ClientContext
 from ClientContext.serializers import ClientContextSerializer
 from CreatorProfile.models import CreatorProfile
+from services.ai_json_parser import parse_ai_json
 from services.ai_prompt_service import AIPromptService
+from services.ai_response_schemas import SemanticAnalysisPayload, post_payload_for_type
+from services.adaptive_batch_sizer import AdaptiveBatchSizer
 from services.ai_service import AiService
 from services.daily_post_amount_service import DailyPostAmountService
 from services.s3_sevice import S3Service
 
-from .models import Post, PostIdea, PostObjective, PostType
+from .models import (
+    GenerationBatchKind,
+    GenerationRun,
+    ImageGenerationJob,
+    Post,
+    PostIdea,
+    PostObjective,
+    PostType,
+)
 from .serializers import (
     ImageGenerationRequestSerializer,
     PostCreateSerializer,
@@ -44,12 +55,16 @@ from .serializers import (
     PostSerializer,
     PostWithIdeasSerializer,
 )
+from .services.batch_generation_service import BatchGenerationService
 from .services.daily_ideas_service import DailyIdeasService
+from .services.generation_ledger_service import GenerationLedgerService
+from .services.image_generation_job_service import ImageGenerationJobService
 from .services.mail_daily_error import MailDailyErrorService
 from .services.mail_daily_ideas_service import MailDailyIdeasService
 from .services.retry_ideas_service import RetryIdeasService
 from .services.retry_weekly_feed import RetryWeeklyFeedService
 from .services.weekly_feed_creation import WeeklyFeedCreationService
+from .utils.cron_progress import ndjson_progress_response, wants_details, wants_ndjson
 
 logger = logging.getLogger(__name__)
 
@@ -228,15 +243,15 @@ def generate_post_idea(request):
 
         ai_service = AiService()
         prompt_service = AIPromptService()
-        s3_service = S3Service()
 
         prompt_service.set_user(request.user)
 
         prompt = prompt_service.build_standalone_post_prompt(post_data, context_data)
 
-        content_result = ai_service.generate_text(
+        content_loaded = ai_service.generate_json(
             prompt,
             user,
+            post_payload_for_type(post_data.get('type')),
             types.GenerateContentConfig(
                 temperature=0.7,
                 top_p=0.9,
@@ -246,57 +261,6 @@ def generate_post_idea(request):
             )
         )
 
-        content_json = content_result.replace(
-            'json', '', 1).strip('`').strip()
-        content_loaded = json.loads(content_json)
-
-        image_url = ''
-
-        # Generate image if requested
-        if include_image:
-            try:
-                user_logo = CreatorProfile.objects.filter(user=user).first().logo
-                if user_logo and "data:image/" in user_logo and ";base64," in user_logo:
-                    user_logo = user_logo.split(",")[1]
-
-                semantic_prompt = prompt_service.semantic_analysis_prompt(
-                    content_loaded)
-                semantic_result = ai_service.generate_text(
-                    semantic_prompt, user)
-                semantic_json = semantic_result.replace(
-                    'json', '', 1).strip('`').strip()
-                semantic_loaded = json.loads(semantic_json)
-
-                semantic_analysis = semantic_loaded.get(
-                    'analise_semantica', {})
-
-                image_prompt = prompt_service.image_generation_prompt(
-                    semantic_analysis)
-
-                image_result = ai_service.generate_image(
-                    image_prompt,
-                    user_logo,
-                    user,
-                    types.GenerateContentConfig(
-                        temperature=0.7,
-                        top_p=0.9,
-                        response_modalities=[
-                            "IMAGE",
-                        ],
-                        image_config=types.ImageConfig(
-                            aspect_ratio="4:5",
-                        ),
-                    ))
-
-                if not image_result:
-                    image_url = ''
-                else:
-                    image_url = s3_service.upload_image(
-                        user, image_result)
-
-            except Exception as image_error:
-                print(f"Warning: Failed to generate image: {image_error}")
-
         post = Post.objects.create(
             user=user,
             name=post_data.get('name'),
@@ -308,20 +272,20 @@ def generate_post_idea(request):
             is_active=False
         )
 
-        if post_data.get('type') == 'feed':
-            post_content = f"""
-                {content_loaded.get('legenda', '').strip()}\n\n\n{' '.join(content_loaded.get('hashtags', []))}\n\n\n{content_loaded.get('cta', '').strip()}
-             """
-        else:
-            post_content = content_loaded.get('roteiro', '').strip()
+        post_content = _build_post_idea_content(post_data.get('type'), content_loaded)
 
         post_idea = PostIdea.objects.create(
             post=post,
             content=post_content,
-            image_url=image_url if include_image else '',
+            image_url='',
             image_description=''
         )
 
+        # Image generation runs in the background job queue
+        image_job = None
+        if include_image:
+            image_job = ImageGenerationJobService.enqueue(post_idea, user)
+
         # Log successful post and content generation
         AuditService.log_content_generation(
             user=request.user,
@@ -338,6 +302,12 @@ def generate_post_idea(request):
 
         return Response({
             'message': 'Post e ideia gerados com sucesso!',
+            'post_id': post.id,
+            'idea_id': post_idea.id,
+            'image_job': {
+                'id': image_job.id,
+                'status': image_job.status,
+            } if image_job else None,
         }, status=status.HTTP_201_CREATED)
 
     except Exception as e:
@@ -359,6 +329,146 @@ def generate_post_idea(request):
         )
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def generate_post_idea_stream(request):
+    """
+    Streaming variant of generate_post_idea (Server-Sent Events).
+
+    Events:
+    - chunk: {"text": ...} for each text fragment as Gemini produces it
+    - post: {"post_id", "idea_id", "content"} once the text is saved
+    - image: {"image_url": ...} when include_image is set and the image is ready
+    - error: {"error": ...} if generation fails
+    - done: {} at the end of the stream
+    """
+    user = request.user
+    serializer = PostGenerationRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(
+            {'error': 'Dados inválidos', 'details': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    post_data = serializer.validated_data
+    include_image = post_data.get('include_image', False)
+
+    def event_stream():
+        try:
+            context = ClientContext.objects.filter(user=user).first()
+            context_data = ClientContextSerializer(context).data
+
+            ai_service = AiService()
+            prompt_service = AIPromptService()
+
+            prompt_service.set_user(user)
+            prompt = prompt_service.build_standalone_post_prompt(post_data, context_data)
+
+            schema = post_payload_for_type(post_data.get('type'))
+            content_result = ''
+            for text in ai_service.generate_text_stream(
+                    prompt,
+                    user,
+                    ai_service.json_config(
+                        schema,
+                        types.GenerateContentConfig(
+                            temperature=0.7,
+                            top_p=0.9,
+                            response_modalities=[
+                                "TEXT",
+                            ],
+                        )
+                    )
+            ):
+                content_result += text
+                yield _sse_event('chunk', {'text': text})
+
+            content_loaded = parse_ai_json(content_result, schema)
+
+            post = Post.objects.create(
+                user=user,
+                name=post_data.get('name'),
+                type=post_data.get('type'),
+                objective=post_data.get('objective'),
+                further_details=post_data.get('further_details', ''),
+                include_image=True if post_data.get('type') == 'feed' else False,
+                is_automatically_generated=True,
+                is_active=False
+            )
+            post_idea = PostIdea.objects.create(
+                post=post,
+                content=_build_post_idea_content(post_data.get('type'), content_loaded),
+                image_url='',
+                image_description=''
+            )
+            yield _sse_event('post', {
+                'post_id': post.id,
+                'idea_id': post_idea.id,
+                'content': post_idea.content,
+            })
+
+            if include_image:
+                try:
+                    image_url, image_description = ImageGenerationJobService(
+                        ai_service=ai_service, prompt_service=prompt_service
+                    ).generate_image_url(user, content_loaded)
+                    post_idea.image_url = image_url
+                    post_idea.image_description = image_description
+                    post_idea.save(update_fields=['image_url', 'image_description', 'updated_at'])
+                    yield _sse_event('image', {'image_url': image_url})
+                except Exception as image_error:
+                    print(f"Warning: Failed to generate image: {image_error}")
+                    yield _sse_event('image', {'image_url': '', 'error': str(image_error)})
+
+            AuditService.log_content_generation(
+                user=user,
+                action='content_generated',
+                status='success',
+                details={
+                    'post_id': post.id,
+                    'post_name': post.name,
+                    'content_type': 'text',
+                    'ai_provider': 'gemini',
+                    'include_image': include_image,
+                    'stream': True,
+                }
+            )
+        except Exception as e:
+            AuditService.log_content_generation(
+                user=user,
+                action='content_generation_failed',
+                status='error',
+                error_message=str(e),
+                details={
+                    'post_data': post_data,
+                    'include_image': include_image,
+                    'stream': True,
+                }
+            )
+            yield _sse_event('error', {'error': f'Erro na geração do post: {str(e)}'})
+
+        yield _sse_event('done', {})
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _build_post_idea_content(post_type: str, content_loaded: dict) -> str:
+    """Build the PostIdea content from the generated JSON."""
+    if post_type == 'feed':
+        return f"""
+                {content_loaded.get('legenda', '').strip()}\n\n\n{' '.join(content_loaded.get('hashtags', []))}\n\n\n{content_loaded.get('cta', '').strip()}
+             """
+    return content_loaded.get('roteiro', '').strip()
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def generate_image_for_idea(request, idea_id):
@@ -409,11 +519,8 @@ def generate_image_for_idea(request, idea_id):
 
             semantic_prompt = prompt_service.semantic_analysis_prompt(
                 post_idea.content)
-            semantic_result = ai_service.generate_text(
-                semantic_prompt, user)
-            semantic_json = semantic_result.replace(
-                'json', '', 1).strip('`').strip()
-            semantic_loaded = json.loads(semantic_json)
+            semantic_loaded = ai_service.generate_json(
+                semantic_prompt, user, SemanticAnalysisPayload, cache=True)
 
             semantic_analysis = semantic_loaded.get(
                 'analise_semantica', {})
@@ -479,6 +586,31 @@ def generate_image_for_idea(request, idea_id):
         )
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def get_image_job_status(request, job_id):
+    """Get the status of a queued image generation job."""
+    try:
+        job = ImageGenerationJob.objects.get(id=job_id, user=request.user)
+    except ImageGenerationJob.DoesNotExist:
+        return Response(
+            {'error': 'Job não encontrado'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return Response({
+        'id': job.id,
+        'post_idea_id': job.post_idea_id,
+        'status': job.status,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'image_url': job.image_url,
+        'error': job.error_message if job.status == 'failed' else '',
+        'created_at': job.created_at,
+        'completed_at': job.completed_at,
+    })
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def edit_post_idea(request, idea_id):
@@ -524,9 +656,10 @@ def edit_post_idea(request, idea_id):
         prompt_service.set_user(request.user)
         prompt = prompt_service.regenerate_standalone_post_prompt(post_data, user_prompt, context_data)
 
-        content_result = ai_service.generate_text(
+        content_loaded = ai_service.generate_json(
             prompt,
             request.user,
+            post_payload_for_type(post_data.get('type')),
             types.GenerateContentConfig(
                 temperature=0.7,
                 top_p=0.9,
@@ -536,10 +669,6 @@ def edit_post_idea(request, idea_id):
             )
         )
 
-        content_json = content_result.replace(
-            'json', '', 1).strip('`').strip()
-        content_loaded = json.loads(content_json)
-
         if post_data.get('type') == 'feed':
             post_content = f"""
                 {content_loaded.get('legenda', '').strip()}\n\n\n{' '.join(content_loaded.get('hashtags', []))}\n\n\n{content_loaded.get('cta', '').strip()}
@@ -681,10 +810,23 @@ def vercel_cron_daily_content_generation(request):
     try:
         # Get batch number from query params (default to 1)
         batch_number = int(request.GET.get('batch', 1))
-        batch_size = 2  # Process 2 users per batch, to avoid vercel timeouts
 
         # Run async processing
         service = DailyIdeasService()
+        # Sized from recent invocations; starts at 2 users until there is history
+        sizer = AdaptiveBatchSizer(
+            'daily_ideas', default_batch_size=2,
+            concurrency=service.semaphore_service.max_concurrent_users)
+        batch_size = sizer.choose_batch_size()
+
+        if wants_ndjson(request):
+            return ndjson_progress_response(
+                lambda on_result: sizer.measure(batch_size, service.process_daily_ideas_for_users(
+                    batch_number=batch_number, batch_size=batch_size,
+                    include_details=wants_details(request), on_result=on_result)),
+                audit_action='daily_content_generation',
+                resource_type='DailyContentGeneration',
+            )
 
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -698,8 +840,9 @@ def vercel_cron_daily_content_generation(request):
 
         try:
             result = loop.run_until_complete(
-                service.process_daily_ideas_for_users(
-                    batch_number=batch_number, batch_size=batch_size)
+                sizer.measure(batch_size, service.process_daily_ideas_for_users(
+                    batch_number=batch_number, batch_size=batch_size,
+                    include_details=wants_details(request)))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -740,6 +883,15 @@ def manual_trigger_daily_generation(request):
     try:
         service = DailyIdeasService()
 
+        if wants_ndjson(request):
+            return ndjson_progress_response(
+                lambda on_result: service.process_daily_ideas_for_users(
+                    batch_number=1, batch_size=0,
+                    include_details=wants_details(request), on_result=on_result),
+                audit_action='daily_content_generation',
+                resource_type='DailyContentGeneration',
+            )
+
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
@@ -753,7 +905,8 @@ def manual_trigger_daily_generation(request):
         try:
             result = loop.run_until_complete(
                 service.process_daily_ideas_for_users(
-                    batch_number=1, batch_size=0)
+                    batch_number=1, batch_size=0,
+                    include_details=wants_details(request))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -796,10 +949,23 @@ def vercel_cron_weekly_feed_generation(request):
     try:
         # Get batch number from query params (default to 1)
         batch_number = int(request.GET.get('batch', 1))
-        batch_size = 6  # Process 6 users per batch, to avoid vercel timeouts
 
         # Run async processing
         service = WeeklyFeedCreationService()
+        # Sized from recent invocations; starts at 6 users until there is history
+        sizer = AdaptiveBatchSizer(
+            'weekly_feed', default_batch_size=6,
+            concurrency=service.semaphore_service.max_concurrent_users)
+        batch_size = sizer.choose_batch_size()
+
+        if wants_ndjson(request):
+            return ndjson_progress_response(
+                lambda on_result: sizer.measure(batch_size, service.process_weekly_ideas_for_users(
+                    batch_number=batch_number, batch_size=batch_size,
+                    include_details=wants_details(request), on_result=on_result)),
+                audit_action='daily_content_generation',
+                resource_type='DailyContentGeneration',
+            )
 
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -813,8 +979,9 @@ def vercel_cron_weekly_feed_generation(request):
 
         try:
             result = loop.run_until_complete(
-                service.process_weekly_ideas_for_users(
-                    batch_number=batch_number, batch_size=batch_size)
+                sizer.measure(batch_size, service.process_weekly_ideas_for_users(
+                    batch_number=batch_number, batch_size=batch_size,
+                    include_details=wants_details(request)))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -855,6 +1022,15 @@ def manual_trigger_weekly_feed_generation(request):
     try:
         service = WeeklyFeedCreationService()
 
+        if wants_ndjson(request):
+            return ndjson_progress_response(
+                lambda on_result: service.process_weekly_ideas_for_users(
+                    batch_number=1, batch_size=0,
+                    include_details=wants_details(request), on_result=on_result),
+                audit_action='daily_content_generation',
+                resource_type='DailyContentGeneration',
+            )
+
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
@@ -868,7 +1044,8 @@ def manual_trigger_weekly_feed_generation(request):
         try:
             result = loop.run_until_complete(
                 service.process_weekly_ideas_for_users(
-                    batch_number=1, batch_size=0)
+                    batch_number=1, batch_size=0,
+                    include_details=wants_details(request))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -898,6 +1075,196 @@ def manual_trigger_weekly_feed_generation(request):
         }, status=500)
 
 
+@csrf_exempt
+@require_http_methods(["GET"])
+@permission_classes([AllowAny])
+@authentication_classes([])
+def vercel_cron_week_plan_backfill(request):
+    """
+    Vercel Cron endpoint generating the current week for users without a week plan
+    Runs before the daily generation, which only reads the week plan
+    """
+
+    try:
+        batch_number = int(request.GET.get('batch', 1))
+        batch_size = 6  # Same size as the weekly feed batches, to avoid vercel timeouts
+        service = WeeklyFeedCreationService()
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        AuditService.log_system_operation(
+            user=None,
+            action='week_plan_backfill_started',
+            status='info',
+            resource_type='WeekPlanBackfill',
+        )
+
+        try:
+            result = loop.run_until_complete(
+                service.backfill_missing_week_plans(
+                    batch_number=batch_number, batch_size=batch_size,
+                    include_details=wants_details(request))
+            )
+            AuditService.log_system_operation(
+                user=None,
+                action='week_plan_backfill_completed',
+                status='success',
+                resource_type='WeekPlanBackfill',
+            )
+        finally:
+            loop.close()
+
+        return JsonResponse({
+            'message': 'Week plan backfill completed',
+            'result': result
+        }, status=200)
+
+    except Exception as e:
+        AuditService.log_system_operation(
+            user=None,
+            action='week_plan_backfill_failed',
+            status='error',
+            resource_type='WeekPlanBackfill',
+            details=str(e)
+        )
+        return JsonResponse({
+            'error': 'Failed to backfill week plans',
+            'details': str(e)
+        }, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@permission_classes([AllowAny])
+@authentication_classes([])
+def vercel_cron_process_image_jobs(request):
+    """
+    Vercel Cron endpoint that drains the image generation job queue
+    """
+    try:
+        limit = int(request.GET.get('limit', 3))  # Keep small to avoid vercel timeouts
+
+        result = ImageGenerationJobService().process_pending_jobs(limit=limit)
+
+        return JsonResponse({
+            'message': 'Image job processing completed',
+            'result': result
+        }, status=200)
+
+    except Exception as e:
+        AuditService.log_system_operation(
+            user=None,
+            action='image_job_processing_failed',
+            status='error',
+            resource_type='ImageGenerationJob',
+            details=str(e)
+        )
+        return JsonResponse({
+            'error': 'Failed to process image jobs',
+            'details': str(e)
+        }, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@permission_classes([AllowAny])
+@authentication_classes([])
+def vercel_cron_submit_generation_batch(request):
+    """
+    Vercel Cron endpoint that submits a Gemini batch job for nightly generation
+
+    Query params:
+    - kind: 'weekly_feed' or 'daily_campaign'
+    - batch: batch number (default 1)
+    - batch_size: users per batch job (default 50, 0 = all users)
+    """
+    try:
+        kind = request.GET.get('kind', GenerationBatchKind.DAILY_CAMPAIGN)
+        if kind not in GenerationBatchKind.values:
+            return JsonResponse({
+                'error': f'Invalid kind. Use one of: {", ".join(GenerationBatchKind.values)}'
+            }, status=400)
+
+        batch_number = int(request.GET.get('batch', 1))
+        batch_size = int(request.GET.get('batch_size', 50))
+
+        service = BatchGenerationService()
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        try:
+            result = loop.run_until_complete(
+                service.submit(kind=kind, batch_number=batch_number, batch_size=batch_size)
+            )
+            AuditService.log_system_operation(
+                user=None,
+                action='generation_batch_submitted',
+                status='success',
+                resource_type='GenerationBatchJob',
+                details={'kind': kind, 'batch_number': batch_number, 'result': result},
+            )
+        finally:
+            loop.close()
+
+        return JsonResponse({
+            'message': 'Generation batch submitted',
+            'result': result
+        }, status=200)
+
+    except Exception as e:
+        AuditService.log_system_operation(
+            user=None,
+            action='generation_batch_submit_failed',
+            status='error',
+            resource_type='GenerationBatchJob',
+            details=str(e)
+        )
+        return JsonResponse({
+            'error': 'Failed to submit generation batch',
+            'details': str(e)
+        }, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@permission_classes([AllowAny])
+@authentication_classes([])
+def vercel_cron_collect_generation_batches(request):
+    """
+    Vercel Cron endpoint that polls submitted Gemini batch jobs and saves finished results
+    """
+    try:
+        service = BatchGenerationService()
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        try:
+            result = loop.run_until_complete(service.collect())
+        finally:
+            loop.close()
+
+        return JsonResponse({
+            'message': 'Generation batch collection completed',
+            'result': result
+        }, status=200)
+
+    except Exception as e:
+        AuditService.log_system_operation(
+            user=None,
+            action='generation_batch_collect_failed',
+            status='error',
+            resource_type='GenerationBatchJob',
+            details=str(e)
+        )
+        return JsonResponse({
+            'error': 'Failed to collect generation batches',
+            'details': str(e)
+        }, status=500)
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
 @permission_classes([AllowAny])
@@ -989,7 +1356,8 @@ def vercel_cron_retry_failed_users(request):
         try:
             result = loop.run_until_complete(
                 service.process_daily_ideas_for_failed_users(
-                    batch_number=batch_number, batch_size=batch_size)
+                    batch_number=batch_number, batch_size=batch_size,
+                    include_details=wants_details(request))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -1044,7 +1412,8 @@ def manual_trigger_retry_failed(request):
         try:
             result = loop.run_until_complete(
                 service.process_daily_ideas_for_failed_users(
-                    batch_number=1, batch_size=10000)
+                    batch_number=1, batch_size=10000,
+                    include_details=wants_details(request))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -1090,6 +1459,33 @@ def admin_fetch_all_daily_posts(request):
         }, status=500)
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser, permissions.IsAuthenticated])
+def admin_generation_run_items(request, run_key):
+    """Admin endpoint paging the per-user results of a generation run."""
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+        page_size = min(max(int(request.GET.get('page_size', 100)), 1), 500)
+    except ValueError:
+        return JsonResponse({'error': 'page and page_size must be integers'}, status=400)
+
+    try:
+        result = GenerationLedgerService.list_items(
+            run_key,
+            status=request.GET.get('status') or None,
+            page=page,
+            page_size=page_size,
+        )
+        return JsonResponse(result, status=200)
+    except GenerationRun.DoesNotExist:
+        return JsonResponse({'error': 'Generation run not found'}, status=404)
+    except Exception as e:
+        return JsonResponse({
+            'error': 'Failed to fetch generation run items',
+            'details': str(e)
+        }, status=500)
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
 @permission_classes([AllowAny])
@@ -1119,7 +1515,8 @@ def vercel_cron_retry_weekly_feed_failed_users(request):
         try:
             result = loop.run_until_complete(
                 service.process_weekly_feed_for_failed_users(
-                    batch_number=batch_number, batch_size=batch_size)
+                    batch_number=batch_number, batch_size=batch_size,
+                    include_details=wants_details(request))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -1174,7 +1571,8 @@ def manual_retry_weekly_feed_failed_users(request):
         try:
             result = loop.run_until_complete(
                 service.process_weekly_feed_for_failed_users(
-                    batch_number=1, batch_size=10000)
+                    batch_number=1, batch_size=10000,
+                    include_details=wants_details(request))
             )
             AuditService.log_system_operation(
                 user=None,
@@ -0,0 +1,127 @@
+"""
+Batch size of a cron invocation chosen from the pipeline's recent history.
+
+The cron views used fixed batch sizes (2 users, 3 users...) guessed to stay
+under the function timeout. Each invocation now records a
+CronInvocationSample (users processed, duration, concurrency) and the next
+invocation estimates how long one round of users takes:
+
+    round_seconds = duration * min(users, concurrency) / users
+
+and takes as many rounds of `concurrency` users as fit in the remaining time
+budget. Users left over are claimed by the next invocation through the
+pipeline's cursor/ledger, as before.
+
+Growth is capped at twice the largest recent batch, and an invocation that
+never finished (killed by the platform timeout) halves the next batch.
+"""
+import logging
+import math
+import os
+from datetime import timedelta
+from typing import Any, Awaitable, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from AuditSystem.models import CronInvocationSample
+
+logger = logging.getLogger(__name__)
+
+# Vercel functions are killed at 300s; keep a margin for startup and the response
+TIME_BUDGET_SECONDS = float(os.getenv('CRON_TIME_BUDGET_SECONDS', 240))
+MAX_ADAPTIVE_BATCH_SIZE = int(os.getenv('CRON_MAX_BATCH_SIZE', 100))
+HISTORY_WINDOW = 20
+SAFETY_FACTOR = 1.25
+HISTORY_RETENTION_DAYS = 30
+
+
+class AdaptiveBatchSizer:
+    """Chooses and records the batch size of one cron pipeline."""
+
+    def __init__(
+            self,
+            pipeline: str,
+            default_batch_size: int,
+            concurrency: int = 1,
+            time_budget_seconds: float = TIME_BUDGET_SECONDS,
+            max_batch_size: int = MAX_ADAPTIVE_BATCH_SIZE,
+    ):
+        self.pipeline = pipeline
+        self.default_batch_size = default_batch_size
+        self.concurrency = max(concurrency, 1)
+        self.time_budget_seconds = time_budget_seconds
+        self.max_batch_size = max_batch_size
+
+    def _recent_samples(self) -> list[CronInvocationSample]:
+        return list(
+            CronInvocationSample.objects.filter(pipeline=self.pipeline).order_by('-started_at')[:HISTORY_WINDOW]
+        )
+
+    def _timed_out(self, sample: CronInvocationSample, now) -> bool:
+        return sample.finished_at is None and sample.started_at < now - timedelta(seconds=2 * self.time_budget_seconds)
+
+    @staticmethod
+    def _round_seconds(sample: CronInvocationSample) -> float:
+        return sample.duration_seconds * min(sample.users, sample.concurrency) / sample.users
+
+    def choose_batch_size(self, elapsed_seconds: float = 0.0) -> int:
+        """Users to take so the invocation ends within the remaining budget."""
+        now = timezone.now()
+        samples = self._recent_samples()
+
+        # The newest invocation that is not still running decides whether to back off
+        for sample in samples:
+            if self._timed_out(sample, now):
+                batch_size = max(sample.planned_users // 2, 1)
+                logger.warning(f"[{self.pipeline}] last invocation timed out, batch size {batch_size}")
+                return batch_size
+            if sample.finished_at is not None:
+                break
+
+        finished = [sample for sample in samples if sample.finished_at is not None and sample.users > 0]
+        if not finished:
+            return self.default_batch_size
+
+        round_seconds = sum(self._round_seconds(sample) for sample in finished) / len(finished)
+        remaining = self.time_budget_seconds - elapsed_seconds
+        rounds = math.floor(remaining / (round_seconds * SAFETY_FACTOR)) if round_seconds > 0 else remaining
+        ceiling = min(2 * max(sample.users for sample in finished), self.max_batch_size)
+
+        batch_size = int(min(max(rounds * self.concurrency, 1), ceiling))
+        logger.info(
+            f"[{self.pipeline}] batch size {batch_size} "
+            f"(round {round_seconds:.1f}s, {remaining:.0f}s left, {len(finished)} samples)"
+        )
+        return batch_size
+
+    def start(self, batch_size: int) -> CronInvocationSample:
+        CronInvocationSample.objects.filter(
+            pipeline=self.pipeline,
+            started_at__lt=timezone.now() - timedelta(days=HISTORY_RETENTION_DAYS),
+        ).delete()
+        return CronInvocationSample.objects.create(
+            pipeline=self.pipeline, planned_users=batch_size, concurrency=self.concurrency)
+
+    @staticmethod
+    def finish(sample: CronInvocationSample, users: int) -> None:
+        sample.finished_at = timezone.now()
+        sample.duration_seconds = (sample.finished_at - sample.started_at).total_seconds()
+        sample.users = users
+        sample.save(update_fields=['finished_at', 'duration_seconds', 'users'])
+
+    async def measure(
+            self,
+            batch_size: int,
+            run: Awaitable[Dict[str, Any]],
+            count_key: str = 'total_users',
+    ) -> Dict[str, Any]:
+        """Await a cron run, recording how many users it processed and how long it took."""
+        sample = await sync_to_async(self.start)(batch_size)
+        result: Optional[Dict[str, Any]] = None
+        try:
+            result = await run
+            return result
+        finally:
+            users = (result or {}).get(count_key, 0) if (result or {}).get('status') != 'error' else 0
+            await sync_to_async(self.finish)(sample, users)
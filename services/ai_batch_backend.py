@@ -0,0 +1,94 @@
+"""
+Backends for offline (batch mode) Gemini generation.
+
+GeminiBatchBackend submits inlined requests through `client.batches`, which is
+billed and rate limited as batch work instead of interactive calls. Results
+come back in the same order as the submitted requests.
+
+FakeBatchBackend runs everything locally and completes immediately; it is
+meant for tests and local development (AI_BATCH_BACKEND=fake).
+"""
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from google.genai import types
+except ImportError:
+    types = None
+
+# Batch states exposed to callers
+BATCH_PENDING = 'pending'
+BATCH_SUCCEEDED = 'succeeded'
+BATCH_FAILED = 'failed'
+
+_SUCCEEDED_STATES = {'JOB_STATE_SUCCEEDED', 'JOB_STATE_PARTIALLY_SUCCEEDED'}
+_FAILED_STATES = {'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'}
+
+
+class GeminiBatchBackend:
+    """Batch jobs through the google-genai `client.batches` API."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, model: str, requests: List[Any], display_name: str) -> str:
+        job = self.client.batches.create(
+            model=model,
+            src=requests,
+            config=types.CreateBatchJobConfig(display_name=display_name),
+        )
+        return job.name
+
+    def get(self, name: str) -> Dict[str, Any]:
+        job = self.client.batches.get(name=name)
+        state = getattr(job.state, 'name', str(job.state))
+
+        if state in _FAILED_STATES:
+            return {'state': BATCH_FAILED, 'error': str(job.error) if job.error else state, 'results': None}
+        if state not in _SUCCEEDED_STATES:
+            return {'state': BATCH_PENDING, 'error': None, 'results': None}
+
+        results = []
+        for inlined in (job.dest.inlined_responses if job.dest else None) or []:
+            if inlined.error:
+                results.append({'text': None, 'error': str(inlined.error)})
+            else:
+                results.append({'text': inlined.response.text if inlined.response else None, 'error': None})
+        return {'state': BATCH_SUCCEEDED, 'error': None, 'results': results}
+
+
+class FakeBatchBackend:
+    """In-memory batch backend that answers each request with `responder`."""
+
+    def __init__(self, responder: Optional[Callable[[Any], str]] = None):
+        self.responder = responder or (lambda request: '{}')
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+
+    def create(self, model: str, requests: List[Any], display_name: str) -> str:
+        name = f"batches/fake-{uuid.uuid4().hex[:12]}"
+        results = []
+        for request in requests:
+            try:
+                results.append({'text': self.responder(request), 'error': None})
+            except Exception as e:
+                results.append({'text': None, 'error': str(e)})
+
+        self.jobs[name] = {
+            'model': model,
+            'display_name': display_name,
+            'requests': requests,
+            'state': BATCH_SUCCEEDED,
+            'error': None,
+            'results': results,
+        }
+        return name
+
+    def get(self, name: str) -> Dict[str, Any]:
+        job = self.jobs.get(name)
+        if job is None:
+            return {'state': BATCH_FAILED, 'error': f'Batch {name} not found', 'results': None}
+        return {'state': job['state'], 'error': job['error'], 'results': job['results']}
+
+
+# Shared instance so jobs submitted by one request can be collected by another
+fake_batch_backend = FakeBatchBackend()
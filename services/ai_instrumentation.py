@@ -0,0 +1,74 @@
+"""
+Structured instrumentation for Gemini calls.
+
+A GenerationTrace follows one AiService operation (generate_text,
+generate_image, ...) across its retry/fallback attempts and records:
+- attempt history (model, latency, error)
+- time to first streamed chunk and total latency
+- token usage reported by the stream's usage_metadata
+
+Traces are logged as structured data and aggregated per model/operation by
+AuditSystem.ai_usage_service.AiUsageMetricsService.
+"""
+import logging
+from dataclasses import asdict, dataclass, field
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GenerationTrace:
+    """Timings, attempts and token usage of a single AiService operation"""
+    operation: str
+    model: Optional[str] = None
+    success: bool = False
+    cache_hit: bool = False
+    attempts: List[Dict[str, Any]] = field(default_factory=list)
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    first_chunk_ms: Optional[int] = None
+    latency_ms: Optional[int] = None
+    started_at: float = field(default_factory=monotonic, repr=False)
+    _attempt_started_at: Optional[float] = field(default=None, repr=False)
+
+    def start_attempt(self, model: str) -> None:
+        """Mark the beginning of an attempt on a model."""
+        self._attempt_started_at = monotonic()
+        self.first_chunk_ms = None
+        self.prompt_tokens = self.output_tokens = self.total_tokens = 0
+        self.attempts.append({'model': model, 'latency_ms': None, 'error': None})
+
+    def on_chunk(self, chunk: Any) -> None:
+        """Register a streamed chunk: first-chunk time and cumulative usage."""
+        if self.first_chunk_ms is None and self._attempt_started_at is not None:
+            self.first_chunk_ms = int((monotonic() - self._attempt_started_at) * 1000)
+
+        usage = getattr(chunk, 'usage_metadata', None)
+        if usage is not None:
+            # Streamed usage is cumulative; the last chunk carries the totals
+            self.prompt_tokens = getattr(usage, 'prompt_token_count', None) or self.prompt_tokens
+            self.output_tokens = getattr(usage, 'candidates_token_count', None) or self.output_tokens
+            self.total_tokens = getattr(usage, 'total_token_count', None) or self.total_tokens
+
+    def end_attempt(self, error: Optional[Exception] = None) -> None:
+        """Close the current attempt with its latency and error, if any."""
+        if not self.attempts or self._attempt_started_at is None:
+            return
+        self.attempts[-1]['latency_ms'] = int((monotonic() - self._attempt_started_at) * 1000)
+        self.attempts[-1]['error'] = str(error)[:200] if error else None
+        self._attempt_started_at = None
+
+    def finish(self, model: Optional[str], success: bool) -> None:
+        """Close the trace."""
+        self.model = model or (self.attempts[-1]['model'] if self.attempts else None)
+        self.success = success
+        self.latency_ms = int((monotonic() - self.started_at) * 1000)
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop('started_at')
+        data.pop('_attempt_started_at')
+        return data
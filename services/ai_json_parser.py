@@ -0,0 +1,151 @@
+"""
+Tolerant JSON parsing for Gemini responses.
+
+Even in JSON mode a response can arrive wrapped in a ```json fence, with a
+short preamble, with trailing commas, or cut off by the token limit. Before,
+any of these made json.loads fail and the whole user was retried at full
+cost. IncrementalJsonParser follows the JSON structure as chunks arrive and
+can close whatever is still open; parse_ai_json uses it to repair a response
+and validate it against a pydantic schema.
+"""
+import json
+import re
+from typing import Any, Optional
+
+from pydantic import TypeAdapter, ValidationError
+
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+class AiJsonParseError(ValueError):
+    """Raised when a response cannot be repaired into valid JSON for its schema"""
+
+
+class IncrementalJsonParser:
+    """Tracks the structure of a JSON document fed in chunks.
+
+    Only the new text of each chunk is scanned. At any point `repaired()`
+    returns the text received so far with open strings, objects and arrays
+    closed, and `parse()` loads it.
+    """
+
+    def __init__(self):
+        self._parts: list[str] = []
+        self._stack: list[str] = []
+        self._started = False
+        self._complete = False
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of the response."""
+        for char in chunk:
+            if self._complete:
+                # Ignore anything after the top-level value (closing fence, prose)
+                return
+
+            if not self._started:
+                if char not in _CLOSERS:
+                    continue
+                self._started = True
+
+            self._parts.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in _CLOSERS:
+                self._stack.append(_CLOSERS[char])
+            elif char in '}]' and self._stack:
+                self._stack.pop()
+                if not self._stack:
+                    self._complete = True
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    @property
+    def complete(self) -> bool:
+        """True once the top-level object/array has been closed."""
+        return self._complete
+
+    def repaired(self) -> str:
+        """The text so far, closed into a syntactically complete document."""
+        text = ''.join(self._parts)
+        if self._complete:
+            return _TRAILING_COMMA_RE.sub(r'\1', text)
+
+        if self._in_string:
+            if self._escape:
+                text = text[:-1]
+            text += '"'
+
+        text = text.rstrip()
+        # A cut number/literal may be incomplete ("12" of "125", "tru"): drop it
+        text = re.sub(r'([:,\[])\s*(?:-?[\d.eE+-]+|t|tr|tru|true|f|fa|fal|fals|false|n|nu|nul|null)$', r'\1', text)
+        if self._stack and self._stack[-1] == '}':
+            # A dangling key ("titulo": / "titulo") cannot be completed
+            text = re.sub(r'([,{])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$', r'\1', text)
+        text = re.sub(r'[,:]\s*$', '', text)
+
+        return _TRAILING_COMMA_RE.sub(r'\1', text + ''.join(reversed(self._stack)))
+
+    def parse(self) -> Any:
+        """Load the (repaired) document; raises AiJsonParseError if impossible."""
+        if not self._started:
+            raise AiJsonParseError('No JSON object or array found in the response')
+        try:
+            return json.loads(self.repaired())
+        except json.JSONDecodeError as e:
+            raise AiJsonParseError(f'Could not repair AI JSON response: {e}') from e
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding ```json ... ``` fence."""
+    return _FENCE_RE.sub('', text.strip()).strip()
+
+
+def parse_ai_json(text: str, schema: Optional[Any] = None) -> Any:
+    """
+    Parse a Gemini JSON response, repairing it when needed.
+
+    Args:
+        text: Raw response text
+        schema: Optional pydantic model (or type such as list[Model]) to validate against
+
+    Returns:
+        Plain dict/list; when a schema is given, the validated data dumped back
+        to Python primitives. Fields the model left out stay absent, so the
+        callers' `.get(key, default)` fallbacks still apply
+    """
+    truncated = False
+    try:
+        data = json.loads(strip_code_fences(text))
+    except json.JSONDecodeError:
+        parser = IncrementalJsonParser()
+        parser.feed(text)
+        data = parser.parse()
+        truncated = not parser.complete
+
+    if schema is None:
+        return data
+
+    adapter = TypeAdapter(schema)
+    try:
+        return adapter.dump_python(adapter.validate_python(data), exclude_unset=True)
+    except ValidationError as e:
+        if truncated and isinstance(data, list) and len(data) > 1:
+            # Keep the complete items of a cut-off list; only the last one is partial
+            return parse_ai_json(json.dumps(data[:-1]), schema)
+        raise AiJsonParseError(f'AI JSON response does not match {getattr(schema, "__name__", schema)}: {e}') from e
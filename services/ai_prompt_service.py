@@ -45,10 +45,24 @@ logger = logging.getLogger(__name__)
 class AIPromptService:
     def __init__(self):
         self.user = None
+        self.bundle = None
 
-    def set_user(self, user) -> None:
-        """Set the user for whom the prompts will be generated."""
+    def set_user(self, user, bundle=None) -> None:
+        """Set the user for whom the prompts will be generated.
+
+        Args:
+            user: Usuário dos prompts
+            bundle: UserGenerationBundle já carregado (opcional). Quando
+                    fornecido, os dados do perfil vêm da memória em vez do banco.
+        """
         self.user = user
+        self.bundle = bundle if bundle is not None and bundle.user.id == user.id else None
+
+    def _get_profile_data(self) -> dict:
+        """Profile data of the current user, from the bundle when there is one."""
+        if self.bundle is not None:
+            return self.bundle.profile_data()
+        return get_creator_profile_data(self.user)
 
     def build_context_prompts(self, discovered_trends: dict = None) -> list[str]:
         """Build context prompts based on the user's creator profile.
@@ -59,7 +73,7 @@ class AIPromptService:
                               tendências - NÃO pode inventar ou sugerir outras.
                               Isso garante que todo conteúdo seja baseado em dados reais.
         """
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
 
         # Formatar tendências descobertas para inclusão no prompt
         trends_section = self._format_discovered_trends_for_prompt(discovered_trends)
@@ -263,7 +277,7 @@ class AIPromptService:
 
     def build_content_prompts(self, context: dict, posts_quantity: str) -> list[str]:
         """Build content generation prompts based on the user's creator profile."""
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
 
         return [
             """
@@ -335,7 +349,7 @@ class AIPromptService:
 
     def build_feed_prompts(self, context: dict) -> list[str]:
         """Build feed generation prompts based on the user's creator profile."""
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
 
         formatted_context = format_weekly_context_output(context)
         return [
@@ -467,7 +481,7 @@ class AIPromptService:
 
     def build_campaign_prompts(self, post_text_feed: dict) -> list[str]:
         """Build campaign generation prompts based on the user's creator profile."""
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
         return [
             """
             Você é um estrategista de conteúdo e redator de marketing digital especializado em redes sociais. Sua função é criar 1 roteiro diário de videos de stories e 1 roteiro para video de Reels para o Instagram totalmente personalizados e criativos para esta empresa. Baseie o conteúdo dos roteiros no conteúdo do post de Feed enviado, sempre respeitando o tom de voz da marca. Seja criativo e crie conteúdo engajador, utilizando o método AIDA. Usar também como referência a jornada do herói.""",
@@ -529,7 +543,7 @@ class AIPromptService:
 
     def build_standalone_post_prompt(self, post_data: dict, context: dict) -> list[str]:
         """Build campaign generation prompts based on the user's creator profile."""
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
         formatted_context = format_weekly_context_output(context)
         return [
             """
@@ -663,7 +677,7 @@ class AIPromptService:
 
     def regenerate_standalone_post_prompt(self, post_data: dict, custom_prompt: str, context: dict) -> list[str]:
         """Build campaign generation prompts based on the user's creator profile."""
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
         formatted_context = format_weekly_context_output(context)
 
         return [
@@ -810,7 +824,7 @@ class AIPromptService:
 
     def semantic_analysis_prompt(self, post_text: str) -> list[str]:
         """Prompt for semantic analysis of user input."""
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
 
         return [
             """
@@ -860,7 +874,7 @@ class AIPromptService:
 
     def image_generation_prompt(self, semantic_analysis: dict) -> list[str]:
         """Prompt for AI image generation based on semantic analysis."""
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
 
         def get_visual_style_info():
             visual_style = profile_data.get('visual_style', '')
@@ -941,7 +955,7 @@ class AIPromptService:
         Returns:
             Lista de prompts para análise histórica
         """
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
 
         name = post_data.get('name', '')
         objective = post_data.get('objective', '')
@@ -1002,7 +1016,7 @@ class AIPromptService:
         Returns:
             Lista de prompts para geração automática
         """
-        profile_data = get_creator_profile_data(self.user)
+        profile_data = self._get_profile_data()
 
         analysis_json = analysis_data if analysis_data else {
             "historical_analysis": "",
@@ -0,0 +1,85 @@
+"""
+Pydantic response schemas for Gemini JSON mode.
+
+Passed as `response_schema` (with response_mime_type application/json) so the
+model is constrained to the payloads the prompts already describe, and used
+by parse_ai_json to validate the result. Only the fields the posts cannot do
+without are required, so a response cut short still yields a usable post.
+"""
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class FeedPostPayload(BaseModel):
+    """Feed post (weekly feed items, standalone/edited feed posts)"""
+    id: Optional[int] = None
+    titulo: str = ''
+    sub_titulo: str = ''
+    legenda: str
+    hashtags: list[str] = Field(default_factory=list)
+    cta: str = ''
+
+
+class ScriptPostPayload(BaseModel):
+    """Stories/Reels post: title and recording script"""
+    titulo: str = ''
+    roteiro: str
+
+
+class CampaignPayload(BaseModel):
+    """Daily campaign generated from the feed post of the week"""
+    post_text_stories: ScriptPostPayload
+    post_text_reels: ScriptPostPayload
+
+
+class SemanticAnalysis(BaseModel):
+    tema_principal: str = ''
+    subtemas: list[str] = Field(default_factory=list)
+    conceitos_visuais: list[str] = Field(default_factory=list)
+    objetos_relevantes: list[str] = Field(default_factory=list)
+    contexto_visual_sugerido: str = ''
+    emoções_associadas: list[str] = Field(default_factory=list)
+    tons_de_cor_sugeridos: list[str] = Field(default_factory=list)
+    ação_sugerida: str = ''
+    sensação_geral: str = ''
+    palavras_chave: list[str] = Field(default_factory=list)
+    sugestao_visual: list[str] = Field(default_factory=list)
+
+
+class SemanticAnalysisPayload(BaseModel):
+    """Semantic analysis used to build the image prompt"""
+    analise_semantica: SemanticAnalysis
+
+
+class OpportunityItem(BaseModel):
+    titulo_ideia: str
+    descricao: str = ''
+    tipo: str = ''
+    score: int = 0
+    url_fonte: str = ''
+    search_keywords: list[str] = Field(default_factory=list)
+
+
+class OpportunityCategory(BaseModel):
+    titulo: str = ''
+    items: list[OpportunityItem] = Field(default_factory=list)
+
+
+class OpportunitiesPayload(BaseModel):
+    """Weekly content opportunities grouped by category"""
+    polemica: OpportunityCategory = Field(default_factory=OpportunityCategory)
+    educativo: OpportunityCategory = Field(default_factory=OpportunityCategory)
+    newsjacking: OpportunityCategory = Field(default_factory=OpportunityCategory)
+    entretenimento: OpportunityCategory = Field(default_factory=OpportunityCategory)
+    estudo_caso: OpportunityCategory = Field(default_factory=OpportunityCategory)
+    futuro: OpportunityCategory = Field(default_factory=OpportunityCategory)
+
+
+# The weekly feed prompt returns a list of posts
+WeeklyFeedPayload = list[FeedPostPayload]
+
+
+def post_payload_for_type(post_type: Optional[str]):
+    """Schema of a standalone post: feed posts have a caption, the others a script."""
+    return FeedPostPayload if post_type == 'feed' else ScriptPostPayload
@@ -1,7 +1,12 @@
+import asyncio
 import base64
 import os
-from time import sleep
+import random
+import re
+from time import monotonic, sleep
+from typing import Iterator
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
 
 try:
@@ -11,32 +16,51 @@ except ImportError:
     genai = None
     types = None
 
+from AuditSystem.ai_usage_service import AiUsageMetricsService
 from AuditSystem.services import AuditService
 from CreditSystem.services.credit_service import CreditService
+from services.ai_batch_backend import GeminiBatchBackend, fake_batch_backend
+from services.ai_instrumentation import GenerationTrace
+from services.ai_json_parser import parse_ai_json
+from services.client_registry import get_genai_client, get_loop_genai_client
+from services.model_circuit_breaker import ModelCircuitBreaker
+from services.model_health_registry import ModelHealthRegistry
+from services.prompt_result_cache import (
+    CACHE_HIT_CREDIT_POLICY,
+    PromptResultCache,
+    prompt_result_cache,
+)
+from services.resource_limiter import GEMINI_IMAGE, GEMINI_TEXT, resource_limiter
+
+# Exponential backoff between attempts on the same model (seconds)
+BACKOFF_BASE_SECONDS = float(os.getenv('AI_BACKOFF_BASE_SECONDS', 2))
+BACKOFF_MAX_SECONDS = float(os.getenv('AI_BACKOFF_MAX_SECONDS', 30))
+
+# Preferred fallback order; at request time it is reordered by
+# ModelHealthRegistry and failing models are skipped through ModelCircuitBreaker
+TEXT_MODELS = [
+    'gemini-3-pro-preview',
+    'gemini-3-flash-preview',
+    'gemini-2.5-flash',
+]
+IMAGE_MODELS = [
+    'gemini-3-pro-image-preview',
+    'gemini-2.5-flash-image',
+]
 
 
 class AiService:
     def __init__(self):
-        self.models = [
-            'gemini-3-pro-preview',
-            'gemini-3-pro-preview',
-            'gemini-3-flash-preview',
-            'gemini-3-flash-preview',
-            'gemini-2.5-flash',
-            'gemini-2.5-flash',
-            'gemini-3-pro-preview',
-            'gemini-3-pro-preview', ]
-        self.image_models = [
-            'gemini-3-pro-image-preview',
-            'gemini-2.5-flash-image',
-            'gemini-3-pro-image-preview',
-            'gemini-2.5-flash-image',
-            'gemini-3-pro-image-preview',
-        ]
+        self.models = list(TEXT_MODELS)
+        self.image_models = list(IMAGE_MODELS)
         self.api_key = os.getenv('GEMINI_API_KEY', '')
         if genai is None:
             raise ImportError("google-genai package is not installed or could not be imported.")
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = get_genai_client(self.api_key)
+        if os.getenv('AI_BATCH_BACKEND', 'gemini').lower() == 'fake':
+            self.batch_backend = fake_batch_backend
+        else:
+            self.batch_backend = GeminiBatchBackend(self.client)
         self.generate_text_config = types.GenerateContentConfig(
             response_modalities=[
                 "TEXT",
@@ -52,13 +76,30 @@ class AiService:
             ),
         )
 
-    def generate_text(self, prompt_list: list[str], user: User, config: types.GenerateContentConfig = None) -> str:
+    def generate_text(self, prompt_list: list[str], user: User, config: types.GenerateContentConfig = None,
+                      cache: bool = False) -> str:
+        """
+        Generate text with Gemini.
+
+        With cache=True identical (prompt_list, config) requests are served from
+        the shared prompt result cache; use it only for deterministic prompts.
+        """
+        trace = GenerationTrace(operation='text_generation')
         try:
             effective_config = self.generate_text_config
 
             if config is not None:
                 effective_config = config
 
+            cache_key = None
+            if cache:
+                cache_key = PromptResultCache.build_key('gemini-text', prompt_list, effective_config)
+                cached = prompt_result_cache.get(cache_key)
+                if cached is not None:
+                    trace.cache_hit = True
+                    trace.finish(cached[0], success=True)
+                    return self._serve_cached_text(user, *cached)
+
             user_has_credits = self._validate_credits(
                 user=user, operation='text_generation')
             if not user_has_credits:
@@ -68,9 +109,13 @@ class AiService:
             model, result = self._try_model_with_retries(
                 models=self.models,
                 generate_function=lambda model: self._try_generate_text(
-                    model, prompt_list, effective_config),
-                max_retries=2
+                    model, prompt_list, effective_config, trace),
+                max_retries=2,
+                trace=trace
             )
+            trace.finish(model, success=True)
+            if cache_key:
+                prompt_result_cache.set(cache_key, model, result)
             self._deduct_credits(
                 user=user, model=model, operation='text_generation',
                 description='Geração de texto via Gemini'
@@ -86,6 +131,7 @@ class AiService:
             return result
 
         except Exception as e:
+            trace.finish(None, success=False)
             AuditService.log_content_generation(
                 user=user,
                 action='content_generation_failed',
@@ -93,8 +139,90 @@ class AiService:
                 details={'error': str(e)}
             )
             raise Exception(f"Error generating text: {str(e)}")
+        finally:
+            self._record_trace(trace)
+
+    def generate_text_stream(self, prompt_list: list[str], user: User,
+                             config: types.GenerateContentConfig = None) -> Iterator[str]:
+        """
+        Yield text chunks as Gemini streams them.
+
+        Model fallback and retries only happen before the first chunk is
+        yielded; once the client has received text, a failure is raised.
+        Credits are deducted after the stream completes.
+        """
+        trace = GenerationTrace(operation='text_generation')
+        try:
+            effective_config = self.generate_text_config
+
+            if config is not None:
+                effective_config = config
+
+            user_has_credits = self._validate_credits(
+                user=user, operation='text_generation')
+            if not user_has_credits:
+                raise Exception(
+                    "Créditos insuficientes para gerar texto. Por favor, adquira mais créditos.")
+
+            contents = self._build_contents(prompt_list)
+            max_retries = 2
+            model = None
+            emitted = False
+            last_error = None
+
+            for candidate in self._available_models(self.models):
+                for attempt in range(max_retries):
+                    print(f"Streaming with model {candidate}, attempt {attempt + 1} of {max_retries}")
+                    started_at = monotonic()
+                    trace.start_attempt(candidate)
+                    try:
+                        resource_limiter.acquire_sync(GEMINI_TEXT)
+                        for chunk in self.client.models.generate_content_stream(
+                                model=candidate,
+                                contents=contents,
+                                config=effective_config
+                        ):
+                            trace.on_chunk(chunk)
+                            text = self._extract_chunk_text(chunk)
+                            if text:
+                                emitted = True
+                                yield text
+                        trace.end_attempt()
+                        self._record_success(candidate, monotonic() - started_at)
+                        model = candidate
+                        break
+                    except Exception as e:
+                        print(
+                            f"Error with model {candidate} on attempt {attempt + 1}: {str(e)}")
+                        last_error = e
+                        trace.end_attempt(e)
+                        if emitted:
+                            raise
+                        delay = self._next_retry_delay(
+                            candidate, e, attempt, max_retries, latency=monotonic() - started_at)
+                        if delay is None:
+                            break
+                        sleep(delay)
+                if model is not None:
+                    break
+
+            if model is None:
+                raise last_error
+
+            trace.finish(model, success=True)
+            self._deduct_credits(
+                user=user, model=model, operation='text_generation',
+                description='Geração de texto via Gemini'
+            )
+            AuditService.log_content_generation(
+                user=user,
+                action='content_generated',
+                status='success',
+                details={'model': model, 'stream': True}
+            )
 
         except Exception as e:
+            trace.finish(None, success=False)
             AuditService.log_content_generation(
                 user=user,
                 action='content_generation_failed',
@@ -102,9 +230,31 @@ class AiService:
                 details={'error': str(e)}
             )
             raise Exception(f"Error generating text: {str(e)}")
+        finally:
+            self._record_trace(trace)
+
+    def json_config(self, schema, config: types.GenerateContentConfig = None) -> types.GenerateContentConfig:
+        """Copy of `config` (or the default text config) in JSON mode constrained to `schema`."""
+        base_config = config if config is not None else self.generate_text_config
+        return base_config.model_copy(update={
+            'response_mime_type': 'application/json',
+            'response_schema': schema,
+        })
+
+    def generate_json(self, prompt_list: list[str], user: User, schema,
+                      config: types.GenerateContentConfig = None, cache: bool = False):
+        """
+        Generate in JSON mode and return the response parsed and validated against `schema`.
+
+        Truncated or slightly malformed responses are repaired by parse_ai_json
+        instead of failing the whole generation.
+        """
+        content_result = self.generate_text(prompt_list, user, self.json_config(schema, config), cache=cache)
+        return parse_ai_json(content_result, schema)
 
     def generate_image(self, prompt_list: list[str], image_attachment: str, user: User,
                        config: types.GenerateContentConfig = None) -> str:
+        trace = GenerationTrace(operation='image_generation')
         try:
             effective_config = self.generate_image_config
 
@@ -120,9 +270,11 @@ class AiService:
             model, result = self._try_model_with_retries(
                 models=self.image_models,
                 generate_function=lambda model: self._try_generate_image(
-                    model, prompt_list, image_attachment, effective_config),
-                max_retries=1
+                    model, prompt_list, image_attachment, effective_config, trace),
+                max_retries=2,
+                trace=trace
             )
+            trace.finish(model, success=True)
             self._deduct_credits(
                 user=user, model=model, operation='image_generation',
                 description='Geração de imagem via Gemini'
@@ -136,6 +288,7 @@ class AiService:
             return result
 
         except Exception as e:
+            trace.finish(None, success=False)
             AuditService.log_image_generation(
                 user=user,
                 action='image_generation_failed',
@@ -143,39 +296,332 @@ class AiService:
                 details={'error': str(e)}
             )
             raise Exception(f"Error generating image: {str(e)}")
+        finally:
+            self._record_trace(trace)
+
+    async def agenerate_text(self, prompt_list: list[str], user: User,
+                             config: types.GenerateContentConfig = None, cache: bool = False) -> str:
+        """Async variant of generate_text, built on the google-genai async client."""
+        trace = GenerationTrace(operation='text_generation')
+        try:
+            effective_config = self.generate_text_config
+
+            if config is not None:
+                effective_config = config
+
+            cache_key = None
+            if cache:
+                cache_key = PromptResultCache.build_key('gemini-text', prompt_list, effective_config)
+                cached = prompt_result_cache.get(cache_key)
+                if cached is not None:
+                    trace.cache_hit = True
+                    trace.finish(cached[0], success=True)
+                    return await sync_to_async(self._serve_cached_text)(user, *cached)
+
+            user_has_credits = await self._avalidate_credits(
+                user=user, operation='text_generation')
+            if not user_has_credits:
+                raise Exception(
+                    "Créditos insuficientes para gerar texto. Por favor, adquira mais créditos.")
+
+            model, result = await self._atry_model_with_retries(
+                models=self.models,
+                generate_function=lambda model: self._atry_generate_text(
+                    model, prompt_list, effective_config, trace),
+                max_retries=2,
+                trace=trace
+            )
+            trace.finish(model, success=True)
+            if cache_key:
+                prompt_result_cache.set(cache_key, model, result)
+            await self._adeduct_credits(
+                user=user, model=model, operation='text_generation',
+                description='Geração de texto via Gemini'
+            )
+
+            await sync_to_async(AuditService.log_content_generation)(
+                user=user,
+                action='content_generated',
+                status='success',
+                details={'model': model}
+            )
+
+            return result
+
+        except Exception as e:
+            trace.finish(None, success=False)
+            await sync_to_async(AuditService.log_content_generation)(
+                user=user,
+                action='content_generation_failed',
+                status='failure',
+                details={'error': str(e)}
+            )
+            raise Exception(f"Error generating text: {str(e)}")
+        finally:
+            await sync_to_async(self._record_trace)(trace)
+
+    async def agenerate_json(self, prompt_list: list[str], user: User, schema,
+                             config: types.GenerateContentConfig = None, cache: bool = False):
+        """Async variant of generate_json."""
+        content_result = await self.agenerate_text(prompt_list, user, self.json_config(schema, config), cache=cache)
+        return parse_ai_json(content_result, schema)
+
+    async def agenerate_image(self, prompt_list: list[str], image_attachment: str, user: User,
+                              config: types.GenerateContentConfig = None) -> bytes:
+        """Async variant of generate_image, built on the google-genai async client."""
+        trace = GenerationTrace(operation='image_generation')
+        try:
+            effective_config = self.generate_image_config
+
+            if config is not None:
+                effective_config = config
+
+            user_has_credits = await self._avalidate_credits(
+                user=user, operation='image_generation')
+            if not user_has_credits:
+                raise Exception(
+                    "Créditos insuficientes para gerar texto. Por favor, adquira mais créditos.")
+
+            model, result = await self._atry_model_with_retries(
+                models=self.image_models,
+                generate_function=lambda model: self._atry_generate_image(
+                    model, prompt_list, image_attachment, effective_config, trace),
+                max_retries=2,
+                trace=trace
+            )
+            trace.finish(model, success=True)
+            await self._adeduct_credits(
+                user=user, model=model, operation='image_generation',
+                description='Geração de imagem via Gemini'
+            )
+            await sync_to_async(AuditService.log_image_generation)(
+                user=user,
+                action='image_generated',
+                status='success',
+                details={'model': model}
+            )
+            return result
+
+        except Exception as e:
+            trace.finish(None, success=False)
+            await sync_to_async(AuditService.log_image_generation)(
+                user=user,
+                action='image_generation_failed',
+                status='failure',
+                details={'error': str(e)}
+            )
+            raise Exception(f"Error generating image: {str(e)}")
+        finally:
+            await sync_to_async(self._record_trace)(trace)
+
+    def submit_text_batch(self, prompt_lists: list[list[str]], config: types.GenerateContentConfig = None,
+                          display_name: str = 'postnow-batch') -> tuple[str, str]:
+        """
+        Submit many text prompts as one offline batch job.
+
+        Credits are not handled here: callers validate before submitting and
+        deduct per successful result when collecting.
+
+        Returns:
+            (job_name, model)
+        """
+        effective_config = config or self.generate_text_config
+        model = self._available_models(self.models)[0]
+        requests = [
+            types.InlinedRequest(
+                model=model,
+                contents=[self._build_contents(prompt_list)],
+                config=effective_config,
+            )
+            for prompt_list in prompt_lists
+        ]
+        job_name = self.batch_backend.create(model, requests, display_name)
+        print(f"Submitted batch {job_name} with {len(requests)} requests on {model}")
+        return job_name, model
+
+    def get_text_batch(self, job_name: str) -> dict:
+        """
+        Return the state of a batch job.
+
+        Returns:
+            Dict with state ('pending', 'succeeded', 'failed'), error and, once
+            succeeded, results: one {'text', 'error'} per request, in order
+        """
+        return self.batch_backend.get(job_name)
+
+    def _serve_cached_text(self, user: User, model: str, result: str) -> str:
+        """Return a cached text result, applying the configured credit policy for hits."""
+        if CACHE_HIT_CREDIT_POLICY == 'charge':
+            if not self._validate_credits(user=user, operation='text_generation'):
+                raise Exception(
+                    "Créditos insuficientes para gerar texto. Por favor, adquira mais créditos.")
+            self._deduct_credits(
+                user=user, model=model, operation='text_generation',
+                description='Geração de texto via Gemini (cache)'
+            )
+
+        AuditService.log_content_generation(
+            user=user,
+            action='content_generated',
+            status='success',
+            details={'model': model, 'cache': 'hit'}
+        )
+        return result
 
-    def _try_model_with_retries(self, models: list[str], generate_function: callable, max_retries: int = 3) -> tuple[
-        str, str]:
+    def _try_model_with_retries(self, models: list[str], generate_function: callable, max_retries: int = 3,
+                                trace: GenerationTrace = None) -> tuple[str, str]:
         """Try making a request to the AI model with retries for retryable errors."""
         last_error = None
-        for model in models:
+        for model in self._available_models(models):
             for attempt in range(max_retries):
                 try:
                     # Pass the current model to the function
                     print(f"Trying model {model}, attempt {attempt + 1} of {max_retries}")
+                    started_at = monotonic()
+                    if trace:
+                        trace.start_attempt(model)
                     result = generate_function(model)
+                    if trace:
+                        trace.end_attempt()
+                    self._record_success(model, monotonic() - started_at)
                     print(f"Model {model} succeeded on attempt {attempt + 1}")
                     return model, result
                 except Exception as e:
                     print(
                         f"Error with model {model} on attempt {attempt + 1}: {str(e)}")
-                    error_str = str(e)
                     last_error = e
-                    if not self._is_retryable_error(error_str):
-                        # Non-retryable error, don't retry
-                        print(
-                            f"Non-retryable error for {model}, trying next model...")
+                    if trace:
+                        trace.end_attempt(e)
+                    delay = self._next_retry_delay(
+                        model, e, attempt, max_retries, latency=monotonic() - started_at)
+                    if delay is None:
                         break  # Break inner loop to try next model
-                    if attempt < max_retries - 1:
-                        # Exponential backoff delay between retries
-                        sleep(5 * (2 ** attempt))
-                        print(
-                            f"Attempt {attempt + 1} failed for {model}, retrying...")
-                    else:
-                        print(
-                            f"All {max_retries} attempts for {model} failed")
+                    sleep(delay)
+        raise last_error
+
+    async def _atry_model_with_retries(self, models: list[str], generate_function: callable,
+                                       max_retries: int = 3, trace: GenerationTrace = None) -> tuple[str, str]:
+        """Async counterpart of _try_model_with_retries; backs off without blocking the event loop."""
+        last_error = None
+        for model in self._available_models(models):
+            for attempt in range(max_retries):
+                try:
+                    print(f"Trying model {model}, attempt {attempt + 1} of {max_retries}")
+                    started_at = monotonic()
+                    if trace:
+                        trace.start_attempt(model)
+                    result = await generate_function(model)
+                    if trace:
+                        trace.end_attempt()
+                    self._record_success(model, monotonic() - started_at)
+                    print(f"Model {model} succeeded on attempt {attempt + 1}")
+                    return model, result
+                except Exception as e:
+                    print(
+                        f"Error with model {model} on attempt {attempt + 1}: {str(e)}")
+                    last_error = e
+                    if trace:
+                        trace.end_attempt(e)
+                    delay = self._next_retry_delay(
+                        model, e, attempt, max_retries, latency=monotonic() - started_at)
+                    if delay is None:
+                        break
+                    await asyncio.sleep(delay)
         raise last_error
 
+    def _available_models(self, models: list[str]) -> list[str]:
+        """
+        Healthiest-first models whose circuit is closed; if all are open, the
+        one that reopens first.
+        """
+        available = [
+            model for model in ModelHealthRegistry.order_models(models)
+            if not ModelCircuitBreaker.is_open(model)
+        ]
+        if not available:
+            soonest = ModelCircuitBreaker.soonest_available(models)
+            print(f"All models have open circuits, trying {soonest}")
+            return [soonest]
+        return available
+
+    def _record_trace(self, trace: GenerationTrace) -> None:
+        """Persist a finished trace; calls that never reached a model are skipped."""
+        if trace.latency_ms is None:
+            # Interrupted before finishing (e.g. a closed stream)
+            trace.finish(None, success=False)
+        if trace.attempts or trace.cache_hit:
+            AiUsageMetricsService.record(trace)
+
+    def _record_success(self, model: str, latency: float) -> None:
+        """Close the model's circuit and feed the health registry."""
+        ModelCircuitBreaker.record_success(model)
+        ModelHealthRegistry.record(model, success=True, latency=latency)
+
+    def _next_retry_delay(self, model: str, error: Exception, attempt: int, max_retries: int,
+                          latency: float = 0.0) -> float | None:
+        """
+        Decide what happens after a failed attempt.
+
+        Returns the delay (seconds) before retrying the same model, or None to
+        move on to the next model.
+        """
+        if not self._is_retryable_error(str(error)):
+            print(f"Non-retryable error for {model}, trying next model...")
+            return None
+
+        ModelHealthRegistry.record(model, success=False, latency=latency)
+        retry_after = self._extract_retry_after(error)
+        if retry_after is not None and retry_after > BACKOFF_MAX_SECONDS:
+            # Server asked for a longer pause than we are willing to wait in the
+            # request path: take the model out of rotation for everyone
+            ModelCircuitBreaker.record_failure(model, open_for=retry_after)
+        else:
+            ModelCircuitBreaker.record_failure(model)
+
+        if attempt >= max_retries - 1:
+            print(f"All {max_retries} attempts for {model} failed")
+            return None
+        if ModelCircuitBreaker.is_open(model):
+            print(f"Circuit open for {model}, trying next model...")
+            return None
+
+        delay = self._compute_backoff(attempt, retry_after)
+        print(f"Attempt {attempt + 1} failed for {model}, retrying in {delay:.1f}s...")
+        return delay
+
+    def _compute_backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Exponential backoff with jitter, honoring the server's retry hint when present."""
+        if retry_after is not None:
+            return retry_after + random.uniform(0, 1)
+        delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _extract_retry_after(self, error: Exception) -> float | None:
+        """Read the retry hint (seconds) from a Gemini API error, if any."""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if headers:
+            try:
+                return float(headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                pass
+
+        # google.rpc.RetryInfo in the error payload, e.g. {"retryDelay": "12s"}
+        details = getattr(error, 'details', None)
+        if isinstance(details, dict):
+            for detail in details.get('error', {}).get('details', []) or []:
+                if isinstance(detail, dict) and 'retryDelay' in detail:
+                    try:
+                        return float(str(detail['retryDelay']).rstrip('s'))
+                    except ValueError:
+                        pass
+
+        match = re.search(r"retry in ([\d.]+)\s*s", str(error), re.IGNORECASE) or \
+            re.search(r"retryDelay['\"]?\s*:\s*['\"]([\d.]+)s", str(error))
+        if match:
+            return float(match.group(1))
+        return None
+
     def _is_retryable_error(self, error_str: str) -> bool:
         """Determine if an error is retryable based on its content."""
         retryable_indicators = [
@@ -191,34 +637,90 @@ class AiService:
         ]
         return any(indicator in error_str.lower() for indicator in retryable_indicators)
 
-    def _try_generate_text(self, model: str, prompt_list: list[str], config: types.GenerateContentConfig) -> str:
+    def _try_generate_text(self, model: str, prompt_list: list[str], config: types.GenerateContentConfig,
+                           trace: GenerationTrace = None) -> str:
         """Try generating text using the specified model."""
         response_text = ''
-        contents = types.Content(
-            role='user',
-            parts=[]
-        )
-        for prompt in prompt_list:
-            contents.parts.append(types.Part.from_text(text=prompt))
+        contents = self._build_contents(prompt_list)
 
+        resource_limiter.acquire_sync(GEMINI_TEXT)
         for chunk in self.client.models.generate_content_stream(
                 model=model,
                 contents=contents,
                 config=config
         ):
-            if not self._check_for_content_parts(chunk):
-                continue
+            if trace:
+                trace.on_chunk(chunk)
+            response_text += self._extract_chunk_text(chunk)
+        return response_text
+
+    async def _atry_generate_text(self, model: str, prompt_list: list[str],
+                                  config: types.GenerateContentConfig, trace: GenerationTrace = None) -> str:
+        """Async counterpart of _try_generate_text."""
+        response_text = ''
+        contents = self._build_contents(prompt_list)
 
-            part = chunk.candidates[0].content.parts[0]
-            if hasattr(part, 'text') and part.text:
-                response_text += part.text
+        await resource_limiter.acquire(GEMINI_TEXT)
+        async for chunk in await self._async_client().models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=config
+        ):
+            if trace:
+                trace.on_chunk(chunk)
+            response_text += self._extract_chunk_text(chunk)
         return response_text
 
     def _try_generate_image(self, model: str, prompt_list: list[str], image_attachment: str,
-                            config: types.GenerateContentConfig) -> bytes:
+                            config: types.GenerateContentConfig, trace: GenerationTrace = None) -> bytes:
         """Try generating an image using the specified model."""
         image_bytes = None
         print(f"Trying to generate image with model: {model}")
+        contents = self._build_contents(prompt_list, image_attachment)
+
+        resource_limiter.acquire_sync(GEMINI_IMAGE)
+        for chunk in self.client.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=config
+        ):
+            if trace:
+                trace.on_chunk(chunk)
+            image_bytes = self._extract_chunk_image(chunk)
+            if image_bytes:
+                break
+
+        return image_bytes
+
+    async def _atry_generate_image(self, model: str, prompt_list: list[str], image_attachment: str,
+                                   config: types.GenerateContentConfig, trace: GenerationTrace = None) -> bytes:
+        """Async counterpart of _try_generate_image."""
+        image_bytes = None
+        print(f"Trying to generate image with model: {model}")
+        contents = self._build_contents(prompt_list, image_attachment)
+
+        await resource_limiter.acquire(GEMINI_IMAGE)
+        async for chunk in await self._async_client().models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=config
+        ):
+            if trace:
+                trace.on_chunk(chunk)
+            image_bytes = self._extract_chunk_image(chunk)
+            if image_bytes:
+                break
+
+        return image_bytes
+
+    def _async_client(self):
+        """Async genai surface; the shared client is swapped for one bound to the running loop."""
+        if self.client is get_genai_client(self.api_key):
+            return get_loop_genai_client(self.api_key).aio
+        return self.client.aio
+
+    def _build_contents(self, prompt_list: list[str], image_attachment: str = None) -> types.Content:
+        """Build the request contents from the prompt list and an optional base64 image."""
         contents = types.Content(
             role='user',
             parts=[]
@@ -234,26 +736,28 @@ class AiService:
 
         for prompt in prompt_list:
             contents.parts.append(types.Part.from_text(text=prompt))
+        return contents
 
-        for chunk in self.client.models.generate_content_stream(
-                model=model,
-                contents=contents,
-                config=config
-        ):
-            if not self._check_for_content_parts(chunk):
-                continue
+    def _extract_chunk_text(self, chunk: types.GenerateContentResponse) -> str:
+        """Return the text carried by a streamed chunk, or an empty string."""
+        if not self._check_for_content_parts(chunk):
+            return ''
 
-            part = chunk.candidates[0].content.parts[0]
+        part = chunk.candidates[0].content.parts[0]
+        if hasattr(part, 'text') and part.text:
+            return part.text
+        return ''
 
-            if hasattr(part, 'inline_data') and part.inline_data and hasattr(part.inline_data,
-                                                                             'data') and part.inline_data.data:
-                inline_data = part.inline_data
-                image_bytes = inline_data.data
-                break
-            elif hasattr(part, 'text') and part.text:
-                continue
+    def _extract_chunk_image(self, chunk: types.GenerateContentResponse) -> bytes | None:
+        """Return the inline image bytes carried by a streamed chunk, if any."""
+        if not self._check_for_content_parts(chunk):
+            return None
 
-        return image_bytes
+        part = chunk.candidates[0].content.parts[0]
+        if hasattr(part, 'inline_data') and part.inline_data and hasattr(part.inline_data,
+                                                                         'data') and part.inline_data.data:
+            return part.inline_data.data
+        return None
 
     def _check_for_content_parts(self, chunk: types.Content) -> bool:
         if not hasattr(chunk, 'candidates') or chunk.candidates is None:
@@ -310,3 +814,12 @@ class AiService:
                 user=user, operation_type=operation, ai_model=model, description=description)
         except Exception:
             return False
+
+    async def _avalidate_credits(self, user: User, operation: str) -> bool:
+        """Awaitable credit validation for the async generation path."""
+        return await sync_to_async(self._validate_credits)(user=user, operation=operation)
+
+    async def _adeduct_credits(self, user: User, model: str, operation: str, description: str) -> bool:
+        """Awaitable credit deduction for the async generation path."""
+        return await sync_to_async(self._deduct_credits)(
+            user=user, model=model, operation=operation, description=description)
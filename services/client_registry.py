@@ -0,0 +1,113 @@
+"""
+Process-level registry of external API clients.
+
+Building a genai, boto3 or Mailjet client is not free (credential lookup,
+SSL context, connection pool), and views/services used to build them on every
+request. The registry builds each client lazily, once per process and
+configuration, so warm workers reuse the same pooled connections.
+
+Async note: the genai client opens its aiohttp session on the event loop of
+the first async call, and the crons run every invocation on a new loop. Async
+calls therefore use `get_loop_genai_client`, which keeps one client per
+running loop instead of sharing the process-wide one; the batch that owns the
+loop calls `close_loop_genai_clients()` when it ends.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable
+
+import boto3
+from botocore.config import Config
+from mailjet_rest import Client as MailjetClient
+
+try:
+    from google import genai
+except ImportError:
+    genai = None
+
+# Connection pool size of the shared S3 client (boto3 default is 10)
+S3_MAX_POOL_CONNECTIONS = int(os.getenv('AWS_S3_MAX_POOL_CONNECTIONS', 25))
+
+_lock = threading.Lock()
+_clients: Dict[Hashable, Any] = {}
+_loop_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Any]]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_or_create(key: Hashable, factory: Callable[[], Any]) -> Any:
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = factory()
+                _clients[key] = client
+    return client
+
+
+def _build_genai_client(api_key: str):
+    if genai is None:
+        raise ImportError("google-genai package is not installed or could not be imported.")
+    return genai.Client(api_key=api_key)
+
+
+def get_genai_client(api_key: str):
+    """Shared genai client for synchronous calls."""
+    return _get_or_create(('genai', api_key), lambda: _build_genai_client(api_key))
+
+
+def get_loop_genai_client(api_key: str):
+    """genai client owned by the running event loop, for `client.aio` calls."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _loop_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            client = _build_genai_client(api_key)
+            clients[api_key] = client
+    return client
+
+
+async def close_loop_genai_clients() -> None:
+    """Close the genai clients opened on the running loop, if any."""
+    with _lock:
+        clients = _loop_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aio.aclose()
+
+
+def get_s3_client(region: str):
+    """Shared boto3 S3 client with a larger keep-alive connection pool."""
+    access_key = os.getenv('AWS_ACCESS_KEY_ID')
+    secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
+
+    return _get_or_create(('s3', region, access_key), lambda: boto3.client(
+        's3',
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name=region,
+        config=Config(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+            retries={'max_attempts': 3, 'mode': 'standard'},
+        ),
+    ))
+
+
+def get_mailjet_client(version: str = 'v3.1'):
+    """Shared Mailjet client for an API version."""
+    api_key = os.getenv("MJ_APIKEY_PUBLIC")
+    secret_key = os.getenv("MJ_APIKEY_PRIVATE")
+
+    return _get_or_create(('mailjet', version, api_key), lambda: MailjetClient(
+        auth=(api_key, secret_key), version=version))
+
+
+def reset_clients() -> None:
+    """Drop every cached client (tests / credential rotation)."""
+    with _lock:
+        _clients.clear()
+        _loop_clients.clear()
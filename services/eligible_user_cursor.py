@@ -0,0 +1,158 @@
+"""
+Keyset-paginated cursor over the users of a batch cron.
+
+The crons used to slice the eligible users with OFFSET (batch_number *
+batch_size). Users gaining or losing eligibility between two batches shifted
+the offsets, so some were skipped and others processed twice, and OFFSET cost
+grew with every batch. The cursor pages by `id > last_id` instead:
+
+- `claim_page` atomically reserves the next page of a cron run, recording the
+  last reserved id in a CronRunCheckpoint so the next invocation continues
+  where it stopped. The page stays in the checkpoint's in-flight list until
+  `complete_page`; a page whose invocation timed out or crashed is handed out
+  again once its lease expires, so users are processed at least once.
+- `iter_pages` streams every page as an async generator, for the manual
+  "process all users" triggers.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Optional, Sequence
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from AuditSystem.models import CronRunCheckpoint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_FIELDS = ('id', 'email', 'username')
+
+# A claimed page not completed within this long is handed out again
+PAGE_LEASE_MINUTES = 15
+
+
+class EligibleUserCursor:
+    """Pages through a User queryset by ascending id."""
+
+    def __init__(
+            self,
+            cron_name: str,
+            queryset_factory: Callable[[], QuerySet],
+            fields: Sequence[str] = DEFAULT_FIELDS,
+            page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        self.cron_name = cron_name
+        self.queryset_factory = queryset_factory
+        self.fields = tuple(fields)
+        self.page_size = page_size
+
+    def run_key(self) -> str:
+        """Checkpoint key of today's run of this cron."""
+        return f"{self.cron_name}:{timezone.localdate().isoformat()}"
+
+    def _fetch_page(self, last_id: int, limit: int) -> list[dict[str, Any]]:
+        return list(
+            self.queryset_factory().filter(id__gt=last_id).order_by('id').values(*self.fields)[:limit]
+        )
+
+    def _reclaim_expired_page(self, checkpoint: CronRunCheckpoint, now: datetime) -> list[dict[str, Any]]:
+        """Users of the first in-flight page whose lease expired, renewing the lease."""
+        for lease in list(checkpoint.in_flight):
+            if datetime.fromisoformat(lease['leased_until']) > now:
+                continue
+
+            users = list(
+                self.queryset_factory().filter(
+                    id__gt=lease['after_id'], id__lte=lease['through_id']
+                ).order_by('id').values(*self.fields)
+            )
+            if users:
+                lease['leased_until'] = (now + timedelta(minutes=PAGE_LEASE_MINUTES)).isoformat()
+                return users
+            # Nobody left in the page is eligible (done or no longer eligible)
+            checkpoint.in_flight.remove(lease)
+        return []
+
+    @sync_to_async
+    def claim_page(self, limit: int) -> list[dict[str, Any]]:
+        """Reserve the next `limit` users of today's run.
+
+        The checkpoint row is locked while the page is read and the checkpoint
+        moved forward, so concurrent invocations never get the same users.
+        Expired in-flight pages are handed out before new ones.
+        """
+        run_key = self.run_key()
+        CronRunCheckpoint.objects.get_or_create(run_key=run_key, defaults={'cron_name': self.cron_name})
+        now = timezone.now()
+
+        with transaction.atomic():
+            checkpoint = CronRunCheckpoint.objects.select_for_update().get(run_key=run_key)
+            users = self._reclaim_expired_page(checkpoint, now)
+
+            if not users:
+                users = self._fetch_page(checkpoint.last_id, limit)
+                if users:
+                    checkpoint.in_flight.append({
+                        'after_id': checkpoint.last_id,
+                        'through_id': users[-1]['id'],
+                        'leased_until': (now + timedelta(minutes=PAGE_LEASE_MINUTES)).isoformat(),
+                    })
+                    checkpoint.last_id = users[-1]['id']
+                    checkpoint.claimed_users += len(users)
+
+            if not users and not checkpoint.in_flight and checkpoint.completed_at is None:
+                checkpoint.completed_at = now
+            checkpoint.save()
+
+        logger.info(f"[{run_key}] claimed {len(users)} users (last_id={checkpoint.last_id})")
+        return users
+
+    @sync_to_async
+    def complete_page(self, users: list[dict[str, Any]]) -> None:
+        """Release a page returned by claim_page once every user in it was processed."""
+        if not users:
+            return
+        first_id, last_id = users[0]['id'], users[-1]['id']
+
+        with transaction.atomic():
+            checkpoint = CronRunCheckpoint.objects.select_for_update().filter(run_key=self.run_key()).first()
+            if checkpoint is None:
+                # The run's day ended while the page was processed
+                return
+            checkpoint.in_flight = [
+                lease for lease in checkpoint.in_flight
+                if not (lease['after_id'] < first_id and last_id <= lease['through_id'])
+            ]
+            checkpoint.save(update_fields=['in_flight', 'updated_at'])
+
+    async def iter_pages(self, page_size: Optional[int] = None) -> AsyncIterator[list[dict[str, Any]]]:
+        """Stream every eligible user, one page at a time, without a checkpoint."""
+        page_size = page_size or self.page_size
+        last_id = 0
+
+        while True:
+            page = await sync_to_async(self._fetch_page)(last_id, page_size)
+            if not page:
+                return
+            yield page
+            last_id = page[-1]['id']
+
+    async def pages(self, batch_size: int) -> AsyncIterator[list[dict[str, Any]]]:
+        """Pages for a cron invocation: the next claimed page, or every user when batch_size is 0.
+
+        The claimed page is completed when the caller asks for the next one,
+        i.e. after its loop body finished without raising.
+        """
+        if batch_size == 0:
+            async for page in self.iter_pages():
+                yield page
+            return
+
+        page = await self.claim_page(batch_size)
+        if page:
+            yield page
+            # Only reached once the caller processed the page without raising
+            await self.complete_page(page)
@@ -14,6 +14,12 @@ def get_creator_profile_data(user: User) -> dict:
     if not profile:
         raise CreatorProfile.DoesNotExist
 
+    return build_creator_profile_data(profile, user, get_random_visual_style(profile, user))
+
+
+def build_creator_profile_data(profile: CreatorProfile, user: User, visual_style: str) -> dict:
+    """Build the prompt profile data from an already loaded profile."""
+
     # Use business_name for email greeting, with safe fallbacks
     # Priority: business_name > first_name > username prefix > 'Empreendedor'
     # Note: strip() handles whitespace-only strings (e.g., "   " becomes "")
@@ -48,7 +54,7 @@ def get_creator_profile_data(user: User) -> dict:
         "main_competitors": profile.main_competitors,
         "reference_profiles": profile.reference_profiles,
         "voice_tone": profile.voice_tone,
-        "visual_style": get_random_visual_style(profile, user),
+        "visual_style": visual_style,
         'color_palette': [] if not any([
             profile.color_1, profile.color_2,
             profile.color_3, profile.color_4, profile.color_5
@@ -15,16 +15,13 @@ For our use case:
 """
 import logging
 import os
-import time
 from typing import Any, Dict, List, Optional
 
 import requests
 
-logger = logging.getLogger(__name__)
+from services.resource_limiter import JINA, resource_limiter
 
-# Rate limiting (conservative to avoid blocks)
-RATE_LIMIT_REQUESTS_PER_SECOND = 2
-RATE_LIMIT_INTERVAL = 1.0 / RATE_LIMIT_REQUESTS_PER_SECOND
+logger = logging.getLogger(__name__)
 
 # Request timeout: (connect_timeout, read_timeout)
 # Aggressive values to avoid blocking enrichment for slow academic/gov sites.
@@ -37,18 +34,12 @@ JINA_READER_URL = 'https://r.jina.ai/'
 class JinaReaderService:
     """Service for extracting clean content from URLs via Jina Reader."""
 
-    _last_request_time: float = 0.0
-
     def __init__(self):
         self.api_key = os.getenv('JINA_API_KEY', '')
 
     def _rate_limit(self) -> None:
-        """Apply rate limiting between requests."""
-        now = time.time()
-        elapsed = now - JinaReaderService._last_request_time
-        if elapsed < RATE_LIMIT_INTERVAL:
-            time.sleep(RATE_LIMIT_INTERVAL - elapsed)
-        JinaReaderService._last_request_time = time.time()
+        """Wait for the shared Jina token bucket (conservative to avoid blocks)."""
+        resource_limiter.acquire_sync(JINA)
 
     def _get_headers(
         self,
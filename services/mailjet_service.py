@@ -4,8 +4,9 @@ import os
 
 from asgiref.sync import sync_to_async
 from AuditSystem.services import AuditService
-from mailjet_rest import Client
 
+from .client_registry import get_mailjet_client
+from .resource_limiter import MAILJET, resource_limiter
 from .s3_sevice import S3Service
 
 logger = logging.getLogger(__name__)
@@ -18,8 +19,7 @@ class MailjetService:
         self.sender_email = os.getenv("SENDER_EMAIL")
         self.sender_name = os.getenv("SENDER_NAME")
         self.base_url = "https://api.mailjet.com/v3.1/send"
-        self.mailjet_client = Client(
-            auth=(self.api_key, self.secret_key), version='v3.1')
+        self.mailjet_client = get_mailjet_client('v3.1')
         self.message_data = {
             "From": {
                 "Email": self.sender_email,
@@ -47,6 +47,7 @@ class MailjetService:
                 message_data["InlinedAttachments"].extend(inline_attachments)
 
             data = {"Messages": [message_data]}
+            await resource_limiter.acquire(MAILJET)
             result = self.mailjet_client.send.create(data=data)
 
             await sync_to_async(audit_service.log_system_operation)(
@@ -0,0 +1,107 @@
+"""
+Circuit breaker for Gemini models, shared by every in-flight call.
+
+State lives in the model health backend (see services.model_health_registry),
+so with AI_HEALTH_BACKEND=cache every process/lambda sees the same breakers:
+once a model starts failing with retryable errors (503, 429, overloaded...)
+the remaining calls skip it instead of each one rediscovering the outage
+through its own retry ladder.
+
+States per model:
+- closed: requests flow normally
+- open: model is skipped until the cooldown (or the server's Retry-After) ends
+- half-open: after the cooldown requests flow again, but the failure count is
+  kept, so a single new failure reopens the circuit and a success closes it
+"""
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from services.model_health_registry import get_health_backend
+
+logger = logging.getLogger(__name__)
+
+# Consecutive retryable failures that open the circuit for a model
+FAILURE_THRESHOLD = int(os.getenv('AI_BREAKER_FAILURE_THRESHOLD', 3))
+
+# Seconds a tripped model stays skipped when the server gives no hint
+COOLDOWN_SECONDS = float(os.getenv('AI_BREAKER_COOLDOWN_SECONDS', 60))
+
+# How long breaker state is remembered after the last failure
+STATE_TTL_SECONDS = int(os.getenv('AI_BREAKER_STATE_TTL_SECONDS', 3600))
+
+
+class ModelCircuitBreaker:
+    """Tracks consecutive retryable failures per model name."""
+
+    @staticmethod
+    def _key(model: str) -> str:
+        return f"breaker:{model}"
+
+    @classmethod
+    def get_state(cls, model: str) -> Dict[str, Any]:
+        """Return the breaker state of a model."""
+        state = get_health_backend().get(cls._key(model)) or {}
+        open_until = state.get('open_until', 0.0)
+        failures = state.get('failures', 0)
+
+        if open_until > time.time():
+            circuit = 'open'
+        elif failures >= FAILURE_THRESHOLD or open_until:
+            circuit = 'half_open'
+        else:
+            circuit = 'closed'
+
+        return {
+            'circuit': circuit,
+            'consecutive_failures': failures,
+            'open_until': open_until or None,
+        }
+
+    @classmethod
+    def is_open(cls, model: str) -> bool:
+        """Return True while the model should be skipped."""
+        state = get_health_backend().get(cls._key(model)) or {}
+        return state.get('open_until', 0.0) > time.time()
+
+    @classmethod
+    def record_success(cls, model: str) -> None:
+        """Close the circuit for a model after a successful call."""
+        backend = get_health_backend()
+        if backend.get(cls._key(model)):
+            backend.set(cls._key(model), {}, STATE_TTL_SECONDS)
+
+    @classmethod
+    def record_failure(cls, model: str, open_for: Optional[float] = None) -> None:
+        """
+        Register a retryable failure for a model.
+
+        Args:
+            model: Model name
+            open_for: Force the circuit open for this many seconds (e.g. a long
+                Retry-After sent by the server), regardless of the threshold
+        """
+        backend = get_health_backend()
+        state = backend.get(cls._key(model)) or {}
+        failures = state.get('failures', 0) + 1
+        state['failures'] = failures
+
+        if failures >= FAILURE_THRESHOLD or open_for:
+            cooldown = open_for or COOLDOWN_SECONDS
+            state['open_until'] = time.time() + cooldown
+            logger.warning(
+                f"[AI BREAKER] Circuit open for {model} "
+                f"({failures} failures, cooldown {cooldown:.0f}s)")
+
+        backend.set(cls._key(model), state, STATE_TTL_SECONDS)
+
+    @classmethod
+    def soonest_available(cls, models: List[str]) -> str:
+        """Return the model whose circuit reopens first (used when all are open)."""
+        return min(models, key=lambda model: cls.get_state(model)['open_until'] or 0.0)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Clear all breaker and health state from the backend."""
+        get_health_backend().clear()
@@ -0,0 +1,203 @@
+"""
+Health registry for Gemini models.
+
+Keeps a rolling window of outcomes (success/failure and latency) per model
+name so AiService can start each request at the healthiest model instead of
+always walking its fallback list from the top. The same storage backend also
+holds ModelCircuitBreaker state.
+
+Backends (AI_HEALTH_BACKEND):
+- 'memory' (default): in-process dict, shared by every call in the worker
+- 'cache': Django cache framework; shared across processes/lambdas when
+  CACHES points at a shared store (e.g. django.core.cache.backends.redis.RedisCache)
+
+Updates are read-modify-write without cross-process locking; a lost sample
+under contention only makes the statistics slightly less precise.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rolling window used to compute error rate and latency
+HEALTH_WINDOW_SECONDS = int(os.getenv('AI_HEALTH_WINDOW_SECONDS', 300))
+
+# Maximum samples kept per model inside the window
+HEALTH_MAX_SAMPLES = int(os.getenv('AI_HEALTH_MAX_SAMPLES', 50))
+
+# Minimum samples before a model's error rate is trusted for ordering
+HEALTH_MIN_SAMPLES = int(os.getenv('AI_HEALTH_MIN_SAMPLES', 3))
+
+
+class InProcessHealthBackend:
+    """Key/value store kept in the worker's memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, tuple[Any, float]] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                self._data.pop(key, None)
+                return None
+            return value
+
+    def set(self, key: str, value: Any, timeout: int) -> None:
+        with self._lock:
+            self._data[key] = (value, time.time() + timeout)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoCacheHealthBackend:
+    """Key/value store on top of the Django cache framework.
+
+    Keys carry a version number kept in the cache itself; `clear` bumps it,
+    so every process stops seeing the old entries (which then expire by
+    themselves) without touching anything else in the cache.
+    """
+
+    prefix = 'ai_health'
+
+    def __init__(self, alias: str = 'default'):
+        self.alias = alias
+
+    @property
+    def _cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.prefix}:version"
+
+    def _versioned(self, key: str) -> str:
+        version = self._cache.get_or_set(self._version_key, 1, None)
+        return f"{self.prefix}:v{version}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            return self._cache.get(self._versioned(key))
+        except Exception as e:
+            logger.warning(f"[AI HEALTH] Cache read failed for {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, value: Any, timeout: int) -> None:
+        try:
+            self._cache.set(self._versioned(key), value, timeout)
+        except Exception as e:
+            logger.warning(f"[AI HEALTH] Cache write failed for {key}: {str(e)}")
+
+    def clear(self) -> None:
+        try:
+            self._cache.add(self._version_key, 1, None)
+            self._cache.incr(self._version_key)
+        except Exception as e:
+            logger.warning(f"[AI HEALTH] Cache clear failed: {str(e)}")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_health_backend():
+    """Return the configured backend (created once per process)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_name = os.getenv('AI_HEALTH_BACKEND', 'memory').lower()
+                if backend_name == 'cache':
+                    _backend = DjangoCacheHealthBackend(
+                        os.getenv('AI_HEALTH_CACHE_ALIAS', 'default'))
+                else:
+                    _backend = InProcessHealthBackend()
+    return _backend
+
+
+def set_health_backend(backend) -> None:
+    """Replace the backend (useful for tests or custom stores)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+class ModelHealthRegistry:
+    """Rolling error rate and latency per model name."""
+
+    @staticmethod
+    def _key(model: str) -> str:
+        return f"samples:{model}"
+
+    @classmethod
+    def record(cls, model: str, success: bool, latency: float) -> None:
+        """Register the outcome of a call to a model."""
+        backend = get_health_backend()
+        now = time.time()
+        samples = [
+            sample for sample in (backend.get(cls._key(model)) or [])
+            if sample[0] >= now - HEALTH_WINDOW_SECONDS
+        ]
+        samples.append((now, bool(success), round(latency, 3)))
+        backend.set(cls._key(model), samples[-HEALTH_MAX_SAMPLES:], HEALTH_WINDOW_SECONDS)
+
+    @classmethod
+    def get_stats(cls, model: str) -> Dict[str, Any]:
+        """Return error rate and latency for a model over the rolling window."""
+        now = time.time()
+        samples = [
+            sample for sample in (get_health_backend().get(cls._key(model)) or [])
+            if sample[0] >= now - HEALTH_WINDOW_SECONDS
+        ]
+        total = len(samples)
+        failures = sum(1 for _, success, _ in samples if not success)
+        latencies = sorted(latency for _, success, latency in samples if success)
+
+        return {
+            'model': model,
+            'samples': total,
+            'failures': failures,
+            'error_rate': round(failures / total, 3) if total else 0.0,
+            'avg_latency_seconds': round(sum(latencies) / len(latencies), 3) if latencies else None,
+            'p95_latency_seconds': latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        }
+
+    @classmethod
+    def order_models(cls, models: List[str]) -> List[str]:
+        """
+        Sort models from healthiest to least healthy.
+
+        Models without enough samples keep their configured position relative
+        to each other, so the preferred model is still tried first when there
+        is no evidence against it.
+        """
+        def sort_key(indexed_model):
+            index, model = indexed_model
+            stats = cls.get_stats(model)
+            if stats['samples'] < HEALTH_MIN_SAMPLES:
+                return (0.0, index)
+            return (stats['error_rate'], index)
+
+        return [model for _, model in sorted(enumerate(models), key=sort_key)]
+
+    @classmethod
+    def snapshot(cls, models: List[str]) -> List[Dict[str, Any]]:
+        """Health stats plus breaker state for each model (debug endpoint)."""
+        from services.model_circuit_breaker import ModelCircuitBreaker
+
+        snapshot = []
+        for model in models:
+            stats = cls.get_stats(model)
+            stats.update(ModelCircuitBreaker.get_state(model))
+            snapshot.append(stats)
+        return snapshot
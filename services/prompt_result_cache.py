@@ -0,0 +1,104 @@
+"""
+Content-addressed cache for deterministic AiService calls.
+
+Results are keyed by (model family, prompt_list hash, config hash), so the same
+semantic analysis requested by generate_post_idea, generate_image_for_idea and
+the daily feed image costs a single Gemini call while the entry is fresh.
+
+The cache is opt-in per call (AiService.generate_text(..., cache=True)), lives
+in the worker's memory with TTL and LRU eviction, and keeps hit/miss counters.
+
+Settings (env):
+- AI_PROMPT_CACHE_TTL_SECONDS: entry lifetime (default 3600)
+- AI_PROMPT_CACHE_MAX_ENTRIES: LRU capacity (default 256)
+- AI_PROMPT_CACHE_HIT_CREDITS: 'free' (default) skips credit checks and
+  deduction on a hit, 'charge' bills the hit like a regular generation
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+CACHE_TTL_SECONDS = int(os.getenv('AI_PROMPT_CACHE_TTL_SECONDS', 3600))
+CACHE_MAX_ENTRIES = int(os.getenv('AI_PROMPT_CACHE_MAX_ENTRIES', 256))
+CACHE_HIT_CREDIT_POLICY = os.getenv('AI_PROMPT_CACHE_HIT_CREDITS', 'free').lower()
+
+
+class PromptResultCache:
+    """Thread-safe TTL + LRU cache of (model, result) pairs."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: int = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def build_key(model_family: str, prompt_list: list[str], config: Any = None) -> str:
+        """Hash the model family, prompts and generation config into a cache key."""
+        if config is None:
+            config_repr = ''
+        elif hasattr(config, 'model_dump'):
+            # response_schema may be a pydantic class, which has no JSON form
+            config_repr = json.dumps(config.model_dump(exclude_none=True), sort_keys=True, default=str)
+        else:
+            config_repr = repr(config)
+
+        payload = json.dumps(
+            [model_family, list(prompt_list), config_repr], ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[tuple[str, Any]]:
+        """Return (model, result) for a fresh entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def set(self, key: str, model: str, result: Any) -> None:
+        """Store a result, evicting the least recently used entries when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, model, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+            }
+
+
+# Shared by every AiService instance in the process
+prompt_result_cache = PromptResultCache()
@@ -0,0 +1,144 @@
+"""
+Per-resource token buckets shared by the whole process.
+
+Every downstream service the crons call has its own quota: Gemini text and
+image requests, Serper searches, Jina reads, Mailjet sends and the database.
+Each one gets a TokenBucket (rate per second plus a burst capacity) so that
+heavy image generation never eats the budget of cheap text calls, and every
+bucket records how many callers are waiting and how long they waited.
+
+Buckets hold no asyncio primitives, so the same bucket serves every event
+loop (the crons use a new loop per invocation) and the sync callers that run
+in worker threads (`acquire_sync`).
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+GEMINI_TEXT = 'gemini_text'
+GEMINI_IMAGE = 'gemini_image'
+SERPER = 'serper'
+JINA = 'jina'
+MAILJET = 'mailjet'
+DB = 'db'
+
+# resource: (tokens per second, burst capacity)
+DEFAULT_RESOURCE_RATES = {
+    GEMINI_TEXT: (float(os.getenv('GEMINI_TEXT_RATE_PER_SECOND', 10)), 20),
+    GEMINI_IMAGE: (float(os.getenv('GEMINI_IMAGE_RATE_PER_SECOND', 2)), 4),
+    SERPER: (float(os.getenv('SERPER_RATE_PER_SECOND', 10)), float(os.getenv('SERPER_BURST', 10))),
+    JINA: (float(os.getenv('JINA_RATE_PER_SECOND', 2)), 2),
+    MAILJET: (float(os.getenv('MAILJET_RATE_PER_SECOND', 10)), 10),
+    DB: (float(os.getenv('DB_RATE_PER_SECOND', 200)), 200),
+}
+
+
+class TokenBucket:
+    """Token bucket with a weighted acquire and wait-time metrics."""
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError(f"Resource {name} needs a positive rate and capacity")
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.waiting = 0
+        self.max_waiting = 0
+        self.acquired = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _try_take(self, weight: float) -> float:
+        """Take `weight` tokens if available; otherwise return the seconds until they are."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= weight:
+                self._tokens -= weight
+                return 0.0
+            return (weight - self._tokens) / self.rate
+
+    def _check_weight(self, weight: float) -> None:
+        if weight > self.capacity:
+            raise ValueError(f"Weight {weight} exceeds the capacity of resource {self.name}")
+
+    def _start_wait(self) -> float:
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+        return time.monotonic()
+
+    def _finish_wait(self, started_at: float) -> None:
+        waited = time.monotonic() - started_at
+        with self._lock:
+            self.waiting -= 1
+            self.acquired += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    async def acquire(self, weight: float = 1) -> None:
+        """Wait (without blocking the loop) until `weight` tokens are available."""
+        self._check_weight(weight)
+        started_at = self._start_wait()
+        try:
+            while (delay := self._try_take(weight)) > 0:
+                await asyncio.sleep(delay)
+        finally:
+            self._finish_wait(started_at)
+
+    def acquire_sync(self, weight: float = 1) -> None:
+        """Blocking acquire for sync callers (requests-based clients in threads)."""
+        self._check_weight(weight)
+        started_at = self._start_wait()
+        try:
+            while (delay := self._try_take(weight)) > 0:
+                time.sleep(delay)
+        finally:
+            self._finish_wait(started_at)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rate_per_second': self.rate,
+                'queue_depth': self.waiting,
+                'max_queue_depth': self.max_waiting,
+                'acquired': self.acquired,
+                'avg_wait_seconds': round(self.total_wait_seconds / self.acquired, 4) if self.acquired else 0.0,
+                'max_wait_seconds': round(self.max_wait_seconds, 4),
+            }
+
+
+class ResourceLimiter:
+    """Registry of the token buckets, one per downstream resource."""
+
+    def __init__(self, rates: Optional[Dict[str, tuple[float, float]]] = None):
+        rates = rates if rates is not None else DEFAULT_RESOURCE_RATES
+        self.buckets = {
+            name: TokenBucket(name, rate, capacity) for name, (rate, capacity) in rates.items()
+        }
+
+    def bucket(self, resource: str) -> TokenBucket:
+        try:
+            return self.buckets[resource]
+        except KeyError:
+            raise ValueError(f"Unknown resource: {resource}") from None
+
+    async def acquire(self, resource: str, weight: float = 1) -> None:
+        await self.bucket(resource).acquire(weight)
+
+    def acquire_sync(self, resource: str, weight: float = 1) -> None:
+        self.bucket(resource).acquire_sync(weight)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: bucket.stats() for name, bucket in self.buckets.items()}
+
+
+resource_limiter = ResourceLimiter()
@@ -2,21 +2,17 @@ import logging
 import os
 import uuid
 
-import boto3
 from django.contrib.auth.models import User
 
+from .client_registry import get_s3_client
+
 logger = logging.getLogger(__name__)
 
 
 class S3Service:
     def __init__(self):
         self.region = os.getenv('AWS_S3_REGION_NAME', 'us-east-1')
-        self.client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=self.region
-        )
+        self.client = get_s3_client(self.region)
         self.image_bucket = os.getenv('AWS_S3_IMAGE_BUCKET')
 
     def upload_image(self, user: User, image_bytes: bytes | str) -> str:
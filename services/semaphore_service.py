@@ -1,32 +1,98 @@
 import asyncio
+import logging
 import os
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Optional
+
+from .resource_limiter import ResourceLimiter, resource_limiter
+
+logger = logging.getLogger(__name__)
 
 
 class SemaphoreService:
-    def __init__(self):
-        self.max_concurrent_users = os.getenv('MAX_CONCURRENT_USERS', 50)
-        self.semaphore = asyncio.Semaphore(int(self.max_concurrent_users))
+    """Bounded worker pool for per-user jobs, plus the shared resource buckets.
+
+    Users are fed through a bounded queue to at most MAX_CONCURRENT_USERS
+    workers, so a batch of 5,000 users holds a handful of coroutines instead
+    of 5,000. Calls to downstream services inside a job go through
+    `acquire(resource)`, which waits on that resource's token bucket.
+    """
+
+    def __init__(self, max_concurrent_users: Optional[int] = None, limiter: Optional[ResourceLimiter] = None):
+        self.max_concurrent_users = int(max_concurrent_users or os.getenv('MAX_CONCURRENT_USERS', 50))
+        self.limiter = limiter or resource_limiter
+        self.queue_stats = {
+            'workers': 0,
+            'processed': 0,
+            'max_queue_depth': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+        }
+
+    async def acquire(self, resource: str, weight: float = 1) -> None:
+        """Wait for `weight` tokens of a downstream resource (gemini_text, serper, ...)."""
+        await self.limiter.acquire(resource, weight)
 
-    async def process_with_semaphore(self, function: callable, user_data: Dict):
-        async with self.semaphore:
-            return await function(user_data)
+    def _record_wait(self, waited: float, queue_depth: int) -> None:
+        self.queue_stats['processed'] += 1
+        self.queue_stats['total_wait_seconds'] += waited
+        self.queue_stats['max_wait_seconds'] = max(self.queue_stats['max_wait_seconds'], waited)
+        self.queue_stats['max_queue_depth'] = max(self.queue_stats['max_queue_depth'], queue_depth)
 
     async def process_concurrently(self, users: List[Dict], function: callable) -> List[Dict[str, Any]]:
-        """Process users in batches to respect concurrency limits."""
-        tasks = [self.process_with_semaphore(
-            function=function, user_data=user) for user in users]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    'user_id': users[i]['id'],
-                    'user': users[i]['email'],
-                    'status': 'failed',
-                    'error': str(result)
-                })
-            else:
-                processed_results.append(result)
-        return processed_results
+        """Process users through the worker pool; results keep the order of `users`."""
+        if not users:
+            return []
+
+        workers = min(self.max_concurrent_users, len(users))
+        self.queue_stats['workers'] = workers
+        queue: asyncio.Queue = asyncio.Queue(maxsize=workers)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(users)
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    queue.task_done()
+                    return
+                index, user, enqueued_at = item
+                self._record_wait(time.monotonic() - enqueued_at, queue.qsize())
+                try:
+                    results[index] = await function(user)
+                except Exception as e:
+                    results[index] = {
+                        'user_id': user.get('id'),
+                        'user': user.get('email'),
+                        'status': 'failed',
+                        'error': str(e)
+                    }
+                finally:
+                    queue.task_done()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            for index, user in enumerate(users):
+                await queue.put((index, user, time.monotonic()))
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        logger.info(f"Processed {len(users)} users with {workers} workers: {self.stats()}")
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Work queue depth/wait time and the per-resource token bucket metrics."""
+        processed = self.queue_stats['processed']
+        return {
+            'queue': {
+                'workers': self.queue_stats['workers'],
+                'processed': processed,
+                'max_queue_depth': self.queue_stats['max_queue_depth'],
+                'avg_wait_seconds': round(self.queue_stats['total_wait_seconds'] / processed, 4) if processed else 0.0,
+                'max_wait_seconds': round(self.queue_stats['max_wait_seconds'], 4),
+            },
+            'resources': self.limiter.stats(),
+        }
@@ -0,0 +1,215 @@
+"""
+Response cache and request coalescing in front of the Serper API.
+
+TrendsDiscoveryService and the enrichment search issue the same sector and
+news queries for every user sharing a specialization, and every one of them
+is a paid Serper query. Responses are cached in the Django cache framework
+keyed by (endpoint, normalized query, gl, hl, num, date filter), so they
+are shared across processes when CACHES points at a shared store (e.g.
+django.core.cache.backends.redis.RedisCache).
+
+Concurrent identical queries inside the process share a single HTTP call:
+the first caller fetches, the others wait for its result (sync callers
+across threads, async callers within their event loop). Failed requests
+are never cached.
+
+Settings (env):
+- SERPER_CACHE_TTL_SEARCH_SECONDS: organic search lifetime (default 86400)
+- SERPER_CACHE_TTL_NEWS_SECONDS: news lifetime (default 3600, news moves fast)
+- SERPER_CACHE_ALIAS: Django cache alias (default 'default')
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SEARCH_ENDPOINT = 'search'
+NEWS_ENDPOINT = 'news'
+
+ENDPOINT_TTL_SECONDS = {
+    SEARCH_ENDPOINT: int(os.getenv('SERPER_CACHE_TTL_SEARCH_SECONDS', 86400)),
+    NEWS_ENDPOINT: int(os.getenv('SERPER_CACHE_TTL_NEWS_SECONDS', 3600)),
+}
+CACHE_ALIAS = os.getenv('SERPER_CACHE_ALIAS', 'default')
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace, so trivially different queries share an entry."""
+    return ' '.join((query or '').lower().split())
+
+
+class SerperResultCache:
+    """Django cache of raw Serper responses with in-flight coalescing and hit counters."""
+
+    prefix = 'serper'
+
+    def __init__(self, alias: str = CACHE_ALIAS, ttl_seconds: Optional[Dict[str, int]] = None):
+        self.alias = alias
+        self.ttl_seconds = {**ENDPOINT_TTL_SECONDS, **(ttl_seconds or {})}
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._async_in_flight: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]' = (
+            weakref.WeakKeyDictionary()
+        )
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def _cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def build_key(self, endpoint: str, payload: Dict[str, Any]) -> str:
+        """Key of (endpoint, normalized query, gl, hl, num, date filter)."""
+        parts = [
+            endpoint,
+            normalize_query(payload.get('q', '')),
+            payload.get('gl'),
+            payload.get('hl'),
+            payload.get('num'),
+            payload.get('tbs'),
+        ]
+        digest = hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()
+        return f"{self.prefix}:{digest}"
+
+    def _count(self, endpoint: str, counter: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                endpoint, {'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0})
+            counters[counter] += 1
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._cache.get(key)
+        except Exception as e:
+            logger.warning(f"[SERPER CACHE] Cache read failed: {str(e)}")
+            return None
+
+    def _write(self, key: str, endpoint: str, data: Dict[str, Any]) -> None:
+        try:
+            self._cache.set(key, data, self.ttl_seconds.get(endpoint, ENDPOINT_TTL_SECONDS[SEARCH_ENDPOINT]))
+        except Exception as e:
+            logger.warning(f"[SERPER CACHE] Cache write failed: {str(e)}")
+
+    def get_or_fetch(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        fetch: Callable[[], Optional[Dict[str, Any]]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response for the request, or fetch it once.
+
+        Args:
+            endpoint: Serper endpoint name ('search', 'news')
+            payload: Request payload (q, gl, hl, num, tbs)
+            fetch: Performs the request; returns the response JSON or None on error
+
+        Returns:
+            Response JSON, or None if the request failed
+        """
+        key = self.build_key(endpoint, payload)
+        data = self._read(key)
+        if data is not None:
+            self._count(endpoint, 'hits')
+            return data
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+
+        if not owner:
+            self._count(endpoint, 'coalesced')
+            return future.result()
+
+        self._count(endpoint, 'misses')
+        data = None
+        try:
+            data = fetch()
+            if data is None:
+                self._count(endpoint, 'errors')
+            else:
+                self._write(key, endpoint, data)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_result(data)
+        return data
+
+    async def aget_or_fetch(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Optional[Dict[str, Any]]:
+        """Async get_or_fetch: coroutines of the same loop share one in-flight request."""
+        key = self.build_key(endpoint, payload)
+        data = self._read(key)
+        if data is not None:
+            self._count(endpoint, 'hits')
+            return data
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            in_flight = self._async_in_flight.setdefault(loop, {})
+            future = in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = in_flight[key] = loop.create_future()
+
+        if not owner:
+            self._count(endpoint, 'coalesced')
+            # shield: a cancelled waiter must not cancel the request of the others
+            return await asyncio.shield(future)
+
+        self._count(endpoint, 'misses')
+        data = None
+        try:
+            data = await fetch()
+            if data is None:
+                self._count(endpoint, 'errors')
+            else:
+                self._write(key, endpoint, data)
+        finally:
+            with self._lock:
+                in_flight.pop(key, None)
+            future.set_result(data)
+        return data
+
+    def clear_stats(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per endpoint and the Serper queries saved."""
+        with self._lock:
+            endpoints = {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+
+        for counters in endpoints.values():
+            lookups = counters['hits'] + counters['misses'] + counters['coalesced']
+            counters['hit_rate'] = round((counters['hits'] + counters['coalesced']) / lookups, 3) if lookups else 0.0
+
+        hits = sum(counters['hits'] for counters in endpoints.values())
+        coalesced = sum(counters['coalesced'] for counters in endpoints.values())
+        misses = sum(counters['misses'] for counters in endpoints.values())
+        lookups = hits + coalesced + misses
+        return {
+            'hits': hits,
+            'coalesced': coalesced,
+            'misses': misses,
+            'queries_saved': hits + coalesced,
+            'hit_rate': round((hits + coalesced) / lookups, 3) if lookups else 0.0,
+            'endpoints': endpoints,
+        }
+
+
+# Shared by every SerperSearchService instance in the process
+serper_result_cache = SerperResultCache()
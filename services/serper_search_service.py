@@ -12,41 +12,67 @@ For our use case (enrichment):
 - ~24 searches per user (6 categories x 4 opportunities)
 - 2,500 free queries = ~104 users/month for free
 - Much better quality than SearXNG (real Google results)
+
+The async methods (asearch, asearch_news) post through one aiohttp session
+per event loop, so searches run on the loop without a worker thread per
+call and reuse pooled connections. Sync and async calls share the same
+Serper token bucket and response cache.
 """
+import asyncio
 import os
-import time
 import logging
-from typing import List, Dict, Any, Optional
+import weakref
+from typing import Awaitable, List, Dict, Any, Optional
 
+import aiohttp
 import requests
 
-logger = logging.getLogger(__name__)
+from services.resource_limiter import SERPER, resource_limiter
+from services.serper_result_cache import NEWS_ENDPOINT, SEARCH_ENDPOINT, serper_result_cache
 
-# Rate limiting (Serper allows 300/sec, but we keep it conservative)
-RATE_LIMIT_QUERIES_PER_SECOND = 10
-RATE_LIMIT_INTERVAL = 1.0 / RATE_LIMIT_QUERIES_PER_SECOND
+logger = logging.getLogger(__name__)
 
 # Serper API endpoints
 SERPER_SEARCH_URL = 'https://google.serper.dev/search'
 SERPER_NEWS_URL = 'https://google.serper.dev/news'
 SERPER_ACCOUNT_URL = 'https://google.serper.dev/account'
 
+REQUEST_TIMEOUT = 10
+MAX_CONNECTIONS = int(os.getenv('SERPER_MAX_CONNECTIONS', 20))
+
+_sessions: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_serper_session() -> aiohttp.ClientSession:
+    """Shared Serper session of the running event loop (created on first use)."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300),
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_serper_session() -> None:
+    """Close the running loop's Serper session, if one was opened."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
 
 class SerperSearchService:
     """Service for performing Google searches via Serper API."""
 
-    _last_request_time: float = 0.0
-
     def __init__(self):
         self.api_key = os.getenv('SERPER_API_KEY', '')
 
     def _rate_limit(self) -> None:
-        """Apply rate limiting between requests."""
-        now = time.time()
-        elapsed = now - SerperSearchService._last_request_time
-        if elapsed < RATE_LIMIT_INTERVAL:
-            time.sleep(RATE_LIMIT_INTERVAL - elapsed)
-        SerperSearchService._last_request_time = time.time()
+        """Wait for the shared Serper token bucket (Serper allows 300/sec, we stay conservative)."""
+        resource_limiter.acquire_sync(SERPER)
 
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with API key."""
@@ -72,13 +98,20 @@ class SerperSearchService:
             payload['tbs'] = f'qdr:{date_filter}'
         return payload
 
-    def _handle_response_errors(self, response: requests.Response) -> bool:
-        """Handle API response errors. Returns True if OK, False if error."""
-        if response.status_code == 401:
+    @staticmethod
+    def _is_account_error(status_code: int) -> bool:
+        """Log and flag invalid key / quota responses."""
+        if status_code == 401:
             logger.error("Serper API authentication failed (invalid API key)")
-            return False
-        if response.status_code == 429:
+            return True
+        if status_code == 429:
             logger.error("Serper API rate limit exceeded")
+            return True
+        return False
+
+    def _handle_response_errors(self, response: requests.Response) -> bool:
+        """Handle API response errors. Returns True if OK, False if error."""
+        if self._is_account_error(response.status_code):
             return False
         response.raise_for_status()
         return True
@@ -108,6 +141,69 @@ class SerperSearchService:
             })
         return results
 
+    def _fetch(self, endpoint: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST a query to Serper. Returns the response JSON, or None on error."""
+        self._rate_limit()
+
+        query = payload['q']
+        try:
+            response = requests.post(
+                endpoint, json=payload, headers=self._get_headers(), timeout=10
+            )
+
+            if not self._handle_response_errors(response):
+                return None
+
+            return response.json()
+
+        except requests.exceptions.Timeout:
+            logger.error(f"Serper search timeout for '{query}'")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Serper search failed for '{query}': {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error in Serper search: {str(e)}")
+        return None
+
+    async def _afetch(self, endpoint: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Async _fetch over the loop's shared session."""
+        await resource_limiter.acquire(SERPER)
+
+        query = payload['q']
+        try:
+            async with get_serper_session().post(
+                endpoint,
+                json=payload,
+                headers=self._get_headers(),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as response:
+                if self._is_account_error(response.status):
+                    return None
+                response.raise_for_status()
+                return await response.json()
+
+        except asyncio.TimeoutError:
+            logger.error(f"Serper search timeout for '{query}'")
+        except aiohttp.ClientError as e:
+            logger.error(f"Serper search failed for '{query}': {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error in Serper search: {str(e)}")
+        return None
+
+    @staticmethod
+    def _endpoint_url(endpoint_name: str) -> str:
+        return SERPER_NEWS_URL if endpoint_name == NEWS_ENDPOINT else SERPER_SEARCH_URL
+
+    def _cached_fetch(self, endpoint_name: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Response for the payload from the shared cache, fetching it on a miss."""
+        endpoint = self._endpoint_url(endpoint_name)
+        return serper_result_cache.get_or_fetch(
+            endpoint_name, payload, lambda: self._fetch(endpoint, payload))
+
+    def _acached_fetch(self, endpoint_name: str, payload: Dict[str, Any]) -> Awaitable[Optional[Dict[str, Any]]]:
+        endpoint = self._endpoint_url(endpoint_name)
+        return serper_result_cache.aget_or_fetch(
+            endpoint_name, payload, lambda: self._afetch(endpoint, payload))
+
     def search(
         self,
         query: str,
@@ -131,32 +227,14 @@ class SerperSearchService:
             logger.warning("Serper API key not configured")
             return []
 
-        self._rate_limit()
-
-        try:
-            payload = self._build_payload(query, num_results, date_filter)
-            endpoint = SERPER_NEWS_URL if search_type == 'news' else SERPER_SEARCH_URL
-
-            response = requests.post(
-                endpoint, json=payload, headers=self._get_headers(), timeout=10
-            )
-
-            if not self._handle_response_errors(response):
-                return []
-
-            data = response.json()
-            results = self._parse_organic_results(data)
-
-            logger.info(f"Serper search for '{query[:30]}...' returned {len(results)} results")
-            return results
+        payload = self._build_payload(query, num_results, date_filter)
+        data = self._cached_fetch(NEWS_ENDPOINT if search_type == 'news' else SEARCH_ENDPOINT, payload)
+        if data is None:
+            return []
 
-        except requests.exceptions.Timeout:
-            logger.error(f"Serper search timeout for '{query}'")
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Serper search failed for '{query}': {str(e)}")
-        except Exception as e:
-            logger.error(f"Unexpected error in Serper search: {str(e)}")
-        return []
+        results = self._parse_organic_results(data)
+        logger.info(f"Serper search for '{query[:30]}...' returned {len(results)} results")
+        return results
 
     def search_news(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
         """
@@ -172,21 +250,44 @@ class SerperSearchService:
         if not self.api_key:
             return []
 
-        self._rate_limit()
+        data = self._cached_fetch(NEWS_ENDPOINT, self._build_payload(query, num_results))
+        if data is None:
+            return []
 
-        try:
-            payload = self._build_payload(query, num_results)
-            response = requests.post(
-                SERPER_NEWS_URL, json=payload, headers=self._get_headers(), timeout=10
-            )
-            response.raise_for_status()
+        return self._parse_news_results(data)
 
-            return self._parse_news_results(response.json())
+    async def asearch(
+        self,
+        query: str,
+        num_results: int = 5,
+        search_type: str = 'search',
+        date_filter: str = None
+    ) -> List[Dict[str, Any]]:
+        """Async version of search()."""
+        if not self.api_key:
+            logger.warning("Serper API key not configured")
+            return []
 
-        except Exception as e:
-            logger.error(f"Serper news search failed: {str(e)}")
+        payload = self._build_payload(query, num_results, date_filter)
+        data = await self._acached_fetch(NEWS_ENDPOINT if search_type == 'news' else SEARCH_ENDPOINT, payload)
+        if data is None:
+            return []
+
+        results = self._parse_organic_results(data)
+        logger.info(f"Serper search for '{query[:30]}...' returned {len(results)} results")
+        return results
+
+    async def asearch_news(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        """Async version of search_news()."""
+        if not self.api_key:
             return []
 
+        data = await self._acached_fetch(NEWS_ENDPOINT, self._build_payload(query, num_results))
+        if data is None:
+            return []
+
+        return self._parse_news_results(data)
+
     def is_configured(self) -> bool:
         """Check if Serper API is properly configured."""
         return bool(self.api_key)
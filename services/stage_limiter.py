@@ -0,0 +1,69 @@
+"""
+Stage-level concurrency limits for the per-user generation pipelines.
+
+SemaphoreService bounds how many users are processed at once, but inside a
+user the stages hit very different backends: Gemini text calls are cheap
+and fast, image generation is slow and has a much lower quota, and S3
+uploads are bounded by the connection pool. StageLimiter keeps one
+semaphore per stage so, for example, 50 users in flight never run more
+than DAILY_IMAGE_STAGE_CONCURRENCY image generations at the same time.
+
+Semaphores are bound to an event loop and the crons run every invocation
+on a new loop, so one set of semaphores is kept per running loop.
+"""
+import asyncio
+import os
+import weakref
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional
+
+TEXT_STAGE = 'text'
+IMAGE_STAGE = 'image'
+UPLOAD_STAGE = 'upload'
+
+DEFAULT_STAGE_LIMITS = {
+    TEXT_STAGE: int(os.getenv('DAILY_TEXT_STAGE_CONCURRENCY', 25)),
+    IMAGE_STAGE: int(os.getenv('DAILY_IMAGE_STAGE_CONCURRENCY', 10)),
+    UPLOAD_STAGE: int(os.getenv('DAILY_UPLOAD_STAGE_CONCURRENCY', 20)),
+}
+
+
+class StageLimiter:
+    """Runs awaitables under the concurrency limit of their stage."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = dict(DEFAULT_STAGE_LIMITS)
+        self.limits.update(limits or {})
+        self._semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]' = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaphore(self, stage: str) -> asyncio.Semaphore:
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if stage not in semaphores:
+            if stage not in self.limits:
+                raise ValueError(f"Unknown generation stage: {stage}")
+            semaphores[stage] = asyncio.Semaphore(self.limits[stage])
+        return semaphores[stage]
+
+    async def run(self, stage: str, function: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await function(*args, **kwargs) holding a slot of the given stage."""
+        async with self._semaphore(stage):
+            return await function(*args, **kwargs)
+
+
+async def gather_stages(*coroutines: Coroutine[Any, Any, Any]) -> list[Any]:
+    """
+    Run independent stages concurrently and return their results in order.
+
+    The stages run in an asyncio.TaskGroup: when one fails, the others are
+    cancelled and awaited before the failure is raised, so no stage is left
+    running (generating an image, writing to the database) after the user
+    has already been marked as failed.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coroutine) for coroutine in coroutines]
+    except BaseExceptionGroup as errors:
+        # Callers record the stage's own error, not the group wrapper
+        raise errors.exceptions[0]
+    return [task.result() for task in tasks]
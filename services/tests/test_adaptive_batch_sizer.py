@@ -0,0 +1,82 @@
+"""
+Testes para o AdaptiveBatchSizer (tamanho de batch a partir do histórico).
+
+Estes testes verificam:
+- Sem histórico, usa o tamanho padrão do cron
+- Tamanho cresce com rodadas rápidas, limitado ao dobro do maior batch recente
+- Invocação que estourou o timeout reduz o próximo batch pela metade
+- measure registra usuários processados e duração
+"""
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+from django.utils import timezone
+
+from AuditSystem.models import CronInvocationSample
+from services.adaptive_batch_sizer import AdaptiveBatchSizer
+
+
+class AdaptiveBatchSizerTestCase(TestCase):
+    """Testes para services.adaptive_batch_sizer."""
+
+    def setUp(self):
+        self.sizer = AdaptiveBatchSizer('test_pipeline', default_batch_size=2, concurrency=5, time_budget_seconds=240)
+
+    def add_sample(self, users, duration, planned=None, finished=True, started_ago=0):
+        started_at = timezone.now() - timedelta(seconds=started_ago)
+        return CronInvocationSample.objects.create(
+            pipeline='test_pipeline',
+            planned_users=planned or users,
+            users=users if finished else 0,
+            concurrency=5,
+            started_at=started_at,
+            finished_at=started_at + timedelta(seconds=duration) if finished else None,
+            duration_seconds=duration if finished else None,
+        )
+
+    def test_sem_historico_usa_padrao(self):
+        """Teste: primeira invocação do pipeline usa o tamanho fixo de antes"""
+        self.assertEqual(self.sizer.choose_batch_size(), 2)
+
+    def test_cresce_ate_o_dobro_do_maior_batch(self):
+        """Teste: rodadas de 20s cabem 9 vezes no orçamento, mas o crescimento é limitado"""
+        self.add_sample(users=4, duration=20)
+
+        self.assertEqual(self.sizer.choose_batch_size(), 8)
+
+    def test_tempo_restante_limita_rodadas(self):
+        """Teste: 10 usuários com 5 em paralelo levaram 100s, ou seja 50s por rodada"""
+        self.add_sample(users=10, duration=100)
+
+        # 240s / (50s * 1.25) = 3 rodadas de 5 usuários
+        self.assertEqual(self.sizer.choose_batch_size(), 15)
+        # Com 180s já gastos só cabe menos de uma rodada
+        self.assertEqual(self.sizer.choose_batch_size(elapsed_seconds=180), 1)
+
+    def test_timeout_reduz_pela_metade(self):
+        """Teste: invocação sem término após o orçamento faz o próximo batch cair pela metade"""
+        self.add_sample(users=4, duration=20, started_ago=3000)
+        self.add_sample(users=0, duration=0, planned=12, finished=False, started_ago=1000)
+
+        self.assertEqual(self.sizer.choose_batch_size(), 6)
+
+    def test_invocacao_em_andamento_nao_conta_como_timeout(self):
+        """Teste: invocação concorrente ainda rodando é ignorada"""
+        self.add_sample(users=4, duration=20, started_ago=300)
+        self.add_sample(users=0, duration=0, planned=12, finished=False, started_ago=10)
+
+        self.assertEqual(self.sizer.choose_batch_size(), 8)
+
+    def test_measure_registra_amostra(self):
+        """Teste: measure grava usuários processados e a duração da invocação"""
+        async def run():
+            return {'status': 'completed', 'total_users': 3}
+
+        result = async_to_sync(self.sizer.measure)(4, run())
+
+        sample = CronInvocationSample.objects.get(pipeline='test_pipeline')
+        self.assertEqual(result['total_users'], 3)
+        self.assertEqual((sample.planned_users, sample.users, sample.concurrency), (4, 3, 5))
+        self.assertIsNotNone(sample.finished_at)
+        self.assertGreaterEqual(sample.duration_seconds, 0)
@@ -0,0 +1,121 @@
+"""
+Testes para a instrumentação das chamadas ao Gemini.
+
+Estes testes verificam:
+- GenerationTrace captura tentativas, tempo até o primeiro chunk e tokens
+- Métricas agregadas por modelo/operação são persistidas
+- Endpoint administrativo de uso de IA
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from AuditSystem.ai_usage_service import AiUsageMetricsService
+from AuditSystem.models import AiUsageMetric
+from services.ai_instrumentation import GenerationTrace
+from services.ai_service import AiService
+from services.model_circuit_breaker import ModelCircuitBreaker
+from services.tests.test_ai_service import FakeAsyncModels, build_service, make_text_chunk, run_async
+
+
+def make_usage_chunk(text, prompt_tokens, output_tokens):
+    """Cria um chunk de texto com usage_metadata acumulado."""
+    chunk = make_text_chunk(text)
+    chunk.usage_metadata = SimpleNamespace(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=output_tokens,
+        total_token_count=prompt_tokens + output_tokens,
+    )
+    return chunk
+
+
+@patch('services.ai_service.AiUsageMetricsService')
+@patch('services.ai_service.AuditService')
+@patch.object(AiService, '_deduct_credits', return_value=True)
+@patch.object(AiService, '_validate_credits', return_value=True)
+class GenerationTraceTestCase(SimpleTestCase):
+    """Testes para a captura de métricas no AiService."""
+
+    def setUp(self):
+        ModelCircuitBreaker.reset()
+
+    def test_trace_captura_tokens_e_tempos(self, mock_validate, mock_deduct, mock_audit, mock_metrics):
+        """Teste: usage_metadata do último chunk e tempo até o primeiro chunk são registrados"""
+        fake_models = FakeAsyncModels(
+            [make_usage_chunk('Olá', 10, 1), make_usage_chunk(' mundo', 10, 3)], delay=0)
+        service = build_service(fake_models)
+
+        run_async(service.agenerate_text(['prompt'], user=MagicMock()))
+
+        trace = mock_metrics.record.call_args.args[0]
+        self.assertTrue(trace.success)
+        self.assertEqual(trace.model, 'gemini-3-pro-preview')
+        self.assertEqual((trace.prompt_tokens, trace.output_tokens, trace.total_tokens), (10, 3, 13))
+        self.assertIsNotNone(trace.first_chunk_ms)
+        self.assertIsNotNone(trace.latency_ms)
+
+    def test_trace_registra_historico_de_tentativas(self, mock_validate, mock_deduct, mock_audit, mock_metrics):
+        """Teste: tentativas com erro ficam no histórico com o modelo usado"""
+        fake_models = FakeAsyncModels(
+            [make_text_chunk('ok')], delay=0, failing_models=['gemini-3-pro-preview'],
+            error=Exception('block_reason: OTHER'))
+        service = build_service(fake_models)
+
+        run_async(service.agenerate_text(['prompt'], user=MagicMock()))
+
+        trace = mock_metrics.record.call_args.args[0]
+        self.assertEqual([a['model'] for a in trace.attempts],
+                         ['gemini-3-pro-preview', 'gemini-3-flash-preview'])
+        self.assertIn('block_reason', trace.attempts[0]['error'])
+        self.assertIsNone(trace.attempts[1]['error'])
+
+    def test_sem_creditos_nao_registra_metrica(self, mock_validate, mock_deduct, mock_audit, mock_metrics):
+        """Teste: chamadas que nunca chegaram ao modelo não entram nas métricas"""
+        mock_validate.return_value = False
+        service = build_service(FakeAsyncModels([]))
+
+        with self.assertRaises(Exception):
+            run_async(service.agenerate_text(['prompt'], user=MagicMock()))
+
+        mock_metrics.record.assert_not_called()
+
+
+class AiUsageMetricsServiceTestCase(TestCase):
+    """Testes para a agregação persistida e o endpoint administrativo."""
+
+    def build_trace(self, success=True, latency_ms=100, tokens=(5, 7)):
+        trace = GenerationTrace(operation='text_generation')
+        trace.start_attempt('gemini-3-pro-preview')
+        trace.end_attempt()
+        trace.finish('gemini-3-pro-preview', success=success)
+        trace.latency_ms = latency_ms
+        trace.prompt_tokens, trace.output_tokens = tokens
+        trace.total_tokens = sum(tokens)
+        return trace
+
+    def test_agrega_chamadas_no_mesmo_registro(self):
+        """Teste: chamadas do mesmo dia/modelo/operação somam no mesmo registro"""
+        AiUsageMetricsService.record(self.build_trace(latency_ms=100))
+        AiUsageMetricsService.record(self.build_trace(success=False, latency_ms=300))
+
+        metric = AiUsageMetric.objects.get()
+        self.assertEqual((metric.calls, metric.successes, metric.failures), (2, 1, 1))
+        self.assertEqual(metric.total_tokens, 24)
+        self.assertEqual(metric.max_latency_ms, 300)
+
+    def test_endpoint_retorna_estatisticas(self):
+        """Teste: admin recebe métricas por modelo e operação"""
+        AiUsageMetricsService.record(self.build_trace())
+        admin = User.objects.create_user(username='admin', password='pass', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        response = client.get('/api/v1/audit/dashboard/ai-usage/?days=7')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_calls'], 1)
+        self.assertEqual(response.data['models'][0]['avg_latency_ms'], 100)
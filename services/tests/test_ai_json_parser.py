@@ -0,0 +1,109 @@
+"""
+Testes para o parser tolerante de JSON e o modo JSON do AiService.
+
+Estes testes verificam:
+- Respostas com cerca ```json, vírgulas sobrando ou truncadas são reparadas
+- O parser incremental acompanha a estrutura chunk a chunk
+- Validação com os schemas pydantic (e descarte do último item truncado)
+- generate_json envia response_mime_type/response_schema e devolve o dict validado
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from services.ai_json_parser import AiJsonParseError, IncrementalJsonParser, parse_ai_json
+from services.ai_response_schemas import (
+    CampaignPayload,
+    SemanticAnalysisPayload,
+    WeeklyFeedPayload,
+)
+from services.ai_service import AiService
+from services.model_circuit_breaker import ModelCircuitBreaker
+from services.tests.test_ai_service import build_service, make_text_chunk
+
+
+class ParseAiJsonTestCase(SimpleTestCase):
+    """Testes para parse_ai_json."""
+
+    def test_remove_cerca_e_virgula_sobrando(self):
+        """Teste: cerca markdown e vírgula final não quebram o parse"""
+        result = parse_ai_json('```json\n{"post_text_stories": {"roteiro": "A"},}\n```')
+
+        self.assertEqual(result, {'post_text_stories': {'roteiro': 'A'}})
+
+    def test_repara_resposta_truncada(self):
+        """Teste: string, objeto e lista abertos são fechados"""
+        result = parse_ai_json('{"analise_semantica": {"tema_principal": "Café", "subtemas": ["grão", "tor')
+
+        self.assertEqual(result, {'analise_semantica': {'tema_principal': 'Café', 'subtemas': ['grão', 'tor']}})
+
+    def test_descarta_chave_pendente(self):
+        """Teste: uma chave sem valor no fim é removida"""
+        self.assertEqual(parse_ai_json('{"titulo": "T", "legenda":'), {'titulo': 'T'})
+
+    def test_lista_truncada_descarta_ultimo_item_invalido(self):
+        """Teste: feed semanal cortado mantém os posts completos"""
+        text = '[{"id": 1, "titulo": "A", "legenda": "L1"}, {"id": 2, "titulo": "B", "leg'
+
+        result = parse_ai_json(text, WeeklyFeedPayload)
+
+        self.assertEqual(result, [{'id': 1, 'titulo': 'A', 'legenda': 'L1'}])
+
+    def test_schema_invalido_gera_erro(self):
+        """Teste: payload sem campos obrigatórios gera AiJsonParseError"""
+        with self.assertRaises(AiJsonParseError):
+            parse_ai_json('{"post_text_stories": {"titulo": "S"}}', CampaignPayload)
+
+    def test_texto_sem_json_gera_erro(self):
+        """Teste: resposta sem objeto JSON gera AiJsonParseError"""
+        with self.assertRaises(AiJsonParseError):
+            parse_ai_json('Desculpe, não consigo ajudar.')
+
+
+class IncrementalJsonParserTestCase(SimpleTestCase):
+    """Testes para IncrementalJsonParser."""
+
+    def test_acompanha_chunks(self):
+        """Teste: snapshot parcial a cada chunk e término detectado"""
+        parser = IncrementalJsonParser()
+
+        parser.feed('Aqui está: {"titulo": "Pos')
+        self.assertEqual(parser.parse(), {'titulo': 'Pos'})
+        self.assertFalse(parser.complete)
+
+        parser.feed('t", "hashtags": ["#a"]}\n```')
+        self.assertTrue(parser.complete)
+        self.assertEqual(parser.parse(), {'titulo': 'Post', 'hashtags': ['#a']})
+
+    def test_chaves_dentro_de_strings(self):
+        """Teste: chaves e aspas escapadas dentro de strings não contam como estrutura"""
+        parser = IncrementalJsonParser()
+        parser.feed('{"roteiro": "use {chaves} e \\"aspas\\" ]"')
+
+        self.assertEqual(parser.parse(), {'roteiro': 'use {chaves} e "aspas" ]'})
+
+
+@patch.object(AiService, '_deduct_credits', return_value=True)
+@patch.object(AiService, '_validate_credits', return_value=True)
+@patch('services.ai_service.AuditService')
+@patch('services.ai_service.AiUsageMetricsService')
+class AiServiceJsonModeTestCase(SimpleTestCase):
+    """Testes para generate_json."""
+
+    def setUp(self):
+        ModelCircuitBreaker.reset()
+
+    def test_generate_json_configura_schema_e_valida(self, mock_metrics, mock_audit, mock_validate, mock_deduct):
+        """Teste: a chamada usa modo JSON e o resultado vem validado"""
+        service = build_service(MagicMock())
+        service.client.models.generate_content_stream.return_value = iter([
+            make_text_chunk('{"analise_semantica": {"tema_principal": "Café"}}'),
+        ])
+
+        result = service.generate_json(['prompt'], MagicMock(), SemanticAnalysisPayload)
+
+        config = service.client.models.generate_content_stream.call_args.kwargs['config']
+        self.assertEqual(config.response_mime_type, 'application/json')
+        self.assertIs(config.response_schema, SemanticAnalysisPayload)
+        self.assertEqual(result, {'analise_semantica': {'tema_principal': 'Café'}})
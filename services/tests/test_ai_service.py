@@ -0,0 +1,269 @@
+"""
+Testes para o caminho assíncrono do AiService.
+
+Estes testes verificam:
+- agenerate_text/agenerate_image usam o cliente async do google-genai
+- Várias gerações ficam em voo simultaneamente no mesmo event loop
+- Créditos e auditoria são chamados pelo caminho async
+- Retry com backoff não bloqueante, Retry-After e circuit breaker compartilhado
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from services.ai_service import AiService
+from services.model_circuit_breaker import ModelCircuitBreaker
+
+
+def run_async(coro):
+    """Helper para executar funções async em testes."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def make_text_chunk(text):
+    """Cria um chunk de stream com uma parte de texto."""
+    part = SimpleNamespace(text=text, inline_data=None)
+    content = SimpleNamespace(parts=[part])
+    return SimpleNamespace(candidates=[SimpleNamespace(content=content)])
+
+
+def make_image_chunk(data):
+    """Cria um chunk de stream com dados de imagem inline."""
+    part = SimpleNamespace(text=None, inline_data=SimpleNamespace(data=data))
+    content = SimpleNamespace(parts=[part])
+    return SimpleNamespace(candidates=[SimpleNamespace(content=content)])
+
+
+class FakeAsyncModels:
+    """Substituto de client.aio.models que registra chamadas simultâneas."""
+
+    def __init__(self, chunks, delay=0.05, failing_models=None, error=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.failing_models = failing_models or []
+        self.error = error or Exception('503 UNAVAILABLE. The model is overloaded.')
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    async def generate_content_stream(self, model, contents, config):
+        self.calls.append(model)
+        if model in self.failing_models:
+            raise self.error
+
+        async def stream():
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.delay)
+                for chunk in self.chunks:
+                    yield chunk
+            finally:
+                self.in_flight -= 1
+
+        return stream()
+
+
+def build_service(fake_models):
+    """Cria um AiService com o cliente genai substituído por fakes."""
+    with patch('services.ai_service.genai.Client'):
+        service = AiService()
+    service.client = MagicMock()
+    service.client.aio.models = fake_models
+    return service
+
+
+@patch('services.ai_service.AuditService')
+@patch.object(AiService, '_deduct_credits', return_value=True)
+@patch.object(AiService, '_validate_credits', return_value=True)
+class AiServiceAsyncTestCase(SimpleTestCase):
+    """Testes para agenerate_text e agenerate_image."""
+
+    def setUp(self):
+        ModelCircuitBreaker.reset()
+
+    def test_agenerate_text_concatena_chunks(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: agenerate_text concatena o texto dos chunks do stream"""
+        fake_models = FakeAsyncModels([make_text_chunk('Olá, '), make_text_chunk('mundo')])
+        service = build_service(fake_models)
+
+        result = run_async(service.agenerate_text(['prompt'], user=MagicMock()))
+
+        self.assertEqual(result, 'Olá, mundo')
+        mock_deduct.assert_called_once()
+        mock_audit.log_content_generation.assert_called_once()
+
+    def test_agenerate_image_retorna_bytes(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: agenerate_image retorna os bytes da primeira imagem do stream"""
+        fake_models = FakeAsyncModels([make_text_chunk('...'), make_image_chunk(b'png-bytes')])
+        service = build_service(fake_models)
+
+        result = run_async(service.agenerate_image(['prompt'], '', user=MagicMock()))
+
+        self.assertEqual(result, b'png-bytes')
+        mock_audit.log_image_generation.assert_called_once()
+
+    def test_geracoes_simultaneas_no_mesmo_loop(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: N chamadas concorrentes ficam em voo ao mesmo tempo"""
+        fake_models = FakeAsyncModels([make_text_chunk('ok')], delay=0.1)
+        service = build_service(fake_models)
+
+        async def run_batch():
+            return await asyncio.gather(*[
+                service.agenerate_text(['prompt'], user=MagicMock()) for _ in range(5)
+            ])
+
+        results = run_async(run_batch())
+
+        self.assertEqual(results, ['ok'] * 5)
+        self.assertEqual(fake_models.max_in_flight, 5)
+
+    def test_sem_creditos_levanta_excecao(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: sem créditos, agenerate_text falha antes de chamar o modelo"""
+        mock_validate.return_value = False
+        fake_models = FakeAsyncModels([make_text_chunk('ok')])
+        service = build_service(fake_models)
+
+        with self.assertRaises(Exception) as ctx:
+            run_async(service.agenerate_text(['prompt'], user=MagicMock()))
+
+        self.assertIn('Créditos insuficientes', str(ctx.exception))
+        self.assertEqual(fake_models.calls, [])
+        mock_audit.log_content_generation.assert_called_once()
+
+
+@patch('services.ai_service.AuditService')
+@patch.object(AiService, '_deduct_credits', return_value=True)
+@patch.object(AiService, '_validate_credits', return_value=True)
+class AiServiceRetryTestCase(SimpleTestCase):
+    """Testes para o agendador de retries e o circuit breaker."""
+
+    def setUp(self):
+        ModelCircuitBreaker.reset()
+
+    def tearDown(self):
+        ModelCircuitBreaker.reset()
+
+    @patch('services.ai_service.asyncio.sleep')
+    def test_modelo_em_falha_e_ignorado_pelas_chamadas_seguintes(
+            self, mock_sleep, mock_validate, mock_deduct, mock_audit):
+        """Teste: após o circuito abrir, outras chamadas pulam o modelo em falha"""
+        fake_models = FakeAsyncModels(
+            [make_text_chunk('ok')], delay=0, failing_models=['gemini-3-pro-preview'])
+        service = build_service(fake_models)
+
+        for _ in range(3):
+            self.assertEqual(run_async(service.agenerate_text(['prompt'], user=MagicMock())), 'ok')
+
+        self.assertTrue(ModelCircuitBreaker.is_open('gemini-3-pro-preview'))
+        fake_models.calls.clear()
+        run_async(service.agenerate_text(['prompt'], user=MagicMock()))
+        self.assertEqual(fake_models.calls, ['gemini-3-flash-preview'])
+
+    @patch('services.ai_service.asyncio.sleep')
+    def test_backoff_usa_sleep_assincrono(self, mock_sleep, mock_validate, mock_deduct, mock_audit):
+        """Teste: o caminho async espera com asyncio.sleep em vez de time.sleep"""
+        fake_models = FakeAsyncModels(
+            [make_text_chunk('ok')], delay=0, failing_models=['gemini-3-pro-preview'])
+        service = build_service(fake_models)
+
+        with patch('services.ai_service.sleep') as mock_blocking_sleep:
+            run_async(service.agenerate_text(['prompt'], user=MagicMock()))
+
+        self.assertTrue(any(call.args[0] > 0 for call in mock_sleep.call_args_list))
+        mock_blocking_sleep.assert_not_called()
+
+    def test_erro_nao_retentavel_nao_abre_circuito(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: erros de conteúdo passam ao próximo modelo sem contar falha"""
+        fake_models = FakeAsyncModels(
+            [make_text_chunk('ok')], delay=0, failing_models=['gemini-3-pro-preview'],
+            error=Exception('block_reason: SAFETY'))
+        service = build_service(fake_models)
+
+        run_async(service.agenerate_text(['prompt'], user=MagicMock()))
+
+        self.assertEqual(fake_models.calls, ['gemini-3-pro-preview', 'gemini-3-flash-preview'])
+        self.assertFalse(ModelCircuitBreaker.is_open('gemini-3-pro-preview'))
+
+    def test_retry_after_longo_abre_circuito(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: Retry-After acima do limite tira o modelo de rotação imediatamente"""
+        error = Exception('429 RESOURCE_EXHAUSTED. Please retry in 120s.')
+        fake_models = FakeAsyncModels(
+            [make_text_chunk('ok')], delay=0, failing_models=['gemini-3-pro-preview'], error=error)
+        service = build_service(fake_models)
+
+        run_async(service.agenerate_text(['prompt'], user=MagicMock()))
+
+        self.assertEqual(fake_models.calls, ['gemini-3-pro-preview', 'gemini-3-flash-preview'])
+        self.assertTrue(ModelCircuitBreaker.is_open('gemini-3-pro-preview'))
+
+    def test_extrai_retry_after(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: retry hint é lido do header, do RetryInfo e da mensagem"""
+        service = build_service(FakeAsyncModels([]))
+
+        header_error = Exception('429')
+        header_error.response = SimpleNamespace(headers={'Retry-After': '7'})
+        details_error = Exception('429')
+        details_error.details = {'error': {'details': [
+            {'@type': 'type.googleapis.com/google.rpc.RetryInfo', 'retryDelay': '12s'}]}}
+
+        self.assertEqual(service._extract_retry_after(header_error), 7.0)
+        self.assertEqual(service._extract_retry_after(details_error), 12.0)
+        self.assertEqual(service._extract_retry_after(Exception('Please retry in 3.5s.')), 3.5)
+        self.assertIsNone(service._extract_retry_after(Exception('503 UNAVAILABLE')))
+
+    def test_todos_circuitos_abertos_tenta_o_mais_proximo(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: com todos os circuitos abertos, tenta o modelo que reabre primeiro"""
+        service = build_service(FakeAsyncModels([]))
+        ModelCircuitBreaker.record_failure('gemini-3-pro-preview', open_for=300)
+        ModelCircuitBreaker.record_failure('gemini-3-flash-preview', open_for=10)
+        ModelCircuitBreaker.record_failure('gemini-2.5-flash', open_for=600)
+
+        self.assertEqual(service._available_models(service.models), ['gemini-3-flash-preview'])
+
+
+@patch('services.ai_service.AuditService')
+@patch.object(AiService, '_deduct_credits', return_value=True)
+@patch.object(AiService, '_validate_credits', return_value=True)
+class AiServiceStreamTestCase(SimpleTestCase):
+    """Testes para generate_text_stream."""
+
+    def setUp(self):
+        ModelCircuitBreaker.reset()
+
+    def test_stream_repassa_chunks_e_cobra_no_fim(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: chunks chegam um a um e os créditos são debitados ao final"""
+        service = build_service(FakeAsyncModels([]))
+        service.client.models.generate_content_stream.return_value = iter(
+            [make_text_chunk('Olá, '), make_text_chunk('mundo')])
+
+        stream = service.generate_text_stream(['prompt'], user=MagicMock())
+
+        self.assertEqual(next(stream), 'Olá, ')
+        mock_deduct.assert_not_called()
+        self.assertEqual(list(stream), ['mundo'])
+        mock_deduct.assert_called_once()
+
+    @patch('services.ai_service.sleep')
+    def test_stream_faz_fallback_antes_do_primeiro_chunk(
+            self, mock_sleep, mock_validate, mock_deduct, mock_audit):
+        """Teste: falha antes de qualquer chunk tenta o próximo modelo"""
+        service = build_service(FakeAsyncModels([]))
+
+        def fake_stream(model, contents, config):
+            if model == 'gemini-3-pro-preview':
+                raise Exception('block_reason: OTHER')
+            return iter([make_text_chunk('ok')])
+
+        service.client.models.generate_content_stream.side_effect = fake_stream
+
+        self.assertEqual(list(service.generate_text_stream(['prompt'], user=MagicMock())), ['ok'])
+        self.assertEqual(mock_deduct.call_args.kwargs['model'], 'gemini-3-flash-preview')
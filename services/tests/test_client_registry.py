@@ -0,0 +1,103 @@
+"""
+Testes para o registro de clientes compartilhados.
+
+Estes testes verificam:
+- Clientes genai, S3 e Mailjet são criados uma vez por processo e configuração
+- O cliente S3 usa pool de conexões com keep-alive
+- Chamadas async usam um cliente genai por event loop
+- O dono do loop fecha os clientes genai dele ao terminar
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from services import client_registry
+from services.ai_service import AiService
+from services.s3_sevice import S3Service
+
+
+class ClientRegistryTestCase(SimpleTestCase):
+    """Testes para services.client_registry."""
+
+    def setUp(self):
+        client_registry.reset_clients()
+        self.addCleanup(client_registry.reset_clients)
+
+    @patch('services.client_registry.genai.Client')
+    def test_ai_service_reutiliza_cliente_genai(self, mock_client):
+        """Teste: várias instâncias de AiService compartilham o mesmo cliente"""
+        mock_client.side_effect = lambda **kwargs: MagicMock()
+
+        first, second = AiService(), AiService()
+
+        self.assertIs(first.client, second.client)
+        mock_client.assert_called_once()
+
+    @patch('services.client_registry.boto3.client')
+    def test_s3_service_reutiliza_cliente_com_pool(self, mock_boto_client):
+        """Teste: S3Service reaproveita o cliente boto3 configurado com keep-alive"""
+        S3Service()
+        S3Service()
+
+        mock_boto_client.assert_called_once()
+        config = mock_boto_client.call_args.kwargs['config']
+        self.assertTrue(config.tcp_keepalive)
+        self.assertEqual(config.max_pool_connections, client_registry.S3_MAX_POOL_CONNECTIONS)
+
+    @patch('services.client_registry.MailjetClient')
+    def test_mailjet_um_cliente_por_versao(self, mock_mailjet):
+        """Teste: clientes Mailjet são separados por versão da API"""
+        mock_mailjet.side_effect = lambda **kwargs: MagicMock()
+
+        v31 = client_registry.get_mailjet_client('v3.1')
+
+        self.assertIs(v31, client_registry.get_mailjet_client('v3.1'))
+        self.assertIsNot(v31, client_registry.get_mailjet_client('v3'))
+        self.assertEqual(mock_mailjet.call_count, 2)
+
+    @patch('services.client_registry.genai.Client')
+    def test_cliente_async_por_event_loop(self, mock_client):
+        """Teste: cada event loop recebe seu próprio cliente para chamadas async"""
+        mock_client.side_effect = lambda **kwargs: MagicMock()
+        service = AiService()
+
+        async def get_pair():
+            return service._async_client(), service._async_client()
+
+        loop_a, loop_b = asyncio.new_event_loop(), asyncio.new_event_loop()
+        try:
+            a1, a2 = loop_a.run_until_complete(get_pair())
+            b1, _ = loop_b.run_until_complete(get_pair())
+        finally:
+            loop_a.close()
+            loop_b.close()
+
+        self.assertIs(a1, a2)
+        self.assertIsNot(a1, b1)
+        self.assertIsNot(a1, service.client.aio)
+
+    @patch('services.client_registry.genai.Client')
+    def test_fecha_clientes_do_loop(self, mock_client):
+        """Teste: fechar os clientes do loop chama aclose e o próximo uso cria outro cliente"""
+        def build(**kwargs):
+            client = MagicMock()
+            client.aio.aclose = AsyncMock()
+            return client
+        mock_client.side_effect = build
+
+        async def run():
+            first = client_registry.get_loop_genai_client('key')
+            await client_registry.close_loop_genai_clients()
+            await client_registry.close_loop_genai_clients()
+            return first, client_registry.get_loop_genai_client('key')
+
+        loop = asyncio.new_event_loop()
+        try:
+            first, second = loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+        first.aio.aclose.assert_awaited_once()
+        self.assertIsNot(first, second)
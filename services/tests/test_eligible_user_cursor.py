@@ -0,0 +1,90 @@
+"""
+Testes para o EligibleUserCursor (paginação por id com checkpoint).
+
+Estes testes verificam:
+- Páginas reservadas seguem o checkpoint mesmo quando a elegibilidade muda
+- Checkpoint marca a execução como concluída quando não restam usuários
+- Página de uma invocação que morreu é entregue de novo após a reserva expirar
+- iter_pages percorre todos os usuários em páginas, sem checkpoint
+"""
+
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from AuditSystem.models import CronRunCheckpoint
+from services.eligible_user_cursor import EligibleUserCursor
+
+
+async def collect_pages(cursor, batch_size):
+    return [page async for page in cursor.pages(batch_size)]
+
+
+class EligibleUserCursorTestCase(TestCase):
+    """Testes para services.eligible_user_cursor."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'user{i}', password='pass') for i in range(5)]
+        self.cursor = EligibleUserCursor('test_cron', lambda: User.objects.filter(is_active=True))
+
+    def ids(self, page):
+        return [user['id'] for user in page]
+
+    def test_reserva_paginas_sem_pular_usuarios(self):
+        """Teste: usuário que deixa de ser elegível não desloca as próximas páginas"""
+        first = async_to_sync(self.cursor.claim_page)(2)
+
+        # Com OFFSET, desativar um usuário já processado pularia o user2
+        self.users[0].is_active = False
+        self.users[0].save()
+        second = async_to_sync(self.cursor.claim_page)(2)
+
+        self.assertEqual(self.ids(first), [self.users[0].id, self.users[1].id])
+        self.assertEqual(self.ids(second), [self.users[2].id, self.users[3].id])
+        checkpoint = CronRunCheckpoint.objects.get(run_key=self.cursor.run_key())
+        self.assertEqual(checkpoint.last_id, self.users[3].id)
+        self.assertEqual(checkpoint.claimed_users, 4)
+
+    def test_execucao_concluida_quando_acabam_usuarios(self):
+        """Teste: página vazia sem páginas em andamento marca completed_at e não retorna usuários"""
+        async_to_sync(collect_pages)(self.cursor, 10)
+
+        self.assertEqual(async_to_sync(collect_pages)(self.cursor, 10), [])
+        self.assertIsNotNone(CronRunCheckpoint.objects.get(run_key=self.cursor.run_key()).completed_at)
+
+    def test_pagina_de_invocacao_que_morreu_e_reentregue(self):
+        """Teste: página não concluída volta a ser entregue quando a reserva expira"""
+        async def process_and_fail():
+            async for page in self.cursor.pages(2):
+                raise TimeoutError('vercel timeout')
+
+        with self.assertRaises(TimeoutError):
+            async_to_sync(process_and_fail)()
+
+        # Reserva ainda válida: a próxima invocação segue para a próxima página
+        self.assertEqual(self.ids(async_to_sync(collect_pages)(self.cursor, 2)[0]),
+                         [self.users[2].id, self.users[3].id])
+
+        checkpoint = CronRunCheckpoint.objects.get(run_key=self.cursor.run_key())
+        expired = (timezone.now() - timedelta(minutes=1)).isoformat()
+        checkpoint.in_flight = [{**lease, 'leased_until': expired} for lease in checkpoint.in_flight]
+        checkpoint.save()
+
+        retried = async_to_sync(collect_pages)(self.cursor, 2)
+        self.assertEqual(self.ids(retried[0]), [self.users[0].id, self.users[1].id])
+        checkpoint.refresh_from_db()
+        self.assertEqual(checkpoint.in_flight, [])
+        self.assertIsNone(checkpoint.completed_at)
+
+    def test_batch_size_zero_percorre_todos(self):
+        """Teste: batch_size=0 transmite todas as páginas sem criar checkpoint"""
+        self.cursor.page_size = 2
+
+        pages = async_to_sync(collect_pages)(self.cursor, 0)
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(map(self.ids, pages), []), [user.id for user in self.users])
+        self.assertFalse(CronRunCheckpoint.objects.exists())
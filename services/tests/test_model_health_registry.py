@@ -0,0 +1,129 @@
+"""
+Testes para o ModelHealthRegistry e o estado compartilhado do circuit breaker.
+
+Estes testes verificam:
+- Taxa de erro e latência na janela móvel
+- Ordenação dos modelos do mais saudável ao menos saudável
+- Backend via Django cache compartilhando estado entre instâncias
+- clear do backend via Django cache descarta só o estado de saúde
+- Endpoint administrativo com o estado dos breakers
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from services.model_circuit_breaker import FAILURE_THRESHOLD, ModelCircuitBreaker
+from services.model_health_registry import (
+    DjangoCacheHealthBackend,
+    InProcessHealthBackend,
+    ModelHealthRegistry,
+    set_health_backend,
+)
+
+
+class ModelHealthRegistryTestCase(SimpleTestCase):
+    """Testes para estatísticas e ordenação por saúde."""
+
+    def setUp(self):
+        set_health_backend(InProcessHealthBackend())
+
+    def tearDown(self):
+        set_health_backend(None)
+
+    def test_estatisticas_da_janela(self):
+        """Teste: taxa de erro e latência média consideram as amostras registradas"""
+        ModelHealthRegistry.record('model-a', success=True, latency=1.0)
+        ModelHealthRegistry.record('model-a', success=True, latency=3.0)
+        ModelHealthRegistry.record('model-a', success=False, latency=0.5)
+        ModelHealthRegistry.record('model-a', success=False, latency=0.5)
+
+        stats = ModelHealthRegistry.get_stats('model-a')
+
+        self.assertEqual(stats['samples'], 4)
+        self.assertEqual(stats['error_rate'], 0.5)
+        self.assertEqual(stats['avg_latency_seconds'], 2.0)
+
+    def test_ordena_pelo_modelo_mais_saudavel(self):
+        """Teste: modelo com muitas falhas vai para o fim da lista"""
+        for _ in range(3):
+            ModelHealthRegistry.record('model-a', success=False, latency=1.0)
+            ModelHealthRegistry.record('model-b', success=True, latency=1.0)
+
+        self.assertEqual(
+            ModelHealthRegistry.order_models(['model-a', 'model-b', 'model-c']),
+            ['model-b', 'model-c', 'model-a'])
+
+    def test_sem_amostras_mantem_ordem_configurada(self):
+        """Teste: sem evidência, a ordem preferida é mantida"""
+        ModelHealthRegistry.record('model-b', success=False, latency=1.0)
+
+        self.assertEqual(
+            ModelHealthRegistry.order_models(['model-a', 'model-b']),
+            ['model-a', 'model-b'])
+
+    def test_estado_do_breaker(self):
+        """Teste: breaker abre no limite de falhas e fecha após sucesso"""
+        for _ in range(FAILURE_THRESHOLD):
+            ModelCircuitBreaker.record_failure('model-a')
+
+        self.assertEqual(ModelCircuitBreaker.get_state('model-a')['circuit'], 'open')
+
+        ModelCircuitBreaker.record_success('model-a')
+        self.assertEqual(ModelCircuitBreaker.get_state('model-a')['circuit'], 'closed')
+
+    def test_backend_cache_compartilha_estado(self):
+        """Teste: instâncias distintas do backend de cache enxergam o mesmo breaker"""
+        set_health_backend(DjangoCacheHealthBackend())
+        ModelCircuitBreaker.record_failure('model-shared', open_for=30)
+
+        set_health_backend(DjangoCacheHealthBackend())
+        self.assertTrue(ModelCircuitBreaker.is_open('model-shared'))
+
+    def test_clear_do_backend_cache_descarta_estado(self):
+        """Teste: clear no backend de cache vale para todas as instâncias e preserva o resto do cache"""
+        cache.set('outra_chave', 'valor')
+        set_health_backend(DjangoCacheHealthBackend())
+        ModelCircuitBreaker.record_failure('model-cleared', open_for=30)
+        ModelHealthRegistry.record('model-cleared', success=False, latency=1.0)
+
+        DjangoCacheHealthBackend().clear()
+
+        self.assertFalse(ModelCircuitBreaker.is_open('model-cleared'))
+        self.assertEqual(ModelHealthRegistry.get_stats('model-cleared')['samples'], 0)
+        self.assertEqual(cache.get('outra_chave'), 'valor')
+
+
+class AiModelHealthViewTestCase(TestCase):
+    """Testes para o endpoint administrativo de saúde dos modelos."""
+
+    def setUp(self):
+        set_health_backend(InProcessHealthBackend())
+        self.client = APIClient()
+        self.url = '/api/v1/audit/dashboard/ai-models/health/'
+
+    def tearDown(self):
+        set_health_backend(None)
+
+    def test_requer_admin(self):
+        """Teste: usuários comuns não acessam o endpoint"""
+        user = User.objects.create_user(username='user', password='pass')
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_retorna_estado_dos_breakers(self):
+        """Teste: admin recebe o estado de cada modelo"""
+        admin = User.objects.create_user(username='admin', password='pass', is_staff=True)
+        self.client.force_authenticate(user=admin)
+        ModelCircuitBreaker.record_failure('gemini-3-pro-preview', open_for=60)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        states = {entry['model']: entry['circuit'] for entry in response.data['text_models']}
+        self.assertEqual(states['gemini-3-pro-preview'], 'open')
+        self.assertEqual(states['gemini-2.5-flash'], 'closed')
@@ -0,0 +1,100 @@
+"""
+Testes para o PromptResultCache e o uso de cache=True no AiService.
+
+Estes testes verificam:
+- Chave de cache muda com prompt e config
+- Expiração por TTL e remoção LRU
+- Hit não chama o modelo e segue a política de créditos
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from services.ai_service import AiService
+from services.model_circuit_breaker import ModelCircuitBreaker
+from services.prompt_result_cache import PromptResultCache, prompt_result_cache
+from services.tests.test_ai_service import FakeAsyncModels, build_service, make_text_chunk, run_async
+
+
+class PromptResultCacheTestCase(SimpleTestCase):
+    """Testes para o cache em memória."""
+
+    def test_chave_depende_de_prompt_e_config(self):
+        """Teste: prompts ou configs diferentes geram chaves diferentes"""
+        key = PromptResultCache.build_key('gemini-text', ['a', 'b'], {'temperature': 0.7})
+
+        self.assertEqual(key, PromptResultCache.build_key('gemini-text', ['a', 'b'], {'temperature': 0.7}))
+        self.assertNotEqual(key, PromptResultCache.build_key('gemini-text', ['a', 'c'], {'temperature': 0.7}))
+        self.assertNotEqual(key, PromptResultCache.build_key('gemini-text', ['a', 'b'], {'temperature': 0.2}))
+
+    def test_ttl_expira_entrada(self):
+        """Teste: entradas expiradas contam como miss"""
+        cache = PromptResultCache(ttl_seconds=0)
+        cache.set('key', 'model', 'result')
+        time.sleep(0.01)
+
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_lru_remove_menos_usado(self):
+        """Teste: ao exceder a capacidade, a entrada menos usada sai primeiro"""
+        cache = PromptResultCache(max_entries=2)
+        cache.set('a', 'model', 1)
+        cache.set('b', 'model', 2)
+        cache.get('a')
+        cache.set('c', 'model', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), ('model', 1))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+
+@patch('services.ai_service.AuditService')
+@patch.object(AiService, '_deduct_credits', return_value=True)
+@patch.object(AiService, '_validate_credits', return_value=True)
+class AiServiceCacheTestCase(SimpleTestCase):
+    """Testes para generate_text/agenerate_text com cache=True."""
+
+    def setUp(self):
+        prompt_result_cache.clear()
+        ModelCircuitBreaker.reset()
+
+    def tearDown(self):
+        prompt_result_cache.clear()
+
+    def test_hit_nao_chama_modelo_nem_cobra(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: segunda chamada idêntica vem do cache sem cobrar créditos"""
+        fake_models = FakeAsyncModels([make_text_chunk('{"analise_semantica": {}}')], delay=0)
+        service = build_service(fake_models)
+
+        first = run_async(service.agenerate_text(['semantic'], user=MagicMock(), cache=True))
+        second = run_async(service.agenerate_text(['semantic'], user=MagicMock(), cache=True))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(fake_models.calls), 1)
+        self.assertEqual(mock_deduct.call_count, 1)
+        self.assertEqual(prompt_result_cache.stats()['hits'], 1)
+
+    def test_sem_cache_sempre_chama_modelo(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: sem cache=True o resultado não é reaproveitado"""
+        fake_models = FakeAsyncModels([make_text_chunk('ok')], delay=0)
+        service = build_service(fake_models)
+
+        run_async(service.agenerate_text(['semantic'], user=MagicMock()))
+        run_async(service.agenerate_text(['semantic'], user=MagicMock()))
+
+        self.assertEqual(len(fake_models.calls), 2)
+
+    @patch('services.ai_service.CACHE_HIT_CREDIT_POLICY', 'charge')
+    def test_politica_charge_cobra_hit(self, mock_validate, mock_deduct, mock_audit):
+        """Teste: com política 'charge', o hit também debita créditos"""
+        fake_models = FakeAsyncModels([make_text_chunk('ok')], delay=0)
+        service = build_service(fake_models)
+
+        run_async(service.agenerate_text(['semantic'], user=MagicMock(), cache=True))
+        run_async(service.agenerate_text(['semantic'], user=MagicMock(), cache=True))
+
+        self.assertEqual(len(fake_models.calls), 1)
+        self.assertEqual(mock_deduct.call_count, 2)
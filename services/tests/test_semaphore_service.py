@@ -0,0 +1,101 @@
+"""
+Testes para o SemaphoreService (fila limitada) e os token buckets por recurso.
+
+Estes testes verificam:
+- A fila limita o número de jobs em voo e mantém a ordem dos resultados
+- Exceções de um usuário viram resultado 'failed' sem derrubar o lote
+- Token bucket com peso espera pelos tokens e registra fila e tempo de espera
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from services.resource_limiter import GEMINI_IMAGE, GEMINI_TEXT, ResourceLimiter, TokenBucket
+from services.semaphore_service import SemaphoreService
+from services.tests.test_ai_service import run_async
+
+
+class SemaphoreServiceTestCase(SimpleTestCase):
+    """Testes para services.semaphore_service."""
+
+    def setUp(self):
+        self.limiter = ResourceLimiter({GEMINI_TEXT: (1000, 1000), GEMINI_IMAGE: (10, 1)})
+        self.service = SemaphoreService(max_concurrent_users=3, limiter=self.limiter)
+        self.active = 0
+        self.peak = 0
+
+    async def job(self, user):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.001 * (10 - user['id']))
+        self.active -= 1
+        if user['id'] == 4:
+            raise Exception('Gemini indisponível')
+        return {'status': 'success', 'user_id': user['id']}
+
+    def test_fila_limita_jobs_e_mantem_ordem(self):
+        """Teste: no máximo 3 jobs em voo e resultados na ordem dos usuários"""
+        users = [{'id': i, 'email': f'user{i}@test.com'} for i in range(10)]
+
+        results = run_async(self.service.process_concurrently(users, self.job))
+
+        self.assertEqual(self.peak, 3)
+        self.assertEqual([r['user_id'] for r in results], list(range(10)))
+        self.assertEqual(results[4], {
+            'user_id': 4, 'user': 'user4@test.com', 'status': 'failed', 'error': 'Gemini indisponível'})
+        self.assertEqual(self.service.stats()['queue']['processed'], 10)
+        self.assertEqual(self.service.stats()['queue']['workers'], 3)
+
+    def test_workers_limitados_ao_tamanho_do_lote(self):
+        """Teste: lote menor que o limite reporta só os workers criados"""
+        users = [{'id': i, 'email': f'user{i}@test.com'} for i in range(2)]
+
+        run_async(self.service.process_concurrently(users, self.job))
+
+        self.assertEqual(self.service.stats()['queue']['workers'], 2)
+
+    def test_lista_vazia(self):
+        """Teste: lote vazio não cria workers"""
+        self.assertEqual(run_async(self.service.process_concurrently([], self.job)), [])
+
+    def test_acquire_usa_bucket_do_recurso(self):
+        """Teste: chamadas de imagem esperam no bucket de imagem, não no de texto"""
+        async def run():
+            await asyncio.gather(*(self.service.acquire(GEMINI_IMAGE) for _ in range(3)))
+            await self.service.acquire(GEMINI_TEXT)
+
+        run_async(run())
+
+        resources = self.service.stats()['resources']
+        self.assertEqual(resources[GEMINI_IMAGE]['acquired'], 3)
+        self.assertEqual(resources[GEMINI_IMAGE]['max_queue_depth'], 2)
+        self.assertGreater(resources[GEMINI_IMAGE]['max_wait_seconds'], 0.1)
+        self.assertEqual(resources[GEMINI_TEXT]['max_wait_seconds'], 0.0)
+
+
+class TokenBucketTestCase(SimpleTestCase):
+    """Testes para services.resource_limiter.TokenBucket."""
+
+    def test_peso_consome_varios_tokens(self):
+        """Teste: acquire com peso 2 espera a recarga dos tokens que faltam"""
+        bucket = TokenBucket('serper', rate=10, capacity=2)
+        bucket.acquire_sync(2)
+
+        with patch('services.resource_limiter.time.sleep') as mock_sleep:
+            mock_sleep.side_effect = lambda delay: setattr(bucket, '_tokens', bucket.capacity)
+            bucket.acquire_sync(2)
+
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 0.2, places=2)
+        self.assertEqual(bucket.stats()['acquired'], 2)
+
+    def test_peso_maior_que_capacidade(self):
+        """Teste: peso acima da capacidade nunca seria atendido e gera ValueError"""
+        with self.assertRaises(ValueError):
+            TokenBucket('jina', rate=1, capacity=2).acquire_sync(3)
+
+    def test_recurso_desconhecido(self):
+        """Teste: recurso sem bucket gera ValueError"""
+        with self.assertRaises(ValueError):
+            ResourceLimiter({}).acquire_sync('openai')
@@ -0,0 +1,173 @@
+"""
+Testes para o cliente async do Serper e a descoberta de tendências async.
+
+Estes testes verificam:
+- asearch/asearch_news usam o token bucket async e a sessão compartilhada do loop
+- Buscas idênticas concorrentes no mesmo loop fazem uma única requisição
+- adiscover_trends_for_sector valida tendências em lotes sem passar por threads
+- Quem é dono do loop fecha a sessão ao terminar
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from ClientContext.services.retry_client_context import RetryClientContext
+from services import serper_search_service
+from services.serper_result_cache import SerperResultCache
+from services.serper_search_service import SerperSearchService, close_serper_session, get_serper_session
+from services.trends_discovery_service import MAX_TRENDS_PER_CATEGORY, TrendsDiscoveryService
+
+
+def aiohttp_response(data, status=200):
+    response = MagicMock()
+    response.status = status
+    response.json = AsyncMock(return_value=data)
+    response.raise_for_status = MagicMock()
+    response.__aenter__ = AsyncMock(return_value=response)
+    response.__aexit__ = AsyncMock(return_value=None)
+    return response
+
+
+class AsyncSerperClientTestCase(SimpleTestCase):
+    """Testes para SerperSearchService.asearch/asearch_news."""
+
+    def setUp(self):
+        cache.clear()
+        patcher = patch.object(serper_search_service, 'serper_result_cache', SerperResultCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = SerperSearchService()
+        self.service.api_key = 'test-key'
+
+    def test_sessao_reutilizada_no_loop(self):
+        """Teste: chamadas no mesmo loop compartilham a sessão HTTP"""
+        async def run():
+            first, second = get_serper_session(), get_serper_session()
+            await close_serper_session()
+            return first, second
+
+        first, second = async_to_sync(run)()
+
+        self.assertIs(first, second)
+        self.assertTrue(first.closed)
+
+    @patch.object(serper_search_service.resource_limiter, 'acquire', new_callable=AsyncMock)
+    def test_asearch_news_usa_bucket_async_e_sessao(self, mock_acquire):
+        """Teste: busca async espera o token bucket sem bloquear e faz POST pela sessão do loop"""
+        session = MagicMock()
+        session.post = MagicMock(return_value=aiohttp_response({'news': [{'link': 'https://g1.com/n'}]}))
+
+        with patch.object(serper_search_service, 'get_serper_session', return_value=session):
+            results = async_to_sync(self.service.asearch_news)('varejo', num_results=3)
+
+        self.assertEqual(results[0]['url'], 'https://g1.com/n')
+        mock_acquire.assert_awaited_once_with(serper_search_service.SERPER)
+        self.assertEqual(session.post.call_args.kwargs['json']['num'], 3)
+
+    @patch.object(serper_search_service.resource_limiter, 'acquire', new_callable=AsyncMock)
+    def test_erro_da_api_retorna_vazio(self, mock_acquire):
+        """Teste: 429 na busca async retorna lista vazia"""
+        session = MagicMock()
+        session.post = MagicMock(return_value=aiohttp_response({}, status=429))
+
+        with patch.object(serper_search_service, 'get_serper_session', return_value=session):
+            self.assertEqual(async_to_sync(self.service.asearch)('seo'), [])
+
+    def test_buscas_identicas_concorrentes_compartilham_requisicao(self):
+        """Teste: mesma query pedida por várias oportunidades ao mesmo tempo gera uma chamada"""
+        calls = []
+
+        async def fake_afetch(endpoint, payload):
+            calls.append(payload['q'])
+            await asyncio.sleep(0.01)
+            return {'organic': [{'link': 'https://g1.com/a'}]}
+
+        self.service._afetch = fake_afetch
+
+        async def run():
+            return await asyncio.gather(*(self.service.asearch('marketing digital') for _ in range(3)))
+
+        results = async_to_sync(run)()
+
+        self.assertEqual(calls, ['marketing digital'])
+        self.assertTrue(all(result[0]['url'] == 'https://g1.com/a' for result in results))
+
+
+class FakeAsyncSearchService:
+    """Serviço de busca com a interface async do SerperSearchService."""
+
+    def __init__(self, titles, sources_by_topic=None):
+        self.titles = titles
+        self.sources_by_topic = sources_by_topic or {}
+        self.searches = []
+
+    async def asearch_news(self, query, num_results=5):
+        return [{'title': title} for title in self.titles]
+
+    async def asearch(self, query, num_results=5):
+        self.searches.append(query)
+        count = self.sources_by_topic.get(query, 3)
+        return [{'url': f'https://fonte{i}.com', 'title': query} for i in range(count)]
+
+
+class AsyncTrendsDiscoveryTestCase(SimpleTestCase):
+    """Testes para TrendsDiscoveryService.adiscover_trends_for_sector."""
+
+    def test_descobre_categorias_com_formato_do_sync(self):
+        """Teste: as três categorias voltam preenchidas e os tópicos em alta marcados"""
+        search_service = FakeAsyncSearchService(['Tema A', 'Tema B', 'Tema A'])
+        service = TrendsDiscoveryService(search_service=search_service)
+
+        result = async_to_sync(service.adiscover_trends_for_sector)('Marketing')
+
+        self.assertEqual([trend['topic'] for trend in result['general_trends']], ['Tema A', 'Tema B'])
+        self.assertEqual(result['sector_trends'][0]['search_keywords'], ['Tema A', 'Marketing'])
+        self.assertTrue(all(trend['is_rising'] for trend in result['rising_topics']))
+        self.assertEqual(result['validated_count'], 6)
+
+    def test_valida_em_lotes_do_que_falta(self):
+        """Teste: só busca fontes para os tópicos necessários, repondo os inválidos"""
+        titles = [f'Tema {i}' for i in range(10)]
+        search_service = FakeAsyncSearchService(titles, sources_by_topic={'Tema 1': 0})
+        service = TrendsDiscoveryService(search_service=search_service)
+
+        trends = async_to_sync(service._adiscover_from_news)('tendências', 10)
+
+        self.assertEqual(len(trends), MAX_TRENDS_PER_CATEGORY)
+        self.assertEqual([trend['topic'] for trend in trends], [f'Tema {i}' for i in (0, 2, 3, 4, 5)])
+        self.assertEqual(len(search_service.searches), MAX_TRENDS_PER_CATEGORY + 1)
+
+    def test_setor_vazio(self):
+        """Teste: setor vazio retorna estrutura vazia sem buscas"""
+        search_service = FakeAsyncSearchService(['Tema A'])
+        service = TrendsDiscoveryService(search_service=search_service)
+
+        result = async_to_sync(service.adiscover_trends_for_sector)('  ')
+
+        self.assertEqual(result['discovery_metadata']['error'], 'empty_sector')
+        self.assertEqual(search_service.searches, [])
+
+
+class SerperSessionOwnersTestCase(SimpleTestCase):
+    """Testes para o fechamento da sessão do Serper por quem é dono do loop."""
+
+    def test_retry_de_contexto_fecha_sessao(self):
+        """Teste: o retry do contexto semanal fecha a sessão do loop ao terminar o batch"""
+        semaphore_service = MagicMock()
+        semaphore_service.process_concurrently = AsyncMock(return_value=[{'status': 'success'}])
+        service = RetryClientContext(semaphore_service=semaphore_service, weekly_context_service=MagicMock())
+
+        async def pages(batch_size):
+            yield [{'id': 1}]
+
+        service.user_cursor.pages = pages
+
+        with patch('ClientContext.services.retry_client_context.close_serper_session',
+                   new_callable=AsyncMock) as mock_close:
+            result = async_to_sync(service.process_all_users_context)(batch_size=2)
+
+        self.assertEqual(result['processed'], 1)
+        mock_close.assert_awaited_once()
@@ -0,0 +1,135 @@
+"""
+Testes para o cache de respostas do Serper.
+
+Estes testes verificam:
+- Chave por endpoint, query normalizada, gl, hl, num e filtro de data
+- Consultas repetidas não chamam a API e falhas não são cacheadas
+- Consultas idênticas simultâneas compartilham uma única requisição
+- Contadores de hit/miss por endpoint
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from services.serper_result_cache import NEWS_ENDPOINT, SEARCH_ENDPOINT, SerperResultCache
+from services.serper_search_service import SerperSearchService
+
+
+def serper_response(data, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = data
+    return response
+
+
+class SerperResultCacheTestCase(SimpleTestCase):
+    """Testes para services.serper_result_cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.result_cache = SerperResultCache()
+
+    def test_chave_normaliza_query_e_separa_parametros(self):
+        """Teste: caixa e espaços não mudam a chave; endpoint, num e data mudam"""
+        payload = {'q': 'Marketing  Digital ', 'gl': 'br', 'hl': 'pt-br', 'num': 10}
+        key = self.result_cache.build_key(SEARCH_ENDPOINT, payload)
+
+        self.assertEqual(key, self.result_cache.build_key(SEARCH_ENDPOINT, {**payload, 'q': 'marketing digital'}))
+        self.assertNotEqual(key, self.result_cache.build_key(NEWS_ENDPOINT, payload))
+        self.assertNotEqual(key, self.result_cache.build_key(SEARCH_ENDPOINT, {**payload, 'num': 5}))
+        self.assertNotEqual(key, self.result_cache.build_key(SEARCH_ENDPOINT, {**payload, 'tbs': 'qdr:w1'}))
+
+    def test_falha_nao_e_cacheada(self):
+        """Teste: resposta None (erro) é buscada de novo na próxima chamada"""
+        fetch = MagicMock(side_effect=[None, {'organic': []}])
+        payload = {'q': 'seo'}
+
+        self.assertIsNone(self.result_cache.get_or_fetch(SEARCH_ENDPOINT, payload, fetch))
+        self.assertEqual(self.result_cache.get_or_fetch(SEARCH_ENDPOINT, payload, fetch), {'organic': []})
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(self.result_cache.stats()['endpoints'][SEARCH_ENDPOINT]['errors'], 1)
+
+    def test_consultas_simultaneas_compartilham_requisicao(self):
+        """Teste: threads pedindo a mesma query esperam a primeira requisição"""
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'news': [{'link': 'https://g1.com/a'}]}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                self.result_cache.get_or_fetch(NEWS_ENDPOINT, {'q': 'varejo'}, slow_fetch)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result == {'news': [{'link': 'https://g1.com/a'}]} for result in results))
+        stats = self.result_cache.stats()
+        self.assertEqual((stats['misses'], stats['coalesced'] + stats['hits']), (1, 3))
+        self.assertEqual(stats['queries_saved'], 3)
+
+
+class SerperSearchServiceCacheTestCase(SimpleTestCase):
+    """Testes para o SerperSearchService com o cache compartilhado."""
+
+    def setUp(self):
+        cache.clear()
+        self.result_cache = SerperResultCache()
+        patcher = patch('services.serper_search_service.serper_result_cache', self.result_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = SerperSearchService()
+        self.service.api_key = 'test-key'
+        self.service._rate_limit = MagicMock()
+
+    @patch('services.serper_search_service.requests.post')
+    def test_busca_repetida_usa_cache(self, mock_post):
+        """Teste: mesma busca para outro usuário não consome cota nem rate limit"""
+        mock_post.return_value = serper_response({'organic': [{'link': 'https://g1.com/a', 'title': 'A'}]})
+
+        first = self.service.search('marketing digital', num_results=5)
+        second = self.service.search('Marketing Digital', num_results=5)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]['url'], 'https://g1.com/a')
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(self.service._rate_limit.call_count, 1)
+        self.assertEqual(self.result_cache.stats()['hit_rate'], 0.5)
+
+    @patch('services.serper_search_service.requests.post')
+    def test_news_e_search_tem_entradas_separadas(self, mock_post):
+        """Teste: search_news e search com a mesma query não compartilham resposta"""
+        mock_post.side_effect = [
+            serper_response({'news': [{'link': 'https://g1.com/n', 'source': 'G1'}]}),
+            serper_response({'organic': [{'link': 'https://g1.com/o'}]}),
+        ]
+
+        news = self.service.search_news('varejo')
+        organic = self.service.search('varejo')
+
+        self.assertEqual(news[0]['url'], 'https://g1.com/n')
+        self.assertEqual(organic[0]['url'], 'https://g1.com/o')
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch('services.serper_search_service.requests.post')
+    def test_erro_da_api_nao_e_cacheado(self, mock_post):
+        """Teste: 429 retorna lista vazia e a próxima chamada tenta a API de novo"""
+        mock_post.side_effect = [
+            serper_response({}, status_code=429),
+            serper_response({'organic': [{'link': 'https://g1.com/a'}]}),
+        ]
+
+        self.assertEqual(self.service.search('seo'), [])
+        self.assertEqual(len(self.service.search('seo')), 1)
+        self.assertEqual(mock_post.call_count, 2)
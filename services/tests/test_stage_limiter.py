@@ -0,0 +1,81 @@
+"""
+Testes para o StageLimiter (limites de concorrência por estágio).
+
+Estes testes verificam:
+- Cada estágio respeita o seu próprio limite
+- Estágios diferentes não disputam o mesmo semáforo
+- gather_stages cancela e espera os outros estágios antes de propagar a falha
+"""
+
+import asyncio
+
+from django.test import SimpleTestCase
+
+from services.stage_limiter import IMAGE_STAGE, TEXT_STAGE, StageLimiter, gather_stages
+from services.tests.test_ai_service import run_async
+
+
+class StageLimiterTestCase(SimpleTestCase):
+    """Testes para services.stage_limiter."""
+
+    def setUp(self):
+        self.limiter = StageLimiter({TEXT_STAGE: 3, IMAGE_STAGE: 1})
+        self.active = {TEXT_STAGE: 0, IMAGE_STAGE: 0}
+        self.peak = {TEXT_STAGE: 0, IMAGE_STAGE: 0}
+
+    async def work(self, stage):
+        self.active[stage] += 1
+        self.peak[stage] = max(self.peak[stage], self.active[stage])
+        await asyncio.sleep(0.01)
+        self.active[stage] -= 1
+        return stage
+
+    def test_limite_por_estagio(self):
+        """Teste: texto e imagem usam limites independentes"""
+        async def run():
+            return await asyncio.gather(*(
+                self.limiter.run(stage, self.work, stage)
+                for stage in [TEXT_STAGE] * 6 + [IMAGE_STAGE] * 3
+            ))
+
+        results = run_async(run())
+
+        self.assertEqual(len(results), 9)
+        self.assertEqual(self.peak, {TEXT_STAGE: 3, IMAGE_STAGE: 1})
+
+    def test_semaforos_por_event_loop(self):
+        """Teste: o mesmo limiter funciona em execuções com loops novos"""
+        self.assertEqual(run_async(self.limiter.run(IMAGE_STAGE, self.work, IMAGE_STAGE)), IMAGE_STAGE)
+        self.assertEqual(run_async(self.limiter.run(IMAGE_STAGE, self.work, IMAGE_STAGE)), IMAGE_STAGE)
+
+    def test_estagio_desconhecido(self):
+        """Teste: estágio sem limite configurado gera ValueError"""
+        with self.assertRaises(ValueError):
+            run_async(self.limiter.run('video', self.work, TEXT_STAGE))
+
+    def test_gather_cancela_os_outros_estagios_na_falha(self):
+        """Teste: a falha de um ramo cancela o outro e só é propagada depois que ele termina"""
+        finished = []
+
+        async def fail():
+            raise RuntimeError('texto bloqueado')
+
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+                finished.append('imagem')
+            except asyncio.CancelledError:
+                finished.append('cancelado')
+                raise
+
+        with self.assertRaisesMessage(RuntimeError, 'texto bloqueado'):
+            run_async(gather_stages(fail(), slow()))
+        self.assertEqual(finished, ['cancelado'])
+
+    def test_gather_retorna_resultados_em_ordem(self):
+        """Teste: resultados voltam na ordem dos estágios"""
+        async def stage(value, delay):
+            await asyncio.sleep(delay)
+            return value
+
+        self.assertEqual(run_async(gather_stages(stage('texto', 0.01), stage('imagem', 0))), ['texto', 'imagem'])
@@ -0,0 +1,67 @@
+"""
+Testes para o UserGenerationBundle (dados do usuário carregados uma vez por execução).
+
+Estes testes verificam:
+- O bundle carrega perfil, logo sem prefixo data URL, estilos visuais e ClientContext
+- Prompts montados a partir do bundle não consultam o banco
+- set_user ignora um bundle de outro usuário
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ClientContext.models import ClientContext
+from CreatorProfile.models import CreatorProfile, VisualStylePreference
+from services.ai_prompt_service import AIPromptService
+from services.user_generation_bundle import UserGenerationBundle
+
+
+class UserGenerationBundleTestCase(TestCase):
+    """Testes para services.user_generation_bundle."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='bundle', password='pass', first_name='Ana')
+        self.style = VisualStylePreference.objects.create(name='Minimalista', description='Fundo limpo')
+        self.profile = CreatorProfile.objects.create(
+            user=self.user,
+            business_name='Café da Ana',
+            specialization='Cafeteria',
+            logo='data:image/png;base64,bG9nbw==',
+            visual_style_ids=[self.style.id],
+            color_1='#112233',
+        )
+        ClientContext.objects.create(user=self.user, market_panorama='Cafés especiais em alta')
+
+    def test_carrega_dados_do_usuario(self):
+        """Teste: logo, estilos, paleta e contexto vêm no bundle"""
+        bundle = UserGenerationBundle.load(self.user, self.profile, subscription_active=True)
+
+        self.assertEqual(bundle.logo, 'bG9nbw==')
+        self.assertEqual(bundle.visual_styles, {self.style.id: 'Minimalista - Fundo limpo'})
+        self.assertEqual(bundle.client_context['market_panorama'], 'Cafés especiais em alta')
+        self.assertEqual(bundle.color_palette[0], '#112233')
+        self.assertTrue(bundle.subscription_active)
+
+    def test_prompts_sem_queries(self):
+        """Teste: com o bundle, os builders de prompt não tocam o banco"""
+        bundle = UserGenerationBundle.load(self.user, self.profile)
+        prompt_service = AIPromptService()
+
+        with self.assertNumQueries(0):
+            prompt_service.set_user(self.user, bundle)
+            semantic_prompt = prompt_service.semantic_analysis_prompt('Post sobre café')
+            profile_data = prompt_service._get_profile_data()
+
+        self.assertIn("'#112233'", ''.join(semantic_prompt))
+        self.assertEqual(profile_data['visual_style'], 'Minimalista - Fundo limpo')
+        self.assertEqual(profile_data['user_name'], 'Café da Ana')
+
+    def test_bundle_de_outro_usuario_ignorado(self):
+        """Teste: set_user com bundle de outro usuário volta a consultar o perfil"""
+        other = User.objects.create_user(username='outro', password='pass')
+        bundle = UserGenerationBundle.load(self.user, self.profile)
+        prompt_service = AIPromptService()
+
+        prompt_service.set_user(other, bundle)
+
+        self.assertIsNone(prompt_service.bundle)
@@ -0,0 +1,79 @@
+"""
+Testes para a elegibilidade em lote do UserValidationService.
+
+Estes testes verificam:
+- Onboarding, assinatura e créditos resolvidos para o lote inteiro
+- UserSubscriptionStatus só é gravado quando muda
+- validate_user_eligibility usa o resultado pré-calculado
+"""
+
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from CreatorProfile.models import CreatorProfile
+from CreditSystem.models import SubscriptionPlan, UserCredits, UserSubscription, UserSubscriptionStatus
+from services.user_validation_service import UserValidationService
+
+
+class ResolveEligibilityTestCase(TestCase):
+    """Testes para UserValidationService.resolve_eligibility."""
+
+    def setUp(self):
+        self.plan = SubscriptionPlan.objects.create(
+            name='Mensal', interval='monthly', price=Decimal('49.90'), monthly_credits=Decimal('0'))
+        self.service = UserValidationService()
+
+        self.eligible = self.create_user('ok', onboarding=True, subscription=True, balance='10.00')
+        self.incomplete = self.create_user('incompleto', onboarding=False, subscription=True, balance='10.00')
+        self.no_subscription = self.create_user('sem_assinatura', onboarding=True, subscription=False, balance='10.00')
+        self.no_credits = self.create_user('sem_creditos', onboarding=True, subscription=True, balance='0.00')
+        self.no_profile = User.objects.create_user(username='sem_perfil', password='pass')
+
+    def create_user(self, username, onboarding, subscription, balance):
+        user = User.objects.create_user(username=username, password='pass')
+        CreatorProfile.objects.create(
+            user=user,
+            business_name='Empresa',
+            specialization='Nicho' if onboarding else '',
+            business_description='Descrição',
+        )
+        if subscription:
+            UserSubscription.objects.create(user=user, plan=self.plan, status='active')
+        UserCredits.objects.create(user=user, balance=Decimal(balance))
+        return user
+
+    def test_resolve_lote(self):
+        """Teste: cada usuário recebe o status e o motivo corretos"""
+        results = self.service.resolve_eligibility([
+            self.eligible.id, self.incomplete.id, self.no_subscription.id, self.no_credits.id, self.no_profile.id,
+        ])
+
+        self.assertEqual(results[self.eligible.id], {'status': 'eligible'})
+        self.assertEqual(results[self.incomplete.id]['reason'], 'incomplete_onboarding')
+        self.assertEqual(results[self.no_subscription.id]['reason'], 'no_active_subscription')
+        self.assertEqual(results[self.no_credits.id]['reason'], 'insufficient_credits')
+        self.assertEqual(results[self.no_profile.id]['reason'], 'user_not_found')
+
+    def test_status_da_assinatura_gravado_so_quando_muda(self):
+        """Teste: a segunda resolução não grava UserSubscriptionStatus"""
+        self.service.resolve_eligibility([self.eligible.id])
+        status = UserSubscriptionStatus.objects.get(user=self.eligible)
+        self.assertTrue(status.has_active_subscription)
+
+        # Usuário apto: 1 query anotada + 1 leitura dos status, sem escrita
+        with self.assertNumQueries(2):
+            self.service.resolve_eligibility([self.eligible.id])
+
+    def test_validate_usa_resultado_pre_calculado(self):
+        """Teste: validate_user_eligibility consome o resultado do prefetch"""
+        async_to_sync(self.service.prefetch_eligibility)([{'id': self.no_subscription.id}])
+
+        with self.assertNumQueries(0):
+            result = async_to_sync(self.service.validate_user_eligibility)(
+                (self.no_subscription, self.no_subscription.creator_profile))
+
+        self.assertEqual(result, {'status': 'ineligible', 'reason': 'no_active_subscription'})
+        self.assertEqual(self.service._eligibility, {})
@@ -12,7 +12,12 @@ Fluxo:
 Este serviço resolve o problema de "inverter o fluxo":
     ANTES: Gemini "inventa" → tentamos validar → falha
     AGORA: Descobrimos tendências reais → Gemini adapta → sempre tem fontes
+
+adiscover_trends_for_sector faz o mesmo fluxo sem threads: as três
+categorias rodam em paralelo no event loop e as buscas de validação de cada
+categoria saem em lotes, pelo cliente async do Serper.
 """
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -73,6 +78,57 @@ class TrendsDiscoveryService:
         """
         logger.info(f"Discovering trends for sector: {sector}")
 
+        result = self._new_result(sector, location)
+        if 'error' in result['discovery_metadata']:
+            return result
+
+        # 1. Buscar tendências gerais do Brasil
+        general_trends = self._discover_general_trends()
+        result['general_trends'] = general_trends
+
+        # 2. Buscar tendências específicas do setor
+        sector_trends = self._discover_sector_trends(sector, business_description)
+        result['sector_trends'] = sector_trends
+
+        # 3. Buscar tópicos em crescimento relacionados ao setor
+        rising_topics = self._discover_rising_topics(sector)
+        result['rising_topics'] = rising_topics
+
+        return self._finish_result(result)
+
+    async def adiscover_trends_for_sector(
+        self,
+        sector: str,
+        business_description: str = '',
+        location: str = 'Brasil',
+    ) -> Dict[str, Any]:
+        """
+        Versão async de discover_trends_for_sector (mesmo formato de retorno).
+
+        As três categorias são descobertas em paralelo usando asearch/asearch_news
+        do serviço de busca.
+        """
+        logger.info(f"Discovering trends for sector: {sector}")
+
+        result = self._new_result(sector, location)
+        if 'error' in result['discovery_metadata']:
+            return result
+
+        general_trends, sector_trends, rising_topics = await asyncio.gather(
+            self._adiscover_from_news("tendências brasil hoje", MAX_GENERAL_TRENDS),
+            self._adiscover_from_news(f"{sector} tendências brasil", MAX_GENERAL_TRENDS, [sector]),
+            self._adiscover_from_news(f"{sector} tendências", 10, [sector]),
+        )
+        for trend in rising_topics:
+            trend['is_rising'] = True
+
+        result['general_trends'] = general_trends
+        result['sector_trends'] = sector_trends
+        result['rising_topics'] = rising_topics
+        return self._finish_result(result)
+
+    def _new_result(self, sector: str, location: str) -> Dict[str, Any]:
+        """Estrutura vazia do resultado; marca erro se o setor estiver vazio."""
         result = {
             'general_trends': [],
             'sector_trends': [],
@@ -88,20 +144,9 @@ class TrendsDiscoveryService:
         if not sector or not sector.strip():
             logger.warning("Empty sector provided, returning empty trends")
             result['discovery_metadata']['error'] = 'empty_sector'
-            return result
-
-        # 1. Buscar tendências gerais do Brasil
-        general_trends = self._discover_general_trends()
-        result['general_trends'] = general_trends
-
-        # 2. Buscar tendências específicas do setor
-        sector_trends = self._discover_sector_trends(sector, business_description)
-        result['sector_trends'] = sector_trends
-
-        # 3. Buscar tópicos em crescimento relacionados ao setor
-        rising_topics = self._discover_rising_topics(sector)
-        result['rising_topics'] = rising_topics
+        return result
 
+    def _finish_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         # Calcular total de tendências validadas
         result['validated_count'] = (
             len(result['general_trends']) +
@@ -109,9 +154,66 @@ class TrendsDiscoveryService:
             len(result['rising_topics'])
         )
 
-        logger.info(f"Discovered {result['validated_count']} validated trends for sector '{sector}'")
+        logger.info(
+            f"Discovered {result['validated_count']} validated trends "
+            f"for sector '{result['discovery_metadata']['sector']}'"
+        )
         return result
 
+    async def _adiscover_from_news(
+        self,
+        query: str,
+        num_results: int,
+        context_keywords: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca notícias e valida os títulos como tendências, em lotes paralelos.
+
+        Cada lote tem o número de tendências que ainda faltam, então o total de
+        buscas fica próximo do fluxo sequencial e a ordem das notícias é mantida.
+        """
+        try:
+            news_results = await self.search_service.asearch_news(query=query, num_results=num_results)
+
+            topics: List[str] = []
+            for article in news_results:
+                topic = article.get('title', '').strip()
+                if topic and topic not in topics:
+                    topics.append(topic)
+
+            validated_trends: List[Dict[str, Any]] = []
+            while topics and len(validated_trends) < MAX_TRENDS_PER_CATEGORY:
+                missing = MAX_TRENDS_PER_CATEGORY - len(validated_trends)
+                batch, topics = topics[:missing], topics[missing:]
+                validated = await asyncio.gather(*(
+                    self._avalidate_trend_with_sources(topic, context_keywords) for topic in batch
+                ))
+                validated_trends.extend(trend for trend in validated if trend)
+
+            return validated_trends
+
+        except Exception as e:
+            logger.error(f"Error discovering trends for '{query}': {e}")
+            return []
+
+    async def _avalidate_trend_with_sources(
+        self,
+        topic: str,
+        context_keywords: Optional[List[str]] = None,
+        growth_score: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """Versão async de _validate_trend_with_sources."""
+        try:
+            sources = await self.search_service.asearch(
+                query=self._trend_search_query(topic, context_keywords),
+                num_results=5
+            )
+            return self._build_trend(topic, sources, context_keywords, growth_score)
+
+        except Exception as e:
+            logger.error(f"Error validating trend '{topic}': {e}")
+            return None
+
     def _discover_general_trends(self) -> List[Dict[str, Any]]:
         """
         Descobre tendências gerais do Brasil via Serper news e valida com fontes.
@@ -263,42 +365,52 @@ class TrendsDiscoveryService:
             return None
 
         try:
-            # Construir query de busca
-            search_query = topic
-            if context_keywords:
-                # Adicionar apenas o primeiro contexto para não poluir a busca
-                search_query = f"{topic} {context_keywords[0]}"
-
             # Buscar fontes
             sources = self.search_service.search(
-                query=search_query,
+                query=self._trend_search_query(topic, context_keywords),
                 num_results=5
             )
-
-            # Validar quantidade mínima de fontes
-            if len(sources) < MIN_SOURCES_FOR_VALID_TREND:
-                logger.debug(f"Trend '{topic}' has only {len(sources)} sources, skipping")
-                return None
-
-            # Calcular score de relevância
-            relevance_score = self._calculate_relevance_score(
-                sources_count=len(sources),
-                growth_score=growth_score
-            )
-
-            return {
-                'topic': topic,
-                'sources': sources,
-                'sources_count': len(sources),
-                'growth_score': growth_score,
-                'relevance_score': relevance_score,
-                'search_keywords': [topic] + (context_keywords or []),
-            }
+            return self._build_trend(topic, sources, context_keywords, growth_score)
 
         except Exception as e:
             logger.error(f"Error validating trend '{topic}': {e}")
             return None
 
+    @staticmethod
+    def _trend_search_query(topic: str, context_keywords: Optional[List[str]] = None) -> str:
+        # Adicionar apenas o primeiro contexto para não poluir a busca
+        if context_keywords:
+            return f"{topic} {context_keywords[0]}"
+        return topic
+
+    def _build_trend(
+        self,
+        topic: str,
+        sources: List[Dict[str, Any]],
+        context_keywords: Optional[List[str]] = None,
+        growth_score: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """Monta a tendência validada, ou None se não tiver fontes suficientes."""
+        # Validar quantidade mínima de fontes
+        if len(sources) < MIN_SOURCES_FOR_VALID_TREND:
+            logger.debug(f"Trend '{topic}' has only {len(sources)} sources, skipping")
+            return None
+
+        # Calcular score de relevância
+        relevance_score = self._calculate_relevance_score(
+            sources_count=len(sources),
+            growth_score=growth_score
+        )
+
+        return {
+            'topic': topic,
+            'sources': sources,
+            'sources_count': len(sources),
+            'growth_score': growth_score,
+            'relevance_score': relevance_score,
+            'search_keywords': [topic] + (context_keywords or []),
+        }
+
     def _calculate_relevance_score(self, sources_count: int, growth_score: int) -> int:
         """
         Calcula score de relevância baseado em fontes e crescimento.
@@ -0,0 +1,82 @@
+"""
+Per-user data shared by every prompt and AI call of a generation run.
+
+A single daily run used to load the same CreatorProfile four or five times
+per user (eligibility check, every prompt builder, the logo for the image
+call) and to query VisualStylePreference for every prompt. The bundle is
+loaded once per user and handed to AIPromptService.set_user and to the image
+calls, so the rest of the run works from memory.
+"""
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from django.contrib.auth.models import User
+
+from ClientContext.models import ClientContext
+from ClientContext.serializers import ClientContextSerializer
+from CreatorProfile.models import CreatorProfile, VisualStylePreference
+from services.get_creator_profile_data import build_creator_profile_data
+
+logger = logging.getLogger(__name__)
+
+
+def strip_logo_data_url(logo: Optional[str]) -> Optional[str]:
+    """Return the base64 payload of a `data:image/...;base64,` logo."""
+    if logo and "data:image/" in logo and ";base64," in logo:
+        return logo.split(",")[1]
+    return logo
+
+
+@dataclass
+class UserGenerationBundle:
+    """Everything the prompt builders and AI calls need about one user."""
+
+    user: User
+    profile: CreatorProfile
+    logo: Optional[str]
+    visual_styles: Dict[int, str] = field(default_factory=dict)
+    client_context: Dict[str, Any] = field(default_factory=dict)
+    subscription_active: bool = False
+
+    @classmethod
+    def load(cls, user: User, profile: CreatorProfile, subscription_active: bool = False) -> 'UserGenerationBundle':
+        """Load the bundle for a user whose profile was already fetched."""
+        style_ids = profile.visual_style_ids or []
+        visual_styles = {
+            style.id: f'{style.name} - {style.description}'
+            for style in VisualStylePreference.objects.filter(id__in=style_ids)
+        } if style_ids else {}
+
+        context = ClientContext.objects.filter(user=user).first()
+
+        return cls(
+            user=user,
+            profile=profile,
+            logo=strip_logo_data_url(profile.logo),
+            visual_styles=visual_styles,
+            client_context=dict(ClientContextSerializer(context).data),
+            subscription_active=subscription_active,
+        )
+
+    @property
+    def color_palette(self) -> list:
+        return self.profile_data(visual_style='')['color_palette']
+
+    def random_visual_style(self) -> str:
+        """Pick one of the user's visual styles, like get_random_visual_style but without a query."""
+        if not self.profile.visual_style_ids:
+            return ""
+
+        style_id = random.choice(self.profile.visual_style_ids)
+        if style_id not in self.visual_styles:
+            logger.warning(f"VisualStylePreference with id {style_id} not found for user {self.user.id}")
+            return ""
+        return self.visual_styles[style_id]
+
+    def profile_data(self, visual_style: Optional[str] = None) -> dict:
+        """Prompt profile data (same shape as get_creator_profile_data)."""
+        if visual_style is None:
+            visual_style = self.random_visual_style()
+        return build_creator_profile_data(self.profile, self.user, visual_style)
@@ -1,13 +1,22 @@
+from decimal import Decimal
+from typing import Any, Dict, Iterable
 
 from asgiref.sync import sync_to_async
 from CreatorProfile.models import CreatorProfile
+from CreditSystem.models import CreditTransaction, UserCredits, UserSubscription
 from CreditSystem.services.credit_service import CreditService
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db.models import F, OuterRef, Subquery
+
+from services.user_generation_bundle import UserGenerationBundle
 
 
 class UserValidationService:
     def __init__(self):
         self.credit_service = CreditService()
+        # Results of resolve_eligibility waiting to be used by validate_user_eligibility
+        self._eligibility: Dict[int, Dict[str, Any]] = {}
 
     @sync_to_async
     def get_user_data(self, user_id: int) -> tuple[User, CreatorProfile] | None:
@@ -21,10 +30,20 @@ class UserValidationService:
 
     @sync_to_async
     def validate_user_eligibility(self, user: dict) -> dict:
-        """Validate if the user is eligible for processing."""
+        """Validate if the user is eligible for processing.
+
+        Uses the result prefetched by `prefetch_eligibility` when there is one,
+        otherwise checks the user individually.
+        """
         if not user:
             return {"status": "ineligible", "reason": "user_not_found"}
 
+        prefetched = self._eligibility.pop(user[0].id, None)
+        if prefetched is not None:
+            if prefetched['status'] != 'eligible':
+                return prefetched
+            return {"status": "eligible", "user": user[0], "profile": user[1]}
+
         if not user[1].step_1_completed:
             return {'status': 'ineligible', 'reason': 'incomplete_onboarding'}
 
@@ -32,3 +51,71 @@ class UserValidationService:
             return {"status": "ineligible", "reason": "no_active_subscription"}
 
         return {"status": "eligible", "user": user[0], "profile": user[1]}
+
+    def resolve_eligibility(
+            self,
+            user_ids: Iterable[int],
+            operation_type: str = 'text_generation') -> Dict[int, Dict[str, Any]]:
+        """
+        Eligibility of a whole batch of users in a few queries.
+
+        Onboarding, active subscription and credit balance come from one
+        annotated query; UserSubscriptionStatus rows are written only when
+        they changed. Users whose balance looks insufficient are re-checked
+        with CreditService.validate_operation, which also applies a pending
+        monthly credit reset.
+
+        Returns:
+            {user_id: {'status': 'eligible'} | {'status': 'ineligible', 'reason': ...}}
+        """
+        user_ids = list(user_ids)
+        cost = CreditTransaction.get_fixed_price(operation_type)
+
+        rows = User.objects.filter(id__in=user_ids).annotate(
+            onboarding_completed=F('creator_profile__step_1_completed'),
+            active_subscription_id=Subquery(
+                UserSubscription.objects.filter(user=OuterRef('pk'), status='active').order_by('id').values('id')[:1]
+            ),
+            credit_balance=Subquery(
+                UserCredits.objects.filter(user=OuterRef('pk')).values('balance')[:1]
+            ),
+        ).values('id', 'onboarding_completed', 'active_subscription_id', 'credit_balance')
+
+        results = {user_id: {'status': 'ineligible', 'reason': 'user_not_found'} for user_id in user_ids}
+        active_subscriptions, low_balance = {}, []
+        for row in rows:
+            if row['onboarding_completed'] is None:
+                continue
+            if not row['onboarding_completed']:
+                results[row['id']] = {'status': 'ineligible', 'reason': 'incomplete_onboarding'}
+            elif row['active_subscription_id'] is None:
+                results[row['id']] = {'status': 'ineligible', 'reason': 'no_active_subscription'}
+            else:
+                active_subscriptions[row['id']] = row['active_subscription_id']
+                if (row['credit_balance'] or Decimal('0.00')) >= cost:
+                    results[row['id']] = {'status': 'eligible'}
+                else:
+                    low_balance.append(row['id'])
+
+        self.credit_service.sync_subscription_statuses(active_subscriptions)
+
+        for user in User.objects.filter(id__in=low_balance):
+            try:
+                sufficient = self.credit_service.validate_operation(user, operation_type)
+            except ValidationError:
+                sufficient = False
+            results[user.id] = {'status': 'eligible'} if sufficient else {
+                'status': 'ineligible', 'reason': 'insufficient_credits'}
+
+        return results
+
+    async def prefetch_eligibility(self, users: list[dict]) -> None:
+        """Resolve a page of users at once for the following validate_user_eligibility calls."""
+        user_ids = [user.get('id') or user.get('user_id') for user in users]
+        self._eligibility.update(await sync_to_async(self.resolve_eligibility)(user_ids))
+
+    @sync_to_async
+    def get_generation_bundle(self, user: tuple, validation_result: dict) -> UserGenerationBundle:
+        """Load the generation bundle of a user checked by validate_user_eligibility."""
+        return UserGenerationBundle.load(
+            user[0], user[1], subscription_active=validation_result['status'] == 'eligible')